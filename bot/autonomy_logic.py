@@ -80,7 +80,7 @@ async def process_autonomy_goal(
     safe_prompt = prompt or f"Objetivo autonomo {goal_name}."
 
     try:
-        ctx = context_manager.ensure_channel_config_loaded(channel_id)
+        ctx = await context_manager.ensure_channel_ready(channel_id)
     except Exception as error:
         observability.record_error(
             category="autonomy_channel_config",
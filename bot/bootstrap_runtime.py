@@ -1,8 +1,11 @@
 import asyncio
 import os
+import time
+from typing import Any
 
 from bot.autonomy_runtime import autonomy_runtime
 from bot.clip_jobs_runtime import clip_jobs
+from bot.event_loop_monitor import event_loop_monitor
 from bot.eventsub_runtime import ByteBot
 from bot.irc_runtime import IrcByteBot
 from bot.observability import observability
@@ -20,6 +23,7 @@ from bot.runtime_config import (
     TWITCH_TOKEN_REFRESH_MARGIN_SECONDS,
     logger,
 )
+from bot.semantic_memory_compaction_runtime import semantic_memory_compaction
 from bot.sentiment_engine import sentiment_engine
 from bot.status_runtime import parse_channel_logins
 from bot.twitch_tokens import TwitchTokenManager, TwitchTokenManagerSettings
@@ -63,6 +67,32 @@ async def resolve_irc_channel_logins() -> list[str]:
     return required_channels
 
 
+async def prefetch_channel_contexts(
+    context_manager: Any, channel_logins: list[str] | None = None
+) -> dict[str, float]:
+    """Restaura no boot, em lote, os contextos dos canais de ``channels_config``."""
+    if channel_logins is None:
+        channel_logins = await persistence.get_active_channels()
+    if not channel_logins:
+        return {}
+    started = time.monotonic()
+    try:
+        ready = await context_manager.prefetch(channel_logins)
+    except Exception as error:
+        logger.error("Prefetch de contexto falhou: %s", error)
+        return {}
+    if ready:
+        slowest = max(ready, key=lambda channel_id: ready[channel_id])
+        logger.info(
+            "Prefetch de contexto: %d canais prontos em %.1f ms (mais lento: %s, %.1f ms).",
+            len(ready),
+            (time.monotonic() - started) * 1000,
+            slowest,
+            ready[slowest],
+        )
+    return ready
+
+
 def resolve_client_secret_for_irc_refresh() -> str:
     if TWITCH_CLIENT_SECRET_INLINE:
         return TWITCH_CLIENT_SECRET_INLINE
@@ -96,6 +126,14 @@ def build_irc_token_manager() -> TwitchTokenManager:
     )
 
 
+def start_dashboard_server_task() -> asyncio.Task[None] | None:
+    from bot.dashboard_async_server import resolve_dashboard_server_mode, run_async_server
+
+    if resolve_dashboard_server_mode() != "asyncio":
+        return None
+    return asyncio.create_task(run_async_server())
+
+
 def run_irc_mode() -> None:
     try:
         from bot.logic import context_manager
@@ -121,6 +159,10 @@ def run_irc_mode() -> None:
             )
 
             irc_channel_control.bind(loop=running_loop, bot=bot)
+            # Contextos restaurados em lote enquanto o IRC conecta.
+            prefetch_task = asyncio.create_task(
+                prefetch_channel_contexts(context_manager, channel_logins)
+            )
 
             async def verify_clips_auth_loop() -> None:
                 while True:
@@ -132,13 +174,19 @@ def run_irc_mode() -> None:
 
             # Start background tasks
             asyncio.create_task(verify_clips_auth_loop())
+            asyncio.create_task(event_loop_monitor.start_loop())
+            start_dashboard_server_task()
 
             # Fase 4: Loop de limpeza de memoria (Context + Sentiment)
             asyncio.create_task(context_manager.start_cleanup_loop())
+            asyncio.create_task(
+                semantic_memory_compaction.start_loop(context_manager.list_active_channels)
+            )
 
             try:
                 await bot.run_forever()
             finally:
+                prefetch_task.cancel()
                 clip_jobs.stop()
                 autonomy_runtime.unbind()
                 irc_channel_control.unbind()
@@ -154,14 +202,21 @@ def run_eventsub_mode() -> None:
         from bot.logic import context_manager
 
         context_manager.set_main_loop(asyncio.get_running_loop())
+        prefetch_task = asyncio.create_task(prefetch_channel_contexts(context_manager))
 
         require_env("TWITCH_CLIENT_ID")
         require_env("TWITCH_BOT_ID")
         require_env("TWITCH_CHANNEL_ID")
         bot = ByteBot(client_secret=get_secret())
+        lag_monitor_task = asyncio.create_task(event_loop_monitor.start_loop())
+        dashboard_task = start_dashboard_server_task()
         try:
             await bot.run()
         finally:
+            prefetch_task.cancel()
+            lag_monitor_task.cancel()
+            if dashboard_task is not None:
+                dashboard_task.cancel()
             autonomy_runtime.unbind()
 
     try:
@@ -107,51 +107,99 @@ class IrcChannelControlBridge:
             future.cancel()
             raise TimeoutError("Channel control timeout while waiting for IRC runtime.") from error
 
-    def execute(self, *, action: str, channel_login: str = "") -> dict[str, Any]:
+    def _prepare(self, action: str, channel_login: str) -> tuple[str, str, dict[str, Any] | None]:
         normalized_action = (action or "").strip().lower()
         normalized_channel = (channel_login or "").strip()
         if normalized_action not in SUPPORTED_ACTIONS:
-            return {
-                "ok": False,
-                "error": "invalid_action",
-                "message": "Unsupported action. Use: list, join, part.",
-            }
-
-        try:
-            if normalized_action == "list":
-                channels = self._submit(self._safe_call("admin_list_channels"))
-                return {
-                    "ok": True,
-                    "action": "list",
-                    "channels": channels,
-                    "message": f"Connected channels: {', '.join(f'#{item}' for item in channels) or 'none'}.",
-                }
-
-            if not normalized_channel:
-                return {
+            return (
+                normalized_action,
+                normalized_channel,
+                {
+                    "ok": False,
+                    "error": "invalid_action",
+                    "message": "Unsupported action. Use: list, join, part.",
+                },
+            )
+        if normalized_action != "list" and not normalized_channel:
+            return (
+                normalized_action,
+                normalized_channel,
+                {
                     "ok": False,
                     "error": "missing_channel",
                     "message": f"Action '{normalized_action}' requires a channel login.",
-                }
-
-            method_name = (
-                "admin_join_channel" if normalized_action == "join" else "admin_part_channel"
-            )
-            success, message, channels = self._submit(
-                self._safe_call(method_name, normalized_channel)
+                },
             )
+        return normalized_action, normalized_channel, None
+
+    def _runtime_call(self, action: str, channel: str) -> Coroutine[Any, Any, Any]:
+        if action == "list":
+            return self._safe_call("admin_list_channels")
+        method_name = "admin_join_channel" if action == "join" else "admin_part_channel"
+        return self._safe_call(method_name, channel)
+
+    @staticmethod
+    def _result_payload(action: str, result: Any) -> dict[str, Any]:
+        if action == "list":
+            channels = result
             return {
-                "ok": bool(success),
-                "action": normalized_action,
+                "ok": True,
+                "action": "list",
                 "channels": channels,
-                "message": str(message),
+                "message": f"Connected channels: {', '.join(f'#{item}' for item in channels) or 'none'}.",
             }
-        except TimeoutError as error:
+        success, message, channels = result
+        return {
+            "ok": bool(success),
+            "action": action,
+            "channels": channels,
+            "message": str(message),
+        }
+
+    @staticmethod
+    def _error_payload(error: Exception) -> dict[str, Any]:
+        if isinstance(error, TimeoutError):
             return {"ok": False, "error": "timeout", "message": str(error)}
-        except RuntimeError as error:
+        if isinstance(error, RuntimeError):
             return {"ok": False, "error": "runtime_unavailable", "message": str(error)}
+        return {"ok": False, "error": "runtime_error", "message": str(error)}
+
+    def execute(self, *, action: str, channel_login: str = "") -> dict[str, Any]:
+        normalized_action, normalized_channel, invalid = self._prepare(action, channel_login)
+        if invalid is not None:
+            return invalid
+        try:
+            result = self._submit(self._runtime_call(normalized_action, normalized_channel))
+        except Exception as error:
+            return self._error_payload(error)
+        return self._result_payload(normalized_action, result)
+
+    async def _await_runtime(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        bot, loop = self._snapshot()
+        if bot is None or loop is None or loop.is_closed() or not loop.is_running():
+            coroutine.close()
+            raise RuntimeError("IRC runtime is not connected yet.")
+        if loop is asyncio.get_running_loop():
+            awaitable: Any = coroutine
+        else:
+            awaitable = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, loop))
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self._timeout_seconds)
+        except TimeoutError as error:
+            raise TimeoutError("Channel control timeout while waiting for IRC runtime.") from error
+
+    async def execute_async(self, *, action: str, channel_login: str = "") -> dict[str, Any]:
+        """Mesmo contrato de ``execute``, aguardando o runtime sem bloquear uma thread."""
+        normalized_action, normalized_channel, invalid = self._prepare(action, channel_login)
+        if invalid is not None:
+            return invalid
+        try:
+            result = await self._await_runtime(
+                self._runtime_call(normalized_action, normalized_channel)
+            )
         except Exception as error:
-            return {"ok": False, "error": "runtime_error", "message": str(error)}
+            return self._error_payload(error)
+        return self._result_payload(normalized_action, result)
 
     async def _safe_call(self, method_name: str, *args: Any) -> Any:
         bot, _ = self._snapshot()
@@ -8,6 +8,7 @@ from typing import Any
 from bot.clip_jobs_store import job_store
 from bot.control_plane import control_plane
 from bot.control_plane_constants import utc_iso
+from bot.dashboard_stream import dashboard_stream
 from bot.runtime_config import CLIENT_ID, EDITOR_ID
 from bot.twitch_clips_api import (
     TwitchClipAuthError,
@@ -24,6 +25,11 @@ logger = logging.getLogger("byte.clips.runtime")
 
 TokenProvider = Callable[[], Awaitable[str]]
 
+# Campos que o dashboard mostra; mudar qualquer um publica ``clip_job`` no stream.
+_CLIP_JOB_VISIBLE_FIELDS = frozenset(
+    {"status", "twitch_clip_id", "edit_url", "clip_url", "download_url", "error"}
+)
+
 
 class ClipJobsRuntime:
     def __init__(self) -> None:
@@ -70,6 +76,14 @@ class ClipJobsRuntime:
                 reverse=True,
             )
 
+    def count_by_status(self) -> dict[str, int]:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for job in self._jobs.values():
+                status = str(job.get("status", "") or "unknown")
+                counts[status] = counts.get(status, 0) + 1
+            return counts
+
     async def _process_loop(self) -> None:
         logger.info("ClipJobsRuntime loop iniciado.")
         while self._running:
@@ -123,6 +137,7 @@ class ClipJobsRuntime:
                 }
                 self._jobs[action_id] = job
                 job_store.save_job(job)
+                dashboard_stream.publish("clip_jobs", dict(job), event="clip_job")
                 logger.info("Novo job de clip criado: %s", job["job_id"])
 
     async def _advance_jobs(self) -> None:
@@ -314,11 +329,18 @@ class ClipJobsRuntime:
             if action_id not in self._jobs:
                 return
             job = self._jobs[action_id]
+            transitioned = any(
+                key in _CLIP_JOB_VISIBLE_FIELDS and job.get(key) != value
+                for key, value in kwargs.items()
+            )
             job.update(kwargs)
             job["updated_at"] = utc_iso(time.time())
 
             # Persist async-ish (fire and forget for now, store handles errors)
             job_store.save_job(job)
+            # Reagendamentos de polling nao interessam ao dashboard.
+            if transitioned:
+                dashboard_stream.publish("clip_jobs", dict(job), event="clip_job")
 
 
 clip_jobs = ClipJobsRuntime()
@@ -50,6 +50,12 @@ class ControlPlaneState:
             "queue_target_pending": 3,
         }
 
+    def action_queue_summary(self, *, timestamp: float | None = None) -> dict[str, int]:
+        return self._action_queue.summary(
+            ignore_after_seconds=self._action_ignore_after_seconds(),
+            timestamp=timestamp,
+        )
+
     def get_config(self) -> dict[str, Any]:
         return self._config_runtime.get_config()
 
@@ -11,6 +11,20 @@ from bot.control_plane_constants import (
     clip_text,
     utc_iso,
 )
+from bot.dashboard_stream import dashboard_stream
+
+
+def _publish_transition(item: dict[str, Any], transition: str) -> None:
+    dashboard_stream.publish(
+        "action_queue",
+        {
+            "transition": transition,
+            "item": {
+                key: item.get(key)
+                for key in ("id", "kind", "risk", "title", "status", "decision", "updated_at")
+            },
+        },
+    )
 
 
 class ControlPlaneActionQueue:
@@ -46,6 +60,7 @@ class ControlPlaneActionQueue:
                 }
             )
             expired.append(copy.deepcopy(item))
+            _publish_transition(item, "ignored")
         return expired
 
     def _summary_locked(self) -> dict[str, int]:
@@ -62,6 +77,17 @@ class ControlPlaneActionQueue:
             "total": int(sum(summary_counter.values())),
         }
 
+    def summary(
+        self,
+        *,
+        ignore_after_seconds: int = 900,
+        timestamp: float | None = None,
+    ) -> dict[str, int]:
+        now = time.time() if timestamp is None else float(timestamp)
+        with self._lock:
+            self._expire_pending_actions_locked(now, max(60, int(ignore_after_seconds)))
+            return self._summary_locked()
+
     def enqueue_action(
         self,
         *,
@@ -113,7 +139,9 @@ class ControlPlaneActionQueue:
 
             self._action_order.append(action_id)
             self._action_items[action_id] = item
-            return copy.deepcopy(item)
+            created = copy.deepcopy(item)
+        _publish_transition(created, "created")
+        return created
 
     def decide_action(
         self,
@@ -153,7 +181,9 @@ class ControlPlaneActionQueue:
                     "note": item["decision_note"],
                 }
             )
-            return copy.deepcopy(item)
+            decided = copy.deepcopy(item)
+        _publish_transition(decided, str(decided["status"]))
+        return decided
 
     def list_actions(
         self,
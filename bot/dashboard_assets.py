@@ -0,0 +1,309 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from bot.dashboard_http_cache import encode_body, supported_encodings
+
+logger = logging.getLogger("byte.dashboard.assets")
+
+DEFAULT_RELOAD_CHECK_SECONDS = 2.0
+ASSET_URL_PREFIX = "/dashboard/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Pastas do repositorio do dashboard que nao sao servidas.
+_EXCLUDED_DIRS = frozenset({"tests", "node_modules"})
+_COMPRESSIBLE_MIN_BYTES = 512
+_JS_IMPORT_PATTERN = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(["'])(\.{1,2}/[^"'\s]+?\.js)\2""")
+_HTML_ASSET_PATTERN = re.compile(r"""(["'])/dashboard/([A-Za-z0-9_./-]+\.(?:js|css|html))\1""")
+
+
+def _resolve_reload_check_seconds() -> float:
+    raw_value = os.environ.get("DASHBOARD_ASSET_RELOAD_CHECK_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else -1.0
+    except (TypeError, ValueError):
+        parsed = -1.0
+    if parsed < 0.0:
+        return DEFAULT_RELOAD_CHECK_SECONDS
+    return parsed
+
+
+def dashboard_content_type(relative_path: str) -> str:
+    guessed_content_type, _ = mimetypes.guess_type(relative_path)
+    content_type = guessed_content_type or "application/octet-stream"
+    if content_type == "text/javascript":
+        content_type = "application/javascript"
+    if content_type.startswith("text/") or content_type in {
+        "application/javascript",
+        "application/json",
+    }:
+        content_type = f"{content_type}; charset=utf-8"
+    return content_type
+
+
+def fingerprinted_name(relative_path: str, digest: str) -> str:
+    """``features/shared/api.js`` -> ``features/shared/api.<digest>.js``."""
+    stem, dot, suffix = relative_path.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{relative_path}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+@dataclass(slots=True)
+class StaticAsset:
+    """Asset do dashboard em memoria, ja reescrito e pre-comprimido."""
+
+    path: str
+    body: bytes
+    etag: str
+    content_type: str
+    hashed_path: str = ""
+    immutable: bool = False
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    def encoded(self, encoding: str) -> bytes:
+        return self.variants.get(encoding, self.body) if encoding else self.body
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(
+        ("text/", "application/javascript", "application/json", "image/svg+xml")
+    )
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=6).hexdigest()
+
+
+def _normalize_import(importer: str, specifier: str) -> str:
+    base = importer.rpartition("/")[0]
+    parts = [part for part in base.split("/") if part]
+    for segment in specifier.split("/"):
+        if segment in ("", "."):
+            continue
+        if segment == "..":
+            if parts:
+                parts.pop()
+            continue
+        parts.append(segment)
+    return "/".join(parts)
+
+
+def _relative_specifier(importer: str, target: str) -> str:
+    importer_dir = importer.rpartition("/")[0]
+    relative = os.path.relpath(target, importer_dir or ".").replace(os.sep, "/")
+    return relative if relative.startswith("../") else f"./{relative}"
+
+
+class DashboardAssetStore:
+    """Arvore do dashboard em memoria com URLs por hash de conteudo.
+
+    Carrega na primeira requisicao e refaz a carga quando o ``mtime`` de algum
+    arquivo muda (checado no maximo a cada ``reload_check_seconds``). Modulos
+    JS importam as versoes com hash dos proprios imports, entao o hash de um
+    modulo cobre o grafo abaixo dele; ``index.html``/``hud.html`` e os partials
+    apontam para as URLs com hash e sao servidos com revalidacao.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        reload_check_seconds: float | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._root = root
+        self._reload_check_seconds = (
+            _resolve_reload_check_seconds()
+            if reload_check_seconds is None
+            else float(reload_check_seconds)
+        )
+        self._assets: dict[str, StaticAsset] = {}
+        self._signature: tuple[tuple[str, int, int], ...] = ()
+        self._checked_at = 0.0
+        self._loads_total = 0
+        self._loaded_at = 0.0
+
+    def _scan(self, root: Path) -> tuple[tuple[str, int, int], ...]:
+        entries: list[tuple[str, int, int]] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(name for name in dirnames if name not in _EXCLUDED_DIRS)
+            for filename in filenames:
+                full_path = Path(dirpath) / filename
+                try:
+                    stat = full_path.stat()
+                except OSError:
+                    continue
+                relative = full_path.relative_to(root).as_posix()
+                entries.append((relative, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
+    def _build(self, root: Path, signature: tuple[tuple[str, int, int], ...]) -> dict[str, Any]:
+        sources: dict[str, bytes] = {}
+        for relative, _mtime, _size in signature:
+            try:
+                sources[relative] = (root / relative).read_bytes()
+            except OSError:
+                continue
+
+        hashed: dict[str, str] = {}
+        bodies: dict[str, bytes] = {}
+
+        def _fingerprint_module(relative: str, visiting: set[str]) -> None:
+            if relative in hashed or relative in visiting:
+                return
+            visiting.add(relative)
+            text = sources[relative].decode("utf-8")
+            for match in _JS_IMPORT_PATTERN.finditer(text):
+                target = _normalize_import(relative, match.group(3))
+                if target in sources:
+                    _fingerprint_module(target, visiting)
+
+            def _rewrite(match: re.Match[str]) -> str:
+                target = _normalize_import(relative, match.group(3))
+                if target not in hashed:
+                    # Ciclo ou arquivo fora da arvore: mantem a URL sem hash.
+                    return match.group(0)
+                quote = match.group(2)
+                return (
+                    f"{match.group(1)}{quote}{_relative_specifier(relative, hashed[target])}{quote}"
+                )
+
+            body = _JS_IMPORT_PATTERN.sub(_rewrite, text).encode("utf-8")
+            bodies[relative] = body
+            hashed[relative] = fingerprinted_name(relative, _digest(body))
+            visiting.discard(relative)
+
+        for relative in sources:
+            if relative.endswith(".js"):
+                _fingerprint_module(relative, set())
+            elif not relative.endswith(".html"):
+                bodies[relative] = sources[relative]
+                hashed[relative] = fingerprinted_name(relative, _digest(sources[relative]))
+
+        # Partials primeiro: o index.html referencia as URLs com hash deles.
+        html_paths = sorted(
+            (path for path in sources if path.endswith(".html")),
+            key=lambda path: (path.count("/") == 0, path),
+        )
+        for relative in html_paths:
+
+            def _rewrite_html(match: re.Match[str]) -> str:
+                target = match.group(2)
+                if target not in hashed:
+                    return match.group(0)
+                quote = match.group(1)
+                return f"{quote}{ASSET_URL_PREFIX}{hashed[target]}{quote}"
+
+            body = _HTML_ASSET_PATTERN.sub(_rewrite_html, sources[relative].decode("utf-8")).encode(
+                "utf-8"
+            )
+            bodies[relative] = body
+            if relative.count("/") > 0:
+                hashed[relative] = fingerprinted_name(relative, _digest(body))
+
+        assets: dict[str, StaticAsset] = {}
+        encodings = supported_encodings()
+        for relative, body in bodies.items():
+            content_type = dashboard_content_type(relative)
+            variants: dict[str, bytes] = {}
+            if _is_compressible(content_type) and len(body) >= _COMPRESSIBLE_MIN_BYTES:
+                for encoding in encodings:
+                    encoded = encode_body(body, encoding)
+                    if len(encoded) < len(body):
+                        variants[encoding] = encoded
+            etag = f'"{_digest(body)}"'
+            hashed_path = hashed.get(relative, "")
+            assets[relative] = StaticAsset(
+                path=relative,
+                body=body,
+                etag=etag,
+                content_type=content_type,
+                hashed_path=hashed_path,
+                variants=variants,
+            )
+            if hashed_path:
+                assets[hashed_path] = StaticAsset(
+                    path=hashed_path,
+                    body=body,
+                    etag=etag,
+                    content_type=content_type,
+                    hashed_path=hashed_path,
+                    immutable=True,
+                    variants=variants,
+                )
+        return assets
+
+    def _ensure_loaded_locked(self, root: Path, now: float) -> None:
+        root_changed = self._root != root
+        if (
+            not root_changed
+            and self._assets
+            and (
+                self._reload_check_seconds <= 0
+                or now - self._checked_at < self._reload_check_seconds
+            )
+        ):
+            return
+        self._checked_at = now
+        signature = self._scan(root)
+        if not root_changed and self._assets and signature == self._signature:
+            return
+        assets = self._build(root, signature)
+        if not root_changed:
+            # URLs com hash da geracao anterior seguem validas para abas ja abertas.
+            for path, asset in self._assets.items():
+                if asset.immutable and path not in assets:
+                    assets[path] = asset
+        self._root = root
+        self._assets = assets
+        self._signature = signature
+        self._loads_total += 1
+        self._loaded_at = time.time()
+        logger.info("Dashboard assets carregados: %d arquivos de %s", len(signature), root)
+
+    def get(
+        self, relative_path: str, *, root: Path, now: float | None = None
+    ) -> StaticAsset | None:
+        current = time.monotonic() if now is None else now
+        with self._lock:
+            self._ensure_loaded_locked(root, current)
+            return self._assets.get(relative_path)
+
+    def preload(self, root: Path) -> int:
+        """Carga no boot, fora do caminho da primeira requisicao."""
+        with self._lock:
+            self._ensure_loaded_locked(root, time.monotonic())
+            return len(self._signature)
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            mutable = [asset for asset in self._assets.values() if not asset.immutable]
+            return {
+                "root": str(self._root or ""),
+                "files": len(mutable),
+                "entries": len(self._assets),
+                "identity_bytes": sum(len(asset.body) for asset in mutable),
+                "loads_total": self._loads_total,
+                "loaded_at": self._loaded_at,
+            }
+
+
+dashboard_assets = DashboardAssetStore()
+
+__all__ = [
+    "IMMUTABLE_CACHE_CONTROL",
+    "REVALIDATE_CACHE_CONTROL",
+    "DashboardAssetStore",
+    "StaticAsset",
+    "dashboard_assets",
+    "dashboard_content_type",
+    "fingerprinted_name",
+]
@@ -0,0 +1,398 @@
+import asyncio
+import http.client
+import io
+import logging
+import os
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any
+
+from bot.dashboard_assets import dashboard_assets
+from bot.dashboard_http_helpers import parse_dashboard_request_path, require_dashboard_auth
+from bot.dashboard_server import (
+    HealthHandler,
+    _finish_channel_control,
+    _prepare_channel_control,
+)
+from bot.dashboard_server_routes import (
+    HEALTH_ROUTES,
+    handle_get,
+    handle_post,
+    handle_put,
+    open_dashboard_stream,
+)
+from bot.dashboard_server_routes_post import _ASYNC_POST_ROUTE_HANDLERS
+from bot.dashboard_stream import STREAM_ROUTE, dashboard_stream
+from bot.runtime_config import DASHBOARD_DIR, irc_channel_control
+
+logger = logging.getLogger("byte.dashboard.async_server")
+
+DASHBOARD_SERVER_MODES = {"threaded", "asyncio"}
+MAX_REQUEST_HEAD_BYTES = 16 * 1024
+MAX_REQUEST_BODY_BYTES = 8 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT_SECONDS = 15.0
+REQUEST_READ_TIMEOUT_SECONDS = 30.0
+MAX_REQUESTS_PER_CONNECTION = 200
+ROUTE_QUEUE_TIMEOUT_SECONDS = 5.0
+DEFAULT_ROUTE_CONCURRENCY = 16
+# Rotas caras ou que seguram o runtime do bot ganham teto proprio.
+ROUTE_CONCURRENCY_LIMITS = {
+    "/api/chat/send": 4,
+    "/api/channel-control": 2,
+    "/api/autonomy/tick": 1,
+    "/api/vision/ingest": 2,
+    "/api/observability/post-stream-report": 2,
+    "/metrics": 2,
+}
+
+
+def resolve_dashboard_server_mode() -> str:
+    raw_value = str(os.environ.get("DASHBOARD_SERVER_MODE", "") or "").strip().lower()
+    return raw_value if raw_value in DASHBOARD_SERVER_MODES else "threaded"
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    version: str
+    headers: Any
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = str(self.headers.get("Connection", "") or "").strip().lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+class AsyncDashboardHandler(HealthHandler):
+    """``HealthHandler`` sem socket: as rotas escrevem num buffer devolvido ao servidor.
+
+    Reaproveita auth, leitura de JSON, assets e respostas do servidor com threads,
+    entao as tabelas de rotas continuam sendo o unico contrato.
+    """
+
+    def __init__(self, request: _Request, client_address: tuple[str, int]) -> None:
+        self.command = request.method
+        self.path = request.path
+        self.request_version = request.version
+        self.headers = request.headers
+        self.rfile = io.BytesIO(request.body)
+        self.wfile = io.BytesIO()
+        self.client_address = client_address
+        self.status_code = 500
+        self._response_headers: list[tuple[str, str]] = []
+
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self.status_code = int(code)
+        self._response_headers = []
+
+    def send_header(self, keyword: str, value: str) -> None:
+        self._response_headers.append((keyword, str(value)))
+
+    def end_headers(self) -> None:
+        return
+
+    def address_string(self) -> str:
+        return str(self.client_address[0])
+
+    def _render_head(self, *, keep_alive: bool, content_length: int | None) -> bytes:
+        try:
+            reason = HTTPStatus(self.status_code).phrase
+        except ValueError:
+            reason = ""
+        lines = [f"HTTP/1.1 {self.status_code} {reason}"]
+        lines.extend(f"{key}: {value}" for key, value in self._response_headers)
+        has_length = any(key.lower() == "content-length" for key, _ in self._response_headers)
+        # 304 nao leva corpo nem Content-Length proprio (o do 200 ja esta no cache do cliente).
+        if content_length is not None and not has_length and self.status_code != 304:
+            lines.append(f"Content-Length: {content_length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def render_response(self, *, keep_alive: bool) -> bytes:
+        body = self.wfile.getvalue()
+        return self._render_head(keep_alive=keep_alive, content_length=len(body)) + body
+
+    def render_stream_head(self) -> bytes:
+        # SSE: corpo delimitado pelo fechamento da conexao, sem Content-Length.
+        return self._render_head(keep_alive=False, content_length=None)
+
+    async def _handle_channel_control_async(
+        self, payload: dict[str, Any]
+    ) -> tuple[dict[str, Any], int]:
+        action, channel_login, unsupported = _prepare_channel_control(
+            payload, self.CHANNEL_CONTROL_IRC_ONLY_ACTIONS
+        )
+        if unsupported is not None:
+            return unsupported
+        result = await irc_channel_control.execute_async(action=action, channel_login=channel_login)
+        # O relatorio pos-live do ``part`` le/grava no Supabase: fica fora do loop.
+        return await asyncio.to_thread(_finish_channel_control, action, channel_login, result)
+
+
+_SYNC_DISPATCH = {"GET": handle_get, "PUT": handle_put, "POST": handle_post}
+
+
+def _is_stream_request(request: _Request) -> bool:
+    route, _query = parse_dashboard_request_path(request.path)
+    return route == STREAM_ROUTE
+
+
+def _concurrency_key(route: str) -> str:
+    if route.startswith("/api/action-queue/") and route.endswith("/decision"):
+        return "/api/action-queue/decision"
+    if route.startswith("/dashboard/"):
+        return "/dashboard/"
+    return route
+
+
+class AsyncDashboardServer:
+    """Servidor HTTP/1.1 do dashboard no event loop principal.
+
+    Keep-alive com timeout ocioso e limite de requisicoes por conexao;
+    requisicoes em pipeline sao atendidas em ordem, e o buffer de leitura
+    limitado aplica backpressure. Cada rota tem um semaforo proprio: acima do
+    teto a requisicao espera ate ``ROUTE_QUEUE_TIMEOUT_SECONDS`` e depois
+    recebe 503. Rotas com substituto awaitable rodam no loop; as demais,
+    sincronas e com I/O bloqueante, rodam em thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        route_limits: dict[str, int] | None = None,
+        default_route_limit: int = DEFAULT_ROUTE_CONCURRENCY,
+        max_requests_per_connection: int = MAX_REQUESTS_PER_CONNECTION,
+        keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT_SECONDS,
+    ) -> None:
+        self._route_limits = dict(
+            ROUTE_CONCURRENCY_LIMITS if route_limits is None else route_limits
+        )
+        self._default_route_limit = max(1, int(default_route_limit))
+        self._max_requests_per_connection = max(1, int(max_requests_per_connection))
+        self._keep_alive_timeout = max(0.1, float(keep_alive_timeout))
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._connection_tasks: set[asyncio.Task[Any]] = set()
+        self._server: asyncio.AbstractServer | None = None
+        self._connections_total = 0
+        self._requests_total = 0
+        self._rejected_busy_total = 0
+        self._streams_total = 0
+
+    def _semaphore_for(self, route: str) -> asyncio.Semaphore:
+        key = _concurrency_key(route)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            limit = self._route_limits.get(key, self._default_route_limit)
+            semaphore = asyncio.Semaphore(max(1, int(limit)))
+            self._semaphores[key] = semaphore
+        return semaphore
+
+    async def start(self, host: str = "0.0.0.0", port: int = 8080) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(
+            self._serve_connection, host, port, limit=MAX_REQUEST_HEAD_BYTES
+        )
+        return self._server
+
+    async def serve_forever(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        await asyncio.to_thread(dashboard_assets.preload, DASHBOARD_DIR)
+        server = await self.start(host, port)
+        logger.info("Dashboard asyncio server ouvindo em %s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Conexoes keep-alive ociosas nao fecham sozinhas com o servidor.
+        tasks = list(self._connection_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "connections_total": self._connections_total,
+            "requests_total": self._requests_total,
+            "rejected_busy_total": self._rejected_busy_total,
+            "streams_total": self._streams_total,
+        }
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> _Request | None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise _BadRequest(HTTPStatus.BAD_REQUEST, "Incomplete request") from error
+            return None
+        except asyncio.LimitOverrunError as error:
+            raise _BadRequest(
+                HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request head too large"
+            ) from error
+
+        request_line, _, raw_headers = head.partition(b"\r\n")
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise _BadRequest(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        method, path, version = parts
+        headers = http.client.parse_headers(io.BytesIO(raw_headers))
+        if str(headers.get("Transfer-Encoding", "") or "").strip():
+            raise _BadRequest(HTTPStatus.NOT_IMPLEMENTED, "Transfer-Encoding not supported")
+        try:
+            content_length = int(str(headers.get("Content-Length", "0") or "0"))
+        except ValueError as error:
+            raise _BadRequest(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from error
+        if content_length < 0:
+            raise _BadRequest(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if content_length > MAX_REQUEST_BODY_BYTES:
+            raise _BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(content_length) if content_length else b""
+        return _Request(method.upper(), path, version, headers, body)
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections_total += 1
+        current_task = asyncio.current_task()
+        if current_task is not None:
+            self._connection_tasks.add(current_task)
+        peer = writer.get_extra_info("peername") or ("", 0)
+        client_address = (str(peer[0]), int(peer[1]))
+        served = 0
+        try:
+            while served < self._max_requests_per_connection:
+                timeout = self._keep_alive_timeout if served else REQUEST_READ_TIMEOUT_SECONDS
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), timeout=timeout)
+                except _BadRequest as error:
+                    writer.write(_plain_response(error.status, str(error)))
+                    await writer.drain()
+                    return
+                except (TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if request is None:
+                    return
+                served += 1
+                if request.method == "GET" and _is_stream_request(request):
+                    await self._serve_stream(request, client_address, writer)
+                    return
+                keep_alive = request.keep_alive and served < self._max_requests_per_connection
+                writer.write(await self.dispatch(request, client_address, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            if current_task is not None:
+                self._connection_tasks.discard(current_task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError, asyncio.CancelledError):
+                pass
+
+    async def _serve_stream(
+        self,
+        request: _Request,
+        client_address: tuple[str, int],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        # O stream segura a conexao: nao passa pelos semaforos das rotas nem por thread.
+        self._requests_total += 1
+        self._streams_total += 1
+        handler = AsyncDashboardHandler(request, client_address)
+        _route, query = parse_dashboard_request_path(request.path)
+        if not handler._check_rate_limit():
+            handler._send_rate_limited()
+        elif require_dashboard_auth(handler):
+            opened = await asyncio.to_thread(open_dashboard_stream, handler, query)
+            if opened is not None:
+                subscription, initial = opened
+                handler._send_event_stream_headers()
+                writer.write(handler.render_stream_head())
+                await dashboard_stream.pump_async(subscription, initial, writer)
+                return
+        writer.write(handler.render_response(keep_alive=False))
+        await writer.drain()
+
+    async def dispatch(
+        self, request: _Request, client_address: tuple[str, int], *, keep_alive: bool
+    ) -> bytes:
+        self._requests_total += 1
+        handler = AsyncDashboardHandler(request, client_address)
+        route, _query = parse_dashboard_request_path(request.path)
+        if request.method == "OPTIONS":
+            handler.do_OPTIONS()
+            return handler.render_response(keep_alive=keep_alive)
+        sync_dispatch = _SYNC_DISPATCH.get(request.method)
+        if sync_dispatch is None:
+            handler._send_text("Method Not Allowed", status_code=405)
+            return handler.render_response(keep_alive=keep_alive)
+        if route in HEALTH_ROUTES and request.method == "GET":
+            handler._send_text("AGENT_ONLINE", status_code=200)
+            return handler.render_response(keep_alive=keep_alive)
+        if not handler._check_rate_limit():
+            handler._send_rate_limited()
+            return handler.render_response(keep_alive=keep_alive)
+
+        semaphore = self._semaphore_for(route)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=ROUTE_QUEUE_TIMEOUT_SECONDS)
+        except TimeoutError:
+            self._rejected_busy_total += 1
+            handler._send_json(
+                {"ok": False, "error": "busy", "message": "Rota saturada, tente novamente."},
+                status_code=503,
+            )
+            return handler.render_response(keep_alive=keep_alive)
+        started_at = time.perf_counter()
+        try:
+            async_handler = (
+                _ASYNC_POST_ROUTE_HANDLERS.get(route) if request.method == "POST" else None
+            )
+            if async_handler is not None:
+                await async_handler(handler)
+            else:
+                await asyncio.to_thread(sync_dispatch, handler)
+        except Exception as error:
+            logger.error("Dashboard asyncio: erro em %s %s: %s", request.method, route, error)
+            handler.wfile = io.BytesIO()
+            handler._send_json({"ok": False, "error": "internal_error"}, status_code=500)
+        finally:
+            semaphore.release()
+        logger.debug(
+            "%s %s -> %d em %.1fms",
+            request.method,
+            route,
+            handler.status_code,
+            (time.perf_counter() - started_at) * 1000,
+        )
+        return handler.render_response(keep_alive=keep_alive)
+
+
+def _plain_response(status: HTTPStatus, message: str) -> bytes:
+    body = message.encode("utf-8")
+    return (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def run_async_server() -> None:
+    port = int(os.environ.get("PORT", "8080"))
+    await AsyncDashboardServer().serve_forever("0.0.0.0", port)
@@ -0,0 +1,254 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+try:  # Opcional: sem o pacote ``brotli`` o dashboard negocia apenas gzip.
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+DEFAULT_COMPRESSION_MIN_BYTES = 1024
+DEFAULT_RESPONSE_CACHE_ENTRIES = 256
+# Teto de idade dos bytes versionados: cobre escrita no Supabase por fora do processo.
+DEFAULT_VERSIONED_MAX_AGE_SECONDS = 30.0
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+JSON_CACHE_CONTROL = "private, no-cache"
+
+
+def _resolve_compression_min_bytes() -> int:
+    raw_value = os.environ.get("DASHBOARD_COMPRESSION_MIN_BYTES")
+    try:
+        parsed = int(raw_value) if raw_value not in (None, "") else -1
+    except (TypeError, ValueError):
+        parsed = -1
+    if parsed < 0:
+        return DEFAULT_COMPRESSION_MIN_BYTES
+    return parsed
+
+
+def _resolve_versioned_max_age_seconds() -> float:
+    raw_value = os.environ.get("DASHBOARD_RESPONSE_CACHE_MAX_AGE_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else -1.0
+    except (TypeError, ValueError):
+        parsed = -1.0
+    if parsed < 0.0:
+        return DEFAULT_VERSIONED_MAX_AGE_SECONDS
+    return parsed
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def serialize_json(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def compute_etag(body: bytes) -> str:
+    # Fraco: o mesmo JSON vale para identity, gzip e br.
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparacao fraca do ``If-None-Match`` (RFC 9110, 13.1.2)."""
+    raw_value = str(if_none_match or "").strip()
+    if not raw_value or not etag:
+        return False
+    if raw_value == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in raw_value.split(","))
+
+
+def negotiate_encoding(
+    accept_encoding: str,
+    size: int,
+    *,
+    min_bytes: int | None = None,
+) -> str:
+    """Escolhe ``br``/``gzip`` pelo ``Accept-Encoding``; ``""`` mantem identity."""
+    threshold = _resolve_compression_min_bytes() if min_bytes is None else min_bytes
+    if size < threshold:
+        return ""
+    accepted: dict[str, float] = {}
+    for part in str(accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    best = ""
+    best_quality = 0.0
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encode_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime fixo: mesmo corpo, mesmos bytes comprimidos.
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+@dataclass(slots=True)
+class PreparedBody:
+    """JSON serializado com ETag e variantes comprimidas sob demanda."""
+
+    body: bytes
+    etag: str
+    _variants: dict[str, bytes] = field(default_factory=dict)
+
+    def encoded(self, encoding: str) -> bytes:
+        if not encoding:
+            return self.body
+        cached = self._variants.get(encoding)
+        if cached is None:
+            cached = encode_body(self.body, encoding)
+            self._variants[encoding] = cached
+        return cached
+
+
+class DashboardResponseCache:
+    """LRU de corpos JSON do dashboard e contadores de bytes transferidos.
+
+    Corpos dinamicos entram por ETag, para reaproveitar a compressao quando o
+    conteudo repete entre polls. Recursos que so mudam por escrita entram por
+    ``(chave, versao)`` e evitam carregar e serializar de novo.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_ENTRIES,
+        versioned_max_age_seconds: float | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max(1, int(max_entries))
+        self._versioned_max_age_seconds = (
+            _resolve_versioned_max_age_seconds()
+            if versioned_max_age_seconds is None
+            else float(versioned_max_age_seconds)
+        )
+        self._by_etag: OrderedDict[str, PreparedBody] = OrderedDict()
+        self._versioned: OrderedDict[str, tuple[Any, float, PreparedBody]] = OrderedDict()
+        self._stats = {
+            "responses_total": 0,
+            "not_modified_total": 0,
+            "compressed_total": 0,
+            "identity_bytes_total": 0,
+            "sent_bytes_total": 0,
+            "versioned_hits_total": 0,
+            "versioned_misses_total": 0,
+        }
+
+    def _remember_locked(self, table: OrderedDict, key: str, value: Any) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self._max_entries:
+            table.popitem(last=False)
+
+    def prepare(self, body: bytes) -> PreparedBody:
+        etag = compute_etag(body)
+        with self._lock:
+            prepared = self._by_etag.get(etag)
+            if prepared is not None:
+                self._by_etag.move_to_end(etag)
+                return prepared
+            prepared = PreparedBody(body=body, etag=etag)
+            self._remember_locked(self._by_etag, etag, prepared)
+            return prepared
+
+    def get_versioned(
+        self, key: str, version: Any, *, now: float | None = None
+    ) -> PreparedBody | None:
+        current = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._versioned.get(key)
+            if entry is None or entry[0] != version:
+                self._stats["versioned_misses_total"] += 1
+                return None
+            if current - entry[1] > self._versioned_max_age_seconds:
+                self._versioned.pop(key, None)
+                self._stats["versioned_misses_total"] += 1
+                return None
+            self._versioned.move_to_end(key)
+            self._stats["versioned_hits_total"] += 1
+            return entry[2]
+
+    def put_versioned(
+        self, key: str, version: Any, body: bytes, *, now: float | None = None
+    ) -> PreparedBody:
+        prepared = self.prepare(body)
+        current = time.monotonic() if now is None else now
+        with self._lock:
+            self._remember_locked(self._versioned, key, (version, current, prepared))
+        return prepared
+
+    def record_transfer(
+        self, *, identity_bytes: int, sent_bytes: int, not_modified: bool, encoding: str
+    ) -> None:
+        with self._lock:
+            self._stats["responses_total"] += 1
+            self._stats["identity_bytes_total"] += int(identity_bytes)
+            self._stats["sent_bytes_total"] += int(sent_bytes)
+            if not_modified:
+                self._stats["not_modified_total"] += 1
+            elif encoding:
+                self._stats["compressed_total"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_etag.clear()
+            self._versioned.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._by_etag)
+            versioned_entries = len(self._versioned)
+        identity = stats["identity_bytes_total"]
+        return {
+            **stats,
+            "entries": entries,
+            "versioned_entries": versioned_entries,
+            "encodings": list(supported_encodings()),
+            "saved_ratio": round(1 - stats["sent_bytes_total"] / identity, 4) if identity else 0.0,
+        }
+
+
+dashboard_response_cache = DashboardResponseCache()
+
+__all__ = [
+    "JSON_CACHE_CONTROL",
+    "DashboardResponseCache",
+    "PreparedBody",
+    "compute_etag",
+    "dashboard_response_cache",
+    "encode_body",
+    "etag_matches",
+    "negotiate_encoding",
+    "serialize_json",
+    "supported_encodings",
+]
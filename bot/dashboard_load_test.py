@@ -0,0 +1,224 @@
+"""Carga comparativa: servidor com threads (``ThreadingHTTPServer``) vs servidor asyncio.
+
+Uso: ``python -m bot.dashboard_load_test --clients 32 --requests 200 --route /health``.
+Cada cliente reaproveita a conexao quando o servidor permite keep-alive.
+
+``--session`` mede os bytes de uma sessao de polling do dashboard sem e com
+revalidacao (ETag/304) e compressao; exige ``BYTE_DASHBOARD_ADMIN_TOKEN``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import os
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+from bot.dashboard_async_server import AsyncDashboardServer
+from bot.dashboard_rate_limit import DashboardRateLimiter, RateBudget
+from bot.dashboard_server import HealthHandler
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _run_clients(port: int, *, clients: int, requests: int, route: str) -> dict[str, Any]:
+    latencies_ms: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def _client() -> None:
+        nonlocal errors
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local_latencies: list[float] = []
+        local_errors = 0
+        for _ in range(requests):
+            started_at = time.perf_counter()
+            try:
+                connection.request("GET", route)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 500:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local_latencies.append((time.perf_counter() - started_at) * 1000)
+        connection.close()
+        with lock:
+            latencies_ms.extend(local_latencies)
+            errors += local_errors
+
+    threads = [threading.Thread(target=_client) for _ in range(clients)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+    ordered = sorted(latencies_ms)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "requests_per_second": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(ordered), 2) if ordered else 0.0,
+        "p99_ms": round(_percentile(ordered, 0.99), 2),
+    }
+
+
+def _with_threaded_server(run: Callable[[int], dict[str, Any]]) -> dict[str, Any]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return run(int(server.server_address[1]))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _with_async_server(run: Callable[[int], dict[str, Any]]) -> dict[str, Any]:
+    loop = asyncio.new_event_loop()
+    server = AsyncDashboardServer()
+    ready = threading.Event()
+    port_holder: list[int] = []
+
+    async def _start() -> None:
+        started = await server.start("127.0.0.1", 0)
+        port_holder.append(int(started.sockets[0].getsockname()[1]))
+        ready.set()
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(_start(), loop).result(timeout=10)
+    ready.wait(timeout=10)
+    try:
+        return run(port_holder[0])
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+
+def _disable_rate_limit(max_requests: int) -> None:
+    # Todos os clientes saem de 127.0.0.1: o orcamento por IP mediria o limitador, nao o servidor.
+    HealthHandler._rate_limiter = DashboardRateLimiter(
+        default_budget=RateBudget("default", max_requests), route_budgets={}
+    )
+
+
+def run_load_test(*, clients: int = 32, requests: int = 200, route: str = "/health") -> dict:
+    _disable_rate_limit(clients * requests * 4)
+
+    def _run(port: int) -> dict[str, Any]:
+        return _run_clients(port, clients=clients, requests=requests, route=route)
+
+    return {
+        "route": route,
+        "clients": clients,
+        "requests_per_client": requests,
+        "threaded": _with_threaded_server(_run),
+        "asyncio": _with_async_server(_run),
+    }
+
+
+# Rotas que o dashboard consulta em loop (polling de 10s) ou a cada troca de canal.
+SESSION_ROUTES = (
+    "/api/observability?channel=default",
+    "/api/control-plane",
+    "/api/action-queue?limit=80",
+    "/api/clip-jobs",
+    "/api/hud/messages?since=0",
+    "/api/sentiment/scores?channel=default",
+    "/api/channel-config?channel=default",
+    "/api/agent-notes?channel=default",
+    "/api/persona-profile?channel=default",
+)
+
+
+def _run_session(port: int, *, polls: int, token: str, revalidate: bool) -> dict[str, int]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    etags: dict[str, str] = {}
+    totals = {"requests": 0, "body_bytes": 0, "not_modified": 0}
+    for _ in range(polls):
+        for route in SESSION_ROUTES:
+            headers = {"X-Byte-Admin-Token": token}
+            if revalidate:
+                headers["Accept-Encoding"] = "br, gzip"
+                if route in etags:
+                    headers["If-None-Match"] = etags[route]
+            connection.request("GET", route, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            if response.getheader("ETag"):
+                etags[route] = str(response.getheader("ETag"))
+            totals["requests"] += 1
+            totals["body_bytes"] += len(body)
+            totals["not_modified"] += int(response.status == 304)
+    connection.close()
+    return totals
+
+
+def run_session_transfer_report(*, polls: int = 30, token: str = "") -> dict[str, Any]:
+    """Bytes de corpo de uma sessao: cliente legado (identity, sem ETag) vs revalidando."""
+    _disable_rate_limit(polls * len(SESSION_ROUTES) * 4)
+    active_token = token or os.environ.get("BYTE_DASHBOARD_ADMIN_TOKEN", "")
+
+    def _run(port: int) -> dict[str, Any]:
+        return {
+            "before": _run_session(port, polls=polls, token=active_token, revalidate=False),
+            "after": _run_session(port, polls=polls, token=active_token, revalidate=True),
+        }
+
+    result = _with_threaded_server(_run)
+    before = result["before"]["body_bytes"]
+    result["polls"] = polls
+    result["saved_ratio"] = round(1 - result["after"]["body_bytes"] / before, 4) if before else 0.0
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara os servidores HTTP do dashboard.")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--route", default="/health")
+    parser.add_argument("--session", action="store_true")
+    parser.add_argument("--polls", type=int, default=30)
+    args = parser.parse_args(argv)
+    if args.session:
+        report = run_session_transfer_report(polls=args.polls)
+        print(f"session: {report['polls']} polls x {len(SESSION_ROUTES)} rotas")
+        for phase in ("before", "after"):
+            stats = report[phase]
+            print(
+                f"{phase:>6}: {stats['body_bytes']:>9} bytes  "
+                f"{stats['requests']} requests  304 {stats['not_modified']}"
+            )
+        print(f" saved: {report['saved_ratio']:.1%}")
+        return 0
+    result = run_load_test(clients=args.clients, requests=args.requests, route=args.route)
+    print(f"route={result['route']} clients={result['clients']} x {result['requests_per_client']}")
+    for mode in ("threaded", "asyncio"):
+        stats = result[mode]
+        print(
+            f"{mode:>9}: {stats['requests_per_second']:>8} req/s  "
+            f"p50 {stats['p50_ms']}ms  p99 {stats['p99_ms']}ms  errors {stats['errors']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
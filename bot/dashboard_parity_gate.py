@@ -334,6 +334,17 @@ PARITY_CONTRACT: tuple[ParityContractEntry, ...] = (
         dashboard_test_files=("dashboard/tests/api_contract_parity.test.js",),
         route_snippet="/api/hud/messages",
     ),
+    ParityContractEntry(
+        method="GET",
+        backend_route="/api/stream",
+        domain="observability",
+        dashboard_surface="dashboard_push_stream + hud_overlay_panel",
+        status="integrated",
+        dashboard_route_prefix="/api/stream",
+        backend_test_files=("bot/tests/test_dashboard_stream.py",),
+        dashboard_test_files=("dashboard/tests/api_contract_parity.test.js",),
+        route_snippet="/api/stream",
+    ),
     ParityContractEntry(
         method="GET",
         backend_route="/api/sentiment/scores",
@@ -450,6 +461,28 @@ PARITY_CONTRACT: tuple[ParityContractEntry, ...] = (
         dashboard_test_files=("dashboard/tests/api_contract_parity.test.js",),
         route_snippet="/api/persona-profile",
     ),
+    ParityContractEntry(
+        method="GET",
+        backend_route="/api/observability/latency",
+        domain="observability",
+        dashboard_surface="ops_scraping",
+        status="headless_approved",
+        backend_test_files=("bot/tests/test_dashboard_routes_v3.py",),
+        route_snippet="/api/observability/latency",
+        headless_reason="Quantis de latencia para scraping/alertas; o dashboard le o bloco latency do snapshot.",
+        planned_phase="latency_panel",
+    ),
+    ParityContractEntry(
+        method="GET",
+        backend_route="/api/observability/batch",
+        domain="observability",
+        dashboard_surface="ops_scraping",
+        status="headless_approved",
+        backend_test_files=("bot/tests/test_observability_batch.py",),
+        route_snippet="/api/observability/batch",
+        headless_reason="Resumo multi-canal para CLI/ops; o dashboard foca um canal por vez.",
+        planned_phase="multi_channel_overview",
+    ),
 )
 
 
@@ -0,0 +1,211 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_RATE_LIMIT_PER_MINUTE = 100
+DEFAULT_CHAT_SEND_RATE_LIMIT_PER_MINUTE = 20
+DEFAULT_VISION_INGEST_RATE_LIMIT_PER_MINUTE = 20
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+DEFAULT_MAX_TRACKED_CLIENTS = 4096
+DEFAULT_BUDGET = "default"
+
+
+def _resolve_per_minute(env_name: str, default: int) -> int:
+    raw_value = os.environ.get(env_name)
+    try:
+        parsed = int(raw_value) if raw_value not in (None, "") else 0
+    except (TypeError, ValueError):
+        parsed = 0
+    if parsed <= 0:
+        return default
+    return parsed
+
+
+@dataclass(frozen=True)
+class RateBudget:
+    name: str
+    max_requests: int
+    window_seconds: float = RATE_LIMIT_WINDOW_SECONDS
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    budget: str = DEFAULT_BUDGET
+    retry_after_seconds: int = 0
+
+
+def build_default_budgets() -> tuple[RateBudget, dict[str, RateBudget]]:
+    """Orcamento global por cliente e orcamentos mais estritos por rota."""
+    default = RateBudget(
+        DEFAULT_BUDGET,
+        _resolve_per_minute("DASHBOARD_RATE_LIMIT_PER_MINUTE", DEFAULT_RATE_LIMIT_PER_MINUTE),
+    )
+    routes = {
+        "/api/chat/send": RateBudget(
+            "chat_send",
+            _resolve_per_minute(
+                "DASHBOARD_CHAT_SEND_RATE_LIMIT_PER_MINUTE",
+                DEFAULT_CHAT_SEND_RATE_LIMIT_PER_MINUTE,
+            ),
+        ),
+        "/api/vision/ingest": RateBudget(
+            "vision_ingest",
+            _resolve_per_minute(
+                "DASHBOARD_VISION_INGEST_RATE_LIMIT_PER_MINUTE",
+                DEFAULT_VISION_INGEST_RATE_LIMIT_PER_MINUTE,
+            ),
+        ),
+    }
+    return default, routes
+
+
+class _SlidingWindowCounter:
+    """Contador de janela deslizante aproximada: janela atual + fracao da anterior."""
+
+    __slots__ = ("current", "previous", "window_start")
+
+    def __init__(self, window_start: float) -> None:
+        self.window_start = window_start
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float, window: float) -> None:
+        elapsed_windows = int((now - self.window_start) // window)
+        if elapsed_windows <= 0:
+            return
+        self.previous = self.current if elapsed_windows == 1 else 0
+        self.current = 0
+        self.window_start += elapsed_windows * window
+
+    def estimate(self, now: float, window: float) -> float:
+        self._roll(now, window)
+        weight = 1.0 - (now - self.window_start) / window
+        return self.previous * weight + self.current
+
+    def retry_after(self, now: float, window: float, max_requests: int) -> int:
+        # Tempo ate a estimativa cair abaixo do limite (o peso da janela anterior decai linear).
+        window_end = self.window_start + window
+        if self.current + 1 > max_requests:
+            # So na proxima janela, quando a atual vira a anterior e comeca a decair.
+            release_weight = (max_requests - 1) / self.current if self.current else 0.0
+            release_at = window_end + (1.0 - release_weight) * window
+        elif self.previous > 0:
+            release_weight = (max_requests - 1 - self.current) / self.previous
+            release_at = self.window_start + (1.0 - release_weight) * window
+        else:
+            release_at = window_end
+        return max(1, math.ceil(release_at - now))
+
+
+class DashboardRateLimiter:
+    """Limitador por cliente com janelas deslizantes O(1) e despejo LRU.
+
+    Cada requisicao conta no orcamento ``default`` e, se a rota tiver um, no
+    orcamento proprio dela; so e aceita se ambos tiverem folga. Clientes mais
+    ociosos saem primeiro quando o limite de clientes rastreados e atingido.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_budget: RateBudget | None = None,
+        route_budgets: dict[str, RateBudget] | None = None,
+        max_clients: int = DEFAULT_MAX_TRACKED_CLIENTS,
+    ) -> None:
+        resolved_default, resolved_routes = build_default_budgets()
+        self._default_budget = default_budget or resolved_default
+        self._route_budgets = dict(resolved_routes if route_budgets is None else route_budgets)
+        self._max_clients = max(1, int(max_clients))
+        self._lock = threading.Lock()
+        self._clients: OrderedDict[str, dict[str, _SlidingWindowCounter]] = OrderedDict()
+        self._allowed_total = 0
+        self._throttled_by_budget: dict[str, int] = {}
+        self._evicted_total = 0
+
+    @property
+    def default_budget(self) -> RateBudget:
+        return self._default_budget
+
+    def budgets_for(self, route: str) -> tuple[RateBudget, ...]:
+        route_budget = self._route_budgets.get(route)
+        if route_budget is None:
+            return (self._default_budget,)
+        return (route_budget, self._default_budget)
+
+    def check(self, client: str, route: str = "", *, now: float | None = None) -> RateDecision:
+        current = time.monotonic() if now is None else now
+        budgets = self.budgets_for(route)
+        with self._lock:
+            counters = self._clients.get(client)
+            if counters is None:
+                counters = {}
+                self._clients[client] = counters
+                while len(self._clients) > self._max_clients:
+                    self._clients.popitem(last=False)
+                    self._evicted_total += 1
+            else:
+                self._clients.move_to_end(client)
+            for budget in budgets:
+                counter = counters.get(budget.name)
+                if counter is None:
+                    counter = _SlidingWindowCounter(current)
+                    counters[budget.name] = counter
+                if counter.estimate(current, budget.window_seconds) + 1 > budget.max_requests:
+                    self._throttled_by_budget[budget.name] = (
+                        self._throttled_by_budget.get(budget.name, 0) + 1
+                    )
+                    return RateDecision(
+                        allowed=False,
+                        budget=budget.name,
+                        retry_after_seconds=counter.retry_after(
+                            current, budget.window_seconds, budget.max_requests
+                        ),
+                    )
+            for budget in budgets:
+                counters[budget.name].current += 1
+            self._allowed_total += 1
+            return RateDecision(allowed=True, budget=budgets[0].name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._allowed_total = 0
+            self._throttled_by_budget = {}
+            self._evicted_total = 0
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            budgets = [self._default_budget, *self._route_budgets.values()]
+            return {
+                "tracked_clients": len(self._clients),
+                "max_clients": self._max_clients,
+                "allowed_total": self._allowed_total,
+                "throttled_total": sum(self._throttled_by_budget.values()),
+                "throttled_by_budget": {
+                    budget.name: self._throttled_by_budget.get(budget.name, 0) for budget in budgets
+                },
+                "evicted_total": self._evicted_total,
+                "budgets": {
+                    budget.name: {
+                        "max_requests": budget.max_requests,
+                        "window_seconds": budget.window_seconds,
+                    }
+                    for budget in budgets
+                },
+            }
+
+
+dashboard_rate_limiter = DashboardRateLimiter()
+
+__all__ = [
+    "DashboardRateLimiter",
+    "RateBudget",
+    "RateDecision",
+    "build_default_budgets",
+    "dashboard_rate_limiter",
+]
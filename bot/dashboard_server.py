@@ -1,11 +1,26 @@
 import json
 import logging
 import os
-import time
+from collections.abc import Callable
 from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from typing import Any, ClassVar
 
 from bot.channel_control import is_dashboard_admin_authorized, parse_terminal_command
+from bot.dashboard_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    dashboard_assets,
+)
+from bot.dashboard_http_cache import (
+    JSON_CACHE_CONTROL,
+    PreparedBody,
+    dashboard_response_cache,
+    etag_matches,
+    negotiate_encoding,
+    serialize_json,
+)
+from bot.dashboard_http_helpers import parse_dashboard_request_path
+from bot.dashboard_rate_limit import DashboardRateLimiter, dashboard_rate_limiter
 from bot.dashboard_server_routes import (
     CHANNEL_CONTROL_IRC_ONLY_ACTIONS,
     build_observability_payload,
@@ -22,32 +37,29 @@ from bot.runtime_config import (
     irc_channel_control,
 )
 
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
 
 class HealthHandler(BaseHTTPRequestHandler):
     MAX_CONTROL_BODY_BYTES = 4096
     CHANNEL_CONTROL_IRC_ONLY_ACTIONS = CHANNEL_CONTROL_IRC_ONLY_ACTIONS
-    _rate_limit_state: ClassVar[dict[str, list[float]]] = {}
-    _rate_limit_max_requests = 100
-    _rate_limit_window_seconds = 60
+    _rate_limiter: ClassVar[DashboardRateLimiter] = dashboard_rate_limiter
+    _rate_limit_retry_after = 0
     _logger = logging.getLogger("byte.dashboard.server")
 
     def _check_rate_limit(self) -> bool:
-        ip = self.client_address[0]
-        now = time.time()
-
-        # Cleanup old entries periodically (every 100 requests roughly)
-        if len(self._rate_limit_state) > 1000:
-            self._rate_limit_state.clear()
-
-        history = self._rate_limit_state.get(ip, [])
-        history = [ts for ts in history if now - ts < self._rate_limit_window_seconds]
-
-        if len(history) >= self._rate_limit_max_requests:
-            return False
-
-        history.append(now)
-        self._rate_limit_state[ip] = history
-        return True
+        route, _query = parse_dashboard_request_path(getattr(self, "path", "/"))
+        decision = self._rate_limiter.check(str(self.client_address[0]), route)
+        self._rate_limit_retry_after = decision.retry_after_seconds
+        return decision.allowed
+
+    def _send_rate_limited(self) -> None:
+        self._send_bytes(
+            b"Too Many Requests",
+            "text/plain; charset=utf-8",
+            status_code=429,
+            extra_headers=(("Retry-After", str(max(1, self._rate_limit_retry_after))),),
+        )
 
     def _send_cors_headers(self) -> None:
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -56,25 +68,108 @@ class HealthHandler(BaseHTTPRequestHandler):
             "Access-Control-Allow-Headers", "Content-Type, X-Byte-Admin-Token, Authorization"
         )
 
-    def _send_bytes(self, payload: bytes, content_type: str, status_code: int = 200) -> None:
+    def _send_bytes(
+        self,
+        payload: bytes,
+        content_type: str,
+        status_code: int = 200,
+        *,
+        cache_control: str = "no-store",
+        extra_headers: tuple[tuple[str, str], ...] = (),
+    ) -> None:
         self.send_response(status_code)
         self._send_cors_headers()
         self.send_header("Content-Type", content_type)
-        self.send_header("Cache-Control", "no-store")
+        self.send_header("Cache-Control", cache_control)
+        for key, value in extra_headers:
+            self.send_header(key, value)
         self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
         self.wfile.write(payload)
 
+    def _send_revalidated(
+        self,
+        *,
+        identity: bytes,
+        etag: str,
+        content_type: str,
+        cache_control: str,
+        encode: Callable[[str], bytes],
+    ) -> tuple[int, str, bool]:
+        """GET 200 com ETag: 304 se o ``If-None-Match`` bate, senao corpo na codificacao negociada.
+
+        Devolve ``(bytes enviados, encoding, not_modified)``.
+        """
+        headers = getattr(self, "headers", None) or {}
+        if etag_matches(str(headers.get("If-None-Match", "") or ""), etag):
+            self.send_response(304)
+            self._send_cors_headers()
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return 0, "", True
+        encoding = negotiate_encoding(str(headers.get("Accept-Encoding", "") or ""), len(identity))
+        body = encode(encoding)
+        if body is identity:
+            encoding = ""
+        extra_headers = [("ETag", etag), ("Vary", "Accept-Encoding")]
+        if encoding:
+            extra_headers.append(("Content-Encoding", encoding))
+        self._send_bytes(
+            body,
+            content_type,
+            status_code=200,
+            cache_control=cache_control,
+            extra_headers=tuple(extra_headers),
+        )
+        return len(body), encoding, False
+
     def _send_json(self, payload: dict[str, Any], status_code: int = 200) -> None:
-        serialized = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        self._send_bytes(serialized, "application/json; charset=utf-8", status_code=status_code)
+        serialized = serialize_json(payload)
+        if status_code != 200 or getattr(self, "command", "") != "GET":
+            self._send_bytes(serialized, JSON_CONTENT_TYPE, status_code=status_code)
+            return
+        self._send_prepared_json(dashboard_response_cache.prepare(serialized))
+
+    def _send_prepared_json(self, prepared: PreparedBody) -> None:
+        """GET 200 de JSON: revalida por ETag (304) e comprime conforme ``Accept-Encoding``."""
+        sent_bytes, encoding, not_modified = self._send_revalidated(
+            identity=prepared.body,
+            etag=prepared.etag,
+            content_type=JSON_CONTENT_TYPE,
+            cache_control=JSON_CACHE_CONTROL,
+            encode=prepared.encoded,
+        )
+        dashboard_response_cache.record_transfer(
+            identity_bytes=len(prepared.body),
+            sent_bytes=sent_bytes,
+            not_modified=not_modified,
+            encoding=encoding,
+        )
 
     def _send_text(self, text: str, status_code: int = 200) -> None:
         self._send_bytes(text.encode("utf-8"), "text/plain; charset=utf-8", status_code=status_code)
 
+    def _send_event_stream_headers(self) -> None:
+        self.send_response(200)
+        self._send_cors_headers()
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        # Proxies (nginx/HF) nao devem segurar os eventos em buffer.
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        self.wfile.flush()
+
+    def _write_stream_chunk(self, chunk: bytes) -> None:
+        self.wfile.write(chunk)
+        self.wfile.flush()
+
     def _dashboard_authorized(self) -> bool:
         if not BYTE_DASHBOARD_ADMIN_TOKEN or len(BYTE_DASHBOARD_ADMIN_TOKEN.strip()) < 8:
-            self._logger.error("DASHBOARD_AUTH_CRITICAL: BYTE_DASHBOARD_ADMIN_TOKEN is missing or too short. Denying all access for security.")
+            self._logger.error(
+                "DASHBOARD_AUTH_CRITICAL: BYTE_DASHBOARD_ADMIN_TOKEN is missing or too short. Denying all access for security."
+            )
             return False
         authorized = is_dashboard_admin_authorized(self.headers, BYTE_DASHBOARD_ADMIN_TOKEN)
         if not authorized:
@@ -139,96 +234,39 @@ class HealthHandler(BaseHTTPRequestHandler):
         if ".." in relative_path or relative_path.startswith("/"):
             self._send_text("Invalid path", status_code=400)
             return True
-        target_path = (DASHBOARD_DIR / relative_path).resolve()
-        if DASHBOARD_DIR not in target_path.parents:
+        asset = dashboard_assets.get(relative_path, root=DASHBOARD_DIR)
+        if asset is None:
             self._send_text("Not Found", status_code=404)
             return True
-        if not target_path.is_file():
-            self._send_text("Not Found", status_code=404)
-            return True
-        self._send_bytes(target_path.read_bytes(), content_type=content_type, status_code=200)
+        self._send_revalidated(
+            identity=asset.body,
+            etag=asset.etag,
+            content_type=content_type,
+            cache_control=(
+                IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL
+            ),
+            encode=asset.encoded,
+        )
         return True
 
-    def _build_observability_payload(self, channel_id: str | None = None) -> dict[str, Any]:
-        return build_observability_payload(channel_id)
+    def _build_observability_payload(
+        self,
+        channel_id: str | None = None,
+        *,
+        fields: frozenset[str] | None = None,
+    ) -> dict[str, Any]:
+        if fields is None:
+            return build_observability_payload(channel_id)
+        return build_observability_payload(channel_id, fields=fields)
 
     def _handle_channel_control(self, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
-        action = str(payload.get("action", "") or "").strip().lower()
-        channel_login = str(payload.get("channel", "") or "").strip()
-        command_text = str(payload.get("command", "") or "").strip()
-        if command_text:
-            action, channel_login = parse_terminal_command(command_text)
-
-        if TWITCH_CHAT_MODE != "irc":
-            if action in self.CHANNEL_CONTROL_IRC_ONLY_ACTIONS:
-                return (
-                    {
-                        "ok": False,
-                        "error": "unsupported_mode",
-                        "message": "Channel control de runtime so funciona em TWITCH_CHAT_MODE=irc.",
-                        "mode": TWITCH_CHAT_MODE,
-                        "action": action,
-                    },
-                    409,
-                )
-            if action == "list":
-                return (
-                    {
-                        "ok": True,
-                        "action": "list",
-                        "channels": [],
-                        "mode": TWITCH_CHAT_MODE,
-                        "message": "Sem runtime IRC ativo neste modo. join/part ficam bloqueados em eventsub.",
-                    },
-                    200,
-                )
-
+        action, channel_login, unsupported = _prepare_channel_control(
+            payload, self.CHANNEL_CONTROL_IRC_ONLY_ACTIONS
+        )
+        if unsupported is not None:
+            return unsupported
         result = irc_channel_control.execute(action=action, channel_login=channel_login)
-        result["mode"] = TWITCH_CHAT_MODE
-        if result.get("ok") and action == "part":
-            report_channel_id = (
-                str(channel_login or result.get("channel") or "default").strip().lower()
-            )
-            report_channel_id = report_channel_id or "default"
-            try:
-                snapshot = build_observability_payload(report_channel_id)
-                history_points = persistence.load_observability_channel_history_sync(
-                    report_channel_id,
-                    limit=120,
-                )
-                generated_report = build_post_stream_report(
-                    channel_id=report_channel_id,
-                    history_points=list(history_points or []),
-                    observability_snapshot=snapshot,
-                    trigger="auto_part_success",
-                )
-                persistence.save_post_stream_report_sync(
-                    report_channel_id,
-                    generated_report,
-                    trigger="auto_part_success",
-                )
-                result["post_stream_report"] = {
-                    "generated": True,
-                    "channel_id": report_channel_id,
-                    "trigger": "auto_part_success",
-                }
-            except Exception as error:
-                self._logger.error(
-                    "Falha ao gerar post_stream_report automatico para %s: %s",
-                    report_channel_id,
-                    error,
-                )
-        if result.get("ok"):
-            return result, 200
-
-        error_code = str(result.get("error", "") or "")
-        if error_code in {"runtime_unavailable", "timeout"}:
-            status_code = 503
-        elif error_code in {"runtime_error"}:
-            status_code = 500
-        else:
-            status_code = 400
-        return result, status_code
+        return _finish_channel_control(action, channel_login, result)
 
     def do_OPTIONS(self) -> None:
         self.send_response(204)
@@ -237,19 +275,19 @@ class HealthHandler(BaseHTTPRequestHandler):
 
     def do_GET(self) -> None:
         if not self._check_rate_limit():
-            self._send_text("Too Many Requests", status_code=429)
+            self._send_rate_limited()
             return
         handle_get(self)
 
     def do_PUT(self) -> None:
         if not self._check_rate_limit():
-            self._send_text("Too Many Requests", status_code=429)
+            self._send_rate_limited()
             return
         handle_put(self)
 
     def do_POST(self) -> None:
         if not self._check_rate_limit():
-            self._send_text("Too Many Requests", status_code=429)
+            self._send_rate_limited()
             return
         handle_post(self)
 
@@ -257,6 +295,98 @@ class HealthHandler(BaseHTTPRequestHandler):
         return
 
 
+def _prepare_channel_control(
+    payload: dict[str, Any], irc_only_actions: tuple[str, ...]
+) -> tuple[str, str, tuple[dict[str, Any], int] | None]:
+    action = str(payload.get("action", "") or "").strip().lower()
+    channel_login = str(payload.get("channel", "") or "").strip()
+    command_text = str(payload.get("command", "") or "").strip()
+    if command_text:
+        action, channel_login = parse_terminal_command(command_text)
+
+    if TWITCH_CHAT_MODE != "irc":
+        if action in irc_only_actions:
+            return (
+                action,
+                channel_login,
+                (
+                    {
+                        "ok": False,
+                        "error": "unsupported_mode",
+                        "message": "Channel control de runtime so funciona em TWITCH_CHAT_MODE=irc.",
+                        "mode": TWITCH_CHAT_MODE,
+                        "action": action,
+                    },
+                    409,
+                ),
+            )
+        if action == "list":
+            return (
+                action,
+                channel_login,
+                (
+                    {
+                        "ok": True,
+                        "action": "list",
+                        "channels": [],
+                        "mode": TWITCH_CHAT_MODE,
+                        "message": "Sem runtime IRC ativo neste modo. join/part ficam bloqueados em eventsub.",
+                    },
+                    200,
+                ),
+            )
+    return action, channel_login, None
+
+
+def _finish_channel_control(
+    action: str, channel_login: str, result: dict[str, Any]
+) -> tuple[dict[str, Any], int]:
+    result["mode"] = TWITCH_CHAT_MODE
+    if result.get("ok") and action == "part":
+        report_channel_id = str(channel_login or result.get("channel") or "default").strip().lower()
+        report_channel_id = report_channel_id or "default"
+        try:
+            snapshot = build_observability_payload(report_channel_id)
+            history_points = persistence.load_observability_channel_history_sync(
+                report_channel_id,
+                limit=120,
+            )
+            generated_report = build_post_stream_report(
+                channel_id=report_channel_id,
+                history_points=list(history_points or []),
+                observability_snapshot=snapshot,
+                trigger="auto_part_success",
+            )
+            persistence.save_post_stream_report_sync(
+                report_channel_id,
+                generated_report,
+                trigger="auto_part_success",
+            )
+            result["post_stream_report"] = {
+                "generated": True,
+                "channel_id": report_channel_id,
+                "trigger": "auto_part_success",
+            }
+        except Exception as error:
+            HealthHandler._logger.error(
+                "Falha ao gerar post_stream_report automatico para %s: %s",
+                report_channel_id,
+                error,
+            )
+    if result.get("ok"):
+        return result, 200
+
+    error_code = str(result.get("error", "") or "")
+    if error_code in {"runtime_unavailable", "timeout"}:
+        status_code = 503
+    elif error_code in {"runtime_error"}:
+        status_code = 500
+    else:
+        status_code = 400
+    return result, status_code
+
+
 def run_server() -> None:
     port = int(os.environ.get("PORT", "8080"))
+    dashboard_assets.preload(DASHBOARD_DIR)
     ThreadingHTTPServer(("0.0.0.0", port), HealthHandler).serve_forever()
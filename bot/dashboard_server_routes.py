@@ -1,11 +1,12 @@
 import asyncio
-import mimetypes
 from collections.abc import Callable
 from typing import Any
 
 from bot.clip_jobs_runtime import clip_jobs
 from bot.coaching_runtime import coaching_runtime
 from bot.control_plane import control_plane
+from bot.dashboard_assets import dashboard_content_type
+from bot.dashboard_http_cache import dashboard_response_cache, serialize_json
 from bot.dashboard_http_helpers import (
     build_control_plane_state_payload,
     parse_dashboard_request_path,
@@ -13,10 +14,22 @@ from bot.dashboard_http_helpers import (
     require_dashboard_auth,
     send_invalid_request,
 )
+from bot.dashboard_rate_limit import dashboard_rate_limiter
+from bot.dashboard_stream import StreamEvent, StreamSubscription, dashboard_stream
+from bot.event_loop_monitor import event_loop_monitor
 from bot.hud_runtime import hud_runtime
 from bot.logic import BOT_BRAND, context_manager
 from bot.observability import observability
+from bot.observability_fields import (
+    BATCH_DEFAULT_FIELDS,
+    OBSERVABILITY_FIELDS,
+    parse_channel_list,
+    parse_observability_selection,
+    resolve_snapshot_sections,
+)
 from bot.observability_history_contract import normalize_observability_history_point
+from bot.observability_openmetrics import OPENMETRICS_CONTENT_TYPE, render_openmetrics
+from bot.observability_snapshot_cache import observability_snapshot_cache
 from bot.persistence_layer import persistence
 from bot.post_stream_report import build_post_stream_report
 from bot.runtime_config import BYTE_VERSION, TWITCH_CHAT_MODE
@@ -97,6 +110,7 @@ def _resolve_text_query_param(
 
 def _serialize_runtime_context(ctx: Any) -> dict[str, Any]:
     runtime_observability = getattr(ctx, "live_observability", {}) or {}
+    ready_ms = getattr(ctx, "ready_ms", None)
     return {
         "channel_id": str(getattr(ctx, "channel_id", "default") or "default"),
         "current_game": str(getattr(ctx, "current_game", "N/A") or "N/A"),
@@ -114,6 +128,8 @@ def _serialize_runtime_context(ctx: Any) -> dict[str, Any]:
             str(key): str(value) for key, value in dict(runtime_observability).items() if str(key)
         },
         "recent_chat_entries": list(getattr(ctx, "recent_chat_entries", []) or [])[-12:],
+        # Time-to-ready do contexto; None enquanto a restauracao do banco nao terminou.
+        "ready_ms": float(ready_ms) if isinstance(ready_ms, int | float) else None,
     }
 
 
@@ -196,18 +212,85 @@ def _serialize_observability_history_point(point: dict[str, Any] | None) -> dict
     return normalize_observability_history_point(point, default_channel_id="default")
 
 
-def build_observability_payload(channel_id: str | None = None) -> dict[str, Any]:
+def build_observability_payload(
+    channel_id: str | None = None,
+    *,
+    fields: frozenset[str] | None = None,
+) -> dict[str, Any]:
+    """Payload de ``/api/observability``; ``fields`` limita o que e calculado.
+
+    Sem ``fields`` o payload vem completo. Com ``fields`` so os blocos pedidos
+    (e as dependencias deles) sao montados, e o cache curto separa cada recorte.
+    """
     ctx = _get_context_sync(channel_id)
     selected_channel = str(getattr(ctx, "channel_id", channel_id or "default") or "default")
+    cache_key = (
+        selected_channel if fields is None else f"{selected_channel}|{','.join(sorted(fields))}"
+    )
+    cached, cache_source, cache_age_ms = observability_snapshot_cache.get_or_build(
+        cache_key,
+        lambda: _build_observability_payload_uncached(ctx, selected_channel, fields),
+    )
+    payload = dict(cached)
+    payload["diagnostics"] = {
+        "snapshot_cache": {
+            "source": cache_source,
+            "age_ms": cache_age_ms,
+            **observability_snapshot_cache.get_status(),
+        },
+    }
+    return payload
+
+
+def _build_observability_payload_uncached(
+    ctx: Any,
+    selected_channel: str,
+    fields: frozenset[str] | None = None,
+) -> dict[str, Any]:
+    def wants(name: str) -> bool:
+        return fields is None or name in fields
+
     snapshot = observability.snapshot(
         bot_brand=BOT_BRAND,
         bot_version=BYTE_VERSION,
         bot_mode=TWITCH_CHAT_MODE,
         stream_context=ctx,
         channel_id=selected_channel,
+        sections=None if fields is None else resolve_snapshot_sections(fields),
     )
-    capabilities = control_plane.build_capabilities(bot_mode=TWITCH_CHAT_MODE)
-    autonomy = control_plane.runtime_snapshot()
+    needs_autonomy = fields is None or bool(fields & {"autonomy", "agent_outcomes", "coaching"})
+    autonomy = control_plane.runtime_snapshot() if needs_autonomy else {}
+    if needs_autonomy:
+        _enrich_agent_outcomes(snapshot, autonomy)
+    if wants("capabilities"):
+        snapshot["capabilities"] = control_plane.build_capabilities(bot_mode=TWITCH_CHAT_MODE)
+    if wants("autonomy"):
+        snapshot["autonomy"] = autonomy
+    snapshot["selected_channel"] = selected_channel
+    if wants("context"):
+        snapshot["context"] = {
+            **(snapshot.get("context") or {}),
+            "channel_id": selected_channel,
+        }
+    if wants("coaching"):
+        snapshot["coaching"] = coaching_runtime.evaluate_and_emit(
+            snapshot,
+            channel_id=selected_channel,
+        )
+    if fields is not None:
+        # Dependencias do coaching e a persistencia so saem quando pedidas.
+        snapshot = {
+            key: value
+            for key, value in snapshot.items()
+            if key in fields or key not in OBSERVABILITY_FIELDS
+        }
+    snapshot["ok"] = True
+    return snapshot
+
+
+def _enrich_agent_outcomes(snapshot: dict[str, Any], autonomy: dict[str, Any]) -> None:
+    if "agent_outcomes" not in snapshot:
+        return
     queue_window_60m = autonomy.get("queue_window_60m", {})
     current_outcomes = snapshot.get("agent_outcomes", {}) or {}
     snapshot["agent_outcomes"] = {
@@ -216,29 +299,73 @@ def build_observability_payload(channel_id: str | None = None) -> dict[str, Any]
         "ignored_total_60m": int(queue_window_60m.get("ignored", 0)),
         "decisions_total_60m": int(queue_window_60m.get("decisions_total", 0)),
     }
-    snapshot["capabilities"] = capabilities
-    snapshot["autonomy"] = autonomy
-    snapshot["selected_channel"] = selected_channel
-    snapshot["context"] = {
-        **(snapshot.get("context") or {}),
-        "channel_id": selected_channel,
-    }
-    snapshot["coaching"] = coaching_runtime.evaluate_and_emit(
-        snapshot,
-        channel_id=selected_channel,
+
+
+def build_observability_batch_payload(
+    channel_ids: list[str] | None = None,
+    *,
+    fields: frozenset[str] = BATCH_DEFAULT_FIELDS,
+) -> dict[str, Any]:
+    """Resumo de varios canais numa requisicao; ``None`` le os canais ativos.
+
+    Os snapshots saem de uma passada so (``observability.snapshot_many``) e
+    capacidades/autonomia, que sao globais, sao calculadas uma vez para o lote.
+    """
+    scope = "active" if channel_ids is None else "explicit"
+    selected = (
+        sorted(context_manager.list_active_channels()) if channel_ids is None else channel_ids
     )
-    snapshot["ok"] = True
-    return snapshot
+    sections = resolve_snapshot_sections(fields)
+    batch = observability.snapshot_many(
+        [(channel_id, _get_context_sync(channel_id)) for channel_id in selected],
+        bot_brand=BOT_BRAND,
+        bot_version=BYTE_VERSION,
+        bot_mode=TWITCH_CHAT_MODE,
+        sections=sections,
+    )
+    needs_autonomy = bool(fields & {"autonomy", "agent_outcomes", "coaching"})
+    autonomy = control_plane.runtime_snapshot() if needs_autonomy else {}
+    channels: dict[str, dict[str, Any]] = {}
+    for channel_id, snapshot in batch["channels"].items():
+        if needs_autonomy:
+            _enrich_agent_outcomes(snapshot, autonomy)
+        if "context" in snapshot:
+            snapshot["context"] = {**snapshot["context"], "channel_id": channel_id}
+        if "coaching" in fields:
+            snapshot["coaching"] = coaching_runtime.evaluate_and_emit(
+                snapshot,
+                channel_id=channel_id,
+            )
+        # Blocos calculados so como dependencia do coaching nao saem no payload.
+        channels[channel_id] = {
+            key: value for key, value in snapshot.items() if key in fields or key == "timestamp"
+        }
+    payload: dict[str, Any] = {
+        "ok": True,
+        "mode": TWITCH_CHAT_MODE,
+        "timestamp": batch["timestamp"],
+        "scope": scope,
+        "fields": sorted(fields),
+        "channel_ids": list(channels),
+        "channels": channels,
+        "persistence": batch["persistence"],
+    }
+    if "capabilities" in fields:
+        payload["capabilities"] = control_plane.build_capabilities(bot_mode=TWITCH_CHAT_MODE)
+    if "autonomy" in fields:
+        payload["autonomy"] = autonomy
+    return payload
 
 
 def build_channel_context_payload(channel_id: str | None = None) -> dict[str, Any]:
     safe_channel_id = str(channel_id or "default").strip().lower() or "default"
     loaded_before_request = safe_channel_id in set(context_manager.list_active_channels())
     ctx = _get_context_sync(safe_channel_id)
-    persisted_state = persistence.load_channel_state_sync(safe_channel_id)
-    persisted_history = persistence.load_recent_history_sync(safe_channel_id)
-    persisted_agent_notes = persistence.load_agent_notes_sync(safe_channel_id)
-    persisted_channel_identity = persistence.load_channel_identity_sync(safe_channel_id)
+    bundle = persistence.load_channel_bundle_sync(safe_channel_id)
+    persisted_state = bundle.state
+    persisted_history = bundle.history
+    persisted_agent_notes = bundle.agent_notes
+    persisted_channel_identity = bundle.channel_identity
     channel_payload = {
         "channel_id": safe_channel_id,
         "runtime_loaded": loaded_before_request,
@@ -258,7 +385,7 @@ def build_channel_context_payload(channel_id: str | None = None) -> dict[str, An
         ),
         "has_persisted_history": bool(persisted_history),
     }
-    persisted_persona_profile = persistence.load_persona_profile_sync(safe_channel_id)
+    persisted_persona_profile = bundle.persona_profile
     channel_payload["persisted_persona_profile"] = dict(persisted_persona_profile or {})
     channel_payload["has_persisted_persona_profile"] = bool(
         persisted_persona_profile and persisted_persona_profile.get("has_profile")
@@ -267,6 +394,11 @@ def build_channel_context_payload(channel_id: str | None = None) -> dict[str, An
         "ok": True,
         "mode": TWITCH_CHAT_MODE,
         "channel": channel_payload,
+        "persistence": {
+            "elapsed_ms": bundle.elapsed_ms,
+            "timed_out": list(bundle.timed_out),
+            "cache": persistence.get_channel_cache_status(),
+        },
     }
 
 
@@ -325,15 +457,12 @@ def build_observability_history_payload(
 def build_sentiment_scores_payload(channel_id: str | None = None) -> dict[str, Any]:
     ctx = _get_context_sync(channel_id)
     selected_channel = str(getattr(ctx, "channel_id", channel_id or "default") or "default")
-    snapshot = observability.snapshot(
-        bot_brand=BOT_BRAND,
-        bot_version=BYTE_VERSION,
-        bot_mode=TWITCH_CHAT_MODE,
-        stream_context=ctx,
+    metrics = observability.query_metrics(
+        ("sentiment", "stream_health"),
         channel_id=selected_channel,
     )
-    sentiment = dict(snapshot.get("sentiment") or {})
-    stream_health = dict(snapshot.get("stream_health") or {})
+    sentiment = dict(metrics.get("sentiment") or {})
+    stream_health = dict(metrics.get("stream_health") or {})
     return {
         "ok": True,
         "mode": TWITCH_CHAT_MODE,
@@ -344,6 +473,38 @@ def build_sentiment_scores_payload(channel_id: str | None = None) -> dict[str, A
     }
 
 
+def build_latency_payload(channel_id: str | None = None) -> dict[str, Any]:
+    # Sem canal le o agregado global; os quantis saem direto dos sketches.
+    safe_channel_id = str(channel_id or "").strip().lower() or None
+    metrics = observability.query_metrics(("latency",), channel_id=safe_channel_id)
+    return {
+        "ok": True,
+        "mode": TWITCH_CHAT_MODE,
+        "channel_id": safe_channel_id or "global",
+        "latency": dict(metrics.get("latency") or {}),
+    }
+
+
+def build_openmetrics_payload() -> str:
+    clip_job_counts = clip_jobs.count_by_status()
+    queues = {
+        "action_queue": {
+            status: count
+            for status, count in control_plane.action_queue_summary().items()
+            if status != "total"
+        },
+        "clip_jobs": clip_job_counts,
+        "hud_messages": {"buffered": int(hud_runtime.get_status().get("count", 0))},
+    }
+    return render_openmetrics(
+        observability.export_metrics(),
+        queues=queues,
+        event_loop=event_loop_monitor.get_status(),
+        http_responses=dashboard_response_cache.get_status(),
+        rate_limit=dashboard_rate_limiter.get_status(),
+    )
+
+
 def build_post_stream_report_payload(
     channel_id: str | None = None,
     *,
@@ -477,16 +638,7 @@ def _dashboard_asset_route(handler: Any, route: str) -> bool:
         return True
     if route.startswith("/dashboard/"):
         relative_path = route[len("/dashboard/") :]
-        guessed_content_type, _ = mimetypes.guess_type(relative_path)
-        content_type = guessed_content_type or "application/octet-stream"
-        if content_type == "text/javascript":
-            content_type = "application/javascript"
-        if content_type.startswith("text/") or content_type in {
-            "application/javascript",
-            "application/json",
-        }:
-            content_type = f"{content_type}; charset=utf-8"
-        handler._send_dashboard_asset(relative_path, content_type)
+        handler._send_dashboard_asset(relative_path, dashboard_content_type(relative_path))
         return True
     return False
 
@@ -510,7 +662,30 @@ def _resolve_action_queue_limit(query: dict[str, list[str]]) -> int:
 
 def _handle_get_observability(handler: Any, query: dict[str, list[str]]) -> None:
     channel_id = _resolve_channel_id(query, required=False)
-    handler._send_json(handler._build_observability_payload(channel_id), status_code=200)
+    try:
+        fields = parse_observability_selection(query)
+    except ValueError as error:
+        send_invalid_request(handler, str(error))
+        return
+    if fields is None:
+        payload = handler._build_observability_payload(channel_id)
+    else:
+        payload = handler._build_observability_payload(channel_id, fields=fields)
+    handler._send_json(payload, status_code=200)
+
+
+def _handle_get_observability_batch(handler: Any, query: dict[str, list[str]]) -> None:
+    try:
+        channel_ids = parse_channel_list(query.get("channels") or [])
+        fields = parse_observability_selection(query, default=BATCH_DEFAULT_FIELDS)
+    except ValueError as error:
+        send_invalid_request(handler, str(error))
+        return
+    if fields is None:
+        fields = frozenset(OBSERVABILITY_FIELDS)
+    handler._send_json(
+        build_observability_batch_payload(channel_ids, fields=fields), status_code=200
+    )
 
 
 def _handle_get_channel_context(handler: Any, query: dict[str, list[str]]) -> None:
@@ -548,21 +723,49 @@ def _handle_get_control_plane(handler: Any, _query: dict[str, list[str]]) -> Non
     handler._send_json(build_control_plane_state_payload(), status_code=200)
 
 
+def _send_versioned_json(
+    handler: Any,
+    cache_key: str,
+    versions: tuple[Any, ...],
+    build_payload: Callable[[], dict[str, Any]],
+) -> None:
+    """Recursos que so mudam por escrita: reaproveita os bytes enquanto a versao nao muda."""
+    if not all(isinstance(version, int) for version in versions):
+        # Persistencia sem contador de versao (mocks em testes): caminho normal.
+        handler._send_json(build_payload(), status_code=200)
+        return
+    prepared = dashboard_response_cache.get_versioned(cache_key, versions)
+    if prepared is None:
+        prepared = dashboard_response_cache.put_versioned(
+            cache_key, versions, serialize_json(build_payload())
+        )
+    handler._send_prepared_json(prepared)
+
+
 def _handle_get_channel_config(handler: Any, query: dict[str, list[str]]) -> None:
     try:
         channel_id = _resolve_channel_id(query)
     except ValueError as error:
         send_invalid_request(handler, str(error))
         return
-    channel_config = persistence.load_channel_config_sync(channel_id)
-    channel_identity = persistence.load_channel_identity_sync(channel_id)
-    handler._send_json(
-        {
+
+    def _build() -> dict[str, Any]:
+        channel_config = persistence.load_channel_config_sync(channel_id)
+        channel_identity = persistence.load_channel_identity_sync(channel_id)
+        return {
             "ok": True,
             "mode": TWITCH_CHAT_MODE,
             "channel": _merge_channel_directives_payload(channel_config, channel_identity),
-        },
-        status_code=200,
+        }
+
+    _send_versioned_json(
+        handler,
+        f"channel-config:{channel_id}",
+        (
+            persistence.get_channel_resource_version("channel_config", channel_id),
+            persistence.get_channel_resource_version("channel_identity", channel_id),
+        ),
+        _build,
     )
 
 
@@ -572,13 +775,15 @@ def _handle_get_agent_notes(handler: Any, query: dict[str, list[str]]) -> None:
     except ValueError as error:
         send_invalid_request(handler, str(error))
         return
-    handler._send_json(
-        {
+    _send_versioned_json(
+        handler,
+        f"agent-notes:{channel_id}",
+        (persistence.get_channel_resource_version("agent_notes", channel_id),),
+        lambda: {
             "ok": True,
             "mode": TWITCH_CHAT_MODE,
             "note": persistence.load_agent_notes_sync(channel_id),
         },
-        status_code=200,
     )
 
 
@@ -619,11 +824,68 @@ def _handle_get_hud_messages(handler: Any, query: dict[str, list[str]]) -> None:
     handler._send_json({"ok": True, "messages": messages}, status_code=200)
 
 
+def _resolve_stream_topics(query: dict[str, list[str]]) -> list[str]:
+    raw_topics = ",".join(str(item or "") for item in query.get("topics") or [])
+    return [topic.strip().lower() for topic in raw_topics.split(",") if topic.strip()]
+
+
+def open_dashboard_stream(
+    handler: Any, query: dict[str, list[str]]
+) -> tuple[StreamSubscription, list[StreamEvent]] | None:
+    """Assina o ``/api/stream``; responde 503 e devolve ``None`` se nao ha vaga."""
+    last_event_id = str(handler.headers.get("Last-Event-ID", "") or "").strip()
+    if not last_event_id:
+        last_event_id = str((query.get("last_event_id") or [""])[0] or "").strip()
+    subscription, initial = dashboard_stream.subscribe(
+        channel=_resolve_channel_id(query, required=False),
+        topics=_resolve_stream_topics(query) or None,
+        last_event_id=last_event_id,
+    )
+    if subscription is None:
+        handler._send_json(
+            {
+                "ok": False,
+                "error": "stream_busy",
+                "message": "Limite de clientes do stream atingido; use polling.",
+            },
+            status_code=503,
+        )
+        return None
+    return subscription, initial
+
+
+def _handle_get_stream(handler: Any, query: dict[str, list[str]]) -> None:
+    opened = open_dashboard_stream(handler, query)
+    if opened is None:
+        return
+    subscription, initial = opened
+    try:
+        handler._send_event_stream_headers()
+    except (ConnectionError, OSError):
+        dashboard_stream.unsubscribe(subscription)
+        return
+    dashboard_stream.pump(subscription, initial, handler._write_stream_chunk)
+
+
 def _handle_get_sentiment_scores(handler: Any, query: dict[str, list[str]]) -> None:
     channel_id = _resolve_channel_id(query, required=False)
     handler._send_json(build_sentiment_scores_payload(channel_id), status_code=200)
 
 
+def _handle_get_latency(handler: Any, query: dict[str, list[str]]) -> None:
+    channel_id = _resolve_channel_id(query, required=False, default="")
+    handler._send_json(build_latency_payload(channel_id), status_code=200)
+
+
+def _handle_get_metrics(handler: Any, _query: dict[str, list[str]]) -> None:
+    # Fora de ``/api/``: a autenticacao nao vem do ``handle_get``.
+    if not require_dashboard_auth(handler):
+        return
+    handler._send_bytes(
+        build_openmetrics_payload().encode("utf-8"), content_type=OPENMETRICS_CONTENT_TYPE
+    )
+
+
 def _handle_get_post_stream_report(handler: Any, query: dict[str, list[str]]) -> None:
     channel_id = _resolve_channel_id(query, required=False)
     generate = _resolve_bool_query_param(query, "generate", default=False)
@@ -724,19 +986,21 @@ def _handle_get_persona_profile(handler: Any, query: dict[str, list[str]]) -> No
     except ValueError as error:
         send_invalid_request(handler, str(error))
         return
-    profile = persistence.load_persona_profile_sync(channel_id)
-    handler._send_json(
-        {
+    _send_versioned_json(
+        handler,
+        f"persona-profile:{channel_id}",
+        (persistence.get_channel_resource_version("persona_profile", channel_id),),
+        lambda: {
             "ok": True,
             "mode": TWITCH_CHAT_MODE,
-            "profile": profile,
+            "profile": persistence.load_persona_profile_sync(channel_id),
         },
-        status_code=200,
     )
 
 
 _GET_ROUTE_HANDLERS: dict[str, Callable[[Any, dict[str, list[str]]], None]] = {
     "/api/observability": _handle_get_observability,
+    "/api/observability/batch": _handle_get_observability_batch,
     "/api/channel-context": _handle_get_channel_context,
     "/api/observability/history": _handle_get_observability_history,
     "/api/control-plane": _handle_get_control_plane,
@@ -745,8 +1009,10 @@ _GET_ROUTE_HANDLERS: dict[str, Callable[[Any, dict[str, list[str]]], None]] = {
     "/api/action-queue": _handle_get_action_queue,
     "/api/clip-jobs": _handle_get_clip_jobs,
     "/api/hud/messages": _handle_get_hud_messages,
+    "/api/stream": _handle_get_stream,
     "/api/sentiment/scores": _handle_get_sentiment_scores,
     "/api/observability/post-stream-report": _handle_get_post_stream_report,
+    "/api/observability/latency": _handle_get_latency,
     "/api/semantic-memory": _handle_get_semantic_memory,
     "/api/ops-playbooks": _handle_get_ops_playbooks,
     "/api/vision/status": _handle_get_vision_status,
@@ -754,6 +1020,7 @@ _GET_ROUTE_HANDLERS: dict[str, Callable[[Any, dict[str, list[str]]], None]] = {
     "/api/webhooks": _handle_get_webhooks,
     "/api/persona-profile": _handle_get_persona_profile,
     "/dashboard/config.js": _handle_get_dashboard_config,
+    "/metrics": _handle_get_metrics,
 }
 
 
@@ -1021,6 +1288,7 @@ __all__ = [
     "CHANNEL_CONTROL_IRC_ONLY_ACTIONS",
     "_dashboard_asset_route",
     "build_channel_context_payload",
+    "build_observability_batch_payload",
     "build_observability_history_payload",
     "build_observability_payload",
     "build_ops_playbooks_payload",
@@ -1,4 +1,7 @@
-from collections.abc import Callable
+import asyncio
+import logging
+import traceback
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from bot.autonomy_runtime import autonomy_runtime
@@ -38,14 +41,18 @@ def _handle_channel_control_post(handler: Any) -> None:
     try:
         response_payload, status_code = handler._handle_channel_control(payload)
     except ValueError as error:
-        handler._send_json(
-            {"ok": False, "error": "invalid_command", "message": str(error)},
-            status_code=400,
-        )
+        _send_invalid_command(handler, error)
         return
     handler._send_json(response_payload, status_code=status_code)
 
 
+def _send_invalid_command(handler: Any, error: ValueError) -> None:
+    handler._send_json(
+        {"ok": False, "error": "invalid_command", "message": str(error)},
+        status_code=400,
+    )
+
+
 def _handle_autonomy_tick(handler: Any) -> None:
     payload = require_auth_and_read_payload(handler, allow_empty=True)
     if payload is None:
@@ -290,26 +297,58 @@ def _handle_revenue_conversion(handler: Any) -> None:
         )
 
 
-def _handle_chat_send(handler: Any) -> None:
-    """Process a chat message through the full AI pipeline and return replies."""
+CHAT_SEND_TIMEOUT_SECONDS = 120.0
+_chat_logger = logging.getLogger("byte.cli_chat")
+
+
+def _read_chat_send_request(handler: Any) -> tuple[str, str | None] | None:
     payload = require_auth_and_read_payload(handler)
     if payload is None:
-        return
+        return None
 
     text = str(payload.get("text", "") or "").strip()
     if not text:
         send_invalid_request(handler, "text is required")
-        return
+        return None
 
     channel_id = str(payload.get("channel_id", "") or "").strip().lower() or None
+    return text, channel_id
+
+
+def _send_chat_send_result(
+    handler: Any, text: str, replies: list[str], error: Exception | None
+) -> None:
+    if error is not None:
+        _chat_logger.error("Chat send pipeline error: %s", error)
+        _chat_logger.error("".join(traceback.format_exception(error)))
+        handler._send_json(
+            {"ok": False, "error": "pipeline_error", "message": str(error)},
+            status_code=500,
+        )
+        return
+
+    handler._send_json(
+        {
+            "ok": True,
+            "text": text,
+            "replies": replies,
+            "reply_count": len(replies),
+            "mode": TWITCH_CHAT_MODE,
+        },
+        status_code=200,
+    )
 
-    import asyncio
-    import logging
+
+def _handle_chat_send(handler: Any) -> None:
+    """Process a chat message through the full AI pipeline and return replies."""
+    request = _read_chat_send_request(handler)
+    if request is None:
+        return
+    text, channel_id = request
 
     from bot.logic import context_manager
     from bot.prompt_runtime import handle_byte_prompt_text
 
-    logger = logging.getLogger("byte.cli_chat")
     replies: list[str] = []
 
     async def collect_reply(reply_text: str) -> None:
@@ -317,13 +356,14 @@ def _handle_chat_send(handler: Any) -> None:
 
     # Use the main loop if available to avoid loop-per-request overhead and background task crashes
     main_loop = getattr(context_manager, "_main_loop", None)
-    logger.info(
+    _chat_logger.info(
         "Chat request received: '%s' (channel=%s). Main loop running: %s",
         text,
         channel_id,
         bool(main_loop and main_loop.is_running()),
     )
 
+    error: Exception | None = None
     try:
         if main_loop and main_loop.is_running():
             future = asyncio.run_coroutine_threadsafe(
@@ -336,10 +376,12 @@ def _handle_chat_send(handler: Any) -> None:
                 main_loop,
             )
             # Wait for result with a generous timeout
-            future.result(timeout=120.0)
-            logger.info("Chat request success: '%s' -> %d replies", text, len(replies))
+            future.result(timeout=CHAT_SEND_TIMEOUT_SECONDS)
+            _chat_logger.info("Chat request success: '%s' -> %d replies", text, len(replies))
         else:
-            logger.warning("Main loop not found or not running. Falling back to temporary loop.")
+            _chat_logger.warning(
+                "Main loop not found or not running. Falling back to temporary loop."
+            )
             loop = asyncio.new_event_loop()
             try:
                 loop.run_until_complete(
@@ -353,27 +395,47 @@ def _handle_chat_send(handler: Any) -> None:
             finally:
                 # Close only temporary loops
                 loop.close()
-    except Exception as error:
-        logger.error("Chat send pipeline error: %s", error)
-        import traceback
+    except Exception as pipeline_error:
+        error = pipeline_error
+    _send_chat_send_result(handler, text, replies, error)
 
-        logger.error(traceback.format_exc())
-        handler._send_json(
-            {"ok": False, "error": "pipeline_error", "message": str(error)},
-            status_code=500,
+
+async def _handle_chat_send_async(handler: Any) -> None:
+    """Versao do servidor asyncio: ja roda no loop principal e aguarda o pipeline direto."""
+    request = _read_chat_send_request(handler)
+    if request is None:
+        return
+    text, channel_id = request
+
+    from bot.prompt_runtime import handle_byte_prompt_text
+
+    replies: list[str] = []
+
+    async def collect_reply(reply_text: str) -> None:
+        replies.append(reply_text)
+
+    error: Exception | None = None
+    try:
+        await asyncio.wait_for(
+            handle_byte_prompt_text(text, "cli_operator", collect_reply, channel_id=channel_id),
+            timeout=CHAT_SEND_TIMEOUT_SECONDS,
         )
+    except Exception as pipeline_error:
+        error = pipeline_error
+    _send_chat_send_result(handler, text, replies, error)
+
+
+async def _handle_channel_control_post_async(handler: Any) -> None:
+    payload = require_auth_and_read_payload(handler)
+    if payload is None:
         return
 
-    handler._send_json(
-        {
-            "ok": True,
-            "text": text,
-            "replies": replies,
-            "reply_count": len(replies),
-            "mode": TWITCH_CHAT_MODE,
-        },
-        status_code=200,
-    )
+    try:
+        response_payload, status_code = await handler._handle_channel_control_async(payload)
+    except ValueError as error:
+        _send_invalid_command(handler, error)
+        return
+    handler._send_json(response_payload, status_code=status_code)
 
 
 _POST_ROUTE_HANDLERS: dict[str, Callable[[Any], None]] = {
@@ -387,3 +449,9 @@ _POST_ROUTE_HANDLERS: dict[str, Callable[[Any], None]] = {
     "/api/webhooks/test": _handle_test_webhook,
     "/api/chat/send": _handle_chat_send,
 }
+
+# Substitutos awaitable usados pelo servidor asyncio; as demais rotas rodam em thread.
+_ASYNC_POST_ROUTE_HANDLERS: dict[str, Callable[[Any], Awaitable[None]]] = {
+    "/api/channel-control": _handle_channel_control_post_async,
+    "/api/chat/send": _handle_chat_send_async,
+}
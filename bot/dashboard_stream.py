@@ -0,0 +1,478 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger("byte.dashboard.stream")
+
+STREAM_ROUTE = "/api/stream"
+STREAM_TOPICS = ("observability", "hud", "action_queue", "clip_jobs")
+DEFAULT_SNAPSHOT_INTERVAL_SECONDS = 2.0
+MIN_SNAPSHOT_INTERVAL_SECONDS = 0.5
+STREAM_HISTORY_EVENTS = 512
+STREAM_CLIENT_BUFFER_EVENTS = 256
+STREAM_HEARTBEAT_SECONDS = 15.0
+# Conexoes longas sao recicladas; o EventSource reconecta com Last-Event-ID.
+STREAM_MAX_DURATION_SECONDS = 900.0
+STREAM_RETRY_MS = 3000
+MAX_STREAM_CLIENTS = 64
+HEARTBEAT_CHUNK = b": ping\n\n"
+
+SnapshotBuilder = Callable[[str], dict[str, Any]]
+
+
+def _resolve_snapshot_interval_seconds() -> float:
+    raw_value = os.environ.get("DASHBOARD_STREAM_SNAPSHOT_INTERVAL_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    if parsed <= 0.0:
+        return DEFAULT_SNAPSHOT_INTERVAL_SECONDS
+    return max(MIN_SNAPSHOT_INTERVAL_SECONDS, parsed)
+
+
+def _default_snapshot_builder(channel_id: str) -> dict[str, Any]:
+    from bot.dashboard_server_routes import build_observability_payload  # lazy: avoid circular
+
+    return build_observability_payload(channel_id)
+
+
+def merge_patch_diff(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """JSON Merge Patch (RFC 7386) que leva ``previous`` a ``current``.
+
+    Chaves removidas viram ``None``; listas sao trocadas inteiras.
+    """
+    patch: dict[str, Any] = {}
+    for key, value in current.items():
+        if key not in previous:
+            patch[key] = value
+            continue
+        old_value = previous[key]
+        if isinstance(old_value, dict) and isinstance(value, dict):
+            nested = merge_patch_diff(old_value, value)
+            if nested:
+                patch[key] = nested
+        elif old_value != value:
+            patch[key] = value
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+    return patch
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    event: str
+    topic: str
+    data: dict[str, Any]
+    # ``None``: evento sintetico por cliente (sem ``id:``, nao altera o Last-Event-ID).
+    seq: int | None = None
+    channel: str = ""
+
+
+class StreamSubscription:
+    """Buffer limitado de um cliente SSE; estourou, o cliente e ressincronizado."""
+
+    def __init__(self, *, channel: str, topics: frozenset[str], buffer_size: int) -> None:
+        self.channel = channel
+        self.topics = topics
+        self.overflowed = False
+        self._buffer_size = max(1, int(buffer_size))
+        self._events: deque[StreamEvent] = deque()
+        self._ready = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._async_ready: asyncio.Event | None = None
+
+    def wants(self, event: StreamEvent) -> bool:
+        if event.topic not in self.topics:
+            return False
+        return not event.channel or event.channel == self.channel
+
+    def _push_locked(self, event: StreamEvent) -> None:
+        if self.overflowed:
+            return
+        if len(self._events) >= self._buffer_size:
+            self._events.clear()
+            self.overflowed = True
+        else:
+            self._events.append(event)
+        self._notify()
+
+    def _notify(self) -> None:
+        self._ready.set()
+        loop, async_ready = self._loop, self._async_ready
+        if loop is None or async_ready is None:
+            return
+        try:
+            loop.call_soon_threadsafe(async_ready.set)
+        except RuntimeError:
+            pass
+
+    def _take_locked(self) -> list[StreamEvent]:
+        events = list(self._events)
+        self._events.clear()
+        self._ready.clear()
+        return events
+
+    def wait(self, timeout: float) -> bool:
+        return self._ready.wait(timeout)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._async_ready = asyncio.Event()
+        if self._ready.is_set():
+            self._async_ready.set()
+
+    async def wait_async(self, timeout: float) -> bool:
+        if self._async_ready is None:
+            self.bind_loop(asyncio.get_running_loop())
+        async_ready = self._async_ready
+        assert async_ready is not None
+        try:
+            await asyncio.wait_for(async_ready.wait(), timeout=timeout)
+        except TimeoutError:
+            return False
+        async_ready.clear()
+        return True
+
+
+class DashboardEventStream:
+    """Hub do ``/api/stream``: publica eventos do runtime para clientes SSE.
+
+    HUD, fila de acoes e jobs de clip publicam quando mudam. Os snapshots de
+    observabilidade sao montados uma vez por canal a cada
+    ``DASHBOARD_STREAM_SNAPSHOT_INTERVAL_SECONDS`` (thread propria, so enquanto
+    houver assinantes) e saem como JSON Merge Patch contra o anterior. Um
+    historico circular permite retomar pelo ``Last-Event-ID``; se a lacuna ja
+    saiu do historico, o cliente recebe ``hello`` com ``resumed=false`` e um
+    snapshot completo.
+    """
+
+    def __init__(
+        self,
+        *,
+        snapshot_builder: SnapshotBuilder | None = None,
+        snapshot_interval_seconds: float | None = None,
+        history_size: int = STREAM_HISTORY_EVENTS,
+        client_buffer_size: int = STREAM_CLIENT_BUFFER_EVENTS,
+        max_clients: int = MAX_STREAM_CLIENTS,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._snapshot_builder = snapshot_builder or _default_snapshot_builder
+        self._snapshot_interval_seconds = (
+            snapshot_interval_seconds or _resolve_snapshot_interval_seconds()
+        )
+        self._client_buffer_size = max(1, int(client_buffer_size))
+        self._max_clients = max(1, int(max_clients))
+        # Ids mudam a cada boot: um Last-Event-ID de outro processo nunca e retomado.
+        self._stream_id = format(int(time.time() * 1000), "x")
+        self._seq = 0
+        self._history: deque[StreamEvent] = deque(maxlen=max(1, int(history_size)))
+        self._subscriptions: set[StreamSubscription] = set()
+        self._baselines: dict[str, dict[str, Any]] = {}
+        self._ticker_running = False
+        self._published_total = 0
+        self._resumed_total = 0
+        self._resynced_total = 0
+        self._rejected_total = 0
+
+    def event_id(self, seq: int) -> str:
+        return f"{self._stream_id}-{seq}"
+
+    def _parse_last_event_id(self, raw_value: str) -> int | None:
+        stream_id, _, raw_seq = str(raw_value or "").strip().rpartition("-")
+        if stream_id != self._stream_id:
+            return None
+        try:
+            return int(raw_seq)
+        except ValueError:
+            return None
+
+    def _publish_locked(self, event: str, topic: str, data: dict[str, Any], channel: str) -> None:
+        self._seq += 1
+        entry = StreamEvent(event=event, topic=topic, data=data, seq=self._seq, channel=channel)
+        self._history.append(entry)
+        self._published_total += 1
+        for subscription in self._subscriptions:
+            if subscription.wants(entry):
+                subscription._push_locked(entry)
+
+    def publish(
+        self, topic: str, data: dict[str, Any], *, event: str = "", channel: str = ""
+    ) -> None:
+        with self._lock:
+            self._publish_locked(event or topic, topic, dict(data), channel)
+
+    def publish_snapshot(self, channel_id: str, payload: dict[str, Any]) -> bool:
+        with self._lock:
+            previous = self._baselines.get(channel_id)
+            self._baselines[channel_id] = payload
+            if previous is None:
+                self._publish_locked(
+                    "snapshot",
+                    "observability",
+                    {"channel": channel_id, "payload": payload},
+                    channel_id,
+                )
+                return True
+            patch = merge_patch_diff(previous, payload)
+            if not patch:
+                return False
+            self._publish_locked(
+                "observability",
+                "observability",
+                {"channel": channel_id, "patch": patch},
+                channel_id,
+            )
+            return True
+
+    def _observed_channels_locked(self) -> set[str]:
+        return {
+            subscription.channel
+            for subscription in self._subscriptions
+            if "observability" in subscription.topics
+        }
+
+    def tick(self) -> int:
+        with self._lock:
+            channels = self._observed_channels_locked()
+            for stale_channel in set(self._baselines) - channels:
+                self._baselines.pop(stale_channel, None)
+        published = 0
+        for channel_id in sorted(channels):
+            try:
+                payload = self._snapshot_builder(channel_id)
+            except Exception as error:
+                logger.error("Dashboard stream: falha no snapshot de %s: %s", channel_id, error)
+                continue
+            if self.publish_snapshot(channel_id, payload):
+                published += 1
+        return published
+
+    def _run_ticker(self) -> None:
+        while True:
+            time.sleep(self._snapshot_interval_seconds)
+            with self._lock:
+                if not self._observed_channels_locked():
+                    self._ticker_running = False
+                    self._baselines.clear()
+                    return
+            self.tick()
+
+    def _ensure_ticker_locked(self) -> None:
+        if self._ticker_running:
+            return
+        self._ticker_running = True
+        threading.Thread(
+            target=self._run_ticker, name="dashboard-stream-ticker", daemon=True
+        ).start()
+
+    def _resync_events_locked(
+        self, subscription: StreamSubscription, payload: dict[str, Any] | None, reason: str
+    ) -> list[StreamEvent]:
+        self._resynced_total += 1
+        events = [
+            StreamEvent(
+                event="hello",
+                topic="",
+                data={"resumed": False, "reason": reason, "stream_id": self._stream_id},
+            )
+        ]
+        if "observability" in subscription.topics and payload is not None:
+            baseline = self._baselines.setdefault(subscription.channel, payload)
+            events.append(
+                StreamEvent(
+                    event="snapshot",
+                    topic="observability",
+                    data={"channel": subscription.channel, "payload": baseline},
+                    seq=self._seq,
+                    channel=subscription.channel,
+                )
+            )
+        return events
+
+    def _baseline_or_build(self, subscription: StreamSubscription) -> dict[str, Any] | None:
+        if "observability" not in subscription.topics:
+            return None
+        with self._lock:
+            baseline = self._baselines.get(subscription.channel)
+        if baseline is not None:
+            return baseline
+        try:
+            return self._snapshot_builder(subscription.channel)
+        except Exception as error:
+            logger.error(
+                "Dashboard stream: falha no snapshot de %s: %s", subscription.channel, error
+            )
+            return None
+
+    def subscribe(
+        self,
+        *,
+        channel: str = "default",
+        topics: Iterable[str] | None = None,
+        last_event_id: str = "",
+    ) -> tuple[StreamSubscription | None, list[StreamEvent]]:
+        """Registra um cliente; devolve ``(None, [])`` quando o limite de clientes estourou."""
+        safe_topics = frozenset(
+            topic for topic in (topics or STREAM_TOPICS) if topic in STREAM_TOPICS
+        )
+        subscription = StreamSubscription(
+            channel=(channel or "default").strip().lower() or "default",
+            topics=safe_topics or frozenset(STREAM_TOPICS),
+            buffer_size=self._client_buffer_size,
+        )
+        resume_seq = self._parse_last_event_id(last_event_id)
+        with self._lock:
+            if len(self._subscriptions) >= self._max_clients:
+                self._rejected_total += 1
+                return None, []
+            oldest_seq = (self._history[0].seq or 0) if self._history else self._seq + 1
+            if resume_seq is not None and resume_seq <= self._seq and oldest_seq <= resume_seq + 1:
+                self._subscriptions.add(subscription)
+                if "observability" in subscription.topics:
+                    self._ensure_ticker_locked()
+                self._resumed_total += 1
+                replay = [
+                    event
+                    for event in self._history
+                    if event.seq is not None
+                    and event.seq > resume_seq
+                    and subscription.wants(event)
+                ]
+                hello = StreamEvent(
+                    event="hello",
+                    topic="",
+                    data={"resumed": True, "reason": "resume", "stream_id": self._stream_id},
+                )
+                return subscription, [hello, *replay]
+
+        payload = self._baseline_or_build(subscription)
+        reason = "gap" if last_event_id else "initial"
+        with self._lock:
+            if len(self._subscriptions) >= self._max_clients:
+                self._rejected_total += 1
+                return None, []
+            self._subscriptions.add(subscription)
+            if "observability" in subscription.topics:
+                self._ensure_ticker_locked()
+            return subscription, self._resync_events_locked(subscription, payload, reason)
+
+    def unsubscribe(self, subscription: StreamSubscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def drain(self, subscription: StreamSubscription) -> list[StreamEvent]:
+        with self._lock:
+            if not subscription.overflowed:
+                return subscription._take_locked()
+        payload = self._baseline_or_build(subscription)
+        with self._lock:
+            subscription._take_locked()
+            subscription.overflowed = False
+            return self._resync_events_locked(subscription, payload, "overflow")
+
+    def encode(self, event: StreamEvent) -> bytes:
+        lines = []
+        if event.seq is not None:
+            lines.append(f"id: {self.event_id(event.seq)}")
+        lines.append(f"event: {event.event}")
+        lines.append("data: " + json.dumps(event.data, ensure_ascii=False, separators=(",", ":")))
+        return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+    def _encode_all(self, events: list[StreamEvent]) -> bytes:
+        return b"".join(self.encode(event) for event in events)
+
+    def pump(
+        self,
+        subscription: StreamSubscription,
+        initial: list[StreamEvent],
+        write: Callable[[bytes], None],
+        *,
+        heartbeat_seconds: float = STREAM_HEARTBEAT_SECONDS,
+        max_duration_seconds: float = STREAM_MAX_DURATION_SECONDS,
+    ) -> None:
+        """Laco bloqueante do servidor com threads; termina quando o cliente cai."""
+        deadline = time.monotonic() + max_duration_seconds
+        try:
+            write(f"retry: {STREAM_RETRY_MS}\n\n".encode() + self._encode_all(initial))
+            while time.monotonic() < deadline:
+                if subscription.wait(heartbeat_seconds):
+                    chunk = self._encode_all(self.drain(subscription))
+                else:
+                    chunk = HEARTBEAT_CHUNK
+                if chunk:
+                    write(chunk)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.unsubscribe(subscription)
+
+    async def pump_async(
+        self,
+        subscription: StreamSubscription,
+        initial: list[StreamEvent],
+        writer: asyncio.StreamWriter,
+        *,
+        heartbeat_seconds: float = STREAM_HEARTBEAT_SECONDS,
+        max_duration_seconds: float = STREAM_MAX_DURATION_SECONDS,
+    ) -> None:
+        """Mesmo laco de ``pump`` no event loop, para o servidor asyncio."""
+        subscription.bind_loop(asyncio.get_running_loop())
+        deadline = time.monotonic() + max_duration_seconds
+        try:
+            writer.write(f"retry: {STREAM_RETRY_MS}\n\n".encode() + self._encode_all(initial))
+            await writer.drain()
+            while time.monotonic() < deadline:
+                if await subscription.wait_async(heartbeat_seconds):
+                    # Ressincronizar pode montar snapshot (I/O): fica fora do loop.
+                    events = (
+                        await asyncio.to_thread(self.drain, subscription)
+                        if subscription.overflowed
+                        else self.drain(subscription)
+                    )
+                    chunk = self._encode_all(events)
+                else:
+                    chunk = HEARTBEAT_CHUNK
+                if chunk:
+                    writer.write(chunk)
+                    await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.unsubscribe(subscription)
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._subscriptions),
+                "max_clients": self._max_clients,
+                "last_event_id": self.event_id(self._seq),
+                "history": len(self._history),
+                "published_total": self._published_total,
+                "resumed_total": self._resumed_total,
+                "resynced_total": self._resynced_total,
+                "rejected_total": self._rejected_total,
+                "snapshot_channels": sorted(self._baselines),
+                "ticker_running": self._ticker_running,
+            }
+
+
+dashboard_stream = DashboardEventStream()
+
+__all__ = [
+    "STREAM_ROUTE",
+    "STREAM_TOPICS",
+    "DashboardEventStream",
+    "StreamEvent",
+    "StreamSubscription",
+    "dashboard_stream",
+    "merge_patch_diff",
+]
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger("byte.event_loop")
+
+DEFAULT_LAG_SAMPLE_INTERVAL_SECONDS = 0.5
+MIN_LAG_SAMPLE_INTERVAL_SECONDS = 0.05
+
+
+def _resolve_interval_seconds() -> float:
+    raw_value = os.environ.get("EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    if parsed <= 0.0:
+        return DEFAULT_LAG_SAMPLE_INTERVAL_SECONDS
+    return max(MIN_LAG_SAMPLE_INTERVAL_SECONDS, parsed)
+
+
+class EventLoopLagMonitor:
+    """Mede o atraso do event loop principal: quanto um ``sleep`` acorda depois do previsto.
+
+    Cada amostra vira gauge (ultimo/maximo) e entra nos sketches de latencia
+    como ``event_loop/main``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running = False
+        self._samples_total = 0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+
+    def record_sample(self, lag_ms: float) -> None:
+        from bot.observability import observability  # lazy: avoid circular
+
+        safe_lag_ms = max(0.0, float(lag_ms))
+        with self._lock:
+            self._samples_total += 1
+            self._last_lag_ms = round(safe_lag_ms, 3)
+            self._max_lag_ms = max(self._max_lag_ms, self._last_lag_ms)
+        observability.record_latency(operation="event_loop", name="main", latency_ms=safe_lag_ms)
+
+    async def start_loop(self, interval_seconds: float | None = None) -> None:
+        safe_interval = interval_seconds or _resolve_interval_seconds()
+        with self._lock:
+            self._running = True
+        try:
+            while True:
+                expected_at = time.perf_counter() + safe_interval
+                await asyncio.sleep(safe_interval)
+                try:
+                    self.record_sample((time.perf_counter() - expected_at) * 1000)
+                except Exception as error:
+                    logger.error("Event loop lag monitor falhou: %s", error)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            with self._lock:
+                self._running = False
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "samples_total": self._samples_total,
+                "last_lag_ms": self._last_lag_ms,
+                "max_lag_ms": self._max_lag_ms,
+            }
+
+
+event_loop_monitor = EventLoopLagMonitor()
+
+__all__ = ["EventLoopLagMonitor", "event_loop_monitor"]
@@ -3,6 +3,8 @@ import time
 from collections import deque
 from typing import Any
 
+from bot.dashboard_stream import dashboard_stream
+
 MAX_HUD_MESSAGES = 20
 HUD_MESSAGE_TTL_SECONDS = 600.0  # 10 minutos
 
@@ -26,6 +28,7 @@ class HudRuntime:
         }
         with self._lock:
             self._messages.append(entry)
+        dashboard_stream.publish("hud", entry)
         return {"ok": True, "entry": entry}
 
     def get_messages(self, since: float = 0.0) -> list[dict[str, Any]]:
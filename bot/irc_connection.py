@@ -35,8 +35,17 @@ class IrcConnectionMixin:
     async def _send_raw(self, line: str) -> None:
         if self.writer is None:
             raise RuntimeError("Conexao IRC nao inicializada.")
+        started_at = time.perf_counter()
         self.writer.write(f"{line}\r\n".encode())
         await self.writer.drain()
+        command, _, rest = line.partition(" ")
+        target = rest.split(" ", 1)[0]
+        observability.record_latency(
+            operation="irc_send",
+            name=command,
+            latency_ms=(time.perf_counter() - started_at) * 1000,
+            channel_id=target[1:] if target.startswith("#") else None,
+        )
 
     async def _await_login_confirmation(self, timeout_seconds: float = 15.0) -> None:
         deadline = time.monotonic() + timeout_seconds
@@ -1,6 +1,8 @@
 import asyncio
+import os
 import threading
 import time
+from concurrent.futures import Future
 from datetime import UTC, datetime
 from typing import Any, Optional
 
@@ -16,6 +18,19 @@ from bot.logic_constants import (
     SYSTEM_INSTRUCTION_TEMPLATE,
 )
 
+DEFAULT_CHANNEL_RESTORE_DEADLINE_SECONDS = 2.0
+
+
+def _resolve_restore_deadline_seconds() -> float:
+    raw_value = os.environ.get("CHANNEL_RESTORE_DEADLINE_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    if parsed <= 0.0:
+        return DEFAULT_CHANNEL_RESTORE_DEADLINE_SECONDS
+    return parsed
+
 
 def normalize_memory_excerpt(text: str, max_length: int = MAX_RECENT_CHAT_PREVIEW_CHARS) -> str:
     compact = " ".join((text or "").split())
@@ -63,6 +78,9 @@ class StreamContext:
         self.last_byte_reply = ""
         self.start_time = time.time()
         self.last_activity = time.time()
+        # Time-to-ready: da criacao ate o estado persistido aplicado (None = restaurando).
+        self.created_monotonic = time.monotonic()
+        self.ready_ms: float | None = None
 
     def get_uptime_minutes(self) -> int:
         return int((time.time() - self.start_time) / 60)
@@ -172,6 +190,18 @@ class ContextManager:
         self._contexts: dict[str, StreamContext] = {}
         self._lock = threading.Lock()
         self._main_loop: asyncio.AbstractEventLoop | None = None
+        # Restauracoes pendentes sao drenadas juntas: varios canais novos no mesmo
+        # tick (boot, raid, dashboard) dividem as queries ``in (...)``.
+        self._pending_restores: dict[str, StreamContext] = {}
+        self._restore_flush_scheduled = False
+        self._restore_batches_total = 0
+        self._restored_channels_total = 0
+        self._last_restore_batch_size = 0
+        # Single-flight: uma restauracao em voo por canal; lazy load, prefetch e o
+        # caminho do prompt esperam o mesmo Future (resolvido com o ready_ms).
+        self._restores: dict[str, Future[float]] = {}
+        self._restore_deadline_seconds = _resolve_restore_deadline_seconds()
+        self._restore_timeouts_total = 0
 
     def set_main_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """Injeta o loop principal para suportar chamadas via Dashboard (síncrono)."""
@@ -198,62 +228,222 @@ class ContextManager:
             return ctx
 
     def _trigger_lazy_load(self, channel_id: str, ctx: StreamContext) -> None:
-        """Inicia a restauração do banco sem bloquear a thread principal."""
+        """Enfileira a restauracao do banco sem bloquear a thread principal.
+
+        Chamado com ``self._lock`` seguro; o flush roda no event loop.
+        """
         from bot.persistence_layer import persistence
 
         if not persistence.is_enabled:
+            ctx.ready_ms = 0.0
             return
-
-        async def _load_task():
-            state = await persistence.load_channel_state(channel_id)
-            if state:
-                ctx.current_game = state.get("current_game", ctx.current_game)
-                ctx.stream_vibe = state.get("stream_vibe", ctx.stream_vibe)
-                ctx.style_profile = state.get("style_profile", ctx.style_profile)
-                ctx.live_observability = state.get("observability", ctx.live_observability)
-                ctx.last_byte_reply = state.get("last_reply", ctx.last_byte_reply)
-
-            history = await persistence.load_recent_history(channel_id)
-            if history:
-                ctx.recent_chat_entries = history
-
-            channel_config = await persistence.load_channel_config(channel_id)
-            ctx.inference_temperature = channel_config.get("temperature")
-            ctx.inference_top_p = channel_config.get("top_p")
-            ctx.channel_paused = bool(channel_config.get("agent_paused", False))
-
-            agent_notes = await persistence.load_agent_notes(channel_id)
-            ctx.agent_notes = str(agent_notes.get("notes") or "")
-
-            channel_identity = await persistence.load_channel_identity(channel_id)
-            ctx.persona_name = str(channel_identity.get("persona_name") or "")
-            ctx.persona_tone = str(channel_identity.get("tone") or "")
-            ctx.persona_emote_vocab = list(channel_identity.get("emote_vocab") or [])
-            ctx.persona_lore = str(channel_identity.get("lore") or "")
-
-            persona_profile = await persistence.load_persona_profile(channel_id)
-            if persona_profile.get("has_profile"):
-                base = persona_profile.get("base_identity") or {}
-                tonality = persona_profile.get("tonality_engine") or {}
-                constraints = persona_profile.get("behavioral_constraints") or {}
-                routing = persona_profile.get("model_routing") or {}
-                ctx.persona_name = str(base.get("name") or "") or ctx.persona_name
-                ctx.persona_lore = str(base.get("lore") or "") or ctx.persona_lore
-                ctx.persona_tone = str(tonality.get("tone") or "") or ctx.persona_tone
-                vocab = list(tonality.get("emote_vocab") or [])
-                ctx.persona_emote_vocab = vocab or ctx.persona_emote_vocab
-                ctx.persona_sentence_style = str(tonality.get("sentence_style") or "")
-                ctx.persona_banned_topics = list(constraints.get("banned_topics") or [])
-                ctx.persona_cta_triggers = list(constraints.get("cta_triggers") or [])
-                ctx.channel_model_routing = dict(routing)
-            ctx.channel_config_loaded = True
-
+        self._schedule_restore_locked(channel_id, ctx)
+
+    def _schedule_restore_locked(self, channel_id: str, ctx: StreamContext) -> Future[float]:
+        """Future da restauracao do canal; cria e enfileira so se nao houver uma em voo."""
+        future = self._restores.get(channel_id)
+        if future is not None:
+            return future
+        future = Future()
+        self._restores[channel_id] = future
+        self._pending_restores[channel_id] = ctx
+        if self._restore_flush_scheduled:
+            return future
         try:
             loop = asyncio.get_running_loop()
-            loop.create_task(_load_task())
+            loop.create_task(self._flush_pending_restores())
         except RuntimeError:
-            if self._main_loop and self._main_loop.is_running():
-                asyncio.run_coroutine_threadsafe(_load_task(), self._main_loop)
+            if not (self._main_loop and self._main_loop.is_running()):
+                # Sem loop ainda: fica pendente para o proximo flush ou prefetch.
+                return future
+            asyncio.run_coroutine_threadsafe(self._flush_pending_restores(), self._main_loop)
+        self._restore_flush_scheduled = True
+        return future
+
+    async def _flush_pending_restores(self) -> None:
+        # Um tick de folga para juntar os get() que chegam em sequencia.
+        await asyncio.sleep(0)
+        with self._lock:
+            pending = self._pending_restores
+            self._pending_restores = {}
+            self._restore_flush_scheduled = False
+        if pending:
+            await self._restore_contexts(pending)
+
+    async def _restore_contexts(self, pending: dict[str, StreamContext]) -> dict[str, float]:
+        """Aplica o estado persistido em varios contextos; devolve o time-to-ready (ms)."""
+        from bot.persistence_layer import persistence
+
+        channel_ids = list(pending)
+        bundles: dict[str, Any] = {}
+        try:
+            if len(channel_ids) == 1:
+                # As seis leituras saem juntas, fora do loop, com prazo unico.
+                bundles = {channel_ids[0]: await persistence.load_channel_bundle(channel_ids[0])}
+            else:
+                # Uma query ``in (...)`` por tabela para o lote inteiro.
+                bundles = await persistence.load_channel_bundles(channel_ids)
+        except Exception as error:
+            from bot.runtime_config import logger
+
+            # Os Futures resolvem mesmo assim: quem espera segue com os padroes.
+            logger.error("Restauracao de %d canais falhou: %s", len(channel_ids), error)
+        return self._finish_restores(pending, bundles)
+
+    def _finish_restores(
+        self, pending: dict[str, StreamContext], bundles: dict[str, Any]
+    ) -> dict[str, float]:
+        finished = time.monotonic()
+        ready: dict[str, float] = {}
+        for channel_id, ctx in pending.items():
+            bundle = bundles.get(channel_id)
+            if bundle is not None:
+                self._apply_bundle(ctx, bundle)
+            ctx.ready_ms = round((finished - ctx.created_monotonic) * 1000, 2)
+            ready[channel_id] = ctx.ready_ms
+        with self._lock:
+            self._restore_batches_total += 1
+            self._restored_channels_total += len(pending)
+            self._last_restore_batch_size = len(pending)
+            futures = [self._restores.pop(channel_id, None) for channel_id in pending]
+        for channel_id, future in zip(pending, futures, strict=True):
+            if future is not None and not future.done():
+                future.set_result(ready[channel_id])
+        return ready
+
+    async def prefetch(self, channel_ids: list[str]) -> dict[str, float]:
+        """Cria e restaura de uma vez os contextos dos canais (boot).
+
+        Canal que ja esta na RAM fica de fora. Devolve o time-to-ready por canal.
+        """
+        from bot.persistence_layer import persistence
+
+        pending: dict[str, StreamContext] = {}
+        ready: dict[str, float] = {}
+        with self._lock:
+            for channel_id in channel_ids:
+                key = str(channel_id or "").strip().lower()
+                if not key or key in self._contexts:
+                    continue
+                ctx = StreamContext()
+                ctx.channel_id = key
+                self._contexts[key] = ctx
+                if not persistence.is_enabled:
+                    ctx.ready_ms = ready[key] = 0.0
+                    continue
+                self._restores[key] = Future()
+                pending[key] = ctx
+            # Restauracoes enfileiradas sem loop (antes do boot) entram no mesmo lote.
+            pending.update(self._pending_restores)
+            self._pending_restores = {}
+        if pending:
+            ready.update(await self._restore_contexts(pending))
+        return ready
+
+    def get_restore_status(self) -> dict[str, Any]:
+        with self._lock:
+            ready_ms = {
+                key: ctx.ready_ms for key, ctx in self._contexts.items() if ctx.ready_ms is not None
+            }
+            restoring = sorted(key for key, ctx in self._contexts.items() if ctx.ready_ms is None)
+            return {
+                "batches_total": self._restore_batches_total,
+                "channels_restored_total": self._restored_channels_total,
+                "last_batch_size": self._last_restore_batch_size,
+                "restoring_channels": restoring,
+                "ready_ms": ready_ms,
+                "max_ready_ms": max(ready_ms.values(), default=0.0),
+                "in_flight": len(self._restores),
+                "deadline_seconds": self._restore_deadline_seconds,
+                "timeouts_total": self._restore_timeouts_total,
+            }
+
+    async def ensure_channel_ready(
+        self,
+        channel_id: str | None = None,
+        *,
+        deadline_seconds: float | None = None,
+    ) -> StreamContext:
+        """Espera a restauracao do canal sem bloquear o loop (caminho do prompt).
+
+        Entra na restauracao ja em voo (lazy load ou prefetch) em vez de repetir
+        as queries. Passado o prazo, devolve o contexto com os padroes; a
+        restauracao continua e preenche o contexto quando terminar.
+        """
+        from bot.persistence_layer import persistence
+
+        key = (channel_id or "default").strip().lower() or "default"
+        ctx = self.get(key)
+        if ctx.channel_config_loaded:
+            return ctx
+        with self._lock:
+            future = self._restores.get(key)
+            if future is None:
+                if not persistence.is_enabled:
+                    ctx.channel_config_loaded = True
+                    return ctx
+                future = self._schedule_restore_locked(key, ctx)
+
+        deadline = self._restore_deadline_seconds if deadline_seconds is None else deadline_seconds
+        try:
+            # ``shield``: o prazo estourado nao cancela a restauracao compartilhada.
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout=max(0.0, deadline)
+            )
+        except TimeoutError:
+            from bot.runtime_config import logger
+
+            with self._lock:
+                self._restore_timeouts_total += 1
+            logger.warning(
+                "Restauracao de %s passou do prazo (%.1fs); seguindo com os padroes.",
+                key,
+                deadline,
+            )
+        return ctx
+
+    @staticmethod
+    def _apply_bundle(ctx: StreamContext, bundle: Any) -> None:
+        state = bundle.state
+        if state:
+            ctx.current_game = state.get("current_game", ctx.current_game)
+            ctx.stream_vibe = state.get("stream_vibe", ctx.stream_vibe)
+            ctx.style_profile = state.get("style_profile", ctx.style_profile)
+            ctx.live_observability = state.get("observability", ctx.live_observability)
+            ctx.last_byte_reply = state.get("last_reply", ctx.last_byte_reply)
+
+        if bundle.history:
+            ctx.recent_chat_entries = list(bundle.history)
+
+        channel_config = bundle.channel_config
+        ctx.inference_temperature = channel_config.get("temperature")
+        ctx.inference_top_p = channel_config.get("top_p")
+        ctx.channel_paused = bool(channel_config.get("agent_paused", False))
+
+        ctx.agent_notes = str(bundle.agent_notes.get("notes") or "")
+
+        channel_identity = bundle.channel_identity
+        ctx.persona_name = str(channel_identity.get("persona_name") or "")
+        ctx.persona_tone = str(channel_identity.get("tone") or "")
+        ctx.persona_emote_vocab = list(channel_identity.get("emote_vocab") or [])
+        ctx.persona_lore = str(channel_identity.get("lore") or "")
+
+        persona_profile = bundle.persona_profile
+        if persona_profile.get("has_profile"):
+            base = persona_profile.get("base_identity") or {}
+            tonality = persona_profile.get("tonality_engine") or {}
+            constraints = persona_profile.get("behavioral_constraints") or {}
+            routing = persona_profile.get("model_routing") or {}
+            ctx.persona_name = str(base.get("name") or "") or ctx.persona_name
+            ctx.persona_lore = str(base.get("lore") or "") or ctx.persona_lore
+            ctx.persona_tone = str(tonality.get("tone") or "") or ctx.persona_tone
+            vocab = list(tonality.get("emote_vocab") or [])
+            ctx.persona_emote_vocab = vocab or ctx.persona_emote_vocab
+            ctx.persona_sentence_style = str(tonality.get("sentence_style") or "")
+            ctx.persona_banned_topics = list(constraints.get("banned_topics") or [])
+            ctx.persona_cta_triggers = list(constraints.get("cta_triggers") or [])
+            ctx.channel_model_routing = dict(routing)
+        ctx.channel_config_loaded = True
 
     def get_sync(self, channel_id: str | None = None) -> StreamContext:
         """Alias para get() - mantém compatibilidade."""
@@ -278,6 +468,10 @@ class ContextManager:
         ctx.channel_config_loaded = True
 
     def ensure_channel_config_loaded(self, channel_id: str | None = None) -> StreamContext:
+        """Versao sincrona para threads (dashboard); no event loop use ``ensure_channel_ready``.
+
+        Tambem e single-flight: entra na restauracao em voo ou assume uma nova.
+        """
         key = (channel_id or "default").strip().lower() or "default"
         ctx = self.get(key)
         if bool(getattr(ctx, "channel_config_loaded", False)):
@@ -289,29 +483,33 @@ class ContextManager:
             ctx.channel_config_loaded = True
             return ctx
 
-        channel_config = persistence.load_channel_config_sync(key)
-        self.apply_channel_config(
-            key,
-            temperature=channel_config.get("temperature"),
-            top_p=channel_config.get("top_p"),
-            agent_paused=bool(channel_config.get("agent_paused", False)),
-        )
-        channel_identity = persistence.load_channel_identity_sync(key)
-        self.apply_channel_identity(
-            key,
-            persona_name=str(channel_identity.get("persona_name") or ""),
-            tone=str(channel_identity.get("tone") or ""),
-            emote_vocab=list(channel_identity.get("emote_vocab") or []),
-            lore=str(channel_identity.get("lore") or ""),
-        )
-        persona_profile = persistence.load_persona_profile_sync(key)
-        self.apply_persona_profile(
-            key,
-            base_identity=persona_profile.get("base_identity"),
-            tonality_engine=persona_profile.get("tonality_engine"),
-            behavioral_constraints=persona_profile.get("behavioral_constraints"),
-            model_routing=persona_profile.get("model_routing"),
-        )
+        with self._lock:
+            future = self._restores.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._restores[key] = future
+        if not owner:
+            try:
+                asyncio.get_running_loop()
+                # Na thread do loop esperar o Future travaria quem vai resolve-lo.
+                return ctx
+            except RuntimeError:
+                pass
+            try:
+                future.result(timeout=self._restore_deadline_seconds)
+            except TimeoutError:
+                with self._lock:
+                    self._restore_timeouts_total += 1
+            return ctx
+
+        bundles: dict[str, Any] = {}
+        try:
+            bundles[key] = persistence.load_channel_bundle_sync(
+                key, deadline_seconds=self._restore_deadline_seconds
+            )
+        finally:
+            self._finish_restores({key: ctx}, bundles)
         return ctx
 
     def apply_agent_notes(self, channel_id: str, *, notes: str) -> None:
@@ -381,9 +579,13 @@ class ContextManager:
 
     async def cleanup(self, channel_id: str) -> None:
         """Remove contexto da RAM (Async para manter assinatura onde esperado)."""
+        from bot.persistence_layer import persistence
+
         key = channel_id.strip().lower()
         with self._lock:
             self._contexts.pop(key, None)
+        # Canal que volta depois le config/notas/persona frescos do banco.
+        persistence.invalidate_channel_caches(key)
 
     async def purge_expired(self, max_age_seconds: float = 7200) -> int:
         """Remove contextos da RAM que não tiveram atividade recente."""
@@ -396,10 +598,15 @@ class ContextManager:
             ]
             for key in expired_keys:
                 self._contexts.pop(key, None)
-            return len(expired_keys)
+        from bot.persistence_layer import persistence
+
+        for key in expired_keys:
+            persistence.invalidate_channel_caches(key)
+        return len(expired_keys)
 
     async def start_cleanup_loop(self, interval_seconds: int = 1800) -> None:
         """Loop de background para limpeza periódica de memória."""
+        from bot.observability import observability
         from bot.sentiment_engine import sentiment_engine
 
         while True:
@@ -407,10 +614,14 @@ class ContextManager:
                 await asyncio.sleep(interval_seconds)
                 purged_ctx = await self.purge_expired()
                 purged_sent = sentiment_engine.cleanup_inactive()
-                if purged_ctx > 0 or purged_sent > 0:
+                # Arquivar escopos grava no Supabase: fora do event loop.
+                purged_obs = await asyncio.to_thread(observability.evict_idle_scopes)
+                if purged_ctx > 0 or purged_sent > 0 or purged_obs > 0:
                     from bot.runtime_config import logger
 
-                    logger.info("Cleanup: %d ctx, %d sent", purged_ctx, purged_sent)
+                    logger.info(
+                        "Cleanup: %d ctx, %d sent, %d obs", purged_ctx, purged_sent, purged_obs
+                    )
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from typing import Any, Literal, Optional, overload
 
 from bot.logic_constants import (
@@ -126,7 +127,13 @@ async def _fetch_search_results(
     search_results: list[Any] = []
     if enable_grounding:
         search_query = _extract_search_query(user_msg)
+        started_at = time.perf_counter()
         search_results = await search_web(search_query)
+        observability.record_latency(
+            operation="web_search",
+            name="duckduckgo",
+            latency_ms=(time.perf_counter() - started_at) * 1000,
+        )
 
     grounding_metadata = _build_grounding_metadata(search_results, enabled=enable_grounding)
     return search_results, grounding_metadata
@@ -332,7 +339,17 @@ async def _execute_inference_with_retry(
         return False
 
     async def _execute_and_record(*args: Any, **kwargs: Any) -> Any:
-        response = await _execute_inference(*args, **kwargs)
+        started_at = time.perf_counter()
+        try:
+            response = await _execute_inference(*args, **kwargs)
+        finally:
+            # Cada tentativa conta, inclusive timeouts: e a cauda que interessa.
+            observability.record_latency(
+                operation="llm",
+                name=model,
+                latency_ms=(time.perf_counter() - started_at) * 1000,
+                channel_id=channel_id,
+            )
         _record_token_usage(response, channel_id=channel_id)
         return response
 
@@ -6,6 +6,7 @@ from bot.bootstrap_runtime import (
     run_eventsub_mode,
     run_irc_mode,
 )
+from bot.dashboard_async_server import resolve_dashboard_server_mode
 from bot.dashboard_server import run_server
 from bot.observability import observability
 from bot.runtime_config import (
@@ -46,8 +47,12 @@ def main() -> None:
         # Não mata o processo aqui para tentarmos ver o stack trace no log do HF
 
     start_heartbeat()
-    logger.info("Starting Dashboard Server thread...")
-    threading.Thread(target=run_server, daemon=True).start()
+    if resolve_dashboard_server_mode() == "threaded":
+        logger.info("Starting Dashboard Server thread...")
+        threading.Thread(target=run_server, daemon=True).start()
+    else:
+        # Modo asyncio: o servidor sobe no loop principal, dentro do bootstrap.
+        logger.info("Dashboard Server will run on the main event loop (asyncio mode).")
 
     try:
         if TWITCH_CHAT_MODE == "irc":
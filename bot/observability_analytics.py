@@ -1,59 +1,40 @@
-from collections import Counter
 from typing import Any
 
 from bot.observability_helpers import (
     LEADERBOARD_LIMIT,
     percentage,
 )
+from bot.observability_rolling import WINDOW_60M_SECONDS, ObservabilityWindows
+from bot.observability_sketches import SpaceSavingTopK, WindowedTopK
 
 
-def compute_chat_metrics(
-    chat_events: list[dict[str, Any]],
-    now: float,
-) -> dict[str, Any]:
-    cutoff_10m = now - 600
-    cutoff_60m = now - 3600
-
-    events_10m = [e for e in chat_events if float(e.get("ts", 0.0)) >= cutoff_10m]
-    events_60m = [e for e in chat_events if float(e.get("ts", 0.0)) >= cutoff_60m]
+def _average_length(count: int, total_length: float) -> float:
+    return round(total_length / count, 1) if count else 0.0
 
-    count_10m = len(events_10m)
-    count_60m = len(events_60m)
 
-    avg_len_10m = (
-        round(sum(int(e.get("length", 0)) for e in events_10m) / count_10m, 1) if count_10m else 0.0
-    )
-    avg_len_60m = (
-        round(sum(int(e.get("length", 0)) for e in events_60m) / count_60m, 1) if count_60m else 0.0
-    )
-
-    command_60m = sum(1 for e in events_60m if bool(e.get("is_command", False)))
-    url_60m = sum(1 for e in events_60m if bool(e.get("has_url", False)))
+def compute_chat_metrics(windows: ObservabilityWindows) -> dict[str, Any]:
+    count_10m = int(windows.chat_10m.total("count"))
+    count_60m = int(windows.chat_60m.total("count"))
+    command_60m = int(windows.chat_60m.total("commands"))
+    url_60m = int(windows.chat_60m.total("urls"))
 
     return {
         "messages_10m": count_10m,
         "messages_60m": count_60m,
         "messages_per_minute_10m": round(count_10m / 10, 2),
         "messages_per_minute_60m": round(count_60m / 60, 2),
-        "avg_message_length_10m": avg_len_10m,
-        "avg_message_length_60m": avg_len_60m,
+        "avg_message_length_10m": _average_length(count_10m, windows.chat_10m.total("length")),
+        "avg_message_length_60m": _average_length(count_60m, windows.chat_60m.total("length")),
         "prefixed_commands_60m": command_60m,
         "prefixed_command_ratio_60m": percentage(command_60m, count_60m),
         "url_messages_60m": url_60m,
         "url_ratio_60m": percentage(url_60m, count_60m),
-        "events_60m": events_60m,  # return for further processing (e.g. source counts)
     }
 
 
-def compute_interaction_metrics(
-    interaction_events: list[dict[str, Any]],
-    now: float,
-) -> dict[str, Any]:
-    cutoff_60m = now - 3600
-    events_60m = [e for e in interaction_events if float(e.get("ts", 0.0)) >= cutoff_60m]
-
-    llm_60m = sum(1 for e in events_60m if bool(e.get("is_llm", False)))
-    useful_60m = sum(1 for e in events_60m if bool(e.get("is_useful_llm", False)))
+def compute_interaction_metrics(windows: ObservabilityWindows) -> dict[str, Any]:
+    llm_60m = int(windows.interactions_60m.total("llm"))
+    useful_60m = int(windows.interactions_60m.total("useful_llm"))
 
     return {
         "llm_interactions_60m": llm_60m,
@@ -63,20 +44,13 @@ def compute_interaction_metrics(
 
 
 def compute_quality_metrics(
-    quality_events: list[dict[str, Any]],
+    windows: ObservabilityWindows,
     llm_interactions_60m: int,
-    now: float,
 ) -> dict[str, Any]:
-    cutoff_60m = now - 3600
-    events_60m = [e for e in quality_events if float(e.get("ts", 0.0)) >= cutoff_60m]
-
-    retry_60m = sum(1 for e in events_60m if str(e.get("outcome", "")).strip().lower() == "retry")
-    success_60m = sum(
-        1 for e in events_60m if str(e.get("outcome", "")).strip().lower() == "retry_success"
-    )
-    fallback_60m = sum(
-        1 for e in events_60m if str(e.get("outcome", "")).strip().lower() == "fallback"
-    )
+    outcomes = windows.quality_60m.group("outcomes")
+    retry_60m = int(outcomes.get("retry", 0))
+    success_60m = int(outcomes.get("retry_success", 0))
+    fallback_60m = int(outcomes.get("fallback", 0))
 
     return {
         "quality_retry_60m": retry_60m,
@@ -87,35 +61,19 @@ def compute_quality_metrics(
     }
 
 
-def compute_token_metrics(
-    token_usage_events: list[dict[str, Any]],
-    now: float,
-) -> dict[str, Any]:
-    cutoff_60m = now - 3600
-    events_60m = [e for e in token_usage_events if float(e.get("ts", 0.0)) >= cutoff_60m]
-
-    input_60m = sum(max(0, int(e.get("input_tokens", 0) or 0)) for e in events_60m)
-    output_60m = sum(max(0, int(e.get("output_tokens", 0) or 0)) for e in events_60m)
-    cost_60m = sum(max(0.0, float(e.get("estimated_cost_usd", 0.0) or 0.0)) for e in events_60m)
-
+def compute_token_metrics(windows: ObservabilityWindows) -> dict[str, Any]:
+    window = windows.tokens_60m
     return {
-        "token_input_60m": input_60m,
-        "token_output_60m": output_60m,
-        "estimated_cost_usd_60m": cost_60m,
+        "token_input_60m": int(window.total("input_tokens")),
+        "token_output_60m": int(window.total("output_tokens")),
+        # Soma incremental de floats: arredonda para nao expor residuo de subtracao.
+        "estimated_cost_usd_60m": round(max(0.0, float(window.total("cost_usd"))), 6),
     }
 
 
-def compute_autonomy_metrics(
-    autonomy_events: list[dict[str, Any]],
-    now: float,
-) -> dict[str, Any]:
-    cutoff_60m = now - 3600
-    events_60m = [e for e in autonomy_events if float(e.get("ts", 0.0)) >= cutoff_60m]
-
-    total_60m = len(events_60m)
-    ignored_60m = sum(
-        1 for e in events_60m if str(e.get("outcome", "")).strip().lower() == "ignored"
-    )
+def compute_autonomy_metrics(windows: ObservabilityWindows) -> dict[str, Any]:
+    total_60m = int(windows.autonomy_60m.total("count"))
+    ignored_60m = int(windows.autonomy_60m.group("outcomes").get("ignored", 0))
 
     return {
         "autonomy_goals_60m": total_60m,
@@ -124,41 +82,35 @@ def compute_autonomy_metrics(
     }
 
 
+def compute_source_counts(windows: ObservabilityWindows) -> dict[str, int]:
+    source_counts = windows.chat_60m.group("sources")
+    return {
+        "irc": int(source_counts.get("irc", 0)),
+        "eventsub": int(source_counts.get("eventsub", 0)),
+        "unknown": int(source_counts.get("unknown", 0)),
+    }
+
+
 def compute_leaderboards(
-    chat_events_60m: list[dict[str, Any]],
-    trigger_events_60m: list[dict[str, Any]],
-    chatter_totals: dict[str, int],
-    trigger_totals: dict[str, int],
+    now: float,
+    *,
+    chatter_totals: SpaceSavingTopK,
+    trigger_totals: SpaceSavingTopK,
+    chatter_window: WindowedTopK,
+    trigger_window: WindowedTopK,
 ) -> dict[str, Any]:
-    chatters_60m: Counter[str] = Counter()
-    source_counts_60m: Counter[str] = Counter()
-
-    for e in chat_events_60m:
-        author = str(e.get("author", "") or "").strip().lower()
-        source = str(e.get("source", "unknown") or "unknown")
-        if author:
-            chatters_60m[author] += 1
-        source_counts_60m[source] += 1
-
-    triggers_60m: Counter[str] = Counter()
-    for e in trigger_events_60m:
-        author = str(e.get("author", "") or "").strip().lower()
-        if author:
-            triggers_60m[author] += 1
-
+    since = now - WINDOW_60M_SECONDS
     top_chatters_60m = [
-        {"author": a, "messages": c} for a, c in chatters_60m.most_common(LEADERBOARD_LIMIT)
+        {"author": a, "messages": c} for a, c in chatter_window.top(LEADERBOARD_LIMIT, since)
     ]
     top_chatters_total = [
-        {"author": a, "messages": c}
-        for a, c in Counter(chatter_totals).most_common(LEADERBOARD_LIMIT)
+        {"author": a, "messages": c} for a, c in chatter_totals.top(LEADERBOARD_LIMIT)
     ]
     top_triggers_60m = [
-        {"author": a, "triggers": c} for a, c in triggers_60m.most_common(LEADERBOARD_LIMIT)
+        {"author": a, "triggers": c} for a, c in trigger_window.top(LEADERBOARD_LIMIT, since)
     ]
     top_triggers_total = [
-        {"author": a, "triggers": c}
-        for a, c in Counter(trigger_totals).most_common(LEADERBOARD_LIMIT)
+        {"author": a, "triggers": c} for a, c in trigger_totals.top(LEADERBOARD_LIMIT)
     ]
 
     return {
@@ -166,5 +118,4 @@ def compute_leaderboards(
         "top_chatters_total": top_chatters_total,
         "top_trigger_users_60m": top_triggers_60m,
         "top_trigger_users_total": top_triggers_total,
-        "source_counts_60m": source_counts_60m,
     }
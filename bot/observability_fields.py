@@ -0,0 +1,110 @@
+from collections.abc import Iterable
+
+from bot.observability_snapshot import SNAPSHOT_SECTIONS
+
+# Blocos calculados fora do snapshot do escopo (globais ou com efeito colateral).
+RUNTIME_FIELDS = ("persistence", "capabilities", "autonomy", "coaching")
+OBSERVABILITY_FIELDS = (*SNAPSHOT_SECTIONS, *RUNTIME_FIELDS)
+# Resumo por canal da visao multi-canal: sem timeline, ranking e eventos.
+BATCH_DEFAULT_FIELDS = frozenset(
+    {
+        "metrics",
+        "chatters",
+        "chat_analytics",
+        "agent_outcomes",
+        "context",
+        "latency",
+        "sentiment",
+        "stream_health",
+    }
+)
+# Recortes nomeados para ``view=``; ``full`` mantem o payload completo.
+OBSERVABILITY_VIEWS: dict[str, frozenset[str] | None] = {
+    "full": None,
+    "summary": BATCH_DEFAULT_FIELDS,
+    "compact": frozenset({"bot", "metrics", "chatters", "stream_health", "recent_events"}),
+}
+# O coaching le estes blocos do snapshot (``build_viewer_churn_payload``).
+_COACHING_SECTIONS = frozenset(
+    {"chat_analytics", "chatters", "agent_outcomes", "sentiment", "stream_health"}
+)
+MAX_BATCH_CHANNELS = 64
+
+
+def parse_observability_fields(
+    raw_values: Iterable[str],
+    *,
+    default: frozenset[str],
+) -> frozenset[str]:
+    """``fields=a,b`` (repetivel) -> conjunto validado; vazio usa ``default``."""
+    names = [
+        name.strip().lower()
+        for raw_value in raw_values
+        for name in str(raw_value or "").split(",")
+        if name.strip()
+    ]
+    if not names:
+        return default
+    unknown = sorted({name for name in names if name not in OBSERVABILITY_FIELDS})
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}.")
+    return frozenset(names)
+
+
+def parse_observability_selection(
+    query: dict[str, list[str]],
+    *,
+    default: frozenset[str] | None = None,
+) -> frozenset[str] | None:
+    """Resolve ``fields=``/``view=`` da query; ``fields`` tem precedencia.
+
+    ``None`` significa payload completo (``view=full`` ou nada pedido com
+    ``default=None``).
+    """
+    fields = parse_observability_fields(query.get("fields") or [], default=frozenset())
+    if fields:
+        return fields
+    view = str((query.get("view") or [""])[0] or "").strip().lower()
+    if not view:
+        return default
+    if view not in OBSERVABILITY_VIEWS:
+        raise ValueError(f"View desconhecida: {view}.")
+    return OBSERVABILITY_VIEWS[view]
+
+
+def resolve_snapshot_sections(fields: frozenset[str]) -> frozenset[str]:
+    """Blocos do snapshot a calcular para entregar ``fields``."""
+    sections = {name for name in fields if name in SNAPSHOT_SECTIONS}
+    if "coaching" in fields:
+        sections |= _COACHING_SECTIONS
+    return frozenset(sections)
+
+
+def parse_channel_list(raw_values: Iterable[str]) -> list[str] | None:
+    """``channels=a,b`` normalizado e sem repeticao; ``None`` pede os canais ativos."""
+    channels: list[str] = []
+    for raw_value in raw_values:
+        for name in str(raw_value or "").split(","):
+            channel_id = name.strip().lower()
+            if channel_id == "*":
+                return None
+            if channel_id and channel_id not in channels:
+                channels.append(channel_id)
+    if not channels:
+        return None
+    if len(channels) > MAX_BATCH_CHANNELS:
+        raise ValueError(f"Maximo de {MAX_BATCH_CHANNELS} canais por requisicao.")
+    return channels
+
+
+__all__ = [
+    "BATCH_DEFAULT_FIELDS",
+    "MAX_BATCH_CHANNELS",
+    "OBSERVABILITY_FIELDS",
+    "OBSERVABILITY_VIEWS",
+    "RUNTIME_FIELDS",
+    "parse_channel_list",
+    "parse_observability_fields",
+    "parse_observability_selection",
+    "resolve_snapshot_sections",
+]
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger("byte.observability")
+
+MIN_FLUSH_WAIT_SECONDS = 1.0
+
+
+class ObservabilityFlusher:
+    """Thread de background que persiste o estado de observability.
+
+    ``flush`` captura o estado sob o lock do ObservabilityState e faz o upload
+    fora dele; deve devolver ``None`` quando nao ha nada pendente ou um dict com
+    ``ok`` e ``dirty_since`` (monotonic da primeira mudanca nao persistida).
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], dict[str, Any] | None],
+        *,
+        interval_seconds: float,
+    ) -> None:
+        self._flush = flush
+        self._interval_seconds = max(0.0, float(interval_seconds))
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._flushes_total = 0
+        self._failures_total = 0
+        self._last_flush_at = 0.0
+        self._last_duration_ms = 0.0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+        self._last_channels = 0
+        self._last_kind = ""
+        self._last_bytes = 0
+        self._bytes_total = 0
+
+    def request(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._stats_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stop.clear()
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="observability-flusher",
+                        daemon=True,
+                    )
+                    self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        wait_seconds = max(MIN_FLUSH_WAIT_SECONDS, self._interval_seconds)
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=wait_seconds)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.run_once()
+            except Exception as error:
+                logger.error("Observability flusher falhou: %s", error)
+
+    def run_once(self) -> bool:
+        with self._run_lock:
+            started = time.monotonic()
+            result = self._flush()
+            if result is None:
+                return False
+            finished = time.monotonic()
+            ok = bool(result.get("ok"))
+            dirty_since = float(result.get("dirty_since") or started)
+            lag_ms = max(0.0, (finished - dirty_since) * 1000)
+            with self._stats_lock:
+                self._last_duration_ms = round((finished - started) * 1000, 2)
+                if ok:
+                    self._flushes_total += 1
+                    self._last_flush_at = time.time()
+                    self._last_lag_ms = round(lag_ms, 2)
+                    self._max_lag_ms = max(self._max_lag_ms, self._last_lag_ms)
+                    self._last_channels = int(result.get("channels") or 0)
+                    self._last_kind = str(result.get("kind") or "")
+                    self._last_bytes = int(result.get("bytes") or 0)
+                    self._bytes_total += self._last_bytes
+                else:
+                    self._failures_total += 1
+            return ok
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+        self.run_once()
+
+    def get_status(self, *, dirty_since: float | None = None) -> dict[str, Any]:
+        pending_lag_ms = 0.0
+        if dirty_since is not None:
+            pending_lag_ms = round(max(0.0, time.monotonic() - dirty_since) * 1000, 2)
+        with self._stats_lock:
+            return {
+                "running": bool(self._thread is not None and self._thread.is_alive()),
+                "flushes_total": self._flushes_total,
+                "failures_total": self._failures_total,
+                "last_flush_at": self._last_flush_at,
+                "last_flush_duration_ms": self._last_duration_ms,
+                "last_flush_channels": self._last_channels,
+                "last_lag_ms": self._last_lag_ms,
+                "max_lag_ms": self._max_lag_ms,
+                "pending_lag_ms": pending_lag_ms,
+                "last_persist_kind": self._last_kind,
+                "last_persist_bytes": self._last_bytes,
+                "persist_bytes_total": self._bytes_total,
+            }
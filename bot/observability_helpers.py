@@ -2,14 +2,66 @@ from datetime import UTC, datetime
 
 TIMELINE_RETENTION_MINUTES = 180
 TIMELINE_WINDOW_MINUTES = 30
+TIMELINE_RING_CAPACITY = TIMELINE_RETENTION_MINUTES + 1
 EVENT_LOG_MAX_ITEMS = 120
 LATENCY_WINDOW_MAX_ITEMS = 300
 CHAT_EVENTS_RETENTION_SECONDS = 6 * 3600
 BYTE_TRIGGER_EVENTS_RETENTION_SECONDS = 6 * 3600
+CHATTER_LAST_SEEN_RETENTION_SECONDS = 86400
 CHAT_EVENTS_MAX_ITEMS = 30_000
 BYTE_TRIGGER_EVENTS_MAX_ITEMS = 12_000
 LEADERBOARD_LIMIT = 8
 
+CHAT_EVENT_FIELDS = (
+    ("ts", "float"),
+    ("source", "symbol"),
+    ("author", "symbol"),
+    ("length", "int"),
+    ("is_command", "bool"),
+    ("has_url", "bool"),
+)
+BYTE_TRIGGER_EVENT_FIELDS = (("ts", "float"), ("author", "symbol"), ("source", "symbol"))
+INTERACTION_EVENT_FIELDS = (
+    ("ts", "float"),
+    ("route", "symbol"),
+    ("is_llm", "bool"),
+    ("is_useful_llm", "bool"),
+)
+QUALITY_EVENT_FIELDS = (("ts", "float"), ("outcome", "symbol"), ("reason", "symbol"))
+TOKEN_USAGE_EVENT_FIELDS = (
+    ("ts", "float"),
+    ("input_tokens", "int"),
+    ("output_tokens", "int"),
+    ("estimated_cost_usd", "float"),
+)
+AUTONOMY_GOAL_EVENT_FIELDS = (("ts", "float"), ("risk", "symbol"), ("outcome", "symbol"))
+
+# atributo do escopo -> (chave serializada, campos, capacidade)
+EVENT_LOG_SPECS = {
+    "_chat_events": ("chat_events", CHAT_EVENT_FIELDS, CHAT_EVENTS_MAX_ITEMS),
+    "_byte_trigger_events": (
+        "byte_trigger_events",
+        BYTE_TRIGGER_EVENT_FIELDS,
+        BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+    ),
+    "_interaction_events": (
+        "interaction_events",
+        INTERACTION_EVENT_FIELDS,
+        BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+    ),
+    "_quality_events": ("quality_events", QUALITY_EVENT_FIELDS, BYTE_TRIGGER_EVENTS_MAX_ITEMS),
+    "_token_usage_events": (
+        "token_usage_events",
+        TOKEN_USAGE_EVENT_FIELDS,
+        BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+    ),
+    "_autonomy_goal_events": (
+        "autonomy_goal_events",
+        AUTONOMY_GOAL_EVENT_FIELDS,
+        BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+    ),
+}
+
 
 def utc_iso(timestamp: float) -> str:
     return (
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+from typing import Any
+
+from bot.observability_sketches import WindowedQuantileSketch
+
+LATENCY_WINDOWS = (("1m", 60.0), ("10m", 600.0), ("60m", 3600.0))
+LATENCY_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+LATENCY_MAX_SERIES = 64
+LATENCY_OVERFLOW_NAME = "other"
+# Limites (ms) dos buckets cumulativos expostos em ``/metrics``; o ultimo e ``+Inf``.
+LATENCY_HISTOGRAM_BOUNDS_MS = (
+    1.0,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+    30000.0,
+    60000.0,
+)
+
+
+def _normalize_label(value: str | None, *, fallback: str) -> str:
+    normalized = str(value or "").strip().lower()[:64]
+    return normalized or fallback
+
+
+class LatencyHistogram:
+    """Histograma cumulativo desde o boot com limites fixos, barato de exportar."""
+
+    __slots__ = ("_counts", "count", "total")
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(LATENCY_HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        self._counts[bisect_left(LATENCY_HISTOGRAM_BOUNDS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+
+    def cumulative(self) -> list[int]:
+        """Contagem acumulada por limite, na ordem de ``LATENCY_HISTOGRAM_BOUNDS_MS`` + ``+Inf``."""
+        running = 0
+        cumulative: list[int] = []
+        for bucket_count in self._counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative
+
+
+class LatencyRegistry:
+    """Sketches de latencia por ``(operacao, nome)`` de um escopo.
+
+    Operacoes usadas hoje: ``llm`` (por modelo), ``persistence`` (por tabela),
+    ``web_search``, ``irc_send`` (por comando) e ``route`` (rota do prompt).
+    Series alem de ``LATENCY_MAX_SERIES`` caem em ``other`` da operacao.
+    """
+
+    __slots__ = ("_histograms", "_series")
+
+    def __init__(self) -> None:
+        self._series: dict[tuple[str, str], WindowedQuantileSketch] = {}
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def record(self, operation: str, name: str, latency_ms: float, now: float) -> None:
+        key = (
+            _normalize_label(operation, fallback="unknown"),
+            _normalize_label(name, fallback="unknown"),
+        )
+        sketch = self._series.get(key)
+        if sketch is None:
+            if len(self._series) >= LATENCY_MAX_SERIES:
+                key = (key[0], LATENCY_OVERFLOW_NAME)
+                sketch = self._series.get(key)
+            if sketch is None:
+                sketch = WindowedQuantileSketch()
+                self._series[key] = sketch
+                self._histograms[key] = LatencyHistogram()
+        safe_latency_ms = max(0.0, float(latency_ms))
+        sketch.add(safe_latency_ms, now)
+        self._histograms[key].add(safe_latency_ms)
+
+    def series(self) -> list[tuple[tuple[str, str], WindowedQuantileSketch]]:
+        return sorted(self._series.items())
+
+    def histograms(self) -> list[dict[str, Any]]:
+        """Copia dos histogramas cumulativos, pronta para exportar fora do lock."""
+        return [
+            {
+                "operation": operation,
+                "name": name,
+                "buckets": histogram.cumulative(),
+                "count": histogram.count,
+                "sum_ms": histogram.total,
+            }
+            for (operation, name), histogram in sorted(self._histograms.items())
+        ]
+
+    def summary(self, now: float) -> dict[str, dict[str, dict[str, dict[str, Any]]]]:
+        """``{operacao: {nome: {janela: {count, p50, p90, p99, p999, max}}}}``."""
+        quantiles = [value for _, value in LATENCY_QUANTILES]
+        summary: dict[str, dict[str, dict[str, dict[str, Any]]]] = {}
+        for (operation, name), sketch in self.series():
+            windows: dict[str, dict[str, Any]] = {}
+            for label, span_seconds in LATENCY_WINDOWS:
+                merged = sketch.window(span_seconds, now)
+                stats: dict[str, Any] = {"count": merged.count}
+                for (quantile_label, _), value in zip(
+                    LATENCY_QUANTILES, merged.quantiles(quantiles), strict=True
+                ):
+                    stats[quantile_label] = round(value, 2)
+                stats["max"] = round(merged.max, 2)
+                windows[label] = stats
+            summary.setdefault(operation, {})[name] = windows
+        return summary
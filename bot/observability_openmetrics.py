@@ -0,0 +1,253 @@
+from collections.abc import Iterable
+from typing import Any
+
+from bot.observability_latency import LATENCY_HISTOGRAM_BOUNDS_MS
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Rotulo do agregado global (soma de todos os canais); nao colide com logins da Twitch.
+GLOBAL_CHANNEL_LABEL = "_all"
+
+_SCOPE_COUNTERS = (
+    ("byte_chat_messages", "chat_messages_total", "Mensagens de chat recebidas."),
+    ("byte_triggers", "byte_triggers_total", "Mensagens que acionaram o Byte."),
+    ("byte_replies", "replies_total", "Respostas enviadas pelo Byte."),
+    ("byte_errors", "errors_total", "Erros registrados pela observabilidade."),
+)
+_SCOPE_WINDOWS = (
+    ("byte_chat_messages_window", "chat_messages", "Mensagens de chat na janela movel."),
+    ("byte_triggers_window", "byte_triggers", "Acionamentos do Byte na janela movel."),
+)
+_LE_LABELS = [_bound / 1000 for _bound in LATENCY_HISTOGRAM_BOUNDS_MS]
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float | int) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _sample(name: str, labels: Iterable[tuple[str, Any]], value: float | int) -> str:
+    rendered = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels)
+    if rendered:
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Exposition:
+    __slots__ = ("lines",)
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str, unit: str = "") -> None:
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        if unit:
+            self.lines.append(f"# UNIT {name} {unit}")
+        self.lines.append(f"# HELP {name} {help_text}")
+
+    def sample(self, name: str, labels: Iterable[tuple[str, Any]], value: float | int) -> None:
+        self.lines.append(_sample(name, labels, value))
+
+
+def _iter_scopes(metrics: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    scopes = [(GLOBAL_CHANNEL_LABEL, dict(metrics.get("global") or {}))]
+    channels = dict(metrics.get("channels") or {})
+    scopes.extend((channel_id, dict(channels[channel_id])) for channel_id in sorted(channels))
+    return scopes
+
+
+def _render_scopes(out: _Exposition, scopes: list[tuple[str, dict[str, Any]]]) -> None:
+    for family, counter_key, help_text in _SCOPE_COUNTERS:
+        out.family(family, "counter", help_text)
+        for channel_id, scope in scopes:
+            counters = scope.get("counters") or {}
+            out.sample(
+                f"{family}_total", (("channel", channel_id),), int(counters.get(counter_key, 0))
+            )
+
+    out.family("byte_llm_tokens", "counter", "Tokens consumidos pelo LLM.")
+    for channel_id, scope in scopes:
+        counters = scope.get("counters") or {}
+        for direction in ("input", "output"):
+            out.sample(
+                "byte_llm_tokens_total",
+                (("channel", channel_id), ("direction", direction)),
+                int(counters.get(f"token_{direction}_total", 0)),
+            )
+
+    out.family("byte_llm_cost_usd", "counter", "Custo estimado do LLM em dolares.")
+    for channel_id, scope in scopes:
+        out.sample(
+            "byte_llm_cost_usd_total",
+            (("channel", channel_id),),
+            float(scope.get("estimated_cost_usd_total", 0.0)),
+        )
+
+    for family, window_key, help_text in _SCOPE_WINDOWS:
+        out.family(family, "gauge", help_text)
+        for channel_id, scope in scopes:
+            windows = scope.get("windows") or {}
+            for window in ("10m", "60m"):
+                out.sample(
+                    family,
+                    (("channel", channel_id), ("window", window)),
+                    int(windows.get(f"{window_key}_{window}", 0)),
+                )
+
+
+def _render_latency(out: _Exposition, histograms: list[dict[str, Any]]) -> None:
+    family = "byte_operation_latency_seconds"
+    out.family(
+        family,
+        "histogram",
+        "Latencia por operacao (llm, persistence, web_search, irc_send, route, event_loop).",
+        unit="seconds",
+    )
+    for histogram in histograms:
+        labels = (("operation", histogram["operation"]), ("name", histogram["name"]))
+        buckets = list(histogram["buckets"])
+        for le_label, cumulative in zip(_LE_LABELS, buckets, strict=False):
+            out.sample(f"{family}_bucket", (*labels, ("le", le_label)), int(cumulative))
+        out.sample(f"{family}_bucket", (*labels, ("le", "+Inf")), int(histogram["count"]))
+        out.sample(f"{family}_count", labels, int(histogram["count"]))
+        out.sample(f"{family}_sum", labels, float(histogram["sum_ms"]) / 1000)
+
+
+def _render_queues(out: _Exposition, queues: dict[str, dict[str, int]]) -> None:
+    out.family("byte_queue_depth", "gauge", "Itens por fila e status.")
+    for queue_name in sorted(queues):
+        statuses = queues[queue_name]
+        for status in sorted(statuses):
+            out.sample(
+                "byte_queue_depth",
+                (("queue", queue_name), ("status", status)),
+                int(statuses[status]),
+            )
+
+
+def _render_persistence(out: _Exposition, persistence: dict[str, Any]) -> None:
+    flusher = dict(persistence.get("flusher") or {})
+    out.family("byte_persistence_dirty", "gauge", "1 se ha agregados ainda nao persistidos.")
+    out.sample("byte_persistence_dirty", (), bool(persistence.get("dirty")))
+    out.family(
+        "byte_persistence_pending_lag_seconds",
+        "gauge",
+        "Tempo desde a primeira mudanca ainda nao persistida.",
+        unit="seconds",
+    )
+    out.sample(
+        "byte_persistence_pending_lag_seconds",
+        (),
+        float(flusher.get("pending_lag_ms", 0.0)) / 1000,
+    )
+    out.family("byte_persistence_flushes", "counter", "Flushes do rollup de observabilidade.")
+    out.sample("byte_persistence_flushes_total", (), int(flusher.get("flushes_total", 0)))
+    out.family("byte_persistence_flush_failures", "counter", "Flushes que falharam.")
+    out.sample("byte_persistence_flush_failures_total", (), int(flusher.get("failures_total", 0)))
+
+
+def _render_event_loop(out: _Exposition, event_loop: dict[str, Any]) -> None:
+    out.family(
+        "byte_event_loop_lag_seconds",
+        "gauge",
+        "Atraso do event loop principal (ultima amostra e maximo).",
+        unit="seconds",
+    )
+    for stat in ("last", "max"):
+        out.sample(
+            "byte_event_loop_lag_seconds",
+            (("stat", stat),),
+            float(event_loop.get(f"{stat}_lag_ms", 0.0)) / 1000,
+        )
+
+
+def _render_http_responses(out: _Exposition, http_responses: dict[str, Any]) -> None:
+    out.family("byte_dashboard_json_responses", "counter", "Respostas JSON GET do dashboard.")
+    out.sample(
+        "byte_dashboard_json_responses_total",
+        (("result", "not_modified"),),
+        int(http_responses.get("not_modified_total", 0)),
+    )
+    out.sample(
+        "byte_dashboard_json_responses_total",
+        (("result", "compressed"),),
+        int(http_responses.get("compressed_total", 0)),
+    )
+    out.sample(
+        "byte_dashboard_json_responses_total",
+        (("result", "all"),),
+        int(http_responses.get("responses_total", 0)),
+    )
+    out.family(
+        "byte_dashboard_json_bytes",
+        "counter",
+        "Bytes de JSON: sem compressao vs enviados.",
+        unit="bytes",
+    )
+    out.sample(
+        "byte_dashboard_json_bytes_total",
+        (("kind", "identity"),),
+        int(http_responses.get("identity_bytes_total", 0)),
+    )
+    out.sample(
+        "byte_dashboard_json_bytes_total",
+        (("kind", "sent"),),
+        int(http_responses.get("sent_bytes_total", 0)),
+    )
+
+
+def _render_rate_limit(out: _Exposition, rate_limit: dict[str, Any]) -> None:
+    out.family(
+        "byte_dashboard_rate_limited", "counter", "Requisicoes recusadas com 429 por orcamento."
+    )
+    throttled = dict(rate_limit.get("throttled_by_budget") or {})
+    for budget in sorted(throttled):
+        out.sample(
+            "byte_dashboard_rate_limited_total", (("budget", budget),), int(throttled[budget])
+        )
+    out.family("byte_dashboard_rate_limit_clients", "gauge", "Clientes rastreados pelo limitador.")
+    out.sample("byte_dashboard_rate_limit_clients", (), int(rate_limit.get("tracked_clients", 0)))
+    out.family(
+        "byte_dashboard_rate_limit_evictions", "counter", "Clientes ociosos despejados (LRU)."
+    )
+    out.sample(
+        "byte_dashboard_rate_limit_evictions_total", (), int(rate_limit.get("evicted_total", 0))
+    )
+
+
+def render_openmetrics(
+    metrics: dict[str, Any],
+    *,
+    queues: dict[str, dict[str, int]] | None = None,
+    event_loop: dict[str, Any] | None = None,
+    http_responses: dict[str, Any] | None = None,
+    rate_limit: dict[str, Any] | None = None,
+) -> str:
+    """Renderiza ``ObservabilityState.export_metrics()`` no formato texto do OpenMetrics.
+
+    Contadores e gauges de escopo saem por canal, com ``channel="_all"`` para o
+    agregado global; o histograma de latencia so sai do global para nao
+    multiplicar series por canal.
+    """
+    out = _Exposition()
+    out.family("byte_uptime_seconds", "gauge", "Tempo desde o boot.", unit="seconds")
+    out.sample("byte_uptime_seconds", (), float(metrics.get("uptime_seconds", 0.0)))
+    _render_scopes(out, _iter_scopes(metrics))
+    _render_latency(out, list(metrics.get("latency") or []))
+    if queues:
+        _render_queues(out, queues)
+    _render_persistence(out, dict(metrics.get("persistence") or {}))
+    if event_loop is not None:
+        _render_event_loop(out, event_loop)
+    if http_responses is not None:
+        _render_http_responses(out, http_responses)
+    if rate_limit is not None:
+        _render_rate_limit(out, rate_limit)
+    out.lines.append("# EOF")
+    return "\n".join(out.lines) + "\n"
@@ -0,0 +1,117 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from bot.observability_analytics import (
+    compute_chat_metrics,
+    compute_interaction_metrics,
+    compute_quality_metrics,
+)
+from bot.observability_helpers import TIMELINE_WINDOW_MINUTES, compute_p95
+from bot.observability_rolling import WINDOW_10M_SECONDS, WINDOW_60M_SECONDS
+from bot.stream_health_score import build_stream_health_score
+
+
+@dataclass
+class MetricQuery:
+    scope: Any
+    now: float
+    started_at: float
+    channel_id: str
+    _sentiment: dict[str, Any] | None = field(default=None, repr=False)
+
+    @property
+    def sentiment(self) -> dict[str, Any]:
+        if self._sentiment is None:
+            from bot.observability_snapshot import _build_sentiment_block  # lazy: avoid circular
+
+            self._sentiment = _build_sentiment_block(self.channel_id)
+        return self._sentiment
+
+
+def _window_total(window_name: str, key: str) -> Callable[[MetricQuery], int]:
+    def _read(query: MetricQuery) -> int:
+        return int(getattr(query.scope._windows, window_name).total(key))
+
+    return _read
+
+
+def _counter(key: str) -> Callable[[MetricQuery], int]:
+    def _read(query: MetricQuery) -> int:
+        return int(query.scope._counters.get(key, 0))
+
+    return _read
+
+
+def _active_chatters(span_seconds: float) -> Callable[[MetricQuery], int]:
+    def _read(query: MetricQuery) -> int:
+        return query.scope._chatter_last_seen.count_since(query.now - span_seconds)
+
+    return _read
+
+
+def _avg_latency_ms(query: MetricQuery) -> float:
+    latencies = query.scope._latencies_ms
+    return round(sum(latencies) / len(latencies), 1) if latencies else 0.0
+
+
+def _timeline_errors(query: MetricQuery) -> int:
+    now_minute = int(query.now // 60)
+    buckets = query.scope._minute_buckets
+    return sum(
+        int((buckets.get(minute_key) or {}).get("errors", 0))
+        for minute_key in range(now_minute - TIMELINE_WINDOW_MINUTES + 1, now_minute + 1)
+    )
+
+
+def _stream_health(query: MetricQuery) -> dict[str, Any]:
+    # Mesmo score do snapshot, alimentado so pelos agregados que ele consome.
+    windows = query.scope._windows
+    chat_analytics = compute_chat_metrics(windows)
+    chat_analytics["byte_triggers_60m"] = int(windows.triggers_60m.total("count"))
+    agent_outcomes = compute_interaction_metrics(windows)
+    agent_outcomes.update(compute_quality_metrics(windows, agent_outcomes["llm_interactions_60m"]))
+    return build_stream_health_score(
+        sentiment=query.sentiment,
+        chat_analytics=chat_analytics,
+        agent_outcomes=agent_outcomes,
+        timeline=[{"errors": _timeline_errors(query)}],
+    )
+
+
+METRIC_READERS: dict[str, Callable[[MetricQuery], Any]] = {
+    "messages_10m": _window_total("chat_10m", "count"),
+    "messages_60m": _window_total("chat_60m", "count"),
+    "byte_triggers_10m": _window_total("triggers_10m", "count"),
+    "byte_triggers_60m": _window_total("triggers_60m", "count"),
+    "llm_interactions_60m": _window_total("interactions_60m", "llm"),
+    "active_chatters_10m": _active_chatters(WINDOW_10M_SECONDS),
+    "active_chatters_60m": _active_chatters(WINDOW_60M_SECONDS),
+    "unique_chatters_total": lambda query: query.scope._chatter_sketch.count(),
+    "unique_chatters_60m_estimate": lambda query: query.scope._chatter_window_sketch.count_since(
+        query.now - WINDOW_60M_SECONDS
+    ),
+    "chat_messages_total": _counter("chat_messages_total"),
+    "byte_triggers_total": _counter("byte_triggers_total"),
+    "replies_total": _counter("replies_total"),
+    "errors_total": _counter("errors_total"),
+    "avg_latency_ms": _avg_latency_ms,
+    "p95_latency_ms": lambda query: compute_p95(list(query.scope._latencies_ms)),
+    "errors_30m": _timeline_errors,
+    "uptime_minutes": lambda query: max(0, int((query.now - query.started_at) / 60)),
+    "sentiment": lambda query: dict(query.sentiment),
+    "stream_health": _stream_health,
+    "latency": lambda query: query.scope._latency.summary(query.now),
+}
+
+
+def validate_metric_names(names: Iterable[str]) -> list[str]:
+    safe_names = [str(name) for name in names]
+    unknown = [name for name in safe_names if name not in METRIC_READERS]
+    if unknown:
+        raise ValueError(f"Metricas desconhecidas: {', '.join(unknown)}.")
+    return safe_names
+
+
+def read_metrics_locked(query: MetricQuery, names: list[str]) -> dict[str, Any]:
+    return {name: METRIC_READERS[name](query) for name in names}
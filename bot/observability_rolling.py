@@ -0,0 +1,111 @@
+from collections.abc import Iterable
+from typing import Any
+
+from bot.observability_helpers import EVENT_LOG_SPECS
+from bot.observability_structures import ColumnarEventLog, RollingWindow
+
+WINDOW_10M_SECONDS = 600.0
+WINDOW_60M_SECONDS = 3600.0
+
+
+def new_event_log(attribute: str, events: Iterable[Any] = ()) -> ColumnarEventLog:
+    _, fields, capacity = EVENT_LOG_SPECS[attribute]
+    return ColumnarEventLog.from_events(fields, capacity, events)
+
+
+def _normalized_outcome(event: dict[str, Any]) -> str:
+    return str(event.get("outcome", "")).strip().lower()
+
+
+def _apply_count(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    window.bump("count", sign)
+
+
+def _apply_chat_volume(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    window.bump("count", sign)
+    window.bump("length", sign * int(event.get("length", 0)))
+
+
+def _apply_chat_detail(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    _apply_chat_volume(window, event, sign)
+    if bool(event.get("is_command", False)):
+        window.bump("commands", sign)
+    if bool(event.get("has_url", False)):
+        window.bump("urls", sign)
+    window.tally("sources", str(event.get("source", "unknown") or "unknown"), sign)
+
+
+def _apply_interaction(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    window.bump("count", sign)
+    if bool(event.get("is_llm", False)):
+        window.bump("llm", sign)
+    if bool(event.get("is_useful_llm", False)):
+        window.bump("useful_llm", sign)
+
+
+def _apply_outcome(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    window.bump("count", sign)
+    window.tally("outcomes", _normalized_outcome(event), sign)
+
+
+def _apply_token_usage(window: RollingWindow, event: dict[str, Any], sign: int) -> None:
+    window.bump("count", sign)
+    window.bump("input_tokens", sign * max(0, int(event.get("input_tokens", 0) or 0)))
+    window.bump("output_tokens", sign * max(0, int(event.get("output_tokens", 0) or 0)))
+    window.bump(
+        "cost_usd",
+        sign * max(0.0, float(event.get("estimated_cost_usd", 0.0) or 0.0)),
+    )
+
+
+class ObservabilityWindows:
+    """Janelas deslizantes de 10m/60m de um escopo, mantidas a cada evento.
+
+    O snapshot le os agregados direto daqui em vez de refiltrar os logs. Os
+    rankings por autor ficam nos sketches ``WindowedTopK`` do escopo.
+    """
+
+    __slots__ = (
+        "autonomy_60m",
+        "chat_10m",
+        "chat_60m",
+        "interactions_60m",
+        "quality_60m",
+        "tokens_60m",
+        "triggers_10m",
+        "triggers_60m",
+    )
+
+    def __init__(self, scope: Any) -> None:
+        chat = scope._chat_events
+        triggers = scope._byte_trigger_events
+        self.chat_10m = RollingWindow(chat, WINDOW_10M_SECONDS, _apply_chat_volume)
+        self.chat_60m = RollingWindow(chat, WINDOW_60M_SECONDS, _apply_chat_detail)
+        self.triggers_10m = RollingWindow(triggers, WINDOW_10M_SECONDS, _apply_count)
+        self.triggers_60m = RollingWindow(triggers, WINDOW_60M_SECONDS, _apply_count)
+        self.interactions_60m = RollingWindow(
+            scope._interaction_events, WINDOW_60M_SECONDS, _apply_interaction
+        )
+        self.quality_60m = RollingWindow(scope._quality_events, WINDOW_60M_SECONDS, _apply_outcome)
+        self.tokens_60m = RollingWindow(
+            scope._token_usage_events, WINDOW_60M_SECONDS, _apply_token_usage
+        )
+        self.autonomy_60m = RollingWindow(
+            scope._autonomy_goal_events, WINDOW_60M_SECONDS, _apply_outcome
+        )
+
+    def all(self) -> tuple[RollingWindow, ...]:
+        return (
+            self.chat_10m,
+            self.chat_60m,
+            self.triggers_10m,
+            self.triggers_60m,
+            self.interactions_60m,
+            self.quality_60m,
+            self.tokens_60m,
+            self.autonomy_60m,
+        )
+
+    def expire(self, now: float) -> None:
+        for window in self.all():
+            window.expire(now)
@@ -0,0 +1,189 @@
+from typing import Any
+
+from bot.observability_helpers import EVENT_LOG_SPECS
+from bot.observability_rollup_codec import decode_event_rows, encode_event_rows
+from bot.observability_sketches import HyperLogLog
+
+TRACKED_COUNTER_KEYS = {
+    "_counters": "counters",
+    "_route_counts": "route_counts",
+}
+HEAVY_HITTER_KEYS = {
+    "_chatter_message_totals": "chatter_message_totals",
+    "_trigger_user_totals": "trigger_user_totals",
+}
+
+
+def mark_persist_cursor_locked(scope: Any) -> None:
+    """Marca o estado atual do escopo como persistido (base do proximo delta)."""
+    for attribute in (*TRACKED_COUNTER_KEYS, *HEAVY_HITTER_KEYS):
+        getattr(scope, attribute).drain_changes()
+    scope._chatter_sketch.drain_changed()
+    last_seen = scope._chatter_last_seen
+    minute_keys = scope._minute_buckets.keys()
+    cursor: dict[str, Any] = {
+        "chatter_ts": last_seen[next(reversed(last_seen))] if last_seen else float("-inf"),
+        "minute": minute_keys[-1] if minute_keys else None,
+        "latencies": scope._latencies_ms.appended,
+        "recent_events": scope._recent_events.appended,
+        "last_prompt": scope._last_prompt,
+        "last_reply": scope._last_reply,
+        "estimated_cost_usd_total": scope._estimated_cost_usd_total,
+    }
+    for attribute, (raw_key, _, _) in EVENT_LOG_SPECS.items():
+        cursor[raw_key] = getattr(scope, attribute).end_seq
+    scope._persist_cursor = cursor
+
+
+def capture_scope_checkpoint_locked(scope: Any) -> dict[str, Any]:
+    # Copias rasas em C (dict/list/array): o custo sob o lock fica em memcpy,
+    # a serializacao pesada acontece depois, fora do lock.
+    capture: dict[str, Any] = {
+        "counters": dict(scope._counters),
+        "route_counts": dict(scope._route_counts),
+        "minute_buckets": [(key, dict(bucket)) for key, bucket in scope._minute_buckets.items()],
+        "latencies_ms": list(scope._latencies_ms),
+        "recent_events": list(scope._recent_events),
+        "chatter_last_seen": dict(scope._chatter_last_seen),
+        "chatter_sketch": scope._chatter_sketch.copy(),
+        "chatter_message_totals": scope._chatter_message_totals.copy(),
+        "trigger_user_totals": scope._trigger_user_totals.copy(),
+        "last_prompt": scope._last_prompt,
+        "last_reply": scope._last_reply,
+        "estimated_cost_usd_total": scope._estimated_cost_usd_total,
+    }
+    if scope._known_chatters is not None:
+        capture["known_chatters"] = set(scope._known_chatters)
+    for attribute, (raw_key, _, _) in EVENT_LOG_SPECS.items():
+        capture[raw_key] = getattr(scope, attribute).copy()
+    mark_persist_cursor_locked(scope)
+    return capture
+
+
+def capture_scope_delta_locked(scope: Any) -> dict[str, Any] | None:
+    """Extrai so o que mudou desde o ultimo cursor; ``None`` se nada mudou."""
+    cursor = scope._persist_cursor
+    counter_changes = {
+        raw_key: getattr(scope, attribute).drain_changes()
+        for attribute, raw_key in TRACKED_COUNTER_KEYS.items()
+    }
+    if not counter_changes["counters"]:
+        return None
+
+    delta: dict[str, Any] = {key: value for key, value in counter_changes.items() if value}
+    for attribute, raw_key in HEAVY_HITTER_KEYS.items():
+        changes = getattr(scope, attribute).drain_changes()
+        if changes:
+            delta[raw_key] = changes
+    last_seen = scope._chatter_last_seen.items_since(cursor.get("chatter_ts", float("-inf")))
+    if last_seen:
+        delta["chatter_last_seen"] = last_seen
+    if scope._chatter_sketch.drain_changed():
+        delta["chatter_sketch"] = scope._chatter_sketch.copy()
+    minute_floor = cursor.get("minute")
+    delta["minute_buckets"] = [
+        (key, dict(bucket))
+        for key, bucket in scope._minute_buckets.items()
+        if minute_floor is None or key >= minute_floor
+    ]
+    delta["latencies_ms"] = scope._latencies_ms.tail_since(cursor.get("latencies", 0))
+    delta["recent_events"] = scope._recent_events.tail_since(cursor.get("recent_events", 0))
+    for attribute, (raw_key, _, _) in EVENT_LOG_SPECS.items():
+        log = getattr(scope, attribute)
+        start = int(cursor.get(raw_key, log.first_seq))
+        if log.end_seq > start:
+            delta[raw_key] = list(log.rows_from(start))
+    for key, attribute in (
+        ("last_prompt", "_last_prompt"),
+        ("last_reply", "_last_reply"),
+        ("estimated_cost_usd_total", "_estimated_cost_usd_total"),
+    ):
+        value = getattr(scope, attribute)
+        if value != cursor.get(key):
+            delta[key] = value
+    mark_persist_cursor_locked(scope)
+    return delta
+
+
+def serialize_scope_capture(capture: dict[str, Any], *, columnar: bool) -> dict[str, Any]:
+    serialized: dict[str, Any] = {}
+    for raw_key in TRACKED_COUNTER_KEYS.values():
+        if raw_key in capture:
+            serialized[raw_key] = {key: int(value) for key, value in capture[raw_key].items()}
+    for raw_key in HEAVY_HITTER_KEYS.values():
+        if raw_key not in capture:
+            continue
+        value = capture[raw_key]
+        serialized[raw_key] = value.to_payload() if hasattr(value, "to_payload") else value
+    if "minute_buckets" in capture:
+        serialized["minute_buckets"] = {
+            str(key): {name: int(amount) for name, amount in bucket.items()}
+            for key, bucket in capture["minute_buckets"]
+        }
+    if "latencies_ms" in capture:
+        serialized["latencies_ms"] = [float(value) for value in capture["latencies_ms"]]
+    if "recent_events" in capture:
+        serialized["recent_events"] = list(capture["recent_events"])
+    if "chatter_last_seen" in capture:
+        serialized["chatter_last_seen"] = {
+            str(key): float(value) for key, value in capture["chatter_last_seen"].items()
+        }
+    if "chatter_sketch" in capture:
+        serialized["chatter_sketch"] = capture["chatter_sketch"].to_payload()
+    if "known_chatters" in capture:
+        serialized["known_chatters"] = sorted(capture["known_chatters"])
+    for raw_key, fields, _ in EVENT_LOG_SPECS.values():
+        if raw_key not in capture:
+            continue
+        rows = capture[raw_key]
+        serialized[raw_key] = encode_event_rows(rows, fields) if columnar else list(rows)
+    if "last_prompt" in capture:
+        serialized["last_prompt"] = str(capture["last_prompt"] or "")
+    if "last_reply" in capture:
+        serialized["last_reply"] = str(capture["last_reply"] or "")
+    if "estimated_cost_usd_total" in capture:
+        serialized["estimated_cost_usd_total"] = float(capture["estimated_cost_usd_total"] or 0.0)
+    return serialized
+
+
+def apply_scope_delta_locked(scope: Any, delta: dict[str, Any]) -> None:
+    for attribute, raw_key in TRACKED_COUNTER_KEYS.items():
+        counter = getattr(scope, attribute)
+        for key, value in dict(delta.get(raw_key) or {}).items():
+            counter[str(key)] = int(value)
+    for attribute, raw_key in HEAVY_HITTER_KEYS.items():
+        if raw_key in delta:
+            getattr(scope, attribute).apply_changes(delta[raw_key])
+    last_seen = dict(delta.get("chatter_last_seen") or {})
+    for author, seen_at in sorted(last_seen.items(), key=lambda item: float(item[1])):
+        safe_author = str(author).strip().lower()
+        if not safe_author:
+            continue
+        scope._chatter_last_seen.touch(safe_author, float(seen_at))
+        scope._chatter_sketch.add(safe_author)
+        if scope._known_chatters is not None:
+            scope._known_chatters.add(safe_author)
+    sketch = HyperLogLog.from_payload(delta.get("chatter_sketch"))
+    if sketch is not None and sketch.precision == scope._chatter_sketch.precision:
+        scope._chatter_sketch.merge(sketch)
+    for key, bucket in dict(delta.get("minute_buckets") or {}).items():
+        if str(key).lstrip("-").isdigit():
+            scope._minute_buckets[int(key)] = {
+                str(name): int(amount) for name, amount in dict(bucket or {}).items()
+            }
+    for value in list(delta.get("latencies_ms") or []):
+        scope._latencies_ms.append(float(value))
+    for event in list(delta.get("recent_events") or []):
+        scope._recent_events.append(event)
+    for attribute, (raw_key, fields, _) in EVENT_LOG_SPECS.items():
+        if raw_key not in delta:
+            continue
+        log = getattr(scope, attribute)
+        for row in decode_event_rows(delta[raw_key], fields):
+            log.append(row)
+    if "last_prompt" in delta:
+        scope._last_prompt = str(delta.get("last_prompt") or "")
+    if "last_reply" in delta:
+        scope._last_reply = str(delta.get("last_reply") or "")
+    if "estimated_cost_usd_total" in delta:
+        scope._estimated_cost_usd_total = float(delta.get("estimated_cost_usd_total") or 0.0)
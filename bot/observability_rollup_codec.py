@@ -0,0 +1,71 @@
+import base64
+import json
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+from bot.observability_structures import EventField
+
+ROLLUP_CODEC = "zlib+json/v1"
+ROLLUP_COMPRESSION_LEVEL = 6
+
+
+def encode_rollup_document(payload: dict[str, Any]) -> dict[str, Any]:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    compressed = zlib.compress(raw, ROLLUP_COMPRESSION_LEVEL)
+    return {"codec": ROLLUP_CODEC, "data": base64.b64encode(compressed).decode("ascii")}
+
+
+def decode_rollup_document(document: dict[str, Any] | None) -> dict[str, Any]:
+    safe_document = dict(document or {})
+    if safe_document.get("codec") != ROLLUP_CODEC:
+        return safe_document
+    raw = zlib.decompress(base64.b64decode(str(safe_document.get("data") or "")))
+    decoded = json.loads(raw.decode("utf-8"))
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def encode_event_rows(
+    rows: Iterable[dict[str, Any]],
+    fields: tuple[EventField, ...],
+) -> dict[str, Any]:
+    """Serializa eventos por coluna; ``ts`` vira microssegundos com delta."""
+    columns: dict[str, list[Any]] = {name: [] for name, _ in fields}
+    previous_us = 0
+    for row in rows:
+        ts_us = round(float(row.get("ts", 0.0) or 0.0) * 1_000_000)
+        columns["ts"].append(ts_us - previous_us)
+        previous_us = ts_us
+        for name, kind in fields[1:]:
+            value = row.get(name)
+            if kind == "float":
+                columns[name].append(float(value or 0.0))
+            elif kind == "int":
+                columns[name].append(int(value or 0))
+            elif kind == "bool":
+                columns[name].append(1 if value else 0)
+            else:
+                columns[name].append(str(value or ""))
+    return {"columnar": 1, **columns}
+
+
+def decode_event_rows(
+    raw: Any,
+    fields: tuple[EventField, ...],
+) -> list[dict[str, Any]]:
+    if isinstance(raw, list):
+        return [row for row in raw if isinstance(row, dict)]
+    if not isinstance(raw, dict) or not raw.get("columnar"):
+        return []
+    columns = {name: list(raw.get(name) or []) for name, _ in fields}
+    rows: list[dict[str, Any]] = []
+    ts_us = 0
+    for index, delta in enumerate(columns["ts"]):
+        ts_us += int(delta)
+        row: dict[str, Any] = {"ts": ts_us / 1_000_000}
+        for name, kind in fields[1:]:
+            values = columns[name]
+            value = values[index] if index < len(values) else None
+            row[name] = bool(value) if kind == "bool" else value
+        rows.append(row)
+    return rows
@@ -0,0 +1,634 @@
+import base64
+import hashlib
+import heapq
+import math
+import zlib
+from bisect import bisect_right
+from collections.abc import Iterable
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any
+
+HLL_DEFAULT_PRECISION = 12
+HLL_WINDOW_PRECISION = 10
+TOP_K_DEFAULT_CAPACITY = 256
+TOP_K_WINDOW_CAPACITY = 64
+QUANTILE_RELATIVE_ACCURACY = 0.01
+QUANTILE_MIN_VALUE = 0.001
+QUANTILE_MAX_VALUE = 1e7
+_HASH_BITS = 64
+
+
+def _hash64(value: str) -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """Sketch HyperLogLog para contagem distinta aproximada.
+
+    Com ``precision=12`` ocupa 4 KiB e erra ~1.6%. Mantem ``sum(2^-M)`` e o
+    numero de registradores zerados incrementalmente, entao ``count()`` e O(1).
+    Sketches com a mesma precisao sao mesclaveis (maximo por registrador).
+    """
+
+    __slots__ = ("_changed", "_inverse_sum", "_precision", "_registers", "_zeros")
+
+    def __init__(self, precision: int = HLL_DEFAULT_PRECISION) -> None:
+        self._precision = max(4, min(16, int(precision)))
+        size = 1 << self._precision
+        self._registers = bytearray(size)
+        self._inverse_sum = float(size)
+        self._zeros = size
+        self._changed = False
+
+    @property
+    def precision(self) -> int:
+        return self._precision
+
+    def _set_register(self, index: int, rank: int) -> bool:
+        current = self._registers[index]
+        if rank <= current:
+            return False
+        if current == 0:
+            self._zeros -= 1
+        self._inverse_sum += 2.0**-rank - 2.0**-current
+        self._registers[index] = rank
+        self._changed = True
+        return True
+
+    def add(self, value: str) -> bool:
+        hashed = _hash64(value)
+        tail_bits = _HASH_BITS - self._precision
+        index = hashed >> tail_bits
+        tail = hashed & ((1 << tail_bits) - 1)
+        rank = tail_bits - tail.bit_length() + 1
+        return self._set_register(index, rank)
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other._precision != self._precision:
+            raise ValueError("Precisao de HyperLogLog incompativel para merge.")
+        for index, rank in enumerate(other._registers):
+            if rank:
+                self._set_register(index, rank)
+
+    def count(self) -> int:
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / self._inverse_sum
+        if estimate <= 2.5 * size and self._zeros:
+            estimate = size * math.log(size / self._zeros)
+        return round(estimate)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def copy(self) -> "HyperLogLog":
+        clone = HyperLogLog(self._precision)
+        clone._registers[:] = self._registers
+        clone._inverse_sum = self._inverse_sum
+        clone._zeros = self._zeros
+        return clone
+
+    def drain_changed(self) -> bool:
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def to_payload(self) -> dict[str, Any]:
+        compressed = zlib.compress(bytes(self._registers), 6)
+        return {"p": self._precision, "registers": base64.b64encode(compressed).decode("ascii")}
+
+    @classmethod
+    def from_payload(cls, raw: Any) -> "HyperLogLog | None":
+        if not isinstance(raw, dict):
+            return None
+        try:
+            sketch = cls(int(raw.get("p") or HLL_DEFAULT_PRECISION))
+            registers = zlib.decompress(base64.b64decode(str(raw.get("registers") or "")))
+        except (TypeError, ValueError, zlib.error):
+            return None
+        if len(registers) != len(sketch._registers):
+            return None
+        for index, rank in enumerate(registers):
+            if rank:
+                sketch._set_register(index, rank)
+        sketch._changed = False
+        return sketch
+
+
+class WindowedHyperLogLog:
+    """Anel de sketches por bucket de tempo para distintos em janela.
+
+    ``count_since`` mescla so os buckets dentro da janela; buckets antigos sao
+    sobrescritos ao reciclar o slot.
+    """
+
+    __slots__ = ("_bucket_seconds", "_keys", "_precision", "_sketches")
+
+    def __init__(
+        self,
+        *,
+        bucket_seconds: float = 300.0,
+        buckets: int = 12,
+        precision: int = HLL_WINDOW_PRECISION,
+    ) -> None:
+        self._bucket_seconds = max(1.0, float(bucket_seconds))
+        self._precision = precision
+        capacity = max(1, int(buckets))
+        self._keys: list[int | None] = [None] * capacity
+        self._sketches: list[HyperLogLog | None] = [None] * capacity
+
+    def add(self, value: str, timestamp: float) -> None:
+        bucket_key = int(timestamp // self._bucket_seconds)
+        index = bucket_key % len(self._keys)
+        current_key = self._keys[index]
+        if current_key is not None and current_key > bucket_key:
+            return
+        sketch = self._sketches[index]
+        if current_key != bucket_key or sketch is None:
+            sketch = HyperLogLog(self._precision)
+            self._keys[index] = bucket_key
+            self._sketches[index] = sketch
+        sketch.add(value)
+
+    def count_since(self, cutoff: float) -> int:
+        cutoff_key = int(cutoff // self._bucket_seconds)
+        merged: bytes | None = None
+        for bucket_key, sketch in zip(self._keys, self._sketches, strict=True):
+            if bucket_key is None or sketch is None or bucket_key < cutoff_key:
+                continue
+            registers = bytes(sketch._registers)
+            merged = registers if merged is None else bytes(map(max, merged, registers))
+        if merged is None:
+            return 0
+        combined = HyperLogLog(self._precision)
+        for index, rank in enumerate(merged):
+            if rank:
+                combined._set_register(index, rank)
+        return combined.count()
+
+
+class SpaceSavingTopK:
+    """Contador Space-Saving de heavy hitters com no maximo ``capacity`` chaves.
+
+    Chave nova com o sketch cheio herda a contagem da menor (que sai), entao
+    ``count`` e limite superior e ``error`` diz quanto pode ser herdado. Quem
+    passa de ``total / capacity`` esta garantido no sketch. ``top`` custa
+    O(capacity), independente de quantos autores ja passaram.
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_changed",
+        "_counts",
+        "_dropped",
+        "_errors",
+        "_fresh",
+        "_heap",
+        "_total",
+    )
+
+    def __init__(self, capacity: int = TOP_K_DEFAULT_CAPACITY) -> None:
+        self._capacity = max(1, int(capacity))
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        # Min-heap preguicoso: entradas com contagem velha sao descartadas no pop.
+        self._heap: list[tuple[int, str]] = []
+        self._total = 0
+        # Rastreio para deltas, limitado a capacity: ``_fresh`` sao chaves que
+        # entraram depois do ultimo drain; so as antigas precisam ir em "drop".
+        self._changed: set[str] = set()
+        self._dropped: set[str] = set()
+        self._fresh: set[str] = set()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._counts
+
+    def get(self, key: str, default: int = 0) -> int:
+        return self._counts.get(key, default)
+
+    def error(self, key: str) -> int:
+        return self._errors.get(key, 0)
+
+    def items(self) -> list[tuple[str, int]]:
+        return list(self._counts.items())
+
+    def _push(self, key: str, count: int) -> None:
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self._capacity + 16:
+            self._heap = [(value, name) for name, value in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _evict_min(self) -> int:
+        while self._heap:
+            count, key = heapq.heappop(self._heap)
+            if self._counts.get(key) == count:
+                del self._counts[key]
+                self._errors.pop(key, None)
+                self._changed.discard(key)
+                if key in self._fresh:
+                    self._fresh.discard(key)
+                else:
+                    self._dropped.add(key)
+                return count
+        return 0
+
+    def _set_entry(self, key: str, count: int, error: int) -> None:
+        if key not in self._counts and len(self._counts) >= self._capacity:
+            self._evict_min()
+        self._counts[key] = count
+        self._errors[key] = min(error, count)
+        self._push(key, count)
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        safe_amount = int(amount)
+        if safe_amount <= 0:
+            return self._counts.get(key, 0)
+        self._total += safe_amount
+        count = self._counts.get(key)
+        if count is None:
+            inherited = self._evict_min() if len(self._counts) >= self._capacity else 0
+            self._errors[key] = inherited
+            count = inherited
+            if key in self._dropped:
+                self._dropped.discard(key)
+            else:
+                self._fresh.add(key)
+        count += safe_amount
+        self._counts[key] = count
+        self._push(key, count)
+        self._changed.add(key)
+        return count
+
+    def top(self, limit: int) -> list[tuple[str, int]]:
+        # nlargest e estavel: empates ficam na ordem de chegada, como most_common.
+        return heapq.nlargest(max(0, int(limit)), self._counts.items(), key=itemgetter(1))
+
+    def copy(self) -> "SpaceSavingTopK":
+        clone = SpaceSavingTopK(self._capacity)
+        clone._counts = dict(self._counts)
+        clone._errors = dict(self._errors)
+        clone._heap = list(self._heap)
+        clone._total = self._total
+        return clone
+
+    def drain_changes(self) -> dict[str, Any] | None:
+        """Devolve as entradas alteradas e as chaves removidas desde a ultima chamada."""
+        if not self._changed and not self._dropped:
+            return None
+        changes = {
+            "set": {
+                key: [self._counts[key], self._errors.get(key, 0)]
+                for key in self._changed
+                if key in self._counts
+            },
+            "drop": sorted(key for key in self._dropped if key not in self._counts),
+            "total": self._total,
+        }
+        self._changed.clear()
+        self._dropped.clear()
+        self._fresh.clear()
+        return changes
+
+    def apply_changes(self, raw: Any) -> None:
+        if not isinstance(raw, dict):
+            return
+        if "set" not in raw and "drop" not in raw:
+            # Delta legado: mapa autor -> contagem exata.
+            for key, value in raw.items():
+                self._set_entry(str(key), int(value), 0)
+            return
+        for key in list(raw.get("drop") or []):
+            if self._counts.pop(str(key), None) is not None:
+                self._errors.pop(str(key), None)
+        for key, entry in dict(raw.get("set") or {}).items():
+            values = [*entry, 0] if isinstance(entry, list) else [entry, 0]
+            self._set_entry(str(key), int(values[0]), int(values[1]))
+        self._total = max(self._total, int(raw.get("total") or 0))
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "capacity": self._capacity,
+            "total": self._total,
+            "items": [
+                [key, count, self._errors.get(key, 0)] for key, count in self._counts.items()
+            ],
+        }
+
+    @classmethod
+    def from_payload(
+        cls,
+        raw: Any,
+        *,
+        capacity: int = TOP_K_DEFAULT_CAPACITY,
+    ) -> "SpaceSavingTopK":
+        """Restaura o formato novo ou um ``Counter`` legado (autor -> contagem)."""
+        if not isinstance(raw, dict):
+            return cls(capacity)
+        if "items" not in raw:
+            sketch = cls(capacity)
+            legacy = sorted(
+                ((str(key), int(value)) for key, value in raw.items()),
+                key=itemgetter(1),
+                reverse=True,
+            )
+            for key, count in legacy[: sketch._capacity]:
+                sketch._set_entry(key, count, 0)
+            sketch._total = sum(count for _, count in legacy)
+            return sketch
+        sketch = cls(int(raw.get("capacity") or capacity))
+        for entry in list(raw.get("items") or []):
+            if isinstance(entry, list) and len(entry) >= 2:
+                error = int(entry[2]) if len(entry) > 2 else 0
+                sketch._set_entry(str(entry[0]), int(entry[1]), error)
+        sketch._total = int(raw.get("total") or sum(sketch._counts.values()))
+        return sketch
+
+
+class WindowedTopK:
+    """Anel de sketches Space-Saving por bucket de tempo para top-K em janela.
+
+    A soma dos buckets fechados fica em cache ate a janela andar ou chegar um
+    evento atrasado; cada ``top`` so combina esse ranking com o bucket atual.
+    A borda da janela tem a granularidade de um bucket.
+    """
+
+    __slots__ = ("_bucket_seconds", "_capacity", "_closed", "_keys", "_sketches", "_version")
+
+    def __init__(
+        self,
+        *,
+        bucket_seconds: float = 60.0,
+        buckets: int = 61,
+        capacity: int = TOP_K_WINDOW_CAPACITY,
+    ) -> None:
+        self._bucket_seconds = max(1.0, float(bucket_seconds))
+        self._capacity = capacity
+        size = max(1, int(buckets))
+        self._keys: list[int | None] = [None] * size
+        self._sketches: list[SpaceSavingTopK | None] = [None] * size
+        self._version = 0
+        self._closed: tuple[tuple[int, int, int], dict[str, int], list[str]] | None = None
+
+    def _newest_key(self) -> int | None:
+        return max((key for key in self._keys if key is not None), default=None)
+
+    def add(self, value: str, timestamp: float, amount: int = 1) -> None:
+        bucket_key = int(timestamp // self._bucket_seconds)
+        index = bucket_key % len(self._keys)
+        current_key = self._keys[index]
+        if current_key is not None and current_key > bucket_key:
+            return
+        newest_key = self._newest_key()
+        if newest_key is not None and bucket_key < newest_key:
+            self._version += 1
+        sketch = self._sketches[index]
+        if current_key != bucket_key or sketch is None:
+            sketch = SpaceSavingTopK(self._capacity)
+            self._keys[index] = bucket_key
+            self._sketches[index] = sketch
+        sketch.increment(value, amount)
+
+    def _closed_ranking(self, cutoff_key: int, newest_key: int) -> tuple[dict[str, int], list[str]]:
+        cache_key = (cutoff_key, newest_key, self._version)
+        if self._closed is not None and self._closed[0] == cache_key:
+            return self._closed[1], self._closed[2]
+        merged: dict[str, int] = {}
+        in_window = sorted(
+            (
+                (key, sketch)
+                for key, sketch in zip(self._keys, self._sketches, strict=True)
+                if key is not None and sketch is not None and cutoff_key <= key < newest_key
+            ),
+            key=itemgetter(0),
+        )
+        for _, sketch in in_window:
+            for author, count in sketch._counts.items():
+                merged[author] = merged.get(author, 0) + count
+        ranking = [author for author, _ in sorted(merged.items(), key=itemgetter(1), reverse=True)]
+        self._closed = (cache_key, merged, ranking)
+        return merged, ranking
+
+    def top(self, limit: int, since: float) -> list[tuple[str, int]]:
+        safe_limit = max(0, int(limit))
+        cutoff_key = int(since // self._bucket_seconds)
+        newest_key = self._newest_key()
+        if not safe_limit or newest_key is None or newest_key < cutoff_key:
+            return []
+        closed, ranking = self._closed_ranking(cutoff_key, newest_key)
+        live = self._sketches[newest_key % len(self._keys)]
+        live_counts = live._counts if live is not None else {}
+        candidates = dict.fromkeys(ranking[:safe_limit])
+        candidates.update(dict.fromkeys(live_counts))
+        combined = (
+            (author, closed.get(author, 0) + live_counts.get(author, 0)) for author in candidates
+        )
+        return heapq.nlargest(safe_limit, combined, key=itemgetter(1))
+
+
+class QuantileSketch:
+    """Sketch de quantis com erro relativo fixo (estilo DDSketch).
+
+    Cada valor cai num bucket logaritmico de base ``gamma``; o quantil volta
+    com erro relativo de ``relative_accuracy``. Mesclar e somar buckets, e o
+    numero de buckets fica limitado pela faixa de valores (~800 para 1us..3h).
+    """
+
+    __slots__ = (
+        "_accuracy",
+        "_bins",
+        "_count",
+        "_cumulative",
+        "_gamma",
+        "_log_gamma",
+        "_max",
+        "_min",
+        "_sum",
+        "_zero",
+    )
+
+    def __init__(self, relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY) -> None:
+        self._accuracy = min(0.5, max(0.0005, float(relative_accuracy)))
+        self._gamma = (1 + self._accuracy) / (1 - self._accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: dict[int, int] = {}
+        self._cumulative: tuple[list[int], list[int]] | None = None
+        self._zero = 0
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._sum
+
+    @property
+    def max(self) -> float:
+        return self._max if self._count else 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        safe_value = min(QUANTILE_MAX_VALUE, max(0.0, float(value)))
+        if count <= 0:
+            return
+        self._cumulative = None
+        if safe_value <= QUANTILE_MIN_VALUE:
+            self._zero += count
+        else:
+            index = math.ceil(math.log(safe_value) / self._log_gamma)
+            self._bins[index] = self._bins.get(index, 0) + count
+        self._count += count
+        self._sum += safe_value * count
+        self._min = min(self._min, safe_value)
+        self._max = max(self._max, safe_value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._accuracy != self._accuracy:
+            raise ValueError("Precisao de QuantileSketch incompativel para merge.")
+        if not other._count:
+            return
+        self._cumulative = None
+        bins = self._bins
+        for index, amount in other._bins.items():
+            bins[index] = bins.get(index, 0) + amount
+        self._zero += other._zero
+        self._count += other._count
+        self._sum += other._sum
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    def copy(self) -> "QuantileSketch":
+        clone = QuantileSketch(self._accuracy)
+        clone.merge(self)
+        return clone
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Devolve ``(limite_superior, contagem)`` em ordem crescente."""
+        pairs = [(QUANTILE_MIN_VALUE, self._zero)] if self._zero else []
+        pairs.extend((self._gamma**index, self._bins[index]) for index in sorted(self._bins))
+        return pairs
+
+    def quantiles(self, quantiles: Iterable[float]) -> list[float]:
+        targets = [min(1.0, max(0.0, float(q))) for q in quantiles]
+        if not self._count:
+            return [0.0 for _ in targets]
+        if self._cumulative is None:
+            indexes = sorted(self._bins)
+            counts = list(accumulate((self._bins[index] for index in indexes), initial=self._zero))
+            self._cumulative = (indexes, counts)
+        indexes, counts = self._cumulative
+        results: list[float] = []
+        for target in targets:
+            # counts[0] e o bucket zero; counts[i] acumula ate indexes[i - 1].
+            position = bisect_right(counts, target * (self._count - 1))
+            if position == 0:
+                estimate = 0.0
+            else:
+                index = indexes[min(position, len(indexes)) - 1]
+                estimate = 2 * self._gamma**index / (self._gamma + 1)
+            results.append(min(self._max, max(self._min, estimate)))
+        return results
+
+    def quantile(self, quantile: float) -> float:
+        return self.quantiles((quantile,))[0]
+
+
+class _SketchRing:
+    __slots__ = ("bucket_seconds", "cache", "keys", "newest", "sketches", "version")
+
+    def __init__(self, bucket_seconds: float, buckets: int) -> None:
+        self.bucket_seconds = max(1.0, float(bucket_seconds))
+        size = max(1, int(buckets))
+        self.keys: list[int | None] = [None] * size
+        self.sketches: list[QuantileSketch | None] = [None] * size
+        self.newest: int | None = None
+        self.version = 0
+        # offset da janela -> (chave, buckets fechados, contagem do bucket atual, resultado)
+        self.cache: dict[int, tuple[tuple[int, int, int], QuantileSketch, int, QuantileSketch]] = {}
+
+    def add(self, value: float, timestamp: float, accuracy: float) -> None:
+        bucket_key = int(timestamp // self.bucket_seconds)
+        index = bucket_key % len(self.keys)
+        current_key = self.keys[index]
+        if current_key is not None and current_key > bucket_key:
+            return
+        if self.newest is None or bucket_key > self.newest:
+            self.newest = bucket_key
+        elif bucket_key < self.newest:
+            self.version += 1
+        sketch = self.sketches[index]
+        if current_key != bucket_key or sketch is None:
+            sketch = QuantileSketch(accuracy)
+            self.keys[index] = bucket_key
+            self.sketches[index] = sketch
+        sketch.add(value)
+
+    def merged_since(self, cutoff: float, accuracy: float) -> QuantileSketch:
+        """Sketch da janela; e compartilhado com o cache, entao nao deve ser alterado."""
+        cutoff_key = int(cutoff // self.bucket_seconds)
+        newest_key = self.newest
+        if newest_key is None or newest_key < cutoff_key:
+            return QuantileSketch(accuracy)
+        live = self.sketches[newest_key % len(self.keys)]
+        live_count = live.count if live is not None else 0
+        offset = cutoff_key - newest_key
+        cache_key = (cutoff_key, newest_key, self.version)
+        cached = self.cache.get(offset)
+        if cached is not None and cached[0] == cache_key:
+            if cached[2] == live_count:
+                return cached[3]
+            closed = cached[1]
+        else:
+            closed = QuantileSketch(accuracy)
+            for bucket_key, sketch in zip(self.keys, self.sketches, strict=True):
+                if bucket_key is not None and sketch is not None:
+                    if cutoff_key <= bucket_key < newest_key:
+                        closed.merge(sketch)
+        merged = closed.copy()
+        if live is not None:
+            merged.merge(live)
+        self.cache[offset] = (cache_key, closed, live_count, merged)
+        return merged
+
+
+class WindowedQuantileSketch:
+    """Quantis em janelas de 1m/10m (buckets de 10s) e 60m (buckets de 60s).
+
+    Igual ao ``WindowedTopK``: a soma dos buckets fechados fica em cache e cada
+    leitura so mescla o bucket atual por cima.
+    """
+
+    __slots__ = ("_accuracy", "_coarse", "_fine")
+
+    def __init__(self, relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY) -> None:
+        self._accuracy = relative_accuracy
+        self._fine = _SketchRing(10.0, 61)
+        self._coarse = _SketchRing(60.0, 61)
+
+    def add(self, value: float, timestamp: float) -> None:
+        self._fine.add(value, timestamp, self._accuracy)
+        self._coarse.add(value, timestamp, self._accuracy)
+
+    def window(self, span_seconds: float, now: float) -> QuantileSketch:
+        ring = self._fine if span_seconds <= 600 else self._coarse
+        return ring.merged_since(now - span_seconds, self._accuracy)
@@ -7,6 +7,7 @@ from bot.observability_analytics import (
     compute_interaction_metrics,
     compute_leaderboards,
     compute_quality_metrics,
+    compute_source_counts,
     compute_token_metrics,
 )
 from bot.observability_helpers import (
@@ -15,8 +16,30 @@ from bot.observability_helpers import (
     compute_p95,
     utc_iso,
 )
+from bot.observability_rolling import ObservabilityWindows
+from bot.observability_sketches import SpaceSavingTopK, WindowedTopK
+from bot.observability_structures import MinuteBucketRing
 from bot.stream_health_score import build_stream_health_score
 
+# Blocos do snapshot selecionaveis por ``sections`` (``timestamp`` sempre vem).
+SNAPSHOT_SECTIONS = (
+    "bot",
+    "metrics",
+    "chatters",
+    "chat_analytics",
+    "leaderboards",
+    "agent_outcomes",
+    "context",
+    "counters",
+    "routes",
+    "latency",
+    "timeline",
+    "recent_events",
+    "sentiment",
+    "stream_health",
+    "vision",
+)
+
 
 def build_observability_snapshot(
     *,
@@ -25,18 +48,18 @@ def build_observability_snapshot(
     counters: dict[str, int],
     route_counts: dict[str, int],
     latencies_ms: list[float],
-    minute_buckets: dict[int, dict[str, int]],
+    minute_buckets: MinuteBucketRing | dict[int, dict[str, int]],
     recent_events: list[dict[str, Any]],
-    chatter_last_seen: dict[str, float],
-    chat_events: list[dict[str, Any]],
-    byte_trigger_events: list[dict[str, Any]],
-    interaction_events: list[dict[str, Any]],
-    quality_events: list[dict[str, Any]],
-    token_usage_events: list[dict[str, Any]],
-    autonomy_goal_events: list[dict[str, Any]],
-    chatter_message_totals: dict[str, int],
-    trigger_user_totals: dict[str, int],
+    active_chatters_10m: int,
+    active_chatters_60m: int,
+    windows: ObservabilityWindows,
+    chatter_message_totals: SpaceSavingTopK,
+    trigger_user_totals: SpaceSavingTopK,
+    chatter_window_top: WindowedTopK,
+    trigger_window_top: WindowedTopK,
+    latency_summary: dict[str, Any] | None = None,
     unique_chatters_total: int,
+    unique_chatters_exact: int | None = None,
     last_prompt: str,
     last_reply: str,
     estimated_cost_usd_total: float,
@@ -46,67 +69,146 @@ def build_observability_snapshot(
     bot_mode: str,
     stream_context: Any,
     channel_id: str = "default",
+    sections: frozenset[str] | None = None,
 ) -> dict[str, Any]:
-    # Active users
-    active_chatters_10m = sum(1 for value in chatter_last_seen.values() if now - value <= 600)
-    active_chatters_60m = sum(1 for value in chatter_last_seen.values() if now - value <= 3600)
+    """Monta o snapshot do escopo; ``sections`` limita quais blocos sao calculados.
 
-    # Latency
-    avg_latency_ms = round(sum(latencies_ms) / len(latencies_ms), 1) if latencies_ms else 0.0
-    p95_latency_ms = compute_p95(latencies_ms)
-
-    # Analytics
-    chat_metrics = compute_chat_metrics(chat_events, now)
-    interaction_metrics = compute_interaction_metrics(interaction_events, now)
-    quality_metrics = compute_quality_metrics(
-        quality_events, interaction_metrics["llm_interactions_60m"], now
-    )
-    token_metrics = compute_token_metrics(token_usage_events, now)
-    autonomy_metrics = compute_autonomy_metrics(autonomy_goal_events, now)
-
-    # Leaderboards
-    # Need byte_trigger_events filtered for 60m first
-    cutoff_60m = now - 3600
-    trigger_events_60m = [e for e in byte_trigger_events if float(e.get("ts", 0.0)) >= cutoff_60m]
-
-    leaderboards = compute_leaderboards(
-        chat_metrics.pop("events_60m"),  # Pop to remove from result dict
-        trigger_events_60m,
-        chatter_message_totals,
-        trigger_user_totals,
-    )
-
-    source_counts = leaderboards.pop("source_counts_60m")
-    chat_metrics["source_counts_60m"] = {
-        "irc": int(source_counts.get("irc", 0)),
-        "eventsub": int(source_counts.get("eventsub", 0)),
-        "unknown": int(source_counts.get("unknown", 0)),
-    }
-    chat_metrics["byte_triggers_10m"] = len(
-        [e for e in byte_trigger_events if float(e.get("ts", 0.0)) >= now - 600]
-    )
-    chat_metrics["byte_triggers_60m"] = len(trigger_events_60m)
+    Blocos fora de ``sections`` nao sao computados (nem entram no payload),
+    exceto quando outro bloco pedido depende deles: ``stream_health`` usa
+    sentimento, chat, resultados do agente e timeline.
+    """
+
+    def wants(name: str) -> bool:
+        return sections is None or name in sections
+
+    need_stream_health = wants("stream_health")
+    need_chat = wants("chat_analytics") or need_stream_health
+    need_outcomes = wants("agent_outcomes") or need_stream_health
+    need_timeline = wants("timeline") or need_stream_health
+    need_sentiment = wants("sentiment") or need_stream_health
+
+    payload: dict[str, Any] = {"timestamp": utc_iso(now)}
+    if wants("bot"):
+        payload["bot"] = {
+            "brand": bot_brand,
+            "version": bot_version,
+            "mode": bot_mode,
+            "status": "online",
+            "uptime_minutes": _resolve_uptime_minutes(stream_context, now, started_at),
+        }
+    if wants("metrics"):
+        payload["metrics"] = _build_metrics_block(counters, latencies_ms, estimated_cost_usd_total)
+    if wants("chatters"):
+        chatters: dict[str, Any] = {
+            "unique_total": unique_chatters_total,
+            "active_10m": active_chatters_10m,
+            "active_60m": active_chatters_60m,
+        }
+        if unique_chatters_exact is not None:
+            chatters["unique_total_exact"] = unique_chatters_exact
+        payload["chatters"] = chatters
+
+    # Analytics (agregados mantidos incrementalmente pelas janelas do escopo)
+    chat_metrics: dict[str, Any] = {}
+    if need_chat:
+        chat_metrics = compute_chat_metrics(windows)
+        chat_metrics["source_counts_60m"] = compute_source_counts(windows)
+        chat_metrics["byte_triggers_10m"] = int(windows.triggers_10m.total("count"))
+        chat_metrics["byte_triggers_60m"] = int(windows.triggers_60m.total("count"))
+        if wants("chat_analytics"):
+            payload["chat_analytics"] = chat_metrics
+    if wants("leaderboards"):
+        payload["leaderboards"] = compute_leaderboards(
+            now,
+            chatter_totals=chatter_message_totals,
+            trigger_totals=trigger_user_totals,
+            chatter_window=chatter_window_top,
+            trigger_window=trigger_window_top,
+        )
+    agent_outcomes: dict[str, Any] = {}
+    if need_outcomes:
+        interaction_metrics = compute_interaction_metrics(windows)
+        agent_outcomes = {
+            **interaction_metrics,
+            **compute_quality_metrics(windows, interaction_metrics["llm_interactions_60m"]),
+            **compute_autonomy_metrics(windows),
+            "token_input_total": int(counters.get("token_input_total", 0)),
+            "token_output_total": int(counters.get("token_output_total", 0)),
+            **compute_token_metrics(windows),
+            "estimated_cost_usd_total": round(max(0.0, float(estimated_cost_usd_total or 0.0)), 6),
+        }
+        if wants("agent_outcomes"):
+            payload["agent_outcomes"] = agent_outcomes
+    if wants("context"):
+        payload["context"] = _build_context_block(
+            stream_context, last_prompt, last_reply, clips_status
+        )
+    if wants("counters"):
+        payload["counters"] = {key: int(value) for key, value in counters.items()}
+    if wants("routes"):
+        sorted_routes = sorted(route_counts.items(), key=lambda item: item[1], reverse=True)
+        payload["routes"] = [{"route": route, "count": count} for route, count in sorted_routes]
+    if wants("latency"):
+        payload["latency"] = dict(latency_summary or {})
+    timeline: list[dict[str, Any]] = []
+    if need_timeline:
+        timeline = _build_timeline(now, minute_buckets)
+        if wants("timeline"):
+            payload["timeline"] = timeline
+    if wants("recent_events"):
+        payload["recent_events"] = list(reversed(recent_events[-40:]))
+    sentiment_block: dict[str, Any] = {}
+    if need_sentiment:
+        sentiment_block = _build_sentiment_block(channel_id)
+        if wants("sentiment"):
+            payload["sentiment"] = sentiment_block
+    if need_stream_health:
+        payload["stream_health"] = build_stream_health_score(
+            sentiment=sentiment_block,
+            chat_analytics=chat_metrics,
+            agent_outcomes=agent_outcomes,
+            timeline=timeline,
+        )
+    if wants("vision"):
+        payload["vision"] = _build_vision_block()
+    return payload
 
-    # Context
+
+def _resolve_uptime_minutes(stream_context: Any, now: float, started_at: float) -> int:
+    get_uptime_minutes = getattr(stream_context, "get_uptime_minutes", None)
+    if callable(get_uptime_minutes):
+        uptime_value = get_uptime_minutes()
+        if isinstance(uptime_value, int | float | str):
+            return max(0, int(uptime_value))
+    return max(0, int((now - started_at) / 60))
+
+
+def _build_context_block(
+    stream_context: Any,
+    last_prompt: str,
+    last_reply: str,
+    clips_status: dict[str, bool],
+) -> dict[str, Any]:
     context_vibe = str(getattr(stream_context, "stream_vibe", "Conversa") or "Conversa")
     context_last_event = str(getattr(stream_context, "last_event", "Bot Online") or "Bot Online")
     raw_observability = getattr(stream_context, "live_observability", {}) or {}
     context_items = {
         str(key): str(value) for key, value in dict(raw_observability).items() if str(value).strip()
     }
-    context_active_count = len(context_items)
+    return {
+        "stream_vibe": context_vibe,
+        "last_event": context_last_event,
+        "active_contexts": len(context_items),
+        "items": context_items,
+        "last_prompt": clip_preview(last_prompt, max_chars=120),
+        "last_reply": clip_preview(last_reply, max_chars=140),
+        "clips_status": clips_status,
+    }
 
-    get_uptime_minutes = getattr(stream_context, "get_uptime_minutes", None)
-    if callable(get_uptime_minutes):
-        uptime_value = get_uptime_minutes()
-        if isinstance(uptime_value, int | float | str):
-            uptime_minutes = max(0, int(uptime_value))
-        else:
-            uptime_minutes = max(0, int((now - started_at) / 60))
-    else:
-        uptime_minutes = max(0, int((now - started_at) / 60))
 
-    # Timeline
+def _build_timeline(
+    now: float, minute_buckets: MinuteBucketRing | dict[int, dict[str, int]]
+) -> list[dict[str, Any]]:
     now_minute = int(now // 60)
     timeline = []
     for minute_key in range(now_minute - TIMELINE_WINDOW_MINUTES + 1, now_minute + 1):
@@ -122,90 +224,44 @@ def build_observability_snapshot(
                 "errors": int(bucket.get("errors", 0)),
             }
         )
+    return timeline
+
 
-    sorted_routes = sorted(route_counts.items(), key=lambda item: item[1], reverse=True)
-    route_rows = [{"route": route, "count": count} for route, count in sorted_routes]
-    events_desc = list(reversed(recent_events[-40:]))
-    sentiment_block = _build_sentiment_block(channel_id)
-    agent_outcomes = {
-        **interaction_metrics,
-        **quality_metrics,
-        **autonomy_metrics,
+def _build_metrics_block(
+    counters: dict[str, int],
+    latencies_ms: list[float],
+    estimated_cost_usd_total: float,
+) -> dict[str, Any]:
+    avg_latency_ms = round(sum(latencies_ms) / len(latencies_ms), 1) if latencies_ms else 0.0
+    return {
+        "chat_messages_total": int(counters.get("chat_messages_total", 0)),
+        "chat_messages_irc_total": int(counters.get("chat_messages_irc", 0)),
+        "chat_messages_eventsub_total": int(counters.get("chat_messages_eventsub", 0)),
+        "chat_prefixed_messages_total": int(counters.get("chat_prefixed_messages", 0)),
+        "chat_messages_with_url_total": int(counters.get("chat_messages_with_url", 0)),
+        "byte_triggers_total": int(counters.get("byte_triggers_total", 0)),
+        "interactions_total": int(counters.get("interactions_total", 0)),
+        "replies_total": int(counters.get("replies_total", 0)),
+        "llm_interactions_total": int(counters.get("llm_interactions_total", 0)),
+        "serious_interactions_total": int(counters.get("serious_interactions_total", 0)),
+        "current_events_interactions_total": int(
+            counters.get("current_events_interactions_total", 0)
+        ),
+        "follow_up_interactions_total": int(counters.get("follow_up_interactions_total", 0)),
+        "quality_checks_total": int(counters.get("quality_checks_total", 0)),
+        "quality_retry_total": int(counters.get("quality_retry_total", 0)),
+        "quality_retry_success_total": int(counters.get("quality_retry_success_total", 0)),
+        "quality_fallback_total": int(counters.get("quality_fallback_total", 0)),
+        "auto_scene_updates_total": int(counters.get("auto_scene_updates_total", 0)),
         "token_input_total": int(counters.get("token_input_total", 0)),
         "token_output_total": int(counters.get("token_output_total", 0)),
-        **token_metrics,
         "estimated_cost_usd_total": round(max(0.0, float(estimated_cost_usd_total or 0.0)), 6),
-    }
-    stream_health = build_stream_health_score(
-        sentiment=sentiment_block,
-        chat_analytics=chat_metrics,
-        agent_outcomes=agent_outcomes,
-        timeline=timeline,
-    )
-
-    return {
-        "timestamp": utc_iso(now),
-        "bot": {
-            "brand": bot_brand,
-            "version": bot_version,
-            "mode": bot_mode,
-            "status": "online",
-            "uptime_minutes": uptime_minutes,
-        },
-        "metrics": {
-            "chat_messages_total": int(counters.get("chat_messages_total", 0)),
-            "chat_messages_irc_total": int(counters.get("chat_messages_irc", 0)),
-            "chat_messages_eventsub_total": int(counters.get("chat_messages_eventsub", 0)),
-            "chat_prefixed_messages_total": int(counters.get("chat_prefixed_messages", 0)),
-            "chat_messages_with_url_total": int(counters.get("chat_messages_with_url", 0)),
-            "byte_triggers_total": int(counters.get("byte_triggers_total", 0)),
-            "interactions_total": int(counters.get("interactions_total", 0)),
-            "replies_total": int(counters.get("replies_total", 0)),
-            "llm_interactions_total": int(counters.get("llm_interactions_total", 0)),
-            "serious_interactions_total": int(counters.get("serious_interactions_total", 0)),
-            "current_events_interactions_total": int(
-                counters.get("current_events_interactions_total", 0)
-            ),
-            "follow_up_interactions_total": int(counters.get("follow_up_interactions_total", 0)),
-            "quality_checks_total": int(counters.get("quality_checks_total", 0)),
-            "quality_retry_total": int(counters.get("quality_retry_total", 0)),
-            "quality_retry_success_total": int(counters.get("quality_retry_success_total", 0)),
-            "quality_fallback_total": int(counters.get("quality_fallback_total", 0)),
-            "auto_scene_updates_total": int(counters.get("auto_scene_updates_total", 0)),
-            "token_input_total": int(counters.get("token_input_total", 0)),
-            "token_output_total": int(counters.get("token_output_total", 0)),
-            "estimated_cost_usd_total": round(max(0.0, float(estimated_cost_usd_total or 0.0)), 6),
-            "token_refreshes_total": int(counters.get("token_refreshes_total", 0)),
-            "auth_failures_total": int(counters.get("auth_failures_total", 0)),
-            "errors_total": int(counters.get("errors_total", 0)),
-            "vision_frames_total": int(counters.get("vision_frames_total", 0)),
-            "avg_latency_ms": avg_latency_ms,
-            "p95_latency_ms": p95_latency_ms,
-        },
-        "chatters": {
-            "unique_total": unique_chatters_total,
-            "active_10m": active_chatters_10m,
-            "active_60m": active_chatters_60m,
-        },
-        "chat_analytics": chat_metrics,
-        "leaderboards": leaderboards,
-        "agent_outcomes": agent_outcomes,
-        "context": {
-            "stream_vibe": context_vibe,
-            "last_event": context_last_event,
-            "active_contexts": context_active_count,
-            "items": context_items,
-            "last_prompt": clip_preview(last_prompt, max_chars=120),
-            "last_reply": clip_preview(last_reply, max_chars=140),
-            "clips_status": clips_status,
-        },
-        "counters": {key: int(value) for key, value in counters.items()},
-        "routes": route_rows,
-        "timeline": timeline,
-        "recent_events": events_desc,
-        "sentiment": sentiment_block,
-        "stream_health": stream_health,
-        "vision": _build_vision_block(),
+        "token_refreshes_total": int(counters.get("token_refreshes_total", 0)),
+        "auth_failures_total": int(counters.get("auth_failures_total", 0)),
+        "errors_total": int(counters.get("errors_total", 0)),
+        "vision_frames_total": int(counters.get("vision_frames_total", 0)),
+        "avg_latency_ms": avg_latency_ms,
+        "p95_latency_ms": compute_p95(latencies_ms),
     }
 
 
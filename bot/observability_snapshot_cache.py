@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_SNAPSHOT_CACHE_TTL_SECONDS = 1.0
+SNAPSHOT_CACHE_MAX_ENTRIES = 64
+SNAPSHOT_CACHE_WAIT_TIMEOUT_SECONDS = 10.0
+
+
+def _resolve_ttl_seconds() -> float:
+    raw_value = os.environ.get("OBSERVABILITY_SNAPSHOT_CACHE_TTL_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else None
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None:
+        return DEFAULT_SNAPSHOT_CACHE_TTL_SECONDS
+    return max(0.0, parsed)
+
+
+class ObservabilitySnapshotCache:
+    """Cache curto por canal do payload de observability, com single-flight.
+
+    Enquanto um build esta em andamento, os outros pedidos do mesmo canal
+    esperam por ele em vez de montar o payload de novo. ``ttl_seconds=0``
+    desliga o cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int = SNAPSHOT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._ttl_seconds = _resolve_ttl_seconds() if ttl_seconds is None else ttl_seconds
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._inflight: dict[str, threading.Event] = {}
+        self._hits = 0
+        self._coalesced = 0
+        self._misses = 0
+        self._build_ms_total = 0.0
+        self._last_build_ms = 0.0
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], dict[str, Any]],
+    ) -> tuple[dict[str, Any], str, float]:
+        """Devolve ``(payload, origem, idade_ms)``; origem e hit, coalesced ou miss."""
+        if self._ttl_seconds <= 0:
+            return self._build(key, build, store=False), "miss", 0.0
+        while True:
+            with self._lock:
+                cached = self._fresh_entry_locked(key)
+                if cached is not None:
+                    self._hits += 1
+                    return cached[1], "hit", cached[0]
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._inflight[key] = event
+            if leader:
+                try:
+                    return self._build(key, build, store=True), "miss", 0.0
+                finally:
+                    with self._lock:
+                        self._inflight.pop(key, None)
+                    event.set()
+            event.wait(timeout=SNAPSHOT_CACHE_WAIT_TIMEOUT_SECONDS)
+            with self._lock:
+                cached = self._fresh_entry_locked(key)
+                if cached is not None:
+                    self._coalesced += 1
+                    return cached[1], "coalesced", cached[0]
+            # O build lider falhou: tenta de novo (alguem vira o novo lider).
+
+    def _fresh_entry_locked(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age_seconds = time.monotonic() - entry[0]
+        if age_seconds >= self._ttl_seconds:
+            return None
+        return round(age_seconds * 1000, 2), entry[1]
+
+    def _build(
+        self,
+        key: str,
+        build: Callable[[], dict[str, Any]],
+        *,
+        store: bool,
+    ) -> dict[str, Any]:
+        started = time.monotonic()
+        payload = build()
+        finished = time.monotonic()
+        with self._lock:
+            self._misses += 1
+            self._last_build_ms = round((finished - started) * 1000, 2)
+            self._build_ms_total += self._last_build_ms
+            if store:
+                self._entries.pop(key, None)
+                self._entries[key] = (finished, payload)
+                while len(self._entries) > self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+        return payload
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            served = self._hits + self._coalesced + self._misses
+            return {
+                "ttl_seconds": self._ttl_seconds,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "coalesced": self._coalesced,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._coalesced) / served, 4) if served else 0.0,
+                "last_build_ms": self._last_build_ms,
+                "avg_build_ms": round(self._build_ms_total / self._misses, 2)
+                if self._misses
+                else 0.0,
+            }
+
+
+observability_snapshot_cache = ObservabilitySnapshotCache()
+
+__all__ = ["ObservabilitySnapshotCache", "observability_snapshot_cache"]
@@ -1,17 +1,47 @@
+import json
+import os
 import threading
 import time
+import uuid
 from collections import Counter, deque
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, cast
 
+from bot.observability_flusher import ObservabilityFlusher
 from bot.observability_helpers import (
-    BYTE_TRIGGER_EVENTS_MAX_ITEMS,
-    CHAT_EVENTS_MAX_ITEMS,
     EVENT_LOG_MAX_ITEMS,
+    EVENT_LOG_SPECS,
     LATENCY_WINDOW_MAX_ITEMS,
+    TIMELINE_RING_CAPACITY,
     utc_iso,
 )
+from bot.observability_latency import LatencyRegistry
+from bot.observability_query import MetricQuery, read_metrics_locked, validate_metric_names
+from bot.observability_rolling import (
+    WINDOW_10M_SECONDS,
+    WINDOW_60M_SECONDS,
+    ObservabilityWindows,
+    new_event_log,
+)
+from bot.observability_rollup import (
+    apply_scope_delta_locked,
+    capture_scope_checkpoint_locked,
+    capture_scope_delta_locked,
+    mark_persist_cursor_locked,
+    serialize_scope_capture,
+)
+from bot.observability_rollup_codec import (
+    decode_event_rows,
+    decode_rollup_document,
+    encode_rollup_document,
+)
+from bot.observability_sketches import (
+    HyperLogLog,
+    SpaceSavingTopK,
+    WindowedHyperLogLog,
+    WindowedTopK,
+)
 from bot.observability_snapshot import build_observability_snapshot
 from bot.observability_state_core import prune_locked, resolve_now
 from bot.observability_state_recorders import (
@@ -22,56 +52,121 @@ from bot.observability_state_recorders import (
     record_byte_trigger_locked,
     record_chat_message_locked,
     record_error_locked,
+    record_latency_locked,
     record_quality_gate_locked,
     record_reply_locked,
     record_token_refresh_locked,
     record_token_usage_locked,
     record_vision_frame_locked,
 )
+from bot.observability_structures import (
+    ColumnarEventLog,
+    MinuteBucketRing,
+    RecencyMap,
+    SequencedDeque,
+    TrackedCounter,
+)
 from bot.stream_health_score import build_stream_health_score
 
 
+DEFAULT_ROLLUP_CHECKPOINT_EVERY = 40
+DEFAULT_SCOPE_IDLE_SECONDS = 7200.0
+
+
 def _normalize_channel_id(channel_id: str | None) -> str:
     normalized = str(channel_id or "").strip().lower()
     return normalized or "default"
 
 
+def _resolve_exact_chatters() -> bool:
+    raw_value = str(os.environ.get("OBSERVABILITY_EXACT_CHATTERS", "") or "").strip().lower()
+    return raw_value in {"1", "true", "yes", "on"}
+
+
+def _build_chatter_window_sketch(scope: Any) -> WindowedHyperLogLog:
+    sketch = WindowedHyperLogLog()
+    for row in scope._chat_events:
+        if row["author"]:
+            sketch.add(row["author"], row["ts"])
+    return sketch
+
+
+def _build_window_top(log: Any) -> WindowedTopK:
+    window_top = WindowedTopK()
+    for row in log:
+        if row["author"]:
+            window_top.add(row["author"], row["ts"])
+    return window_top
+
+
+def _resolve_checkpoint_every() -> int:
+    raw_value = os.environ.get("OBSERVABILITY_ROLLUP_CHECKPOINT_EVERY")
+    try:
+        parsed = int(raw_value) if raw_value not in (None, "") else 0
+    except (TypeError, ValueError):
+        parsed = 0
+    return parsed if parsed > 0 else DEFAULT_ROLLUP_CHECKPOINT_EVERY
+
+
+def _resolve_scope_idle_seconds() -> float:
+    raw_value = os.environ.get("OBSERVABILITY_SCOPE_IDLE_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    return parsed if parsed > 0 else DEFAULT_SCOPE_IDLE_SECONDS
+
+
 @dataclass
 class _ObservabilityScope:
-    _counters: Counter[str] = field(default_factory=Counter)
-    _route_counts: Counter[str] = field(default_factory=Counter)
-    _minute_buckets: dict[int, dict[str, int]] = field(default_factory=dict)
-    _latencies_ms: deque[float] = field(
-        default_factory=lambda: deque(maxlen=LATENCY_WINDOW_MAX_ITEMS)
+    _counters: TrackedCounter = field(default_factory=TrackedCounter)
+    _route_counts: TrackedCounter = field(default_factory=TrackedCounter)
+    _minute_buckets: MinuteBucketRing = field(
+        default_factory=lambda: MinuteBucketRing(TIMELINE_RING_CAPACITY)
     )
-    _recent_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=EVENT_LOG_MAX_ITEMS)
+    _latencies_ms: SequencedDeque = field(
+        default_factory=lambda: SequencedDeque(maxlen=LATENCY_WINDOW_MAX_ITEMS)
     )
-    _chatter_last_seen: dict[str, float] = field(default_factory=dict)
-    _known_chatters: set[str] = field(default_factory=set)
-    _chat_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=CHAT_EVENTS_MAX_ITEMS)
+    _recent_events: SequencedDeque = field(
+        default_factory=lambda: SequencedDeque(maxlen=EVENT_LOG_MAX_ITEMS)
     )
-    _byte_trigger_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
+    _chatter_last_seen: RecencyMap = field(default_factory=RecencyMap)
+    _chatter_sketch: HyperLogLog = field(default_factory=HyperLogLog)
+    _chatter_window_sketch: WindowedHyperLogLog = field(default_factory=WindowedHyperLogLog)
+    _known_chatters: set[str] | None = None
+    _chat_events: ColumnarEventLog = field(default_factory=lambda: new_event_log("_chat_events"))
+    _byte_trigger_events: ColumnarEventLog = field(
+        default_factory=lambda: new_event_log("_byte_trigger_events")
     )
-    _interaction_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
+    _interaction_events: ColumnarEventLog = field(
+        default_factory=lambda: new_event_log("_interaction_events")
     )
-    _quality_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
+    _quality_events: ColumnarEventLog = field(
+        default_factory=lambda: new_event_log("_quality_events")
     )
-    _token_usage_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
+    _token_usage_events: ColumnarEventLog = field(
+        default_factory=lambda: new_event_log("_token_usage_events")
     )
-    _autonomy_goal_events: deque[dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
+    _autonomy_goal_events: ColumnarEventLog = field(
+        default_factory=lambda: new_event_log("_autonomy_goal_events")
     )
-    _chatter_message_totals: Counter[str] = field(default_factory=Counter)
-    _trigger_user_totals: Counter[str] = field(default_factory=Counter)
+    _chatter_message_totals: SpaceSavingTopK = field(default_factory=SpaceSavingTopK)
+    _trigger_user_totals: SpaceSavingTopK = field(default_factory=SpaceSavingTopK)
+    _chatter_window_top: WindowedTopK = field(default_factory=WindowedTopK)
+    _trigger_window_top: WindowedTopK = field(default_factory=WindowedTopK)
+    _latency: LatencyRegistry = field(default_factory=LatencyRegistry)
+    _windows: ObservabilityWindows = field(init=False)
+    _persist_cursor: dict[str, Any] = field(default_factory=dict)
     _last_prompt: str = ""
     _last_reply: str = ""
     _estimated_cost_usd_total: float = 0.0
+    _last_activity_at: float = 0.0
+    # Marcado sob ``_lock`` ao arquivar: quem esperava o lock busca o escopo de novo.
+    _evicted: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._windows = ObservabilityWindows(self)
 
 
 class ObservabilityState:
@@ -80,39 +175,62 @@ class ObservabilityState:
         *,
         persistence_layer: Any | None = None,
         persist_interval_seconds: float = 15.0,
+        flush_in_background: bool = True,
+        checkpoint_every: int | None = None,
+        exact_chatters: bool | None = None,
     ) -> None:
+        # Lock striping: ``_lock`` protege so o agregado global, cada escopo de
+        # canal tem o seu, ``_meta_lock`` cobre dirty/persistencia e
+        # ``_scopes_lock`` so a criacao de escopos.
         self._lock = threading.Lock()
+        self._meta_lock = threading.Lock()
+        self._scopes_lock = threading.Lock()
         self._started_at = time.time()
         self._persistence = persistence_layer
         self._persist_interval_seconds = max(0.0, float(persist_interval_seconds))
         self._last_persisted_monotonic = 0.0
         self._dirty = False
+        self._dirty_since = 0.0
+        self._last_recorded_at = 0.0
+        self._flush_in_background = bool(flush_in_background)
+        self._checkpoint_every = max(1, int(checkpoint_every or _resolve_checkpoint_every()))
+        self._exact_chatters = (
+            _resolve_exact_chatters() if exact_chatters is None else bool(exact_chatters)
+        )
+        self._rollup_checkpoint_id = ""
+        self._rollup_delta_sequence = 0
+        self._force_checkpoint = True
+        self._flusher = ObservabilityFlusher(
+            self._flush_pending,
+            interval_seconds=self._persist_interval_seconds,
+        )
         self._persistence_source = "memory"
         self._persistence_updated_at = ""
         self._restored_from_persistence = False
-        self._counters: Counter[str] = Counter()
-        self._route_counts: Counter[str] = Counter()
-        self._minute_buckets: dict[int, dict[str, int]] = {}
-        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_WINDOW_MAX_ITEMS)
-        self._recent_events: deque[dict[str, Any]] = deque(maxlen=EVENT_LOG_MAX_ITEMS)
-        self._chatter_last_seen: dict[str, float] = {}
-        self._known_chatters: set[str] = set()
-        self._chat_events: deque[dict[str, Any]] = deque(maxlen=CHAT_EVENTS_MAX_ITEMS)
-        self._byte_trigger_events: deque[dict[str, Any]] = deque(
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS
-        )
-        self._interaction_events: deque[dict[str, Any]] = deque(
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS
-        )
-        self._quality_events: deque[dict[str, Any]] = deque(maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS)
-        self._token_usage_events: deque[dict[str, Any]] = deque(
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS
-        )
-        self._autonomy_goal_events: deque[dict[str, Any]] = deque(
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS
-        )
-        self._chatter_message_totals: Counter[str] = Counter()
-        self._trigger_user_totals: Counter[str] = Counter()
+        self._counters = TrackedCounter()
+        self._route_counts = TrackedCounter()
+        self._minute_buckets = MinuteBucketRing(TIMELINE_RING_CAPACITY)
+        self._latencies_ms = SequencedDeque(maxlen=LATENCY_WINDOW_MAX_ITEMS)
+        self._recent_events = SequencedDeque(maxlen=EVENT_LOG_MAX_ITEMS)
+        self._chatter_last_seen = RecencyMap()
+        self._chatter_sketch = HyperLogLog()
+        self._chatter_window_sketch = WindowedHyperLogLog()
+        # Conjunto exato so em modo debug (OBSERVABILITY_EXACT_CHATTERS).
+        self._known_chatters: set[str] | None = set() if self._exact_chatters else None
+        self._chat_events = new_event_log("_chat_events")
+        self._byte_trigger_events = new_event_log("_byte_trigger_events")
+        self._interaction_events = new_event_log("_interaction_events")
+        self._quality_events = new_event_log("_quality_events")
+        self._token_usage_events = new_event_log("_token_usage_events")
+        self._autonomy_goal_events = new_event_log("_autonomy_goal_events")
+        self._chatter_message_totals = SpaceSavingTopK()
+        self._trigger_user_totals = SpaceSavingTopK()
+        self._chatter_window_top = WindowedTopK()
+        self._trigger_window_top = WindowedTopK()
+        # Sketches de latencia sao so de memoria: janelas de ate 60m, sem rollup.
+        self._latency = LatencyRegistry()
+        self._windows = ObservabilityWindows(self)
+        self._persist_cursor: dict[str, Any] = {}
         self._last_prompt = ""
         self._last_reply = ""
         self._estimated_cost_usd_total = 0.0
@@ -121,128 +239,211 @@ class ObservabilityState:
             "scope_ok": False,
         }
         self._channel_scopes: dict[str, _ObservabilityScope] = {}
+        # Canais ociosos arquivados fora do rollup; voltam no proximo evento ou leitura.
+        self._archived_channels: set[str] = set()
+        self._local_scope_archives: dict[str, dict[str, Any]] = {}
         self._restore_from_persistence()
 
-    def _serialize_scope_locked(self, scope: Any) -> dict[str, Any]:
-        return {
-            "counters": {key: int(value) for key, value in scope._counters.items()},
-            "route_counts": {key: int(value) for key, value in scope._route_counts.items()},
-            "minute_buckets": {
-                str(key): {name: int(amount) for name, amount in bucket.items()}
-                for key, bucket in scope._minute_buckets.items()
-            },
-            "latencies_ms": [float(value) for value in scope._latencies_ms],
-            "recent_events": list(scope._recent_events),
-            "chatter_last_seen": {
-                str(key): float(value) for key, value in scope._chatter_last_seen.items()
-            },
-            "known_chatters": sorted(scope._known_chatters),
-            "chat_events": list(scope._chat_events),
-            "byte_trigger_events": list(scope._byte_trigger_events),
-            "interaction_events": list(scope._interaction_events),
-            "quality_events": list(scope._quality_events),
-            "token_usage_events": list(scope._token_usage_events),
-            "autonomy_goal_events": list(scope._autonomy_goal_events),
-            "chatter_message_totals": {
-                key: int(value) for key, value in scope._chatter_message_totals.items()
-            },
-            "trigger_user_totals": {
-                key: int(value) for key, value in scope._trigger_user_totals.items()
-            },
-            "last_prompt": str(scope._last_prompt or ""),
-            "last_reply": str(scope._last_reply or ""),
-            "estimated_cost_usd_total": float(scope._estimated_cost_usd_total or 0.0),
-        }
-
     def _restore_scope_locked(self, scope: Any, raw_state: dict[str, Any]) -> None:
-        scope._counters = Counter(
+        scope._counters = TrackedCounter(
             {str(key): int(value) for key, value in dict(raw_state.get("counters") or {}).items()}
         )
-        scope._route_counts = Counter(
+        scope._route_counts = TrackedCounter(
             {
                 str(key): int(value)
                 for key, value in dict(raw_state.get("route_counts") or {}).items()
             }
         )
-        scope._minute_buckets = {
-            int(key): {
+        scope._minute_buckets = MinuteBucketRing(TIMELINE_RING_CAPACITY)
+        for key, bucket in dict(raw_state.get("minute_buckets") or {}).items():
+            if not str(key).lstrip("-").isdigit():
+                continue
+            scope._minute_buckets[int(key)] = {
                 str(bucket_key): int(bucket_value)
                 for bucket_key, bucket_value in dict(bucket or {}).items()
             }
-            for key, bucket in dict(raw_state.get("minute_buckets") or {}).items()
-            if str(key).lstrip("-").isdigit()
-        }
-        scope._latencies_ms = deque(
+        scope._latencies_ms = SequencedDeque(
             [float(value) for value in list(raw_state.get("latencies_ms") or [])],
             maxlen=LATENCY_WINDOW_MAX_ITEMS,
         )
-        scope._recent_events = deque(
+        scope._recent_events = SequencedDeque(
             list(raw_state.get("recent_events") or []),
             maxlen=EVENT_LOG_MAX_ITEMS,
         )
-        scope._chatter_last_seen = {
-            str(key): float(value)
-            for key, value in dict(raw_state.get("chatter_last_seen") or {}).items()
-        }
-        scope._known_chatters = {
+        scope._chatter_last_seen = RecencyMap.from_mapping(
+            {
+                str(key): float(value)
+                for key, value in dict(raw_state.get("chatter_last_seen") or {}).items()
+            }
+        )
+        legacy_chatters = {
             str(value).strip().lower()
             for value in list(raw_state.get("known_chatters") or [])
             if str(value).strip()
         }
-        scope._chat_events = deque(
-            list(raw_state.get("chat_events") or []),
-            maxlen=CHAT_EVENTS_MAX_ITEMS,
-        )
-        scope._byte_trigger_events = deque(
-            list(raw_state.get("byte_trigger_events") or []),
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS,
-        )
-        scope._interaction_events = deque(
-            list(raw_state.get("interaction_events") or []),
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS,
-        )
-        scope._quality_events = deque(
-            list(raw_state.get("quality_events") or []),
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+        scope._chatter_sketch = HyperLogLog.from_payload(raw_state.get("chatter_sketch")) or (
+            HyperLogLog()
         )
-        scope._token_usage_events = deque(
-            list(raw_state.get("token_usage_events") or []),
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS,
+        scope._chatter_sketch.update(legacy_chatters)
+        scope._known_chatters = legacy_chatters if self._exact_chatters else None
+        for attribute, (raw_key, fields, _) in EVENT_LOG_SPECS.items():
+            rows = decode_event_rows(raw_state.get(raw_key), fields)
+            setattr(scope, attribute, new_event_log(attribute, rows))
+        scope._chatter_message_totals = SpaceSavingTopK.from_payload(
+            raw_state.get("chatter_message_totals")
         )
-        scope._autonomy_goal_events = deque(
-            list(raw_state.get("autonomy_goal_events") or []),
-            maxlen=BYTE_TRIGGER_EVENTS_MAX_ITEMS,
-        )
-        scope._chatter_message_totals = Counter(
-            {
-                str(key): int(value)
-                for key, value in dict(raw_state.get("chatter_message_totals") or {}).items()
-            }
-        )
-        scope._trigger_user_totals = Counter(
-            {
-                str(key): int(value)
-                for key, value in dict(raw_state.get("trigger_user_totals") or {}).items()
-            }
+        scope._trigger_user_totals = SpaceSavingTopK.from_payload(
+            raw_state.get("trigger_user_totals")
         )
         scope._last_prompt = str(raw_state.get("last_prompt") or "")
         scope._last_reply = str(raw_state.get("last_reply") or "")
         scope._estimated_cost_usd_total = float(raw_state.get("estimated_cost_usd_total") or 0.0)
 
-    def _build_rollup_payload_locked(self) -> dict[str, Any]:
+    def _supports_rollup_deltas(self) -> bool:
+        return all(
+            callable(getattr(self._persistence, name, None))
+            for name in (
+                "append_observability_rollup_delta_sync",
+                "load_observability_rollup_deltas_sync",
+                "clear_observability_rollup_deltas_sync",
+            )
+        )
+
+    def _clips_status_copy_locked(self) -> dict[str, bool]:
         return {
-            "schema_version": 2,
-            **self._serialize_scope_locked(self),
-            "clips_status": {
-                "token_valid": bool(self._clips_status.get("token_valid", False)),
-                "scope_ok": bool(self._clips_status.get("scope_ok", False)),
-            },
+            "token_valid": bool(self._clips_status.get("token_valid", False)),
+            "scope_ok": bool(self._clips_status.get("scope_ok", False)),
+        }
+
+    def _capture_rollup(
+        self, *, as_delta: bool, now: float
+    ) -> tuple[dict[str, Any], list[tuple[str, dict[str, Any]]]]:
+        """Captura o rollup escopo a escopo, cada um sob o proprio lock."""
+        capture_scope = capture_scope_delta_locked if as_delta else capture_scope_checkpoint_locked
+        with self._lock:
+            global_capture = capture_scope(self)
+        channel_captures: dict[str, dict[str, Any]] = {}
+        history_rows: list[tuple[str, dict[str, Any]]] = []
+        for channel_id, scope in self._channel_scope_items():
+            with scope._lock:
+                if scope._evicted:
+                    continue
+                prune_locked(scope, now)
+                scope_capture = capture_scope(scope)
+                if self._scope_has_activity_locked(scope):
+                    history_rows.append(
+                        (
+                            channel_id,
+                            self._build_channel_history_payload_locked(
+                                channel_id=channel_id, scope=scope, now=now
+                            ),
+                        )
+                    )
+            if scope_capture is not None:
+                channel_captures[channel_id] = scope_capture
+        with self._meta_lock:
+            clips_status = self._clips_status_copy_locked()
+        with self._scopes_lock:
+            archived_channels = sorted(self._archived_channels)
+        capture = {
+            "kind": "delta" if as_delta else "checkpoint",
+            "global": global_capture or {},
+            "clips_status": clips_status,
+            "channel_scopes": channel_captures,
+            "archived_channels": archived_channels,
+        }
+        return capture, history_rows
+
+    @staticmethod
+    def _build_rollup_payload(
+        capture: dict[str, Any], *, schema_version: int, columnar: bool
+    ) -> dict[str, Any]:
+        return {
+            "schema_version": schema_version,
+            **serialize_scope_capture(capture["global"], columnar=columnar),
+            "clips_status": capture["clips_status"],
+            "archived_channels": list(capture.get("archived_channels") or []),
             "channel_scopes": {
-                channel_id: self._serialize_scope_locked(scope)
-                for channel_id, scope in self._channel_scopes.items()
+                channel_id: serialize_scope_capture(scope_capture, columnar=columnar)
+                for channel_id, scope_capture in capture["channel_scopes"].items()
             },
         }
 
+    def _write_rollup(self, capture: dict[str, Any]) -> tuple[dict[str, Any], int]:
+        """Grava checkpoint (completo) ou delta; devolve o retorno da persistencia e bytes."""
+        if not self._supports_rollup_deltas():
+            payload = self._build_rollup_payload(capture, schema_version=2, columnar=False)
+            persisted = self._persistence.save_observability_rollup_sync(payload)
+            return persisted or {}, len(json.dumps(payload, separators=(",", ":")))
+
+        body = self._build_rollup_payload(capture, schema_version=3, columnar=True)
+        if capture["kind"] == "checkpoint":
+            checkpoint_id = uuid.uuid4().hex[:16]
+            document = {
+                "schema_version": 3,
+                "checkpoint_id": checkpoint_id,
+                **encode_rollup_document(body),
+            }
+            persisted = self._persistence.save_observability_rollup_sync(document)
+            self._persistence.clear_observability_rollup_deltas_sync()
+            self._rollup_checkpoint_id = checkpoint_id
+            self._rollup_delta_sequence = 0
+        else:
+            sequence = self._rollup_delta_sequence + 1
+            document = {
+                "schema_version": 3,
+                "checkpoint_id": self._rollup_checkpoint_id,
+                "sequence": sequence,
+                **encode_rollup_document(body),
+            }
+            persisted = self._persistence.append_observability_rollup_delta_sync(
+                self._rollup_checkpoint_id, sequence, document
+            )
+            self._rollup_delta_sequence = sequence
+        return persisted or {}, len(json.dumps(document, separators=(",", ":")))
+
+    def _restore_rollup_deltas_locked(self, checkpoint_id: str) -> int:
+        loader = getattr(self._persistence, "load_observability_rollup_deltas_sync", None)
+        if not checkpoint_id or not callable(loader):
+            return 0
+        try:
+            deltas = list(loader(checkpoint_id) or [])
+        except Exception:
+            return 0
+        applied = 0
+        ordered = sorted(
+            deltas, key=lambda item: int(dict(item.get("state") or {}).get("sequence") or 0)
+        )
+        for item in ordered:
+            document = dict(item.get("state") or {})
+            if str(document.get("checkpoint_id") or "") != checkpoint_id:
+                continue
+            try:
+                delta = decode_rollup_document(document)
+            except Exception:
+                break
+            apply_scope_delta_locked(self, delta)
+            if "clips_status" in delta:
+                self._clips_status = {
+                    "token_valid": bool(dict(delta["clips_status"]).get("token_valid", False)),
+                    "scope_ok": bool(dict(delta["clips_status"]).get("scope_ok", False)),
+                }
+            if "archived_channels" in delta:
+                self._archived_channels = {
+                    _normalize_channel_id(str(value))
+                    for value in list(delta.get("archived_channels") or [])
+                }
+            for raw_channel_id, scope_delta in dict(delta.get("channel_scopes") or {}).items():
+                if isinstance(scope_delta, dict):
+                    channel_id = _normalize_channel_id(str(raw_channel_id))
+                    scope = self._channel_scopes.get(channel_id)
+                    if scope is None:
+                        scope = self._new_channel_scope()
+                        self._channel_scopes[channel_id] = scope
+                    apply_scope_delta_locked(scope, scope_delta)
+            applied += 1
+        return applied
+
     def _restore_from_persistence(self) -> None:
         if not self._persistence:
             return
@@ -252,7 +453,11 @@ class ObservabilityState:
             return
         if not persisted:
             return
-        state = dict(persisted.get("state") or {})
+        document = dict(persisted.get("state") or {})
+        try:
+            state = decode_rollup_document(document)
+        except Exception:
+            return
         with self._lock:
             self._restore_scope_locked(self, state)
             restored_clips_status = dict(state.get("clips_status") or {})
@@ -266,63 +471,267 @@ class ObservabilityState:
                 if not isinstance(raw_scope_state, dict):
                     continue
                 channel_id = _normalize_channel_id(str(raw_channel_id))
-                scope = _ObservabilityScope()
+                scope = self._new_channel_scope()
                 self._restore_scope_locked(scope, dict(raw_scope_state))
                 self._channel_scopes[channel_id] = scope
+            self._archived_channels = {
+                _normalize_channel_id(str(value))
+                for value in list(state.get("archived_channels") or [])
+            }
+            self._restore_rollup_deltas_locked(str(document.get("checkpoint_id") or ""))
+            self._archived_channels.difference_update(self._channel_scopes)
+            restored_at = time.time()
+            for scope in (self, *self._channel_scopes.values()):
+                self._finish_scope_restore_locked(scope)
+                scope._last_activity_at = restored_at
             self._restored_from_persistence = True
             self._persistence_source = str(persisted.get("source") or "memory")
             self._persistence_updated_at = str(persisted.get("updated_at") or "")
 
-    def _persist_if_needed_locked(self, now: float, *, force: bool = False) -> None:
-        if not self._persistence or not self._dirty:
+    @staticmethod
+    def _finish_scope_restore_locked(scope: Any) -> None:
+        scope._windows = ObservabilityWindows(scope)
+        scope._chatter_window_sketch = _build_chatter_window_sketch(scope)
+        scope._chatter_window_top = _build_window_top(scope._chat_events)
+        scope._trigger_window_top = _build_window_top(scope._byte_trigger_events)
+        mark_persist_cursor_locked(scope)
+
+    def _request_flush_locked(self) -> None:
+        # Escritas seguem ``persist_interval_seconds`` mesmo sob trafego de leitura
+        # (dashboard, SSE); so ``flush()``/``close()`` gravam fora do intervalo.
+        if not self._persistence or not self._dirty or not self._flush_in_background:
             return
-        monotonic_now = time.monotonic()
         if (
-            not force
-            and self._persist_interval_seconds > 0
-            and monotonic_now - self._last_persisted_monotonic < self._persist_interval_seconds
+            self._persist_interval_seconds > 0
+            and time.monotonic() - self._last_persisted_monotonic < self._persist_interval_seconds
         ):
             return
-        try:
-            persisted = self._persistence.save_observability_rollup_sync(
-                self._build_rollup_payload_locked()
-            )
-        except Exception:
+        self._flusher.request()
+
+    def _mark_dirty(self, now: float) -> None:
+        with self._meta_lock:
+            if not self._dirty:
+                self._dirty_since = time.monotonic()
+            self._dirty = True
+            self._last_recorded_at = max(self._last_recorded_at, now)
+            self._request_flush_locked()
+
+    def _save_channel_history(self, rows: list[tuple[str, dict[str, Any]]]) -> None:
+        if not rows:
+            return
+        batch_writer = getattr(
+            self._persistence, "save_observability_channel_history_batch_sync", None
+        )
+        if callable(batch_writer):
+            try:
+                batch_writer(rows)
+            except Exception:
+                pass
             return
         history_writer = getattr(self._persistence, "save_observability_channel_history_sync", None)
-        if callable(history_writer):
-            for channel_id, scope in self._channel_scopes.items():
-                if not self._scope_has_activity_locked(scope):
-                    continue
-                try:
-                    history_writer(
-                        channel_id,
-                        self._build_channel_history_payload_locked(
-                            channel_id=channel_id,
-                            scope=scope,
-                            now=now,
-                        ),
-                    )
-                except Exception:
-                    continue
-        self._dirty = False
-        self._restored_from_persistence = True
-        self._last_persisted_monotonic = monotonic_now
-        self._persistence_source = str((persisted or {}).get("source") or "memory")
-        self._persistence_updated_at = str((persisted or {}).get("updated_at") or "")
+        if not callable(history_writer):
+            return
+        for channel_id, payload in rows:
+            try:
+                history_writer(channel_id, payload)
+            except Exception:
+                continue
 
-    def _mark_dirty_locked(self, now: float) -> None:
-        self._dirty = True
-        self._persist_if_needed_locked(now, force=False)
+    def _flush_pending(self) -> dict[str, Any] | None:
+        if not self._persistence:
+            return None
+        with self._meta_lock:
+            if not self._dirty:
+                return None
+            dirty_since = self._dirty_since
+            as_delta = (
+                not self._force_checkpoint
+                and bool(self._rollup_checkpoint_id)
+                and self._rollup_delta_sequence < self._checkpoint_every
+                and self._supports_rollup_deltas()
+            )
+            self._force_checkpoint = False
+            # Limpa antes de capturar: o que chegar durante a captura volta a sujar.
+            self._dirty = False
+            now = self._last_recorded_at
+        capture, history_rows = self._capture_rollup(as_delta=as_delta, now=now)
 
-    def _get_or_create_channel_scope_locked(self, channel_id: str | None) -> _ObservabilityScope:
+        try:
+            persisted, persisted_bytes = self._write_rollup(capture)
+        except Exception:
+            with self._meta_lock:
+                # O delta ja consumiu as mudancas rastreadas: so um checkpoint recupera.
+                self._force_checkpoint = True
+                self._dirty_since = (
+                    min(self._dirty_since, dirty_since) if self._dirty else dirty_since
+                )
+                self._dirty = True
+            return {"ok": False, "dirty_since": dirty_since, "kind": capture["kind"]}
+        self._save_channel_history(history_rows)
+
+        with self._meta_lock:
+            self._restored_from_persistence = True
+            self._last_persisted_monotonic = time.monotonic()
+            self._persistence_source = str(persisted.get("source") or "memory")
+            self._persistence_updated_at = str(persisted.get("updated_at") or "")
+        return {
+            "ok": True,
+            "dirty_since": dirty_since,
+            "channels": len(history_rows),
+            "kind": capture["kind"],
+            "bytes": persisted_bytes,
+        }
+
+    def flush(self) -> bool:
+        """Persiste imediatamente o que estiver pendente (bloqueante, fora do lock)."""
+        return self._flusher.run_once()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._flusher.stop(timeout=timeout)
+
+    def _get_or_create_channel_scope(self, channel_id: str | None) -> _ObservabilityScope:
+        return cast(_ObservabilityScope, self._lookup_channel_scope(channel_id, create=True))
+
+    def _lookup_channel_scope(
+        self, channel_id: str | None, *, create: bool
+    ) -> _ObservabilityScope | None:
+        """Devolve o escopo do canal, reidratando do arquivo se ele foi despejado.
+
+        Com ``create=False`` so reidrata: canal nunca visto devolve ``None``.
+        """
         safe_channel_id = _normalize_channel_id(channel_id)
         scope = self._channel_scopes.get(safe_channel_id)
-        if scope is None:
-            scope = _ObservabilityScope()
+        if scope is not None:
+            return scope
+        with self._scopes_lock:
+            scope = self._channel_scopes.get(safe_channel_id)
+            if scope is not None:
+                return scope
+            if safe_channel_id not in self._archived_channels:
+                if not create:
+                    return None
+                scope = self._new_channel_scope()
+                self._channel_scopes[safe_channel_id] = scope
+                return scope
+        # I/O do arquivo fora dos locks; corrida entre dois reidratadores so duplica a leitura.
+        raw_state = self._load_scope_archive(safe_channel_id)
+        with self._scopes_lock:
+            scope = self._channel_scopes.get(safe_channel_id)
+            if scope is not None:
+                return scope
+            scope = self._new_channel_scope()
+            with scope._lock:
+                if raw_state:
+                    self._restore_scope_locked(scope, raw_state)
+                self._finish_scope_restore_locked(scope)
+                scope._last_activity_at = time.time()
             self._channel_scopes[safe_channel_id] = scope
+            self._archived_channels.discard(safe_channel_id)
+            self._local_scope_archives.pop(safe_channel_id, None)
+        # O escopo volta ao rollup inteiro: so um checkpoint o carrega de novo.
+        with self._meta_lock:
+            self._force_checkpoint = True
+        self._mark_dirty(resolve_now(None))
+        return scope
+
+    def _load_scope_archive(self, channel_id: str) -> dict[str, Any] | None:
+        document = self._local_scope_archives.get(channel_id)
+        loader = getattr(self._persistence, "load_observability_scope_archive_sync", None)
+        if document is None and callable(loader):
+            try:
+                persisted = loader(channel_id)
+            except Exception:
+                persisted = None
+            document = dict((persisted or {}).get("state") or {}) or None
+        if not document:
+            return None
+        try:
+            return decode_rollup_document(document)
+        except Exception:
+            return None
+
+    def _write_scope_archive(self, channel_id: str, document: dict[str, Any]) -> None:
+        writer = getattr(self._persistence, "save_observability_scope_archive_sync", None)
+        if callable(writer):
+            try:
+                writer(channel_id, document)
+                return
+            except Exception:
+                pass
+        # Sem persistencia (ou com falha) o arquivo fica comprimido em memoria.
+        self._local_scope_archives[channel_id] = document
+
+    def evict_idle_scopes(
+        self,
+        *,
+        max_age_seconds: float | None = None,
+        timestamp: float | None = None,
+    ) -> int:
+        """Arquiva e remove da memoria os escopos de canal ociosos.
+
+        Cada escopo despejado grava um checkpoint proprio (mesmo formato do
+        rollup) e uma linha de historico do canal; o rollup seguinte e um
+        checkpoint sem ele. O escopo volta no proximo evento ou leitura do canal.
+        """
+        now = resolve_now(timestamp)
+        safe_max_age = (
+            _resolve_scope_idle_seconds() if max_age_seconds is None else float(max_age_seconds)
+        )
+        evicted = 0
+        history_rows: list[tuple[str, dict[str, Any]]] = []
+        for channel_id, scope in self._channel_scope_items():
+            if channel_id == "default":
+                continue
+            with scope._lock:
+                if scope._evicted or now - scope._last_activity_at <= safe_max_age:
+                    continue
+                prune_locked(scope, now)
+                if self._scope_has_activity_locked(scope):
+                    history_rows.append(
+                        (
+                            channel_id,
+                            self._build_channel_history_payload_locked(
+                                channel_id=channel_id, scope=scope, now=now
+                            ),
+                        )
+                    )
+                body = serialize_scope_capture(
+                    capture_scope_checkpoint_locked(scope), columnar=True
+                )
+                # Grava ainda sob o lock do canal (ocioso): quem chegar agora espera e
+                # reidrata do arquivo ja escrito.
+                self._write_scope_archive(
+                    channel_id,
+                    {
+                        "schema_version": 3,
+                        "channel_id": channel_id,
+                        "archived_at": utc_iso(now),
+                        **encode_rollup_document(body),
+                    },
+                )
+                scope._evicted = True
+                with self._scopes_lock:
+                    self._channel_scopes.pop(channel_id, None)
+                    self._archived_channels.add(channel_id)
+            evicted += 1
+        if not evicted:
+            return 0
+        self._save_channel_history(history_rows)
+        with self._meta_lock:
+            self._force_checkpoint = True
+        self._mark_dirty(now)
+        return evicted
+
+    def _new_channel_scope(self) -> _ObservabilityScope:
+        scope = _ObservabilityScope()
+        if self._exact_chatters:
+            scope._known_chatters = set()
         return scope
 
+    def _channel_scope_items(self) -> list[tuple[str, _ObservabilityScope]]:
+        with self._scopes_lock:
+            return list(self._channel_scopes.items())
+
     @staticmethod
     def _scope_has_activity_locked(scope: _ObservabilityScope) -> bool:
         return bool(
@@ -334,10 +743,6 @@ class ObservabilityState:
             or scope._recent_events
         )
 
-    @staticmethod
-    def _count_recent_events_locked(events: deque[dict[str, Any]], *, cutoff: float) -> int:
-        return sum(1 for event in events if float(event.get("ts", 0.0)) >= cutoff)
-
     def _build_channel_history_payload_locked(
         self,
         *,
@@ -345,41 +750,20 @@ class ObservabilityState:
         scope: _ObservabilityScope,
         now: float,
     ) -> dict[str, Any]:
-        cutoff_60m = now - 3600
-        messages_60m = self._count_recent_events_locked(scope._chat_events, cutoff=cutoff_60m)
-        triggers_60m = self._count_recent_events_locked(
-            scope._byte_trigger_events,
-            cutoff=cutoff_60m,
-        )
-        interactions_60m = self._count_recent_events_locked(
-            scope._interaction_events,
-            cutoff=cutoff_60m,
-        )
-        retry_60m = sum(
-            1
-            for event in scope._quality_events
-            if float(event.get("ts", 0.0)) >= cutoff_60m
-            and str(event.get("outcome") or "").strip().lower() == "retry"
-        )
-        fallback_60m = sum(
-            1
-            for event in scope._quality_events
-            if float(event.get("ts", 0.0)) >= cutoff_60m
-            and str(event.get("outcome") or "").strip().lower() == "fallback"
-        )
-        ignored_60m = sum(
-            1
-            for event in scope._quality_events
-            if float(event.get("ts", 0.0)) >= cutoff_60m
-            and str(event.get("outcome") or "").strip().lower() == "ignored"
-        )
+        windows = scope._windows
+        windows.expire(now)
+        messages_60m = int(windows.chat_60m.total("count"))
+        triggers_60m = int(windows.triggers_60m.total("count"))
+        interactions_60m = int(windows.interactions_60m.total("count"))
+        quality_outcomes = windows.quality_60m.group("outcomes")
+        retry_60m = int(quality_outcomes.get("retry", 0))
+        fallback_60m = int(quality_outcomes.get("fallback", 0))
+        ignored_60m = int(quality_outcomes.get("ignored", 0))
         useful_60m = max(0, interactions_60m - ignored_60m)
         useful_rate = (useful_60m / interactions_60m) * 100 if interactions_60m else 0.0
         ignored_rate = (ignored_60m / interactions_60m) * 100 if interactions_60m else 0.0
 
-        active_60m = sum(
-            1 for seen in scope._chatter_last_seen.values() if now - float(seen) <= 3600
-        )
+        active_60m = scope._chatter_last_seen.count_since(now - WINDOW_60M_SECONDS)
         from bot.sentiment_engine import sentiment_engine  # lazy import avoids startup side effects
 
         sentiment_scores = sentiment_engine.get_scores(channel_id)
@@ -420,7 +804,7 @@ class ObservabilityState:
                 "errors_total": int(scope._counters.get("errors_total", 0)),
             },
             "chatters": {
-                "unique_total": len(scope._known_chatters),
+                "unique_total": scope._chatter_sketch.count(),
                 "active_60m": int(active_60m),
             },
             "chat_analytics": chat_analytics,
@@ -436,24 +820,37 @@ class ObservabilityState:
             },
         }
 
-    def _record_scoped_locked(
+    def _record_scoped(
         self,
         *,
         channel_id: str | None,
         recorder: Callable[..., None],
         now: float,
+        persist: bool = True,
         **kwargs: Any,
     ) -> None:
-        recorder(self, now=now, **kwargs)
-        recorder(self._get_or_create_channel_scope_locked(channel_id), now=now, **kwargs)
+        while True:
+            scope = self._get_or_create_channel_scope(channel_id)
+            with scope._lock:
+                if scope._evicted:
+                    continue
+                recorder(scope, now=now, **kwargs)
+                scope._last_activity_at = max(scope._last_activity_at, now)
+                break
+        # Locks em sequencia, nunca aninhados: o agregado global custa microssegundos
+        # e so um snapshot global segura a ingestao enquanto monta o payload.
+        with self._lock:
+            recorder(self, now=now, **kwargs)
+        if persist:
+            self._mark_dirty(now)
 
     def update_clips_auth_status(
         self, *, token_valid: bool, scope_ok: bool, timestamp: float | None = None
     ) -> None:
-        with self._lock:
+        with self._meta_lock:
             self._clips_status["token_valid"] = bool(token_valid)
             self._clips_status["scope_ok"] = bool(scope_ok)
-            self._mark_dirty_locked(resolve_now(timestamp))
+        self._mark_dirty(resolve_now(timestamp))
 
     def record_chat_message(
         self,
@@ -465,16 +862,14 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_chat_message_locked,
-                now=now,
-                author_name=author_name,
-                source=source,
-                text=text,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_chat_message_locked,
+            now=now,
+            author_name=author_name,
+            source=source,
+            text=text,
+        )
 
     def record_byte_trigger(
         self,
@@ -486,29 +881,25 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_byte_trigger_locked,
-                now=now,
-                prompt=prompt,
-                source=source,
-                author_name=author_name,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_byte_trigger_locked,
+            now=now,
+            prompt=prompt,
+            source=source,
+            author_name=author_name,
+        )
 
     def record_reply(
         self, *, text: str, channel_id: str | None = None, timestamp: float | None = None
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_reply_locked,
-                now=now,
-                text=text,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_reply_locked,
+            now=now,
+            text=text,
+        )
 
     def record_quality_gate(
         self,
@@ -519,15 +910,13 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_quality_gate_locked,
-                now=now,
-                outcome=outcome,
-                reason=reason,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_quality_gate_locked,
+            now=now,
+            outcome=outcome,
+            reason=reason,
+        )
 
     def record_byte_interaction(
         self,
@@ -545,22 +934,45 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_byte_interaction_locked,
-                now=now,
-                route=route,
-                author_name=author_name,
-                prompt_chars=prompt_chars,
-                reply_parts=reply_parts,
-                reply_chars=reply_chars,
-                serious=serious,
-                follow_up=follow_up,
-                current_events=current_events,
-                latency_ms=latency_ms,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_byte_interaction_locked,
+            now=now,
+            route=route,
+            author_name=author_name,
+            prompt_chars=prompt_chars,
+            reply_parts=reply_parts,
+            reply_chars=reply_chars,
+            serious=serious,
+            follow_up=follow_up,
+            current_events=current_events,
+            latency_ms=latency_ms,
+        )
+
+    def record_latency(
+        self,
+        *,
+        operation: str,
+        name: str,
+        latency_ms: float,
+        channel_id: str | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Registra a duracao de uma chamada externa (LLM, persistencia, busca, IRC).
+
+        Nao marca o estado como sujo: os sketches nao entram no rollup, e assim
+        a propria escrita do rollup pode ser medida sem disparar outro flush.
+        """
+        now = resolve_now(timestamp)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_latency_locked,
+            now=now,
+            persist=False,
+            operation=operation,
+            name=name,
+            latency_ms=latency_ms,
+        )
 
     def record_token_usage(
         self,
@@ -572,16 +984,14 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_token_usage_locked,
-                now=now,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                estimated_cost_usd=estimated_cost_usd,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_token_usage_locked,
+            now=now,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            estimated_cost_usd=estimated_cost_usd,
+        )
 
     def record_autonomy_goal(
         self,
@@ -593,16 +1003,14 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_autonomy_goal_locked,
-                now=now,
-                risk=risk,
-                outcome=outcome,
-                details=details,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_autonomy_goal_locked,
+            now=now,
+            risk=risk,
+            outcome=outcome,
+            details=details,
+        )
 
     def record_auto_scene_update(
         self,
@@ -612,40 +1020,34 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_auto_scene_update_locked,
-                now=now,
-                update_types=update_types,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_auto_scene_update_locked,
+            now=now,
+            update_types=update_types,
+        )
 
     def record_token_refresh(
         self, *, reason: str, channel_id: str | None = None, timestamp: float | None = None
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_token_refresh_locked,
-                now=now,
-                reason=reason,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_token_refresh_locked,
+            now=now,
+            reason=reason,
+        )
 
     def record_auth_failure(
         self, *, details: str, channel_id: str | None = None, timestamp: float | None = None
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_auth_failure_locked,
-                now=now,
-                details=details,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_auth_failure_locked,
+            now=now,
+            details=details,
+        )
 
     def record_error(
         self,
@@ -656,28 +1058,151 @@ class ObservabilityState:
         timestamp: float | None = None,
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_error_locked,
-                now=now,
-                category=category,
-                details=details,
-            )
-            self._mark_dirty_locked(now)
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_error_locked,
+            now=now,
+            category=category,
+            details=details,
+        )
 
     def record_vision_frame(
         self, *, analysis: str, channel_id: str | None = None, timestamp: float | None = None
     ) -> None:
         now = resolve_now(timestamp)
-        with self._lock:
-            self._record_scoped_locked(
-                channel_id=channel_id,
-                recorder=record_vision_frame_locked,
+        self._record_scoped(
+            channel_id=channel_id,
+            recorder=record_vision_frame_locked,
+            now=now,
+            analysis=analysis,
+        )
+
+    def _resolve_read_scope(self, channel_id: str | None) -> tuple[Any, str]:
+        if channel_id is None:
+            return self, "default"
+        selected_channel_id = _normalize_channel_id(channel_id)
+        scope = self._lookup_channel_scope(selected_channel_id, create=False)
+        return scope or _ObservabilityScope(), selected_channel_id
+
+    def query_metrics(
+        self,
+        names: Iterable[str],
+        *,
+        channel_id: str | None = None,
+        timestamp: float | None = None,
+    ) -> dict[str, Any]:
+        """Le so as metricas pedidas dos agregados ja mantidos, sem snapshot."""
+        safe_names = validate_metric_names(names)
+        now = resolve_now(timestamp)
+        scope, selected_channel_id = self._resolve_read_scope(channel_id)
+        with scope._lock:
+            prune_locked(scope, now)
+            query = MetricQuery(
+                scope=scope,
                 now=now,
-                analysis=analysis,
+                started_at=self._started_at,
+                channel_id=selected_channel_id,
             )
-            self._mark_dirty_locked(now)
+            return read_metrics_locked(query, safe_names)
+
+    @staticmethod
+    def _export_scope_locked(scope: Any) -> dict[str, Any]:
+        windows = scope._windows
+        return {
+            "counters": dict(scope._counters),
+            "estimated_cost_usd_total": float(scope._estimated_cost_usd_total),
+            "windows": {
+                "chat_messages_10m": int(windows.chat_10m.total("count")),
+                "chat_messages_60m": int(windows.chat_60m.total("count")),
+                "byte_triggers_10m": int(windows.triggers_10m.total("count")),
+                "byte_triggers_60m": int(windows.triggers_60m.total("count")),
+            },
+        }
+
+    def export_metrics(self, *, timestamp: float | None = None) -> dict[str, Any]:
+        """Copia dos agregados para ``/metrics``: sem snapshot e sem pedir flush."""
+        now = resolve_now(timestamp)
+        channels: dict[str, dict[str, Any]] = {}
+        for channel_id, scope in self._channel_scope_items():
+            with scope._lock:
+                prune_locked(scope, now)
+                channels[channel_id] = self._export_scope_locked(scope)
+        with self._lock:
+            prune_locked(self, now)
+            global_scope = self._export_scope_locked(self)
+            latency = self._latency.histograms()
+        with self._meta_lock:
+            flusher = self._flusher.get_status(
+                dirty_since=self._dirty_since if self._dirty else None
+            )
+            dirty = bool(self._dirty)
+        return {
+            "uptime_seconds": max(0.0, now - self._started_at),
+            "global": global_scope,
+            "channels": channels,
+            "latency": latency,
+            "persistence": {"dirty": dirty, "flusher": flusher},
+        }
+
+    def _snapshot_scope_locked(
+        self,
+        scope: Any,
+        *,
+        now: float,
+        channel_id: str,
+        clips_status: dict[str, bool],
+        bot_brand: str,
+        bot_version: str,
+        bot_mode: str,
+        stream_context: Any,
+        sections: frozenset[str] | None,
+    ) -> dict[str, Any]:
+        prune_locked(scope, now)
+        wants_events = sections is None or "recent_events" in sections
+        return build_observability_snapshot(
+            now=now,
+            started_at=self._started_at,
+            counters=dict(scope._counters),
+            route_counts=dict(scope._route_counts),
+            latencies_ms=list(scope._latencies_ms),
+            minute_buckets=scope._minute_buckets,
+            recent_events=list(scope._recent_events) if wants_events else [],
+            active_chatters_10m=scope._chatter_last_seen.count_since(now - WINDOW_10M_SECONDS),
+            active_chatters_60m=scope._chatter_last_seen.count_since(now - WINDOW_60M_SECONDS),
+            windows=scope._windows,
+            chatter_message_totals=scope._chatter_message_totals,
+            trigger_user_totals=scope._trigger_user_totals,
+            chatter_window_top=scope._chatter_window_top,
+            trigger_window_top=scope._trigger_window_top,
+            latency_summary=scope._latency.summary(now),
+            unique_chatters_total=scope._chatter_sketch.count(),
+            unique_chatters_exact=(
+                len(scope._known_chatters) if scope._known_chatters is not None else None
+            ),
+            last_prompt=scope._last_prompt,
+            last_reply=scope._last_reply,
+            estimated_cost_usd_total=float(scope._estimated_cost_usd_total),
+            clips_status=clips_status,
+            bot_brand=bot_brand,
+            bot_version=bot_version,
+            bot_mode=bot_mode,
+            stream_context=stream_context,
+            channel_id=channel_id,
+            sections=sections,
+        )
+
+    def _persistence_status_locked(self) -> dict[str, Any]:
+        return {
+            "enabled": bool(self._persistence),
+            "restored": bool(self._restored_from_persistence),
+            "source": str(self._persistence_source or "memory"),
+            "updated_at": str(self._persistence_updated_at or ""),
+            "dirty": bool(self._dirty),
+            "persist_interval_seconds": float(self._persist_interval_seconds),
+            "flusher": self._flusher.get_status(
+                dirty_since=self._dirty_since if self._dirty else None
+            ),
+        }
 
     def snapshot(
         self,
@@ -688,52 +1213,69 @@ class ObservabilityState:
         stream_context: Any,
         channel_id: str | None = None,
         timestamp: float | None = None,
+        sections: frozenset[str] | None = None,
     ) -> dict[str, Any]:
         now = resolve_now(timestamp)
-        with self._lock:
-            prune_locked(self, now)
-            for scope in self._channel_scopes.values():
-                prune_locked(scope, now)
-            self._persist_if_needed_locked(now, force=True)
-            scope: Any = self
-            selected_channel_id = "default"
-            if channel_id is not None:
-                selected_channel_id = _normalize_channel_id(channel_id)
-                scope = self._channel_scopes.get(selected_channel_id) or _ObservabilityScope()
-            snapshot = build_observability_snapshot(
+        with self._meta_lock:
+            self._request_flush_locked()
+            clips_status = dict(self._clips_status)
+        scope, selected_channel_id = self._resolve_read_scope(channel_id)
+        with scope._lock:
+            snapshot = self._snapshot_scope_locked(
+                scope,
                 now=now,
-                started_at=self._started_at,
-                counters=dict(scope._counters),
-                route_counts=dict(scope._route_counts),
-                latencies_ms=list(scope._latencies_ms),
-                minute_buckets={key: value.copy() for key, value in scope._minute_buckets.items()},
-                recent_events=list(scope._recent_events),
-                chatter_last_seen=dict(scope._chatter_last_seen),
-                chat_events=list(scope._chat_events),
-                byte_trigger_events=list(scope._byte_trigger_events),
-                interaction_events=list(scope._interaction_events),
-                quality_events=list(scope._quality_events),
-                token_usage_events=list(scope._token_usage_events),
-                autonomy_goal_events=list(scope._autonomy_goal_events),
-                chatter_message_totals=dict(scope._chatter_message_totals),
-                trigger_user_totals=dict(scope._trigger_user_totals),
-                unique_chatters_total=len(scope._known_chatters),
-                last_prompt=scope._last_prompt,
-                last_reply=scope._last_reply,
-                estimated_cost_usd_total=float(scope._estimated_cost_usd_total),
-                clips_status=dict(self._clips_status),
+                channel_id=selected_channel_id,
+                clips_status=clips_status,
                 bot_brand=bot_brand,
                 bot_version=bot_version,
                 bot_mode=bot_mode,
                 stream_context=stream_context,
-                channel_id=selected_channel_id,
+                sections=sections,
             )
-            snapshot["persistence"] = {
-                "enabled": bool(self._persistence),
-                "restored": bool(self._restored_from_persistence),
-                "source": str(self._persistence_source or "memory"),
-                "updated_at": str(self._persistence_updated_at or ""),
-                "dirty": bool(self._dirty),
-                "persist_interval_seconds": float(self._persist_interval_seconds),
-            }
+        with self._meta_lock:
+            snapshot["persistence"] = self._persistence_status_locked()
             return snapshot
+
+    def snapshot_many(
+        self,
+        channels: Iterable[tuple[str, Any]],
+        *,
+        bot_brand: str,
+        bot_version: str,
+        bot_mode: str,
+        timestamp: float | None = None,
+        sections: frozenset[str] | None = None,
+    ) -> dict[str, Any]:
+        """Snapshots de varios canais numa passada, com o mesmo ``now``.
+
+        ``channels`` traz pares ``(channel_id, stream_context)``. O lock de
+        metadados e tomado uma unica vez (flush, clips e persistencia saem
+        compartilhados) e cada escopo e lido sob o proprio lock, em sequencia.
+        """
+        now = resolve_now(timestamp)
+        with self._meta_lock:
+            self._request_flush_locked()
+            clips_status = dict(self._clips_status)
+            persistence = self._persistence_status_locked()
+        snapshots: dict[str, dict[str, Any]] = {}
+        for channel_id, stream_context in channels:
+            scope, selected_channel_id = self._resolve_read_scope(channel_id)
+            if selected_channel_id in snapshots:
+                continue
+            with scope._lock:
+                snapshots[selected_channel_id] = self._snapshot_scope_locked(
+                    scope,
+                    now=now,
+                    channel_id=selected_channel_id,
+                    clips_status=clips_status,
+                    bot_brand=bot_brand,
+                    bot_version=bot_version,
+                    bot_mode=bot_mode,
+                    stream_context=stream_context,
+                    sections=sections,
+                )
+        return {
+            "timestamp": utc_iso(now),
+            "channels": snapshots,
+            "persistence": persistence,
+        }
@@ -4,10 +4,12 @@ from typing import Any
 from bot.observability_helpers import (
     BYTE_TRIGGER_EVENTS_RETENTION_SECONDS,
     CHAT_EVENTS_RETENTION_SECONDS,
+    CHATTER_LAST_SEEN_RETENTION_SECONDS,
     TIMELINE_RETENTION_MINUTES,
     clip_preview,
     utc_iso,
 )
+from bot.observability_structures import ColumnarEventLog, RollingWindow
 
 
 def resolve_now(timestamp: float | None) -> float:
@@ -47,41 +49,27 @@ def append_event_locked(state: Any, now: float, level: str, event: str, message:
     )
 
 
-def prune_locked(state: Any, now: float) -> None:
-    oldest_minute = int(now // 60) - TIMELINE_RETENTION_MINUTES
-    for minute_key in list(state._minute_buckets):
-        if minute_key < oldest_minute:
-            del state._minute_buckets[minute_key]
+def append_windowed_locked(
+    events: ColumnarEventLog, event: dict[str, Any], *windows: RollingWindow
+) -> None:
+    if events.is_full():
+        for window in windows:
+            window.evict(events.first_seq)
+    events.append(event)
+    for window in windows:
+        window.add(event)
 
-    oldest_chatter_cutoff = now - 86400
-    for chatter, last_seen in list(state._chatter_last_seen.items()):
-        if last_seen < oldest_chatter_cutoff:
-            del state._chatter_last_seen[chatter]
 
-    chat_cutoff = now - CHAT_EVENTS_RETENTION_SECONDS
-    while state._chat_events and float(state._chat_events[0].get("ts", 0.0)) < chat_cutoff:
-        state._chat_events.popleft()
+def prune_locked(state: Any, now: float) -> None:
+    state._windows.expire(now)
+    state._minute_buckets.expire_before(int(now // 60) - TIMELINE_RETENTION_MINUTES)
+    state._chatter_last_seen.expire_before(now - CHATTER_LAST_SEEN_RETENTION_SECONDS)
 
+    chat_cutoff = now - CHAT_EVENTS_RETENTION_SECONDS
+    state._chat_events.expire_before(chat_cutoff)
     trigger_cutoff = now - BYTE_TRIGGER_EVENTS_RETENTION_SECONDS
-    while (
-        state._byte_trigger_events
-        and float(state._byte_trigger_events[0].get("ts", 0.0)) < trigger_cutoff
-    ):
-        state._byte_trigger_events.popleft()
-    while (
-        state._interaction_events
-        and float(state._interaction_events[0].get("ts", 0.0)) < trigger_cutoff
-    ):
-        state._interaction_events.popleft()
-    while state._quality_events and float(state._quality_events[0].get("ts", 0.0)) < trigger_cutoff:
-        state._quality_events.popleft()
-    while (
-        state._token_usage_events
-        and float(state._token_usage_events[0].get("ts", 0.0)) < trigger_cutoff
-    ):
-        state._token_usage_events.popleft()
-    while (
-        state._autonomy_goal_events
-        and float(state._autonomy_goal_events[0].get("ts", 0.0)) < trigger_cutoff
-    ):
-        state._autonomy_goal_events.popleft()
+    state._byte_trigger_events.expire_before(trigger_cutoff)
+    state._interaction_events.expire_before(trigger_cutoff)
+    state._quality_events.expire_before(trigger_cutoff)
+    state._token_usage_events.expire_before(trigger_cutoff)
+    state._autonomy_goal_events.expire_before(trigger_cutoff)
@@ -1,7 +1,12 @@
 from typing import Any
 
 from bot.observability_helpers import clip_preview
-from bot.observability_state_core import append_event_locked, bump_timeline_locked, prune_locked
+from bot.observability_state_core import (
+    append_event_locked,
+    append_windowed_locked,
+    bump_timeline_locked,
+    prune_locked,
+)
 
 
 def record_chat_message_locked(
@@ -22,7 +27,8 @@ def record_chat_message_locked(
     state._counters["chat_messages_total"] += 1
     state._counters[f"chat_messages_{safe_source}"] += 1
     bump_timeline_locked(state, now, chat_messages=1)
-    state._chat_events.append(
+    append_windowed_locked(
+        state._chat_events,
         {
             "ts": now,
             "source": safe_source,
@@ -30,12 +36,18 @@ def record_chat_message_locked(
             "length": len(message_text),
             "is_command": is_command,
             "has_url": has_url,
-        }
+        },
+        state._windows.chat_10m,
+        state._windows.chat_60m,
     )
     if safe_author:
-        state._known_chatters.add(safe_author)
-        state._chatter_last_seen[safe_author] = now
-        state._chatter_message_totals[safe_author] += 1
+        state._chatter_sketch.add(safe_author)
+        state._chatter_window_sketch.add(safe_author, now)
+        if state._known_chatters is not None:
+            state._known_chatters.add(safe_author)
+        state._chatter_last_seen.touch(safe_author, now)
+        state._chatter_message_totals.increment(safe_author)
+        state._chatter_window_top.add(safe_author, now)
     if is_command:
         state._counters["chat_prefixed_messages"] += 1
     if has_url:
@@ -58,8 +70,14 @@ def record_byte_trigger_locked(
 
     state._counters["byte_triggers_total"] += 1
     state._counters[f"byte_triggers_{safe_source}"] += 1
-    state._trigger_user_totals[safe_author_key] += 1
-    state._byte_trigger_events.append({"ts": now, "author": safe_author_key, "source": safe_source})
+    state._trigger_user_totals.increment(safe_author_key)
+    state._trigger_window_top.add(safe_author_key, now)
+    append_windowed_locked(
+        state._byte_trigger_events,
+        {"ts": now, "author": safe_author_key, "source": safe_source},
+        state._windows.triggers_10m,
+        state._windows.triggers_60m,
+    )
     state._last_prompt = prompt_preview
     bump_timeline_locked(state, now, byte_triggers=1)
     append_event_locked(state, now, "INFO", "byte_trigger", f"{safe_author}: {prompt_preview}")
@@ -90,12 +108,14 @@ def record_quality_gate_locked(
 
     state._counters["quality_checks_total"] += 1
     state._counters[f"quality_{safe_outcome}_total"] += 1
-    state._quality_events.append(
+    append_windowed_locked(
+        state._quality_events,
         {
             "ts": now,
             "outcome": safe_outcome,
             "reason": safe_reason,
-        }
+        },
+        state._windows.quality_60m,
     )
     append_event_locked(state, now, event_level, "quality_gate", f"{safe_outcome}: {safe_reason}")
     prune_locked(state, now)
@@ -125,13 +145,15 @@ def record_byte_interaction_locked(
     state._counters["interaction_reply_chars_total"] += max(0, int(reply_chars))
     llm_route = safe_route.startswith("llm")
     useful_llm = llm_route and "fallback" not in safe_route
-    state._interaction_events.append(
+    append_windowed_locked(
+        state._interaction_events,
         {
             "ts": now,
             "route": safe_route,
             "is_llm": llm_route,
             "is_useful_llm": useful_llm,
-        }
+        },
+        state._windows.interactions_60m,
     )
     if safe_route.startswith("llm"):
         state._counters["llm_interactions_total"] += 1
@@ -144,6 +166,7 @@ def record_byte_interaction_locked(
         state._counters["current_events_interactions_total"] += 1
     if latency_ms >= 0:
         state._latencies_ms.append(float(latency_ms))
+        state._latency.record("route", safe_route, latency_ms, now)
     details = (
         f"{safe_route} by {safe_author} | prompt={max(0, int(prompt_chars))} chars | "
         f"replies={max(0, int(reply_parts))} | latency={round(max(0.0, latency_ms), 1)}ms"
@@ -167,13 +190,15 @@ def record_token_usage_locked(
     state._counters["token_input_total"] += safe_input
     state._counters["token_output_total"] += safe_output
     state._estimated_cost_usd_total += safe_cost
-    state._token_usage_events.append(
+    append_windowed_locked(
+        state._token_usage_events,
         {
             "ts": now,
             "input_tokens": safe_input,
             "output_tokens": safe_output,
             "estimated_cost_usd": safe_cost,
-        }
+        },
+        state._windows.tokens_60m,
     )
     prune_locked(state, now)
 
@@ -192,12 +217,14 @@ def record_autonomy_goal_locked(
 
     state._counters["autonomy_goals_total"] += 1
     state._counters[f"autonomy_{safe_risk}_{safe_outcome}_total"] += 1
-    state._autonomy_goal_events.append(
+    append_windowed_locked(
+        state._autonomy_goal_events,
         {
             "ts": now,
             "risk": safe_risk,
             "outcome": safe_outcome,
-        }
+        },
+        state._windows.autonomy_60m,
     )
     append_event_locked(
         state,
@@ -256,3 +283,14 @@ def record_vision_frame_locked(state: Any, *, now: float, analysis: str) -> None
     state._counters["vision_frames_total"] += 1
     append_event_locked(state, now, "INFO", "vision_frame", safe_analysis or "frame ingested")
     prune_locked(state, now)
+
+
+def record_latency_locked(
+    state: Any,
+    *,
+    now: float,
+    operation: str,
+    name: str,
+    latency_ms: float,
+) -> None:
+    state._latency.record(operation, name, latency_ms, now)
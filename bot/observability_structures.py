@@ -0,0 +1,405 @@
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+
+class MinuteBucketRing:
+    """Anel fixo de buckets por minuto.
+
+    Cada minuto ocupa o slot ``minute % capacity``; minutos expirados sao
+    descartados ao sobrescrever o slot ou ao subir o piso via ``expire_before``,
+    sem varrer o anel inteiro.
+    """
+
+    __slots__ = ("_buckets", "_capacity", "_floor", "_keys")
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = max(1, int(capacity))
+        self._keys: list[int | None] = [None] * self._capacity
+        self._buckets: list[dict[str, int] | None] = [None] * self._capacity
+        self._floor: int | None = None
+
+    def _is_live(self, minute_key: int | None) -> bool:
+        if minute_key is None:
+            return False
+        return self._floor is None or minute_key >= self._floor
+
+    def get(self, minute_key: int, default: Any = None) -> Any:
+        index = minute_key % self._capacity
+        if self._keys[index] == minute_key and self._is_live(minute_key):
+            return self._buckets[index]
+        return default
+
+    def __setitem__(self, minute_key: int, bucket: dict[str, int]) -> None:
+        if self._floor is not None and minute_key < self._floor:
+            return
+        index = minute_key % self._capacity
+        current_key = self._keys[index]
+        if current_key is not None and current_key > minute_key and self._is_live(current_key):
+            return
+        self._keys[index] = minute_key
+        self._buckets[index] = bucket
+
+    def __getitem__(self, minute_key: int) -> dict[str, int]:
+        index = minute_key % self._capacity
+        bucket = self._buckets[index]
+        if bucket is None or self._keys[index] != minute_key or not self._is_live(minute_key):
+            raise KeyError(minute_key)
+        return bucket
+
+    def __contains__(self, minute_key: object) -> bool:
+        return isinstance(minute_key, int) and self.get(minute_key) is not None
+
+    def expire_before(self, minute_key: int) -> None:
+        if self._floor is None or minute_key > self._floor:
+            self._floor = minute_key
+
+    def keys(self) -> list[int]:
+        return [key for key, _ in self.items()]
+
+    def items(self) -> list[tuple[int, dict[str, int]]]:
+        live: list[tuple[int, dict[str, int]]] = []
+        for key, bucket in zip(self._keys, self._buckets, strict=True):
+            if key is None or bucket is None or not self._is_live(key):
+                continue
+            live.append((key, bucket))
+        live.sort(key=lambda item: item[0])
+        return live
+
+    def values(self) -> list[dict[str, int]]:
+        return [bucket for _, bucket in self.items()]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+
+class RecencyMap(OrderedDict[str, float]):
+    """Mapa autor -> ultimo visto, mantido em ordem de atualizacao.
+
+    O item mais antigo fica sempre na frente, entao a expiracao so toca nos
+    itens vencidos.
+    """
+
+    def touch(self, key: str, timestamp: float) -> None:
+        if key in self:
+            self.move_to_end(key)
+        self[key] = timestamp
+
+    def expire_before(self, cutoff: float) -> int:
+        removed = 0
+        while self:
+            oldest_key = next(iter(self))
+            if self[oldest_key] >= cutoff:
+                break
+            self.popitem(last=False)
+            removed += 1
+        return removed
+
+    def count_since(self, cutoff: float) -> int:
+        count = 0
+        for key in reversed(self):
+            if self[key] < cutoff:
+                break
+            count += 1
+        return count
+
+    def items_since(self, cutoff: float) -> dict[str, float]:
+        recent: dict[str, float] = {}
+        for key in reversed(self):
+            if self[key] < cutoff:
+                break
+            recent[key] = self[key]
+        return recent
+
+    @classmethod
+    def from_mapping(cls, raw: dict[str, float]) -> "RecencyMap":
+        return cls(sorted(raw.items(), key=lambda item: item[1]))
+
+
+class TrackedCounter(Counter[str]):
+    """Counter que lembra as chaves alteradas desde o ultimo ``drain_changes``."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._changed: set[str] = set()
+        super().__init__(*args, **kwargs)
+        self._changed.clear()
+
+    def __setitem__(self, key: str, value: int) -> None:
+        self._changed.add(key)
+        super().__setitem__(key, value)
+
+    def drain_changes(self) -> dict[str, int]:
+        changes = {key: int(self[key]) for key in self._changed if key in self}
+        self._changed.clear()
+        return changes
+
+
+class SequencedDeque(deque[Any]):
+    """Deque com contador monotono de appends, para extrair so o que entrou depois."""
+
+    def __init__(self, iterable: Iterable[Any] = (), maxlen: int | None = None) -> None:
+        super().__init__(iterable, maxlen)
+        self.appended = len(self)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self.appended += 1
+
+    def tail_since(self, appended: int) -> list[Any]:
+        count = min(len(self), max(0, self.appended - int(appended)))
+        if count <= 0:
+            return []
+        return list(self)[-count:]
+
+
+EventField = tuple[str, str]
+
+_FIELD_TYPECODES = {"float": "d", "int": "q", "bool": "b", "symbol": "I"}
+
+
+class ColumnarEventLog:
+    """Log de eventos em colunas tipadas dentro de um ring buffer fixo.
+
+    ``fields`` define ``(nome, tipo)`` com tipo ``float``, ``int``, ``bool`` ou
+    ``symbol`` (string internada com contagem de referencias). O primeiro campo
+    e sempre ``ts``. Cada evento recebe um ``seq`` crescente; iterar devolve os
+    eventos como dicts, no mesmo formato serializado de antes.
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_columns",
+        "_fields",
+        "_first_seq",
+        "_free_symbols",
+        "_size",
+        "_start",
+        "_symbol_ids",
+        "_symbol_refs",
+        "_symbols",
+    )
+
+    def __init__(self, fields: tuple[EventField, ...], capacity: int) -> None:
+        if not fields or fields[0] != ("ts", "float"):
+            raise ValueError("ColumnarEventLog exige 'ts' float como primeiro campo")
+        self._fields = fields
+        self._capacity = max(1, int(capacity))
+        self._columns: list[array[Any]] = [array(_FIELD_TYPECODES[kind]) for _, kind in fields]
+        self._start = 0
+        self._size = 0
+        self._first_seq = 0
+        self._symbols: list[str] = []
+        self._symbol_ids: dict[str, int] = {}
+        self._symbol_refs: list[int] = []
+        self._free_symbols: list[int] = []
+
+    @property
+    def maxlen(self) -> int:
+        return self._capacity
+
+    @property
+    def first_seq(self) -> int:
+        return self._first_seq
+
+    @property
+    def end_seq(self) -> int:
+        return self._first_seq + self._size
+
+    def is_full(self) -> bool:
+        return self._size >= self._capacity
+
+    def _intern(self, value: str) -> int:
+        symbol_id = self._symbol_ids.get(value)
+        if symbol_id is None:
+            if self._free_symbols:
+                symbol_id = self._free_symbols.pop()
+                self._symbols[symbol_id] = value
+                self._symbol_refs[symbol_id] = 0
+            else:
+                symbol_id = len(self._symbols)
+                self._symbols.append(value)
+                self._symbol_refs.append(0)
+            self._symbol_ids[value] = symbol_id
+        self._symbol_refs[symbol_id] += 1
+        return symbol_id
+
+    def _release(self, symbol_id: int) -> None:
+        self._symbol_refs[symbol_id] -= 1
+        if self._symbol_refs[symbol_id] <= 0:
+            del self._symbol_ids[self._symbols[symbol_id]]
+            self._symbols[symbol_id] = ""
+            self._free_symbols.append(symbol_id)
+
+    def _encode(self, kind: str, value: Any) -> Any:
+        if kind == "float":
+            return float(value or 0.0)
+        if kind == "int":
+            return int(value or 0)
+        if kind == "bool":
+            return 1 if value else 0
+        return self._intern(str(value or ""))
+
+    def _index(self, seq: int) -> int:
+        offset = seq - self._first_seq
+        if offset < 0 or offset >= self._size:
+            raise IndexError(seq)
+        return (self._start + offset) % self._capacity
+
+    def _drop_oldest(self) -> None:
+        index = self._start
+        for (_, kind), column in zip(self._fields, self._columns, strict=True):
+            if kind == "symbol":
+                self._release(column[index])
+        self._start = (self._start + 1) % self._capacity
+        self._size -= 1
+        self._first_seq += 1
+        if self._size == 0:
+            self._start = 0
+            for column in self._columns:
+                del column[:]
+
+    def append(self, event: dict[str, Any]) -> int:
+        if self._size >= self._capacity:
+            self._drop_oldest()
+        index = (self._start + self._size) % self._capacity
+        for (name, kind), column in zip(self._fields, self._columns, strict=True):
+            encoded = self._encode(kind, event.get(name))
+            if index == len(column):
+                column.append(encoded)
+            else:
+                column[index] = encoded
+        self._size += 1
+        return self.end_seq - 1
+
+    def ts_at(self, seq: int) -> float:
+        return float(self._columns[0][self._index(seq)])
+
+    def row(self, seq: int) -> dict[str, Any]:
+        index = self._index(seq)
+        event: dict[str, Any] = {}
+        for (name, kind), column in zip(self._fields, self._columns, strict=True):
+            raw = column[index]
+            if kind == "symbol":
+                event[name] = self._symbols[raw]
+            elif kind == "bool":
+                event[name] = bool(raw)
+            else:
+                event[name] = raw
+        return event
+
+    def expire_before(self, cutoff: float) -> int:
+        removed = 0
+        ts_column = self._columns[0]
+        while self._size and ts_column[self._start] < cutoff:
+            self._drop_oldest()
+            removed += 1
+        return removed
+
+    def copy(self) -> "ColumnarEventLog":
+        clone = ColumnarEventLog(self._fields, self._capacity)
+        clone._columns = [column[:] for column in self._columns]
+        clone._start = self._start
+        clone._size = self._size
+        clone._first_seq = self._first_seq
+        clone._symbols = list(self._symbols)
+        clone._symbol_ids = dict(self._symbol_ids)
+        clone._symbol_refs = list(self._symbol_refs)
+        clone._free_symbols = list(self._free_symbols)
+        return clone
+
+    def rows_from(self, seq: int) -> Iterator[dict[str, Any]]:
+        for current in range(max(seq, self._first_seq), self.end_seq):
+            yield self.row(current)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.rows_from(self._first_seq)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_events(
+        cls,
+        fields: tuple[EventField, ...],
+        capacity: int,
+        events: Iterable[Any],
+    ) -> "ColumnarEventLog":
+        log = cls(fields, capacity)
+        for event in events:
+            if isinstance(event, dict):
+                log.append(event)
+        return log
+
+
+WindowApply = Callable[["RollingWindow", dict[str, Any], int], None]
+
+
+class RollingWindow:
+    """Agregado incremental dos eventos de ``log`` com ``ts >= now - span_seconds``.
+
+    A janela e um cursor (``seq``) sobre o sufixo mais recente do log: cada
+    evento entra uma vez (``add``) e sai uma vez (``expire``/``evict``);
+    ``apply`` recebe o sinal (+1/-1) e atualiza ``totals`` e ``groups``.
+    """
+
+    __slots__ = ("_apply", "_log", "_start", "groups", "span_seconds", "totals")
+
+    def __init__(self, log: ColumnarEventLog, span_seconds: float, apply: WindowApply) -> None:
+        self.span_seconds = float(span_seconds)
+        self._log = log
+        self._apply = apply
+        self._start = log.first_seq
+        self.totals: dict[str, float] = {}
+        self.groups: dict[str, Counter[str]] = {}
+        self.rebuild()
+
+    def bump(self, key: str, amount: float) -> None:
+        self.totals[key] = self.totals.get(key, 0) + amount
+
+    def tally(self, group: str, key: str, sign: int) -> None:
+        counter = self.groups.setdefault(group, Counter())
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]
+
+    def total(self, key: str) -> float:
+        return self.totals.get(key, 0)
+
+    def group(self, name: str) -> Counter[str]:
+        return self.groups.get(name) or Counter()
+
+    def add(self, event: dict[str, Any]) -> None:
+        """Contabiliza ``event``, que acabou de ser anexado ao log."""
+        self._apply(self, event, 1)
+
+    def _remove_oldest(self) -> None:
+        self._apply(self, self._log.row(self._start), -1)
+        self._start += 1
+        if self._start >= self._log.end_seq:
+            self.totals.clear()
+            self.groups.clear()
+
+    def expire(self, now: float) -> None:
+        if self._start < self._log.first_seq:
+            self.rebuild()
+        cutoff = float(now) - self.span_seconds
+        while self._start < self._log.end_seq and self._log.ts_at(self._start) < cutoff:
+            self._remove_oldest()
+
+    def evict(self, seq: int) -> None:
+        if self._start == seq and seq < self._log.end_seq:
+            self._remove_oldest()
+
+    def rebuild(self) -> None:
+        self._start = self._log.first_seq
+        self.totals.clear()
+        self.groups.clear()
+        for event in self._log.rows_from(self._start):
+            self._apply(self, event, 1)
+
+    def __len__(self) -> int:
+        return max(0, self._log.end_seq - self._start)
@@ -1,4 +1,7 @@
 import logging
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -8,6 +11,20 @@ from bot.persistence_utils import normalize_channel_id
 
 logger = logging.getLogger("byte.persistence")
 
+DEFAULT_CACHE_TTL_SECONDS = 30.0
+
+
+def _resolve_cache_ttl_seconds() -> float:
+    """TTL da leitura em cache; ``0`` desliga (toda leitura vai ao Supabase)."""
+    raw_value = os.environ.get("PERSISTENCE_CACHE_TTL_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else -1.0
+    except (TypeError, ValueError):
+        parsed = -1.0
+    if parsed < 0.0:
+        return DEFAULT_CACHE_TTL_SECONDS
+    return parsed
+
 
 class CachedChannelRepository(ABC):
     def __init__(
@@ -16,10 +33,73 @@ class CachedChannelRepository(ABC):
         enabled: bool,
         client: Client | None,
         cache: dict[str, dict[str, Any]],
+        ttl_seconds: float | None = None,
     ) -> None:
         self._enabled = enabled
         self._client = client
         self._cache = cache
+        # Versao por canal: sobe a cada escrita ou leitura que mudou o payload.
+        self._versions: dict[str, int] = {}
+        # Read-through: ``_cache`` so serve leitura enquanto o payload que veio do
+        # Supabase (leitura ou upsert) tiver menos de ``ttl_seconds``.
+        self._ttl_seconds = _resolve_cache_ttl_seconds() if ttl_seconds is None else ttl_seconds
+        self._fetched_at: dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def version(self, channel_id: str) -> int:
+        normalized = normalize_channel_id(channel_id) or "default"
+        return self._versions.get(normalized, 0)
+
+    def _fresh(self, channel_id: str, now: float) -> dict[str, Any] | None:
+        fetched_at = self._fetched_at.get(channel_id)
+        if fetched_at is None or now - fetched_at >= self._ttl_seconds:
+            return None
+        cached = self._cache.get(channel_id)
+        return dict(cached) if cached is not None else None
+
+    def _count(self, *, hits: int = 0, misses: int = 0) -> None:
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+
+    def _store_fetched(self, channel_id: str, payload: dict[str, Any]) -> None:
+        self._store(channel_id, payload)
+        self._fetched_at[channel_id] = time.monotonic()
+
+    def invalidate(self, channel_id: str | None = None) -> int:
+        """Forca a proxima leitura a ir ao Supabase (um canal ou todos).
+
+        O payload fica em ``_cache`` como fallback de erro/modo volatil.
+        """
+        if channel_id is None:
+            dropped = len(self._fetched_at)
+            self._fetched_at.clear()
+        else:
+            normalized = normalize_channel_id(channel_id) or "default"
+            dropped = 1 if self._fetched_at.pop(normalized, None) is not None else 0
+        with self._stats_lock:
+            self._invalidations += dropped
+        return dropped
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            reads = self._hits + self._misses
+            return {
+                "ttl_seconds": self._ttl_seconds,
+                "entries": len(self._fetched_at),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / reads, 4) if reads else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+    def _store(self, channel_id: str, payload: dict[str, Any]) -> None:
+        if self._cache.get(channel_id) != payload:
+            self._versions[channel_id] = self._versions.get(channel_id, 0) + 1
+        self._cache[channel_id] = payload
 
     @property
     @abstractmethod
@@ -70,6 +150,14 @@ class CachedChannelRepository(ABC):
         if not self._enabled or not self._client:
             return self._default_payload(normalized)
 
+        cached = self._fresh(normalized, time.monotonic())
+        if cached is not None:
+            self._count(hits=1)
+            return cached
+        self._count(misses=1)
+        return self._fetch_sync(normalized)
+
+    def _fetch_sync(self, normalized: str) -> dict[str, Any]:
         try:
             result = (
                 self._client.table(self.table_name)
@@ -80,7 +168,7 @@ class CachedChannelRepository(ABC):
             )
             raw_data = getattr(result, "data", None) or {}
             payload = self._row_to_payload(normalized, raw_data)
-            self._cache[normalized] = payload
+            self._store_fetched(normalized, payload)
             return payload
         except Exception as error:
             logger.error(
@@ -91,24 +179,86 @@ class CachedChannelRepository(ABC):
             )
             return self._default_payload(normalized)
 
+    def load_many_sync(self, channel_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Carrega varios canais com um unico ``in (...)``; canal sem linha vem padrao."""
+        normalized_ids = list(
+            dict.fromkeys(
+                normalize_channel_id(channel_id) or "default" for channel_id in channel_ids
+            )
+        )
+        if not normalized_ids:
+            return {}
+        if not self._enabled or not self._client:
+            return {channel_id: self._default_payload(channel_id) for channel_id in normalized_ids}
+
+        now = time.monotonic()
+        payloads: dict[str, dict[str, Any]] = {}
+        for channel_id in normalized_ids:
+            cached = self._fresh(channel_id, now)
+            if cached is not None:
+                payloads[channel_id] = cached
+        stale_ids = [channel_id for channel_id in normalized_ids if channel_id not in payloads]
+        self._count(hits=len(payloads), misses=len(stale_ids))
+        if not stale_ids:
+            return payloads
+
+        try:
+            result = (
+                self._client.table(self.table_name)
+                .select(self.select_columns)
+                .in_("channel_id", stale_ids)
+                .execute()
+            )
+            rows = {
+                str(row.get("channel_id") or ""): row
+                for row in list(getattr(result, "data", None) or [])
+                if isinstance(row, dict)
+            }
+        except Exception as error:
+            logger.error(
+                "PersistenceLayer: Erro ao carregar %s de %d canais: %s",
+                self.entity_name,
+                len(stale_ids),
+                error,
+            )
+            for channel_id in stale_ids:
+                payloads[channel_id] = self._default_payload(channel_id)
+            return {channel_id: payloads[channel_id] for channel_id in normalized_ids}
+
+        for channel_id in stale_ids:
+            payload = self._row_to_payload(channel_id, rows.get(channel_id) or {})
+            self._store_fetched(channel_id, payload)
+            payloads[channel_id] = payload
+        return {channel_id: payloads[channel_id] for channel_id in normalized_ids}
+
     def save_sync(self, channel_id: str, **kwargs: Any) -> dict[str, Any]:
         normalized = normalize_channel_id(channel_id)
         if not normalized:
             raise ValueError("channel_id obrigatorio.")
 
         payload = self._build_memory_payload(normalized, **kwargs)
-        self._cache[normalized] = payload
+        self._store(normalized, payload)
 
         if not self._enabled or not self._client:
             return payload
 
+        # A escrita tira o canal do cache ate a linha confirmada voltar.
+        self._fetched_at.pop(normalized, None)
         try:
-            self._client.table(self.table_name).upsert(
-                self._build_upsert_payload(normalized, payload)
-            ).execute()
-            persisted = self.load_sync(normalized)
+            # O upsert do postgrest devolve a linha gravada (``return=representation``):
+            # o cache sai da resposta da escrita, sem um segundo round trip de leitura.
+            result = (
+                self._client.table(self.table_name)
+                .upsert(self._build_upsert_payload(normalized, payload))
+                .execute()
+            )
+            row = self._returned_row(getattr(result, "data", None))
+            if row is None:
+                persisted = self._fetch_sync(normalized)
+            else:
+                persisted = self._row_to_payload(normalized, row)
             persisted["source"] = "supabase"
-            self._cache[normalized] = persisted
+            self._store_fetched(normalized, persisted)
             return persisted
         except Exception as error:
             logger.error(
@@ -118,3 +268,9 @@ class CachedChannelRepository(ABC):
                 error,
             )
             return payload
+
+    @staticmethod
+    def _returned_row(data: Any) -> dict[str, Any] | None:
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from bot.persistence_utils import normalize_channel_id
+
+logger = logging.getLogger("byte.persistence")
+
+DEFAULT_BUNDLE_DEADLINE_SECONDS = 5.0
+# Uma thread por leitura do pacote: as seis saem juntas para o Supabase.
+BUNDLE_MAX_WORKERS = 6
+CHANNEL_BUNDLE_PARTS = (
+    "state",
+    "history",
+    "channel_config",
+    "agent_notes",
+    "channel_identity",
+    "persona_profile",
+)
+
+
+def _resolve_deadline_seconds() -> float:
+    raw_value = os.environ.get("PERSISTENCE_BUNDLE_DEADLINE_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    if parsed <= 0.0:
+        return DEFAULT_BUNDLE_DEADLINE_SECONDS
+    return parsed
+
+
+def _fallback(part: str) -> Any:
+    if part == "state":
+        return None
+    if part == "history":
+        return []
+    return {}
+
+
+@dataclass(slots=True)
+class ChannelBundle:
+    """Estado persistido de um canal lido de uma vez (partes fora do prazo vem vazias)."""
+
+    channel_id: str
+    state: dict[str, Any] | None = None
+    history: list[str] = field(default_factory=list)
+    channel_config: dict[str, Any] = field(default_factory=dict)
+    agent_notes: dict[str, Any] = field(default_factory=dict)
+    channel_identity: dict[str, Any] = field(default_factory=dict)
+    persona_profile: dict[str, Any] = field(default_factory=dict)
+    timed_out: tuple[str, ...] = ()
+    elapsed_ms: float = 0.0
+    part_ms: dict[str, float] = field(default_factory=dict)
+
+
+class ChannelBundleLoader:
+    """Le estado, historico, config, notas, identidade e persona em paralelo.
+
+    Cada leitura e uma query sincrona do client Supabase; aqui elas rodam num
+    pool proprio e o pacote espera no maximo ``deadline_seconds``. Parte que nao
+    voltou no prazo entra com o valor vazio e continua rodando no pool (o
+    resultado atualiza o cache do repositorio quando chegar).
+    """
+
+    def __init__(
+        self,
+        readers: dict[str, Callable[[str], Any]],
+        *,
+        bulk_readers: dict[str, Callable[[list[str]], dict[str, Any]]] | None = None,
+        parallel: Callable[[], bool] = lambda: True,
+        deadline_seconds: float | None = None,
+        max_workers: int = BUNDLE_MAX_WORKERS,
+    ) -> None:
+        self._readers = dict(readers)
+        # Leitura de varios canais numa query so (``in (...)``), por parte.
+        self._bulk_readers = dict(bulk_readers or {})
+        self._parallel = parallel
+        self._deadline_seconds = (
+            _resolve_deadline_seconds() if deadline_seconds is None else float(deadline_seconds)
+        )
+        self._max_workers = max(1, int(max_workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._loads_total = 0
+        self._timeouts_total = 0
+        self._elapsed_ms_total = 0.0
+        self._serial_ms_total = 0.0
+        self._bulk_loads_total = 0
+        self._bulk_channels_total = 0
+        self._bulk_elapsed_ms_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="byte-channel-bundle",
+                )
+            return self._executor
+
+    def _timed_read(self, part: str, channel_id: str) -> tuple[Any, float]:
+        started = time.perf_counter()
+        value = self._readers[part](channel_id)
+        return value, (time.perf_counter() - started) * 1000
+
+    def load_sync(
+        self,
+        channel_id: str,
+        *,
+        parts: Iterable[str] | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ChannelBundle:
+        normalized = normalize_channel_id(channel_id) or "default"
+        selected = tuple(CHANNEL_BUNDLE_PARTS if parts is None else parts)
+        unknown = [part for part in selected if part not in self._readers]
+        if unknown:
+            raise ValueError(f"Partes desconhecidas: {', '.join(unknown)}.")
+        deadline = self._deadline_seconds if deadline_seconds is None else deadline_seconds
+        started = time.perf_counter()
+        results: dict[str, tuple[Any, float]] = {}
+        timed_out: list[str] = []
+
+        if not self._parallel() or len(selected) <= 1:
+            # Sem Supabase as leituras sao do cache em memoria: nao vale a thread.
+            for part in selected:
+                results[part] = self._timed_read(part, normalized)
+        else:
+            executor = self._get_executor()
+            futures: dict[Future, str] = {
+                executor.submit(self._timed_read, part, normalized): part for part in selected
+            }
+            done, _pending = wait(futures, timeout=max(0.0, deadline))
+            for future, part in futures.items():
+                if future not in done:
+                    timed_out.append(part)
+                    continue
+                try:
+                    results[part] = future.result()
+                except Exception as error:
+                    logger.error(
+                        "PersistenceLayer: Erro no pacote de %s (%s): %s", normalized, part, error
+                    )
+
+        bundle = ChannelBundle(channel_id=normalized)
+        for part in selected:
+            value, part_ms = results.get(part, (_fallback(part), 0.0))
+            setattr(bundle, part, value if value is not None else _fallback(part))
+            bundle.part_ms[part] = round(part_ms, 2)
+        bundle.timed_out = tuple(timed_out)
+        bundle.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        if timed_out:
+            logger.warning(
+                "PersistenceLayer: Pacote de %s passou do prazo (%.1fs): %s",
+                normalized,
+                deadline,
+                ", ".join(timed_out),
+            )
+        with self._lock:
+            self._loads_total += 1
+            self._timeouts_total += len(timed_out)
+            self._elapsed_ms_total += bundle.elapsed_ms
+            self._serial_ms_total += sum(bundle.part_ms.values())
+        return bundle
+
+    def load_many_sync(
+        self,
+        channel_ids: Iterable[str],
+        *,
+        deadline_seconds: float | None = None,
+    ) -> dict[str, ChannelBundle]:
+        """Pacotes de varios canais com uma query por parte em vez de uma por canal.
+
+        Cada parte com leitor em lote vira um ``in (...)``; as partes rodam em
+        paralelo no mesmo pool e dividem um prazo unico. Parte sem leitor em lote
+        cai para as leituras por canal, em serie dentro da propria thread.
+        """
+        normalized_ids = list(
+            dict.fromkeys(
+                normalize_channel_id(channel_id) or "default" for channel_id in channel_ids
+            )
+        )
+        if not normalized_ids:
+            return {}
+        deadline = self._deadline_seconds if deadline_seconds is None else deadline_seconds
+        started = time.perf_counter()
+        results: dict[str, tuple[dict[str, Any], float]] = {}
+        timed_out: list[str] = []
+
+        if not self._parallel():
+            for part in CHANNEL_BUNDLE_PARTS:
+                results[part] = self._timed_read_many(part, normalized_ids)
+        else:
+            executor = self._get_executor()
+            futures: dict[Future, str] = {
+                executor.submit(self._timed_read_many, part, normalized_ids): part
+                for part in CHANNEL_BUNDLE_PARTS
+            }
+            done, _pending = wait(futures, timeout=max(0.0, deadline))
+            for future, part in futures.items():
+                if future not in done:
+                    timed_out.append(part)
+                    continue
+                try:
+                    results[part] = future.result()
+                except Exception as error:
+                    logger.error(
+                        "PersistenceLayer: Erro no pacote em lote de %d canais (%s): %s",
+                        len(normalized_ids),
+                        part,
+                        error,
+                    )
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        bundles: dict[str, ChannelBundle] = {}
+        for channel_id in normalized_ids:
+            bundle = ChannelBundle(channel_id=channel_id)
+            for part in CHANNEL_BUNDLE_PARTS:
+                values, part_ms = results.get(part, ({}, 0.0))
+                value = values.get(channel_id)
+                setattr(bundle, part, value if value is not None else _fallback(part))
+                bundle.part_ms[part] = round(part_ms, 2)
+            bundle.timed_out = tuple(timed_out)
+            bundle.elapsed_ms = elapsed_ms
+            bundles[channel_id] = bundle
+        if timed_out:
+            logger.warning(
+                "PersistenceLayer: Pacote em lote de %d canais passou do prazo (%.1fs): %s",
+                len(normalized_ids),
+                deadline,
+                ", ".join(timed_out),
+            )
+        with self._lock:
+            self._bulk_loads_total += 1
+            self._bulk_channels_total += len(normalized_ids)
+            self._bulk_elapsed_ms_total += elapsed_ms
+            self._timeouts_total += len(timed_out)
+        return bundles
+
+    def _timed_read_many(self, part: str, channel_ids: list[str]) -> tuple[dict[str, Any], float]:
+        started = time.perf_counter()
+        bulk_reader = self._bulk_readers.get(part)
+        if bulk_reader is not None:
+            values = bulk_reader(channel_ids)
+        else:
+            values = {channel_id: self._readers[part](channel_id) for channel_id in channel_ids}
+        return values, (time.perf_counter() - started) * 1000
+
+    async def load(
+        self,
+        channel_id: str,
+        *,
+        parts: Iterable[str] | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ChannelBundle:
+        """Versao para o event loop: a espera pelo pacote roda fora do loop."""
+        return await asyncio.to_thread(
+            self.load_sync,
+            channel_id,
+            parts=None if parts is None else tuple(parts),
+            deadline_seconds=deadline_seconds,
+        )
+
+    async def load_many(
+        self,
+        channel_ids: Iterable[str],
+        *,
+        deadline_seconds: float | None = None,
+    ) -> dict[str, ChannelBundle]:
+        return await asyncio.to_thread(
+            self.load_many_sync, tuple(channel_ids), deadline_seconds=deadline_seconds
+        )
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            loads = self._loads_total
+            elapsed = self._elapsed_ms_total
+            serial = self._serial_ms_total
+            bulk_loads = self._bulk_loads_total
+            return {
+                "loads_total": loads,
+                "timeouts_total": self._timeouts_total,
+                "deadline_seconds": self._deadline_seconds,
+                "avg_elapsed_ms": round(elapsed / loads, 2) if loads else 0.0,
+                # Soma das leituras individuais: quanto custaria o pacote em serie.
+                "avg_serial_ms": round(serial / loads, 2) if loads else 0.0,
+                "bulk_loads_total": bulk_loads,
+                "bulk_channels_total": self._bulk_channels_total,
+                "avg_bulk_elapsed_ms": (
+                    round(self._bulk_elapsed_ms_total / bulk_loads, 2) if bulk_loads else 0.0
+                ),
+            }
+
+
+__all__ = [
+    "CHANNEL_BUNDLE_PARTS",
+    "ChannelBundle",
+    "ChannelBundleLoader",
+]
@@ -0,0 +1,73 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+LatencySink = Callable[[str, float], None]
+
+
+class _TimedQuery:
+    """Envolve um builder do postgrest e mede so o ``execute()`` final."""
+
+    __slots__ = ("_builder", "_sink", "_table")
+
+    def __init__(self, builder: Any, table: str, sink: LatencySink) -> None:
+        self._builder = builder
+        self._table = table
+        self._sink = sink
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return self._builder.execute(*args, **kwargs)
+        finally:
+            self._sink(self._table, (time.perf_counter() - started_at) * 1000)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            if hasattr(attribute, "execute"):
+                return _TimedQuery(attribute, self._table, self._sink)
+            return attribute
+
+        def _chain(*args: Any, **kwargs: Any) -> Any:
+            result = attribute(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return _TimedQuery(result, self._table, self._sink)
+            return result
+
+        return _chain
+
+
+class InstrumentedClient:
+    """Proxy do client Supabase que mede a latencia de cada query por tabela.
+
+    ``table``/``from_`` e ``rpc`` devolvem builders medidos; o resto do client
+    passa direto. Erros do ``execute`` tambem entram na medida.
+    """
+
+    __slots__ = ("_client", "_sink")
+
+    def __init__(self, client: Any, sink: LatencySink) -> None:
+        self._client = client
+        self._sink = sink
+
+    def table(self, table_name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.table(table_name), str(table_name), self._sink)
+
+    def from_(self, table_name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.from_(table_name), str(table_name), self._sink)
+
+    def rpc(self, fn: str, *args: Any, **kwargs: Any) -> _TimedQuery:
+        return _TimedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}", self._sink)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def record_persistence_latency(table: str, latency_ms: float) -> None:
+    try:
+        from bot.observability import observability  # lazy: avoid circular
+    except ImportError:
+        # Restore do proprio ObservabilityState no boot, antes do singleton existir.
+        return
+    observability.record_latency(operation="persistence", name=table, latency_ms=latency_ms)
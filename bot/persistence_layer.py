@@ -1,14 +1,17 @@
 import logging
 import os
-from typing import Any
+from typing import Any, cast
 
 from supabase import Client, create_client
 
 from bot.persistence_agent_notes_repository import AgentNotesRepository
+from bot.persistence_cached_channel_repository import CachedChannelRepository
+from bot.persistence_channel_bundle import ChannelBundle, ChannelBundleLoader
 from bot.persistence_channel_config_repository import ChannelConfigRepository
 from bot.persistence_channel_identity_repository import ChannelIdentityRepository
 from bot.persistence_observability_history_repository import ObservabilityHistoryRepository
 from bot.persistence_persona_profile_repository import PersonaProfileRepository
+from bot.persistence_instrumentation import InstrumentedClient, record_persistence_latency
 from bot.persistence_post_stream_report_repository import PostStreamReportRepository
 from bot.persistence_revenue_attribution_repository import RevenueAttributionRepository
 from bot.persistence_semantic_memory_repository import SemanticMemoryRepository
@@ -33,6 +36,8 @@ class PersistenceLayer:
         self._agent_notes_cache: dict[str, dict[str, Any]] = {}
         self._channel_identity_cache: dict[str, dict[str, Any]] = {}
         self._observability_rollup_cache: dict[str, Any] | None = None
+        self._observability_rollup_deltas_cache: list[dict[str, Any]] = []
+        self._observability_scope_archive_cache: dict[str, dict[str, Any]] = {}
         self._observability_channel_history_cache: dict[str, list[dict[str, Any]]] = {}
         self._post_stream_report_cache: dict[str, dict[str, Any]] = {}
         self._semantic_memory_cache: dict[str, list[dict[str, Any]]] = {}
@@ -42,7 +47,14 @@ class PersistenceLayer:
 
         if self._url and self._key:
             try:
-                self._client = create_client(self._url, self._key)
+                # Proxy com a mesma interface; mede a latencia de cada query por tabela.
+                self._client = cast(
+                    Client,
+                    InstrumentedClient(
+                        create_client(self._url, self._key),
+                        record_persistence_latency,
+                    ),
+                )
                 self._enabled = True
                 logger.info("PersistenceLayer: Supabase conectado com sucesso.")
             except Exception as e:
@@ -95,11 +107,120 @@ class PersistenceLayer:
             client=self._client,
             cache=self._persona_profile_cache,
         )
+        self._channel_repositories: dict[str, CachedChannelRepository] = {
+            "channel_config": self._channel_config_repo,
+            "agent_notes": self._agent_notes_repo,
+            "channel_identity": self._channel_identity_repo,
+            "persona_profile": self._persona_profile_repo,
+        }
+        self._channel_bundle_loader = ChannelBundleLoader(
+            {
+                "state": lambda channel_id: self.load_channel_state_sync(channel_id),
+                "history": lambda channel_id: self.load_recent_history_sync(channel_id),
+                "channel_config": lambda channel_id: self.load_channel_config_sync(channel_id),
+                "agent_notes": lambda channel_id: self.load_agent_notes_sync(channel_id),
+                "channel_identity": lambda channel_id: self.load_channel_identity_sync(channel_id),
+                "persona_profile": lambda channel_id: self.load_persona_profile_sync(channel_id),
+            },
+            bulk_readers={
+                "state": lambda channel_ids: self.load_channel_states_sync(channel_ids),
+                "history": lambda channel_ids: self.load_recent_histories_sync(channel_ids),
+                "channel_config": lambda channel_ids: self._channel_config_repo.load_many_sync(
+                    channel_ids
+                ),
+                "agent_notes": lambda channel_ids: self._agent_notes_repo.load_many_sync(
+                    channel_ids
+                ),
+                "channel_identity": lambda channel_ids: self._channel_identity_repo.load_many_sync(
+                    channel_ids
+                ),
+                "persona_profile": lambda channel_ids: self._persona_profile_repo.load_many_sync(
+                    channel_ids
+                ),
+            },
+            parallel=lambda: self._enabled,
+        )
 
     @property
     def is_enabled(self) -> bool:
         return self._enabled
 
+    def get_channel_resource_version(self, resource: str, channel_id: str) -> int:
+        """Versao do recurso por canal (``channel_config``, ``agent_notes``, ...)."""
+        repository = self._channel_repositories.get(resource)
+        if repository is None:
+            raise ValueError(f"Recurso sem versao: {resource}")
+        return repository.version(channel_id)
+
+    def invalidate_channel_caches(
+        self,
+        channel_id: str | None = None,
+        *,
+        resources: tuple[str, ...] | None = None,
+    ) -> int:
+        """Descarta o cache de leitura (um canal ou todos) dos recursos por canal."""
+        selected = tuple(self._channel_repositories if resources is None else resources)
+        unknown = [resource for resource in selected if resource not in self._channel_repositories]
+        if unknown:
+            raise ValueError(f"Recursos sem cache: {', '.join(unknown)}")
+        return sum(
+            self._channel_repositories[resource].invalidate(channel_id) for resource in selected
+        )
+
+    def get_channel_cache_status(self) -> dict[str, dict[str, Any]]:
+        """Hit rate do cache de leitura por repositorio."""
+        return {
+            resource: repository.get_cache_stats()
+            for resource, repository in self._channel_repositories.items()
+        }
+
+    def load_channel_bundle_sync(
+        self,
+        channel_id: str,
+        *,
+        parts: tuple[str, ...] | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ChannelBundle:
+        """Estado persistido do canal com as leituras em paralelo e prazo unico."""
+        return self._channel_bundle_loader.load_sync(
+            channel_id, parts=parts, deadline_seconds=deadline_seconds
+        )
+
+    async def load_channel_bundle(
+        self,
+        channel_id: str,
+        *,
+        parts: tuple[str, ...] | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ChannelBundle:
+        return await self._channel_bundle_loader.load(
+            channel_id, parts=parts, deadline_seconds=deadline_seconds
+        )
+
+    def load_channel_bundles_sync(
+        self,
+        channel_ids: list[str],
+        *,
+        deadline_seconds: float | None = None,
+    ) -> dict[str, ChannelBundle]:
+        """Pacotes de varios canais: uma query ``in (...)`` por tabela, todas em paralelo."""
+        return self._channel_bundle_loader.load_many_sync(
+            channel_ids, deadline_seconds=deadline_seconds
+        )
+
+    async def load_channel_bundles(
+        self,
+        channel_ids: list[str],
+        *,
+        deadline_seconds: float | None = None,
+    ) -> dict[str, ChannelBundle]:
+        return await self._channel_bundle_loader.load_many(
+            channel_ids, deadline_seconds=deadline_seconds
+        )
+
+    def get_channel_bundle_status(self) -> dict[str, Any]:
+        return self._channel_bundle_loader.get_status()
+
     # --- Lógica de Boot e Canais ---
 
     async def get_active_channels(self) -> list[str]:
@@ -234,6 +355,36 @@ class PersistenceLayer:
             logger.error("PersistenceLayer: Falha ao carregar estado de %s: %s", normalized, e)
             return None
 
+    def load_channel_states_sync(self, channel_ids: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Snapshots de varios canais com um unico ``in (...)``."""
+        normalized_ids = list(
+            dict.fromkeys(
+                normalize_channel_id(channel_id) or channel_id for channel_id in channel_ids
+            )
+        )
+        if not self._enabled or not self._client or not normalized_ids:
+            return dict.fromkeys(normalized_ids)
+        try:
+            result = (
+                self._client.table("channel_state")
+                .select("*")
+                .in_("channel_id", normalized_ids)
+                .execute()
+            )
+            rows = {
+                str(row.get("channel_id") or ""): row
+                for row in (getattr(result, "data", None) or [])
+                if isinstance(row, dict)
+            }
+            return {channel_id: rows.get(channel_id) for channel_id in normalized_ids}
+        except Exception as e:
+            logger.error(
+                "PersistenceLayer: Falha ao carregar estado de %d canais: %s",
+                len(normalized_ids),
+                e,
+            )
+            return dict.fromkeys(normalized_ids)
+
     async def load_channel_state(self, channel_id: str) -> dict[str, Any] | None:
         return self.load_channel_state_sync(channel_id)
 
@@ -292,6 +443,53 @@ class PersistenceLayer:
             logger.error("PersistenceLayer: Erro ao carregar histórico de %s: %s", normalized, e)
             return []
 
+    def load_recent_histories_sync(
+        self, channel_ids: list[str], limit: int = 12
+    ) -> dict[str, list[str]]:
+        """Historico recente de varios canais numa query so.
+
+        O ``in (...)`` volta ate ``limit`` linhas por canal no total; se o teto
+        for atingido, canal que ficou com menos que ``limit`` (abafado por um
+        canal mais movimentado) e relido individualmente.
+        """
+        normalized_ids = list(
+            dict.fromkeys(
+                normalize_channel_id(channel_id) or channel_id for channel_id in channel_ids
+            )
+        )
+        if not self._enabled or not self._client or not normalized_ids:
+            return {channel_id: [] for channel_id in normalized_ids}
+        row_cap = limit * len(normalized_ids)
+        try:
+            result = (
+                self._client.table("channel_history")
+                .select("channel_id, author, message")
+                .in_("channel_id", normalized_ids)
+                .order("ts", desc=True)
+                .limit(row_cap)
+                .execute()
+            )
+            data = list(result.data or [])
+        except Exception as e:
+            logger.error(
+                "PersistenceLayer: Erro ao carregar histórico de %d canais: %s",
+                len(normalized_ids),
+                e,
+            )
+            return {channel_id: [] for channel_id in normalized_ids}
+
+        buckets: dict[str, list[str]] = {channel_id: [] for channel_id in normalized_ids}
+        for row in data:
+            bucket = buckets.get(str(row.get("channel_id") or ""))
+            if bucket is not None and len(bucket) < limit:
+                bucket.append(f"{row['author']}: {row['message']}")
+        histories = {channel_id: list(reversed(rows)) for channel_id, rows in buckets.items()}
+        if len(data) >= row_cap:
+            for channel_id, rows in histories.items():
+                if len(rows) < limit:
+                    histories[channel_id] = self.load_recent_history_sync(channel_id, limit=limit)
+        return histories
+
     async def load_recent_history(self, channel_id: str, limit: int = 12) -> list[str]:
         return self.load_recent_history_sync(channel_id, limit=limit)
 
@@ -311,6 +509,18 @@ class PersistenceLayer:
     ) -> dict[str, Any]:
         return self.save_observability_channel_history_sync(channel_id, payload)
 
+    def save_observability_channel_history_batch_sync(
+        self,
+        entries: list[tuple[str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        return self._observability_history_repo.save_channel_history_batch_sync(entries)
+
+    async def save_observability_channel_history_batch(
+        self,
+        entries: list[tuple[str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        return self.save_observability_channel_history_batch_sync(entries)
+
     def load_observability_channel_history_sync(
         self,
         channel_id: str,
@@ -523,6 +733,32 @@ class PersistenceLayer:
             **kwargs,
         )
 
+    def compact_semantic_memory_entries_sync(
+        self,
+        channel_id: str,
+        *,
+        similarity_threshold: Any = None,
+        max_entries: Any = None,
+    ) -> dict[str, Any]:
+        return self._semantic_memory_repo.compact_channel_entries_sync(
+            channel_id,
+            similarity_threshold=similarity_threshold,
+            max_entries=max_entries,
+        )
+
+    async def compact_semantic_memory_entries(
+        self,
+        channel_id: str,
+        *,
+        similarity_threshold: Any = None,
+        max_entries: Any = None,
+    ) -> dict[str, Any]:
+        return self.compact_semantic_memory_entries_sync(
+            channel_id,
+            similarity_threshold=similarity_threshold,
+            max_entries=max_entries,
+        )
+
     def get_semantic_memory_search_settings_sync(self) -> dict[str, Any]:
         return self._semantic_memory_repo.search_settings_sync()
 
@@ -581,6 +817,127 @@ class PersistenceLayer:
             logger.error("PersistenceLayer: Erro ao salvar observability rollup: %s", e)
             return dict(payload)
 
+    def append_observability_rollup_delta_sync(
+        self,
+        checkpoint_id: str,
+        sequence: int,
+        delta: dict[str, Any],
+    ) -> dict[str, Any]:
+        rollup_key = f"global:delta:{checkpoint_id}:{int(sequence):08d}"
+        payload = {
+            "rollup_key": rollup_key,
+            "state": dict(delta or {}),
+            "updated_at": utc_iso_now(),
+            "source": "memory",
+        }
+        self._observability_rollup_deltas_cache.append(payload)
+        if not self._enabled or not self._client:
+            return dict(payload)
+        try:
+            self._client.table("observability_rollups").insert(
+                {"rollup_key": rollup_key, "state": dict(delta or {}), "updated_at": "now()"}
+            ).execute()
+            payload["source"] = "supabase"
+            return dict(payload)
+        except Exception as e:
+            logger.error("PersistenceLayer: Erro ao salvar delta de observability rollup: %s", e)
+            raise
+
+    def load_observability_rollup_deltas_sync(self, checkpoint_id: str) -> list[dict[str, Any]]:
+        prefix = f"global:delta:{checkpoint_id}:"
+        cached = [
+            dict(item)
+            for item in self._observability_rollup_deltas_cache
+            if str(item.get("rollup_key") or "").startswith(prefix)
+        ]
+        if not self._enabled or not self._client:
+            return cached
+        try:
+            result = (
+                self._client.table("observability_rollups")
+                .select("rollup_key, state, updated_at")
+                .like("rollup_key", f"{prefix}%")
+                .order("rollup_key")
+                .execute()
+            )
+            return [
+                {
+                    "rollup_key": str(row.get("rollup_key") or ""),
+                    "state": dict(row.get("state") or {}),
+                    "updated_at": str(row.get("updated_at") or ""),
+                    "source": "supabase",
+                }
+                for row in (result.data or [])
+            ]
+        except Exception as e:
+            logger.error("PersistenceLayer: Erro ao carregar deltas de observability rollup: %s", e)
+            return cached
+
+    def clear_observability_rollup_deltas_sync(self) -> None:
+        self._observability_rollup_deltas_cache.clear()
+        if not self._enabled or not self._client:
+            return
+        try:
+            self._client.table("observability_rollups").delete().like(
+                "rollup_key", "global:delta:%"
+            ).execute()
+        except Exception as e:
+            logger.error("PersistenceLayer: Erro ao limpar deltas de observability rollup: %s", e)
+
+    def save_observability_scope_archive_sync(
+        self,
+        channel_id: str,
+        state: dict[str, Any],
+    ) -> dict[str, Any]:
+        normalized = str(channel_id or "").strip().lower() or "default"
+        rollup_key = f"channel:archive:{normalized}"
+        payload = {
+            "rollup_key": rollup_key,
+            "state": dict(state or {}),
+            "updated_at": utc_iso_now(),
+            "source": "memory",
+        }
+        if not self._enabled or not self._client:
+            self._observability_scope_archive_cache[normalized] = payload
+            return dict(payload)
+        try:
+            self._client.table("observability_rollups").upsert(
+                {"rollup_key": rollup_key, "state": dict(state or {}), "updated_at": "now()"}
+            ).execute()
+            self._observability_scope_archive_cache.pop(normalized, None)
+            payload["source"] = "supabase"
+            return dict(payload)
+        except Exception as e:
+            logger.error("PersistenceLayer: Erro ao arquivar escopo de %s: %s", normalized, e)
+            self._observability_scope_archive_cache[normalized] = payload
+            return dict(payload)
+
+    def load_observability_scope_archive_sync(self, channel_id: str) -> dict[str, Any] | None:
+        normalized = str(channel_id or "").strip().lower() or "default"
+        cached = self._observability_scope_archive_cache.get(normalized)
+        if cached or not self._enabled or not self._client:
+            return dict(cached) if cached else None
+        try:
+            result = (
+                self._client.table("observability_rollups")
+                .select("rollup_key, state, updated_at")
+                .eq("rollup_key", f"channel:archive:{normalized}")
+                .maybe_single()
+                .execute()
+            )
+            row = getattr(result, "data", None)
+            if not row:
+                return None
+            return {
+                "rollup_key": str(row.get("rollup_key") or ""),
+                "state": dict(row.get("state") or {}),
+                "updated_at": str(row.get("updated_at") or ""),
+                "source": "supabase",
+            }
+        except Exception as e:
+            logger.error("PersistenceLayer: Erro ao carregar arquivo de %s: %s", normalized, e)
+            return None
+
     async def load_observability_rollup(self) -> dict[str, Any] | None:
         return self.load_observability_rollup_sync()
 
@@ -70,6 +70,46 @@ class ObservabilityHistoryRepository:
             )
             return {**point, "source": "memory"}
 
+    def save_channel_history_batch_sync(
+        self,
+        entries: list[tuple[str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        points: list[dict[str, Any]] = []
+        for channel_id, payload in entries:
+            normalized = normalize_channel_id(channel_id)
+            if not normalized:
+                continue
+            point = self._normalize_history_point(normalized, payload)
+            cached_points = list(self._cache.get(normalized, []))
+            cached_points.append(point)
+            self._cache[normalized] = cached_points[-360:]
+            points.append(point)
+
+        if not points:
+            return []
+        if not self._enabled or not self._client:
+            return [{**point, "source": "memory"} for point in points]
+
+        try:
+            self._client.table("observability_channel_history").insert(
+                [
+                    {
+                        "channel_id": point["channel_id"],
+                        "snapshot": point,
+                        "captured_at": "now()",
+                    }
+                    for point in points
+                ]
+            ).execute()
+            return [{**point, "source": "supabase"} for point in points]
+        except Exception as error:
+            logger.error(
+                "PersistenceLayer: Erro ao salvar lote de histórico de observability (%d canais): %s",
+                len(points),
+                error,
+            )
+            return [{**point, "source": "memory"} for point in points]
+
     def load_channel_history_sync(
         self,
         channel_id: str,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import time
 import uuid
 from typing import Any
 
@@ -13,7 +14,12 @@ from bot.persistence_utils import (
     normalize_optional_text,
     utc_iso_now,
 )
-from bot.semantic_memory import EMBEDDING_DIMENSIONS, embed_text, rank_semantic_matches
+from bot.semantic_memory import (
+    EMBEDDING_DIMENSIONS,
+    cluster_semantic_entries,
+    embed_text,
+    rank_semantic_matches,
+)
 
 logger = logging.getLogger("byte.persistence")
 
@@ -22,6 +28,15 @@ DEFAULT_PGVECTOR_RPC_FUNCTIONS = (
     "semantic_memory_search_pgvector",
     "semantic_memory_search",
 )
+DEFAULT_COMPACTION_SIMILARITY = 0.92
+DEFAULT_COMPACTION_MAX_ENTRIES = 1000
+# Leitura paginada: a compactacao percorre a tabela inteira do canal.
+COMPACTION_PAGE_SIZE = 1000
+MAX_COMPACTION_MAX_ENTRIES = 5000
+COMPACTION_DELETE_BATCH_SIZE = 200
+SEMANTIC_MEMORY_SELECT_COLUMNS = (
+    "entry_id, channel_id, memory_type, content, tags, context, embedding, created_at, updated_at"
+)
 
 
 def _read_bool_env(var_name: str, *, default: bool) -> bool:
@@ -44,6 +59,16 @@ def _coerce_similarity_threshold(value: Any, *, default: float = -1.0) -> float:
     return round(max(-1.0, min(1.0, parsed)), 6)
 
 
+def _coerce_positive_int(value: Any, *, default: int, maximum: int) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    if parsed <= 0:
+        return default
+    return min(parsed, maximum)
+
+
 class SemanticMemoryRepository:
     def __init__(
         self,
@@ -65,6 +90,15 @@ class SemanticMemoryRepository:
             default=-1.0,
         )
         self._pgvector_warning_emitted = False
+        self._compaction_similarity = _coerce_similarity_threshold(
+            os.environ.get("SEMANTIC_MEMORY_COMPACTION_SIMILARITY"),
+            default=DEFAULT_COMPACTION_SIMILARITY,
+        )
+        self._compaction_max_entries = _coerce_positive_int(
+            os.environ.get("SEMANTIC_MEMORY_MAX_ENTRIES"),
+            default=DEFAULT_COMPACTION_MAX_ENTRIES,
+            maximum=MAX_COMPACTION_MAX_ENTRIES,
+        )
 
     def _normalize_memory_type(self, memory_type: Any) -> str:
         normalized = str(memory_type or "fact").strip().lower() or "fact"
@@ -334,6 +368,28 @@ class SemanticMemoryRepository:
             "updated_at": updated_at,
         }
 
+    def _normalize_rows(self, channel_id: str, rows: Any) -> list[dict[str, Any]]:
+        normalized_entries: list[dict[str, Any]] = []
+        for row in list(rows or []):
+            try:
+                entry = self._normalize_entry(
+                    channel_id,
+                    {
+                        "entry_id": row.get("entry_id"),
+                        "memory_type": row.get("memory_type"),
+                        "content": row.get("content"),
+                        "tags": row.get("tags"),
+                        "context": row.get("context"),
+                        "embedding": row.get("embedding"),
+                        "created_at": row.get("created_at"),
+                        "updated_at": row.get("updated_at"),
+                    },
+                )
+            except ValueError:
+                continue
+            normalized_entries.append(entry)
+        return normalized_entries
+
     def _sorted_entries(
         self,
         channel_id: str,
@@ -438,34 +494,13 @@ class SemanticMemoryRepository:
         try:
             result = (
                 self._client.table("semantic_memory_entries")
-                .select(
-                    "entry_id, channel_id, memory_type, content, tags, context, embedding, created_at, updated_at"
-                )
+                .select(SEMANTIC_MEMORY_SELECT_COLUMNS)
                 .eq("channel_id", normalized_channel)
                 .order("updated_at", desc=True)
                 .limit(safe_limit)
                 .execute()
             )
-            rows = list(result.data or [])
-            normalized_entries: list[dict[str, Any]] = []
-            for row in rows:
-                try:
-                    entry = self._normalize_entry(
-                        normalized_channel,
-                        {
-                            "entry_id": row.get("entry_id"),
-                            "memory_type": row.get("memory_type"),
-                            "content": row.get("content"),
-                            "tags": row.get("tags"),
-                            "context": row.get("context"),
-                            "embedding": row.get("embedding"),
-                            "created_at": row.get("created_at"),
-                            "updated_at": row.get("updated_at"),
-                        },
-                    )
-                    normalized_entries.append(entry)
-                except ValueError:
-                    continue
+            normalized_entries = self._normalize_rows(normalized_channel, result.data)
             self._cache[normalized_channel] = normalized_entries
             return [{**entry, "source": "supabase"} for entry in normalized_entries[:safe_limit]]
         except Exception as error:
@@ -566,3 +601,192 @@ class SemanticMemoryRepository:
             "force_fallback": safe_force_fallback,
             **self.search_settings_sync(),
         }
+
+    def compaction_settings_sync(self) -> dict[str, Any]:
+        return {
+            "similarity_threshold": float(self._compaction_similarity),
+            "max_entries": int(self._compaction_max_entries),
+        }
+
+    def _load_compaction_candidates_sync(self, channel_id: str) -> tuple[list[dict[str, Any]], str]:
+        if not self._enabled or not self._client:
+            return [dict(row or {}) for row in self._cache.get(channel_id, [])], "memory"
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            # ``entry_id`` desempata ``updated_at`` para as paginas nao se sobreporem.
+            result = (
+                self._client.table("semantic_memory_entries")
+                .select(SEMANTIC_MEMORY_SELECT_COLUMNS)
+                .eq("channel_id", channel_id)
+                .order("updated_at", desc=True)
+                .order("entry_id")
+                .range(offset, offset + COMPACTION_PAGE_SIZE - 1)
+                .execute()
+            )
+            page = list(result.data or [])
+            rows.extend(page)
+            if len(page) < COMPACTION_PAGE_SIZE:
+                break
+            offset += COMPACTION_PAGE_SIZE
+        return self._normalize_rows(channel_id, rows), "supabase"
+
+    def _merge_cluster(self, cluster: list[dict[str, Any]]) -> dict[str, Any]:
+        newest = dict(cluster[0])
+        if len(cluster) == 1:
+            return newest
+        merged_context: dict[str, Any] = {}
+        for entry in reversed(cluster):
+            merged_context.update(dict(entry.get("context") or {}))
+        merged_tags = [tag for entry in cluster for tag in list(entry.get("tags") or [])]
+        created_values = [str(entry.get("created_at") or "") for entry in cluster]
+        return {
+            **newest,
+            "tags": self._normalize_tags(merged_tags),
+            "context": self._normalize_context(merged_context),
+            "created_at": min(
+                (value for value in created_values if value),
+                default=newest["created_at"],
+            ),
+        }
+
+    def _measure_rank_latency_ms(self, entries: list[dict[str, Any]]) -> float:
+        # So o ranking em processo (fallback sem pgvector); nao inclui round trip.
+        if not entries:
+            return 0.0
+        probe = str(entries[0].get("content") or "")
+        started = time.perf_counter()
+        rank_semantic_matches(
+            query_text=probe,
+            entries=entries,
+            limit=5,
+            dimensions=EMBEDDING_DIMENSIONS,
+        )
+        return round((time.perf_counter() - started) * 1000.0, 3)
+
+    def _apply_compaction_sync(
+        self,
+        channel_id: str,
+        *,
+        merged_entries: list[dict[str, Any]],
+        removed_ids: list[str],
+    ) -> None:
+        if not self._client:
+            return
+        table = self._client.table("semantic_memory_entries")
+        if merged_entries:
+            table.upsert(
+                [
+                    {
+                        "channel_id": channel_id,
+                        "entry_id": entry["entry_id"],
+                        "memory_type": entry["memory_type"],
+                        "content": entry["content"],
+                        "tags": entry["tags"],
+                        "context": entry["context"],
+                        "embedding": entry["embedding"],
+                        "created_at": entry["created_at"],
+                        "updated_at": entry["updated_at"],
+                    }
+                    for entry in merged_entries
+                ]
+            ).execute()
+        for start in range(0, len(removed_ids), COMPACTION_DELETE_BATCH_SIZE):
+            batch = removed_ids[start : start + COMPACTION_DELETE_BATCH_SIZE]
+            table.delete().eq("channel_id", channel_id).in_("entry_id", batch).execute()
+
+    def compact_channel_entries_sync(
+        self,
+        channel_id: str,
+        *,
+        similarity_threshold: Any = None,
+        max_entries: Any = None,
+    ) -> dict[str, Any]:
+        normalized_channel = normalize_channel_id(channel_id)
+        if not normalized_channel:
+            raise ValueError("channel_id obrigatorio.")
+        safe_threshold = _coerce_similarity_threshold(
+            similarity_threshold,
+            default=self._compaction_similarity,
+        )
+        safe_max_entries = _coerce_positive_int(
+            max_entries,
+            default=self._compaction_max_entries,
+            maximum=MAX_COMPACTION_MAX_ENTRIES,
+        )
+        report: dict[str, Any] = {
+            "ok": True,
+            "channel_id": normalized_channel,
+            "similarity_threshold": safe_threshold,
+            "max_entries": safe_max_entries,
+        }
+        try:
+            entries, source = self._load_compaction_candidates_sync(normalized_channel)
+        except Exception as error:
+            logger.error(
+                "PersistenceLayer: Erro ao carregar semantic_memory para compactacao de %s: %s",
+                normalized_channel,
+                error,
+            )
+            return {**report, "ok": False, "error": str(error)}
+
+        clusters = cluster_semantic_entries(entries, similarity_threshold=safe_threshold)
+        survivors = [self._merge_cluster(cluster) for cluster in clusters]
+        merged_entries = [
+            survivor
+            for survivor, cluster in zip(survivors, clusters, strict=True)
+            if len(cluster) > 1
+        ]
+        kept = survivors[:safe_max_entries]
+        kept_ids = {str(entry.get("entry_id") or "") for entry in kept}
+        merged_entries = [entry for entry in merged_entries if entry["entry_id"] in kept_ids]
+        removed_ids = [
+            str(entry.get("entry_id") or "")
+            for entry in entries
+            if str(entry.get("entry_id") or "") not in kept_ids
+        ]
+        duplicate_count = sum(len(cluster) - 1 for cluster in clusters)
+
+        report.update(
+            {
+                "source": source,
+                "entries_before": len(entries),
+                "entries_after": len(kept),
+                "clusters_merged": len([cluster for cluster in clusters if len(cluster) > 1]),
+                "duplicates_removed": duplicate_count,
+                "trimmed_over_limit": max(0, len(survivors) - len(kept)),
+                "removed_count": len(removed_ids),
+                "rank_latency_ms_before": self._measure_rank_latency_ms(entries),
+                "rank_latency_ms_after": self._measure_rank_latency_ms(kept),
+            }
+        )
+        report["rank_latency_ms_delta"] = round(
+            report["rank_latency_ms_after"] - report["rank_latency_ms_before"],
+            3,
+        )
+        if not removed_ids and not merged_entries:
+            return report
+
+        if source == "supabase":
+            try:
+                self._apply_compaction_sync(
+                    normalized_channel,
+                    merged_entries=merged_entries,
+                    removed_ids=removed_ids,
+                )
+            except Exception as error:
+                logger.error(
+                    "PersistenceLayer: Erro ao compactar semantic_memory de %s: %s",
+                    normalized_channel,
+                    error,
+                )
+                return {**report, "ok": False, "error": str(error)}
+
+        self._cache[normalized_channel] = list(reversed(kept))[-360:]
+        logger.info(
+            "PersistenceLayer: semantic_memory de %s compactada (%d -> %d entradas).",
+            normalized_channel,
+            report["entries_before"],
+            report["entries_after"],
+        )
+        return report
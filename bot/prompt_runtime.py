@@ -66,10 +66,11 @@ def unwrap_inference_result(result: Any) -> tuple[str, dict | None]:
     return unwrap_inference_result_impl(result)
 
 
-def _resolve_channel_context(channel_id: str | None = None) -> Any:
+async def _resolve_channel_context(channel_id: str | None = None) -> Any:
     ctx = context_manager.get(channel_id)
     try:
-        ctx = context_manager.ensure_channel_config_loaded(channel_id)
+        # Junta-se a restauracao em voo do canal; passado o prazo segue com os padroes.
+        ctx = await context_manager.ensure_channel_ready(channel_id)
     except Exception as error:
         logger.warning(
             "Falha ao restaurar channel_config de %s: %s", channel_id or "default", error
@@ -142,7 +143,7 @@ async def handle_movie_fact_sheet_prompt(
     reply_fn,
     channel_id: str | None = None,
 ) -> None:
-    ctx = _resolve_channel_context(channel_id)
+    ctx = await _resolve_channel_context(channel_id)
     if _is_channel_paused(ctx):
         _record_channel_paused_skip(
             prompt,
@@ -166,7 +167,7 @@ async def handle_byte_prompt_text(
     status_line_factory=None,
     channel_id: str | None = None,
 ) -> None:
-    ctx = _resolve_channel_context(channel_id)
+    ctx = await _resolve_channel_context(channel_id)
     if _is_channel_paused(ctx):
         _record_channel_paused_skip(
             prompt, author_name, route="channel_paused", channel_id=channel_id
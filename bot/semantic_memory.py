@@ -98,3 +98,54 @@ def rank_semantic_matches(
     for row in top_entries:
         row.pop("_index", None)
     return top_entries
+
+
+def _entry_embedding(entry: dict[str, Any], dimensions: int) -> list[float]:
+    embedding = entry.get("embedding")
+    if (
+        isinstance(embedding, list)
+        and len(embedding) == dimensions
+        and all(isinstance(value, int | float) for value in embedding)
+    ):
+        return [float(value) for value in embedding]
+    return embed_text(str(entry.get("content") or ""), dimensions=dimensions)
+
+
+def cluster_semantic_entries(
+    entries: list[dict[str, Any]],
+    *,
+    similarity_threshold: float,
+    dimensions: int = EMBEDDING_DIMENSIONS,
+) -> list[list[dict[str, Any]]]:
+    """Agrupa entradas quase duplicadas (mesmo memory_type, cosseno >= threshold).
+
+    Cada cluster vem ordenado da entrada mais nova para a mais antiga; o primeiro
+    item e o representante usado na comparacao com as demais entradas.
+    """
+    safe_dimensions = _normalize_dimensions(dimensions)
+    ordered = sorted(
+        (dict(entry or {}) for entry in list(entries or [])),
+        key=lambda row: (
+            str(row.get("updated_at") or ""),
+            str(row.get("entry_id") or ""),
+        ),
+        reverse=True,
+    )
+    clusters: list[list[dict[str, Any]]] = []
+    representatives: list[tuple[str, list[float]]] = []
+    for entry in ordered:
+        memory_type = str(entry.get("memory_type") or "fact")
+        embedding = _entry_embedding(entry, safe_dimensions)
+        target_index = -1
+        for index, (cluster_type, cluster_embedding) in enumerate(representatives):
+            if cluster_type != memory_type:
+                continue
+            if cosine_similarity(embedding, cluster_embedding) >= similarity_threshold:
+                target_index = index
+                break
+        if target_index >= 0:
+            clusters[target_index].append(entry)
+            continue
+        clusters.append([entry])
+        representatives.append((memory_type, embedding))
+    return clusters
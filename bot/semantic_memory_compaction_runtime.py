@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger("byte.semantic_memory")
+
+DEFAULT_COMPACTION_INTERVAL_SECONDS = 3600.0
+MIN_COMPACTION_INTERVAL_SECONDS = 60.0
+
+
+def _resolve_interval_seconds() -> float:
+    raw_value = os.environ.get("SEMANTIC_MEMORY_COMPACTION_INTERVAL_SECONDS")
+    try:
+        parsed = float(raw_value) if raw_value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        parsed = 0.0
+    if parsed <= 0.0:
+        return DEFAULT_COMPACTION_INTERVAL_SECONDS
+    return max(MIN_COMPACTION_INTERVAL_SECONDS, parsed)
+
+
+class SemanticMemoryCompactionRuntime:
+    """Job de background que compacta a memoria semantica de cada canal ativo."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_reports: dict[str, dict[str, Any]] = {}
+        self._last_run_at = 0.0
+
+    def compact_channels_sync(self, channel_ids: Iterable[str]) -> list[dict[str, Any]]:
+        from bot.persistence_layer import persistence
+
+        reports: list[dict[str, Any]] = []
+        for channel_id in dict.fromkeys(str(item or "").strip().lower() for item in channel_ids):
+            if not channel_id or channel_id == "default":
+                continue
+            try:
+                report = persistence.compact_semantic_memory_entries_sync(channel_id)
+            except Exception as error:
+                logger.error("Semantic memory compaction falhou para %s: %s", channel_id, error)
+                report = {"ok": False, "channel_id": channel_id, "error": str(error)}
+            report["compacted_at"] = time.time()
+            reports.append(report)
+            with self._lock:
+                self._last_reports[channel_id] = dict(report)
+        with self._lock:
+            self._last_run_at = time.time()
+        return reports
+
+    async def start_loop(
+        self,
+        channel_source: Callable[[], Iterable[str]],
+        interval_seconds: float | None = None,
+    ) -> None:
+        safe_interval = interval_seconds or _resolve_interval_seconds()
+        while True:
+            try:
+                await asyncio.sleep(safe_interval)
+                channel_ids = list(channel_source() or [])
+                reports = await asyncio.to_thread(self.compact_channels_sync, channel_ids)
+                removed = sum(int(report.get("removed_count") or 0) for report in reports)
+                if removed > 0:
+                    logger.info(
+                        "Semantic memory compaction: %d canais, %d entradas removidas",
+                        len(reports),
+                        removed,
+                    )
+            except asyncio.CancelledError:
+                break
+            except Exception as error:
+                logger.error("Semantic memory compaction loop falhou: %s", error)
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "last_run_at": self._last_run_at,
+                "channels": {key: dict(value) for key, value in self._last_reports.items()},
+            }
+
+
+semantic_memory_compaction = SemanticMemoryCompactionRuntime()
+
+__all__ = ["SemanticMemoryCompactionRuntime", "semantic_memory_compaction"]
@@ -42,30 +42,26 @@ def format_status_channels(channel_logins: list[str] | None = None, max_items: i
     )
 
 
+STATUS_LINE_METRICS = (
+    "messages_10m",
+    "active_chatters_10m",
+    "byte_triggers_10m",
+    "p95_latency_ms",
+)
+
+
 async def build_status_line(channel_logins: list[str] | None = None) -> str:
     ctx = context_manager.get()
-    snapshot = observability.snapshot(
-        bot_brand=BOT_BRAND,
-        bot_version=BYTE_VERSION,
-        bot_mode=TWITCH_CHAT_MODE,
-        stream_context=ctx,
-    )
-    metrics = snapshot.get("metrics", {})
-    chatters = snapshot.get("chatters", {})
-    chat_analytics = snapshot.get("chat_analytics", {})
-    uptime = int(snapshot.get("bot", {}).get("uptime_minutes", ctx.get_uptime_minutes()))
-    chat_10m = int(chat_analytics.get("messages_10m", 0))
-    active_10m = int(chatters.get("active_10m", 0))
-    triggers_10m = int(chat_analytics.get("byte_triggers_10m", 0))
-    p95_latency_ms = float(metrics.get("p95_latency_ms", 0.0))
+    metrics = observability.query_metrics(STATUS_LINE_METRICS)
+    uptime = int(ctx.get_uptime_minutes())
     channels_label = format_status_channels(channel_logins=channel_logins)
     return compose_status_line(
         bot_brand=BOT_BRAND,
         bot_version=BYTE_VERSION,
         uptime_minutes=uptime,
         channels_label=channels_label,
-        chat_messages_10m=chat_10m,
-        active_chatters_10m=active_10m,
-        triggers_10m=triggers_10m,
-        p95_latency_ms=p95_latency_ms,
+        chat_messages_10m=int(metrics["messages_10m"]),
+        active_chatters_10m=int(metrics["active_chatters_10m"]),
+        triggers_10m=int(metrics["byte_triggers_10m"]),
+        p95_latency_ms=float(metrics["p95_latency_ms"]),
     )
@@ -130,14 +130,15 @@ class ScientificPromptCoreTestsMixin(ScientificTestCase):
         self.assertFalse(is_current_events_prompt(non_current))
         self.assertEqual(build_verifiable_prompt(non_current), non_current)
 
-    @patch("bot.status_runtime.observability.snapshot")
+    @patch("bot.status_runtime.observability.query_metrics")
     @patch("bot.status_runtime.context_manager")
-    def test_status_line_exposes_aggregate_metrics_only(self, mock_cm, mock_snapshot):
-        mock_snapshot.return_value = {
-            "bot": {"uptime_minutes": 14},
-            "metrics": {"p95_latency_ms": 420.5},
-            "chatters": {"active_10m": 7},
-            "chat_analytics": {"messages_10m": 38, "byte_triggers_10m": 9},
+    def test_status_line_exposes_aggregate_metrics_only(self, mock_cm, mock_query):
+        mock_cm.get.return_value.get_uptime_minutes.return_value = 14
+        mock_query.return_value = {
+            "messages_10m": 38,
+            "active_chatters_10m": 7,
+            "byte_triggers_10m": 9,
+            "p95_latency_ms": 420.5,
         }
 
         import asyncio
@@ -150,6 +151,7 @@ class ScientificPromptCoreTestsMixin(ScientificTestCase):
         self.assertIn("Chat 10m: 38 msgs/7 ativos", status_line)
         self.assertIn("Triggers 10m: 9", status_line)
         self.assertIn("Privacidade: metricas agregadas", status_line)
+        mock_query.assert_called_once()
 
     def test_current_events_detection_for_news_prompt(self):
         prompt = "quais as noticias mais relevantes de IA nesta semana?"
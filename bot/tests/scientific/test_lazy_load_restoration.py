@@ -1,7 +1,7 @@
 import asyncio
 import os
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 from bot.logic import context_manager
 from bot.persistence_layer import persistence
@@ -26,11 +26,9 @@ class TestLazyLoadDurabilityScientific(unittest.IsolatedAsyncioTestCase):
                     saved_history = ["user1: msg antiga", "user2: msg antiga 2"]
 
                     # 3. Mock das funções de carregamento
-                    with patch.object(
-                        persistence, "load_channel_state", new_callable=AsyncMock
-                    ) as mock_load_state:
+                    with patch.object(persistence, "load_channel_state_sync") as mock_load_state:
                         with patch.object(
-                            persistence, "load_recent_history", new_callable=AsyncMock
+                            persistence, "load_recent_history_sync"
                         ) as mock_load_hist:
                             mock_load_state.return_value = saved_state
                             mock_load_hist.return_value = saved_history
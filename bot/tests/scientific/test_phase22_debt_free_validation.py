@@ -14,6 +14,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from bot.persistence_channel_bundle import ChannelBundle
+
 
 # ---------------------------------------------------------------------------
 # 1. Repository Validation Boundaries
@@ -541,14 +543,10 @@ class TestBuildChannelContextPayloadPersonaProfile:
             live_observability={},
             recent_chat_entries=[],
         )
-        mock_persistence.load_channel_state_sync.return_value = None
-        mock_persistence.load_agent_notes_sync.return_value = None
-        mock_persistence.load_channel_identity_sync.return_value = None
-        mock_persistence.load_recent_history_sync.return_value = []
-        mock_persistence.load_persona_profile_sync.return_value = {
-            "has_profile": True,
-            "base_identity": {"name": "Prof"},
-        }
+        mock_persistence.load_channel_bundle_sync.return_value = ChannelBundle(
+            channel_id="ch",
+            persona_profile={"has_profile": True, "base_identity": {"name": "Prof"}},
+        )
 
         payload = build_channel_context_payload("ch")
 
@@ -572,11 +570,7 @@ class TestBuildChannelContextPayloadPersonaProfile:
             live_observability={},
             recent_chat_entries=[],
         )
-        mock_persistence.load_channel_state_sync.return_value = None
-        mock_persistence.load_agent_notes_sync.return_value = None
-        mock_persistence.load_channel_identity_sync.return_value = None
-        mock_persistence.load_recent_history_sync.return_value = []
-        mock_persistence.load_persona_profile_sync.return_value = None
+        mock_persistence.load_channel_bundle_sync.return_value = ChannelBundle(channel_id="ch")
 
         payload = build_channel_context_payload("ch")
 
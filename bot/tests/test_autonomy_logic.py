@@ -38,8 +38,8 @@ class TestAutonomyLogic(unittest.IsolatedAsyncioTestCase):
         mock_context_manager,
         mock_generate,
     ):
-        mock_context_manager.ensure_channel_config_loaded.return_value = MagicMock(
-            channel_paused=True
+        mock_context_manager.ensure_channel_ready = AsyncMock(
+            return_value=MagicMock(channel_paused=True)
         )
 
         result = await autonomy_logic.process_autonomy_goal(
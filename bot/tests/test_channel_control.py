@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import unittest
 from unittest.mock import MagicMock, patch
@@ -108,3 +109,26 @@ class TestChannelControl(unittest.TestCase):
         result = bridge.execute(action="list")
         self.assertFalse(result["ok"])
         self.assertIn(result["error"], ["timeout", "runtime_error"])
+
+    def test_irc_channel_control_bridge_execute_async_on_bound_loop(self):
+        """Should await the runtime directly when already on the bound loop."""
+        bridge = channel_control.IrcChannelControlBridge()
+
+        class _Bot:
+            async def admin_join_channel(self, channel):
+                return True, f"Joined #{channel}.", ["byte", channel]
+
+        async def _run():
+            bridge.bind(loop=asyncio.get_running_loop(), bot=_Bot())
+            return await bridge.execute_async(action="join", channel_login="nova")
+
+        result = asyncio.run(_run())
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["channels"], ["byte", "nova"])
+
+    def test_irc_channel_control_bridge_execute_async_no_bind(self):
+        """Should report runtime_unavailable without blocking."""
+        bridge = channel_control.IrcChannelControlBridge()
+        result = asyncio.run(bridge.execute_async(action="list"))
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["error"], "runtime_unavailable")
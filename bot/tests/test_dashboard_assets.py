@@ -0,0 +1,133 @@
+import gzip
+import http.client
+import os
+import re
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from bot.dashboard_assets import DashboardAssetStore, fingerprinted_name
+from bot.dashboard_rate_limit import DashboardRateLimiter
+from bot.dashboard_server import HealthHandler
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limit():
+    with patch.object(HealthHandler, "_rate_limiter", DashboardRateLimiter()):
+        yield
+
+
+@pytest.fixture
+def dashboard_tree(tmp_path):
+    (tmp_path / "features" / "shared").mkdir(parents=True)
+    (tmp_path / "partials").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "index.html").write_text(
+        '<link href="/dashboard/styles.css" />\n'
+        '<script>const url = "/dashboard/partials/panel.html";</script>\n'
+        '<script src="/dashboard/config.js"></script>\n'
+        '<script type="module" src="/dashboard/main.js"></script>\n'
+    )
+    (tmp_path / "styles.css").write_text("body { color: red; }\n" * 60)
+    (tmp_path / "partials" / "panel.html").write_text("<section>painel</section>")
+    (tmp_path / "main.js").write_text(
+        'import { boot } from "./features/boot.js";\nimport {\n  api,\n} from "./features/shared/api.js";\nboot(api);\n'
+    )
+    (tmp_path / "features" / "boot.js").write_text(
+        'import { api } from "./shared/api.js";\nexport function boot() { return api; }\n'
+    )
+    (tmp_path / "features" / "shared" / "api.js").write_text("export const api = 1;\n")
+    (tmp_path / "tests" / "x.test.js").write_text("nao servido")
+    return tmp_path
+
+
+def _hashed_refs(body: bytes) -> list[str]:
+    return re.findall(r"/dashboard/([^\"]+)", body.decode())
+
+
+def test_fingerprinted_name_keeps_extension():
+    assert fingerprinted_name("features/shared/api.js", "abc") == "features/shared/api.abc.js"
+    assert fingerprinted_name("LICENSE", "abc") == "LICENSE.abc"
+
+
+def test_html_and_module_graph_point_to_hashed_urls(dashboard_tree):
+    store = DashboardAssetStore(reload_check_seconds=0)
+    index = store.get("index.html", root=dashboard_tree)
+    main = store.get("main.js", root=dashboard_tree)
+    boot = store.get("features/boot.js", root=dashboard_tree)
+
+    assert index is not None and main is not None and boot is not None
+    refs = _hashed_refs(index.body)
+    assert main.hashed_path in refs
+    assert "config.js" in refs
+    assert any(re.fullmatch(r"partials/panel\.[0-9a-f]{12}\.html", ref) for ref in refs)
+    assert re.search(r'from "\./shared/api\.[0-9a-f]{12}\.js"', boot.body.decode())
+    assert re.search(r'from "\./features/shared/api\.[0-9a-f]{12}\.js"', main.body.decode())
+    assert store.get(main.hashed_path, root=dashboard_tree).immutable is True
+    assert store.get("tests/x.test.js", root=dashboard_tree) is None
+    assert "gzip" in store.get("styles.css", root=dashboard_tree).variants
+
+
+def test_dependency_change_rehashes_importers_and_keeps_old_urls(dashboard_tree):
+    store = DashboardAssetStore(reload_check_seconds=5)
+    old_main = store.get("main.js", root=dashboard_tree, now=0.0)
+    api_path = dashboard_tree / "features" / "shared" / "api.js"
+    api_path.write_text("export const api = 2;\n")
+    stat = api_path.stat()
+    os.utime(api_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+    assert store.get("main.js", root=dashboard_tree, now=1.0) is old_main
+    new_main = store.get("main.js", root=dashboard_tree, now=10.0)
+    assert new_main.hashed_path != old_main.hashed_path
+    assert store.get(old_main.hashed_path, root=dashboard_tree, now=10.0) is not None
+    assert store.get_status()["loads_total"] == 2
+
+
+def _get(port: int, path: str, **headers: str) -> tuple[int, dict[str, str], bytes]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    result = response.status, {key.lower(): value for key, value in response.getheaders()}, body
+    connection.close()
+    return result
+
+
+def test_threaded_server_serves_immutable_precompressed_assets(dashboard_tree):
+    store = DashboardAssetStore(reload_check_seconds=0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with (
+        patch("bot.dashboard_server.DASHBOARD_DIR", dashboard_tree),
+        patch("bot.dashboard_server.dashboard_assets", store),
+        patch("bot.dashboard_http_cache._resolve_compression_min_bytes", return_value=0),
+    ):
+        thread.start()
+        try:
+            port = server.server_address[1]
+            status, headers, body = _get(port, "/dashboard/")
+            assert status == 200
+            assert headers["cache-control"] == "no-cache"
+            css_ref = next(ref for ref in _hashed_refs(body) if ref.endswith(".css"))
+
+            status, _headers, _body = _get(
+                port, "/dashboard/", **{"If-None-Match": headers["etag"]}
+            )
+            assert status == 304
+
+            status, headers, body = _get(
+                port, f"/dashboard/{css_ref}", **{"Accept-Encoding": "gzip"}
+            )
+            assert status == 200
+            assert headers["cache-control"] == "public, max-age=31536000, immutable"
+            assert headers["content-type"] == "text/css; charset=utf-8"
+            assert headers["content-encoding"] == "gzip"
+            assert gzip.decompress(body).startswith(b"body { color: red; }")
+
+            assert _get(port, "/dashboard/nao-existe.js")[0] == 404
+            assert _get(port, "/dashboard/../secret.txt")[0] in {400, 404}
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from bot import dashboard_async_server
+from bot.dashboard_async_server import AsyncDashboardServer, resolve_dashboard_server_mode
+from bot.dashboard_rate_limit import DashboardRateLimiter
+from bot.dashboard_server import HealthHandler
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limit():
+    # O limitador e compartilhado: outros testes no mesmo processo ja consumiram 127.0.0.1.
+    with patch.object(HealthHandler, "_rate_limiter", DashboardRateLimiter()):
+        yield
+
+
+async def _start_server(**kwargs):
+    server = AsyncDashboardServer(**kwargs)
+    started = await server.start("127.0.0.1", 0)
+    return server, started.sockets[0].getsockname()[1]
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return int(lines[0].split()[1]), headers, body
+
+
+def test_resolve_dashboard_server_mode_defaults_to_threaded():
+    with patch.dict("os.environ", {"DASHBOARD_SERVER_MODE": "asyncio"}):
+        assert resolve_dashboard_server_mode() == "asyncio"
+    with patch.dict("os.environ", {"DASHBOARD_SERVER_MODE": "bogus"}):
+        assert resolve_dashboard_server_mode() == "threaded"
+
+
+def test_keep_alive_serves_pipelined_requests_in_order():
+    async def _run():
+        server, port = await _start_server()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+            b"GET /healthz HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+        await writer.drain()
+        first = await _read_response(reader)
+        second = await _read_response(reader)
+        assert await reader.read() == b""
+        writer.close()
+        await server.close()
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first[0] == 200 and first[2] == b"AGENT_ONLINE"
+    assert first[1]["connection"] == "keep-alive"
+    assert second[0] == 200
+    assert second[1]["connection"] == "close"
+
+
+def test_route_concurrency_cap_rejects_when_saturated():
+    def _slow_get(handler):
+        time.sleep(0.3)
+        handler._send_text("ok", status_code=200)
+
+    async def _request(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /api/slow HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        response = await _read_response(reader)
+        writer.close()
+        return response[0]
+
+    async def _run():
+        server, port = await _start_server(route_limits={"/api/slow": 1})
+        statuses = await asyncio.gather(_request(port), _request(port))
+        await server.close()
+        return sorted(statuses), server.get_status()
+
+    with (
+        patch.dict(dashboard_async_server._SYNC_DISPATCH, {"GET": _slow_get}),
+        patch.object(dashboard_async_server, "ROUTE_QUEUE_TIMEOUT_SECONDS", 0.05),
+    ):
+        statuses, status = asyncio.run(_run())
+    assert statuses == [200, 503]
+    assert status["rejected_busy_total"] == 1
+
+
+def test_async_post_routes_run_on_the_event_loop_and_others_in_threads():
+    seen = {}
+
+    async def _async_handler(handler):
+        seen["async"] = threading.get_ident()
+        payload = handler._read_json_payload()
+        handler._send_json({"ok": True, "echo": payload["text"]}, status_code=200)
+
+    def _sync_get(handler):
+        seen["sync"] = threading.get_ident()
+        handler._send_text("ok", status_code=200)
+
+    async def _run():
+        seen["loop"] = threading.get_ident()
+        server, port = await _start_server()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = b'{"text": "oi"}'
+        writer.write(
+            b"POST /api/chat/send HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+            + b"GET /api/other HTTP/1.1\r\nHost: x\r\n\r\n"
+        )
+        await writer.drain()
+        post_response = await _read_response(reader)
+        get_response = await _read_response(reader)
+        writer.close()
+        await server.close()
+        return post_response, get_response
+
+    with (
+        patch.dict(
+            dashboard_async_server._ASYNC_POST_ROUTE_HANDLERS, {"/api/chat/send": _async_handler}
+        ),
+        patch.dict(dashboard_async_server._SYNC_DISPATCH, {"GET": _sync_get}),
+    ):
+        post_response, get_response = asyncio.run(_run())
+    assert post_response[0] == 200
+    assert b'"echo": "oi"' in post_response[2]
+    assert get_response[0] == 200
+    assert seen["async"] == seen["loop"]
+    assert seen["sync"] != seen["loop"]
+
+
+def test_oversized_body_is_rejected_before_reading():
+    async def _run():
+        server, port = await _start_server()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            b"POST /api/chat/send HTTP/1.1\r\nHost: x\r\nContent-Length: 999999999\r\n\r\n"
+        )
+        await writer.drain()
+        response = await _read_response(reader)
+        writer.close()
+        await server.close()
+        return response
+
+    status, headers, _ = asyncio.run(_run())
+    assert status == 413
+    assert headers["connection"] == "close"
@@ -0,0 +1,203 @@
+import asyncio
+import gzip
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from bot.dashboard_async_server import AsyncDashboardServer
+from bot.dashboard_http_cache import (
+    DashboardResponseCache,
+    compute_etag,
+    etag_matches,
+    negotiate_encoding,
+)
+from bot.dashboard_rate_limit import DashboardRateLimiter
+from bot.dashboard_server import HealthHandler
+from bot.persistence_layer import PersistenceLayer
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limit():
+    with patch.object(HealthHandler, "_rate_limiter", DashboardRateLimiter()):
+        yield
+
+
+def test_negotiate_encoding_respects_threshold_and_quality():
+    assert negotiate_encoding("gzip", 100, min_bytes=1024) == ""
+    assert negotiate_encoding("gzip, deflate", 4096, min_bytes=1024) == "gzip"
+    assert negotiate_encoding("gzip;q=0", 4096, min_bytes=1024) == ""
+    assert negotiate_encoding("*", 4096, min_bytes=1024) != ""
+    assert negotiate_encoding("", 4096, min_bytes=1024) == ""
+    with patch("bot.dashboard_http_cache.brotli", object()):
+        assert negotiate_encoding("gzip;q=0.5, br", 4096, min_bytes=1024) == "br"
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = compute_etag(b'{"ok": true}')
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"outro", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"outro"', etag)
+    assert not etag_matches("", etag)
+
+
+def test_versioned_entries_expire_on_version_change_and_max_age():
+    cache = DashboardResponseCache(versioned_max_age_seconds=30)
+    prepared = cache.put_versioned("persona-profile:canal_a", (1,), b"{}", now=100.0)
+
+    assert cache.get_versioned("persona-profile:canal_a", (1,), now=110.0) is prepared
+    assert cache.get_versioned("persona-profile:canal_a", (2,), now=110.0) is None
+    assert cache.get_versioned("persona-profile:canal_a", (1,), now=131.0) is None
+    status = cache.get_status()
+    assert status["versioned_hits_total"] == 1
+    assert status["versioned_misses_total"] == 2
+
+
+def test_prepared_body_reuses_compressed_variant():
+    cache = DashboardResponseCache()
+    body = json.dumps({"items": ["x" * 40] * 100}).encode()
+    first = cache.prepare(body)
+    compressed = first.encoded("gzip")
+
+    assert cache.prepare(bytes(body)) is first
+    assert first.encoded("gzip") is compressed
+    assert gzip.decompress(compressed) == body
+
+
+def test_repository_version_bumps_only_when_payload_changes():
+    layer = PersistenceLayer()
+    assert layer.get_channel_resource_version("agent_notes", "canal_a") == 0
+
+    layer.save_agent_notes_sync("canal_a", notes="foco em speedrun")
+    version = layer.get_channel_resource_version("agent_notes", "canal_a")
+    assert version == 1
+    layer.save_agent_notes_sync("canal_a", notes="foco em speedrun")
+    assert layer.get_channel_resource_version("agent_notes", "canal_a") == version
+    with pytest.raises(ValueError):
+        layer.get_channel_resource_version("webhooks", "canal_a")
+
+
+def _get(port: int, path: str, **headers: str) -> tuple[int, dict[str, str], bytes]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", path, headers={"X-Byte-Admin-Token": TOKEN, **headers})
+    response = connection.getresponse()
+    body = response.read()
+    result = response.status, {key.lower(): value for key, value in response.getheaders()}, body
+    connection.close()
+    return result
+
+
+def test_threaded_server_revalidates_and_compresses_json():
+    layer = PersistenceLayer()
+    cache = DashboardResponseCache()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with (
+        patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN),
+        patch("bot.dashboard_server.dashboard_response_cache", cache),
+        patch("bot.dashboard_server_routes.dashboard_response_cache", cache),
+        patch("bot.dashboard_server_routes.persistence", layer),
+        patch("bot.dashboard_http_cache._resolve_compression_min_bytes", return_value=0),
+    ):
+        thread.start()
+        try:
+            port = server.server_address[1]
+            path = "/api/agent-notes?channel=canal_a"
+            status, headers, body = _get(port, path, **{"Accept-Encoding": "gzip"})
+            assert status == 200
+            assert headers["content-encoding"] == "gzip"
+            assert headers["vary"] == "Accept-Encoding"
+            assert headers["cache-control"] == "private, no-cache"
+            assert json.loads(gzip.decompress(body))["note"]["channel_id"] == "canal_a"
+
+            status, _headers, body = _get(port, path, **{"If-None-Match": headers["etag"]})
+            assert (status, body) == (304, b"")
+            assert cache.get_status()["versioned_hits_total"] == 1
+
+            layer.save_agent_notes_sync("canal_a", notes="nova nota")
+            status, changed, body = _get(port, path, **{"If-None-Match": headers["etag"]})
+            assert status == 200
+            assert changed["etag"] != headers["etag"]
+            assert json.loads(body)["note"]["notes"] == "nova nota"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    status = cache.get_status()
+    assert status["not_modified_total"] == 1
+    assert status["compressed_total"] == 1
+    assert status["sent_bytes_total"] < status["identity_bytes_total"]
+
+
+def test_error_responses_are_not_cached():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN):
+        thread.start()
+        try:
+            status, headers, _body = _get(server.server_address[1], "/api/agent-notes")
+            assert status == 400
+            assert headers["cache-control"] == "no-store"
+            assert "etag" not in headers
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_async_server_sends_bodyless_304():
+    async def _request(port: int, extra: str = "") -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET /api/clip-jobs HTTP/1.1\r\nHost: x\r\nX-Byte-Admin-Token: {TOKEN}\r\n"
+            f"Connection: close\r\n{extra}\r\n".encode()
+        )
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return raw
+
+    async def _run() -> tuple[bytes, bytes]:
+        server = AsyncDashboardServer()
+        started = await server.start("127.0.0.1", 0)
+        port = started.sockets[0].getsockname()[1]
+        first = await _request(port)
+        etag = next(
+            line.split(b": ", 1)[1].decode()
+            for line in first.split(b"\r\n")
+            if line.lower().startswith(b"etag:")
+        )
+        second = await _request(port, f"If-None-Match: {etag}\r\n")
+        await server.close()
+        return first, second
+
+    with patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN):
+        first, second = asyncio.run(_run())
+
+    assert first.startswith(b"HTTP/1.1 200")
+    head, _, body = second.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 304")
+    assert b"Content-Length" not in head
+    assert body == b""
+
+
+def test_openmetrics_exposes_transfer_counters():
+    from bot.observability_openmetrics import render_openmetrics
+
+    text = render_openmetrics(
+        {"uptime_seconds": 1.0},
+        http_responses={
+            "not_modified_total": 3,
+            "identity_bytes_total": 900,
+            "sent_bytes_total": 120,
+        },
+    )
+    assert 'byte_dashboard_json_responses_total{result="not_modified"} 3' in text
+    assert 'byte_dashboard_json_bytes_total{kind="sent"} 120' in text
+    assert "# UNIT byte_dashboard_json_bytes bytes" in text
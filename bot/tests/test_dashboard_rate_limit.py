@@ -0,0 +1,91 @@
+import threading
+
+from bot.dashboard_rate_limit import DashboardRateLimiter, RateBudget, build_default_budgets
+from bot.observability_openmetrics import render_openmetrics
+
+
+def _limiter(max_requests=4, **routes):
+    return DashboardRateLimiter(
+        default_budget=RateBudget("default", max_requests, window_seconds=60),
+        route_budgets={
+            route: RateBudget(name, limit, window_seconds=60)
+            for route, (name, limit) in routes.items()
+        },
+    )
+
+
+def test_sliding_window_weights_previous_window():
+    limiter = _limiter(4)
+    for _ in range(4):
+        assert limiter.check("ip", now=10.0).allowed
+    decision = limiter.check("ip", now=30.0)
+    assert decision.allowed is False
+    assert decision.retry_after_seconds >= 1
+
+    # Janela seguinte comeca em 70s; aos 100s a anterior pesa 4 * (1 - 30/60) = 2.
+    assert limiter.check("ip", now=100.0).allowed
+    assert limiter.check("ip", now=100.0).allowed
+    assert limiter.check("ip", now=100.0).allowed is False
+    # Duas janelas depois a contagem antiga some por completo.
+    assert limiter.check("ip", now=200.0).allowed
+
+
+def test_retry_after_points_to_release():
+    limiter = _limiter(4)
+    for _ in range(4):
+        limiter.check("ip", now=0.0)
+    retry_after = limiter.check("ip", now=0.0).retry_after_seconds
+    assert limiter.check("ip", now=retry_after - 1.0).allowed is False
+    assert limiter.check("ip", now=float(retry_after)).allowed
+
+
+def test_route_budget_is_stricter_and_also_counts_in_default():
+    limiter = _limiter(5, **{"/api/chat/send": ("chat_send", 2)})
+    assert limiter.check("ip", "/api/chat/send", now=0.0).allowed
+    assert limiter.check("ip", "/api/chat/send", now=0.0).allowed
+    decision = limiter.check("ip", "/api/chat/send", now=0.0)
+    assert (decision.allowed, decision.budget) == (False, "chat_send")
+
+    assert limiter.check("ip", "/api/observability", now=0.0).allowed
+    assert limiter.check("ip", "/api/observability", now=0.0).allowed
+    assert limiter.check("ip", "/api/observability", now=0.0).allowed
+    assert limiter.check("ip", "/api/observability", now=0.0).budget == "default"
+
+    status = limiter.get_status()
+    assert status["throttled_by_budget"] == {"default": 1, "chat_send": 1}
+    assert status["allowed_total"] == 5
+
+
+def test_default_budgets_cover_sensitive_routes(monkeypatch):
+    monkeypatch.setenv("DASHBOARD_CHAT_SEND_RATE_LIMIT_PER_MINUTE", "7")
+    default, routes = build_default_budgets()
+    assert default.max_requests == 100
+    assert routes["/api/chat/send"].max_requests == 7
+    assert routes["/api/vision/ingest"].max_requests < default.max_requests
+
+
+def test_concurrent_checks_never_exceed_budget():
+    limiter = _limiter(50)
+    allowed = []
+    lock = threading.Lock()
+
+    def _worker():
+        local = sum(limiter.check("ip", now=0.0).allowed for _ in range(40))
+        with lock:
+            allowed.append(local)
+
+    threads = [threading.Thread(target=_worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(allowed) == 50
+
+
+def test_openmetrics_exposes_throttle_counters():
+    limiter = _limiter(1)
+    limiter.check("ip", now=0.0)
+    limiter.check("ip", now=0.0)
+    text = render_openmetrics({"uptime_seconds": 1.0}, rate_limit=limiter.get_status())
+    assert 'byte_dashboard_rate_limited_total{budget="default"} 1' in text
+    assert "byte_dashboard_rate_limit_clients 1" in text
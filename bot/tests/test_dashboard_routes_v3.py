@@ -6,6 +6,7 @@ from bot.dashboard_server import HealthHandler
 from bot.dashboard_server_routes import (
     _dashboard_asset_route,
     build_channel_context_payload,
+    build_latency_payload,
     build_observability_history_payload,
     build_ops_playbooks_payload,
     build_post_stream_report_payload,
@@ -21,6 +22,8 @@ from bot.dashboard_server_routes_post import (
     _handle_vision_ingest,
     handle_post,
 )
+from bot.observability_snapshot_cache import observability_snapshot_cache
+from bot.persistence_channel_bundle import ChannelBundle
 
 
 class DummyHandler:
@@ -58,7 +61,27 @@ class DummyHandler:
         return {"json": True}
 
 
+def _bundle_from_loaders(mock_persistence):
+    def _load(channel_id, **_kwargs):
+        return ChannelBundle(
+            channel_id=channel_id,
+            state=mock_persistence.load_channel_state_sync(channel_id),
+            history=mock_persistence.load_recent_history_sync(channel_id),
+            agent_notes=mock_persistence.load_agent_notes_sync(channel_id),
+            channel_identity=mock_persistence.load_channel_identity_sync(channel_id),
+            persona_profile=mock_persistence.load_persona_profile_sync(channel_id),
+        )
+
+    return _load
+
+
 class TestDashboardRoutesV3:
+    @pytest.fixture(autouse=True)
+    def _reset_snapshot_cache(self):
+        observability_snapshot_cache.invalidate()
+        yield
+        observability_snapshot_cache.invalidate()
+
     def test_dashboard_asset_route(self):
         handler = MagicMock()
         assert _dashboard_asset_route(handler, "/") is True
@@ -109,6 +132,13 @@ class TestDashboardRoutesV3:
         assert res["selected_channel"] == "canal_a"
         assert res["agent_outcomes"]["ignored_total_60m"] == 5
         assert res["coaching"]["risk_band"] == "watch"
+        assert res["diagnostics"]["snapshot_cache"]["source"] == "miss"
+
+        cached = build_observability_payload("canal_a")
+        assert mock_obs.snapshot.call_count == 1
+        assert mock_coaching_runtime.evaluate_and_emit.call_count == 1
+        assert cached["diagnostics"]["snapshot_cache"]["source"] == "hit"
+        assert cached["agent_outcomes"]["ignored_total_60m"] == 5
 
     @patch("bot.dashboard_server_routes.coaching_runtime")
     @patch("bot.dashboard_server_routes._get_context_sync")
@@ -142,6 +172,61 @@ class TestDashboardRoutesV3:
         assert res["context"]["channel_id"] == "canal_ctx"
         assert res["coaching"]["risk_band"] == "low"
 
+    @patch("bot.dashboard_server_routes.coaching_runtime")
+    @patch("bot.dashboard_server_routes._get_context_sync")
+    @patch("bot.dashboard_server_routes.observability")
+    @patch("bot.dashboard_server_routes.control_plane")
+    def test_build_observability_payload_with_fields_skips_unrequested_blocks(
+        self,
+        mock_cp,
+        mock_obs,
+        mock_get_context,
+        mock_coaching_runtime,
+    ):
+        from bot.dashboard_server_routes import build_observability_payload
+
+        mock_get_context.return_value = MagicMock(channel_id="canal_a")
+        mock_obs.snapshot.return_value = {
+            "timestamp": "t",
+            "metrics": {"chat_messages_total": 2},
+            "persistence": {"enabled": False},
+        }
+
+        res = build_observability_payload("canal_a", fields=frozenset({"metrics"}))
+
+        assert mock_obs.snapshot.call_args.kwargs["sections"] == frozenset({"metrics"})
+        mock_cp.runtime_snapshot.assert_not_called()
+        mock_cp.build_capabilities.assert_not_called()
+        mock_coaching_runtime.evaluate_and_emit.assert_not_called()
+        assert set(res) == {"timestamp", "metrics", "selected_channel", "ok", "diagnostics"}
+
+        full = build_observability_payload("canal_a")
+        assert mock_obs.snapshot.call_count == 2
+        assert mock_obs.snapshot.call_args.kwargs["sections"] is None
+        assert "capabilities" in full
+
+    def test_handle_get_api_observability_fields_and_view(self):
+        handler = MagicMock(path="/api/observability?channel=canal_a&view=compact")
+        handler._dashboard_authorized.return_value = True
+        handle_get(handler)
+        call = handler._build_observability_payload.call_args
+        assert call.args == ("canal_a",)
+        assert "recent_events" in call.kwargs["fields"]
+
+        handler = MagicMock(path="/api/observability?fields=metrics,coaching&view=compact")
+        handler._dashboard_authorized.return_value = True
+        handle_get(handler)
+        assert handler._build_observability_payload.call_args.kwargs["fields"] == {
+            "metrics",
+            "coaching",
+        }
+
+        handler = MagicMock(path="/api/observability?view=huge")
+        handler._dashboard_authorized.return_value = True
+        handle_get(handler)
+        handler._build_observability_payload.assert_not_called()
+        assert handler._send_json.call_args.kwargs["status_code"] == 400
+
     @patch("bot.dashboard_server_routes.persistence")
     @patch("bot.dashboard_server_routes.context_manager")
     def test_build_channel_context_payload(self, mock_context_manager, mock_persistence):
@@ -201,6 +286,9 @@ class TestDashboardRoutesV3:
             "source": "memory",
         }
 
+        mock_persistence.load_channel_bundle_sync.side_effect = _bundle_from_loaders(
+            mock_persistence
+        )
         payload = build_channel_context_payload("canal_a")
 
         assert payload["ok"] is True
@@ -243,6 +331,9 @@ class TestDashboardRoutesV3:
         mock_persistence.load_recent_history_sync.return_value = []
         mock_persistence.load_persona_profile_sync.return_value = None
 
+        mock_persistence.load_channel_bundle_sync.side_effect = _bundle_from_loaders(
+            mock_persistence
+        )
         payload = build_channel_context_payload("canal_a")
 
         assert payload["channel"]["runtime_loaded"] is True
@@ -378,11 +469,11 @@ class TestDashboardRoutesV3:
 
     @patch("bot.dashboard_server_routes._get_context_sync")
     @patch("bot.dashboard_server_routes.observability")
-    def test_build_sentiment_scores_payload_uses_channel_snapshot(
+    def test_build_sentiment_scores_payload_queries_channel_metrics(
         self, mock_observability, mock_get_context
     ):
         mock_get_context.return_value = MagicMock(channel_id="canal_ctx")
-        mock_observability.snapshot.return_value = {
+        mock_observability.query_metrics.return_value = {
             "sentiment": {
                 "vibe": "Hyped",
                 "avg": 1.4,
@@ -400,7 +491,8 @@ class TestDashboardRoutesV3:
         payload = build_sentiment_scores_payload("canal_a")
 
         mock_get_context.assert_called_once_with("canal_a")
-        assert mock_observability.snapshot.call_args.kwargs["channel_id"] == "canal_ctx"
+        assert mock_observability.query_metrics.call_args.kwargs["channel_id"] == "canal_ctx"
+        mock_observability.snapshot.assert_not_called()
         assert payload["channel_id"] == "canal_ctx"
         assert payload["vibe"] == "Hyped"
         assert payload["sentiment"]["count"] == 7
@@ -416,6 +508,66 @@ class TestDashboardRoutesV3:
         handler._send_json.assert_called_once()
         assert handler._send_json.call_args[0][0]["vibe"] == "chill"
 
+    @patch("bot.dashboard_server_routes.observability")
+    def test_build_latency_payload_reads_global_or_channel_sketches(self, mock_observability):
+        mock_observability.query_metrics.return_value = {
+            "latency": {"llm": {"model-a": {"1m": {"count": 3, "p99": 820.0}}}}
+        }
+
+        payload = build_latency_payload()
+        assert mock_observability.query_metrics.call_args.args[0] == ("latency",)
+        assert mock_observability.query_metrics.call_args.kwargs["channel_id"] is None
+        assert payload["channel_id"] == "global"
+        assert payload["latency"]["llm"]["model-a"]["1m"]["p99"] == 820.0
+
+        build_latency_payload("Canal_A")
+        assert mock_observability.query_metrics.call_args.kwargs["channel_id"] == "canal_a"
+        mock_observability.snapshot.assert_not_called()
+
+    @patch("bot.dashboard_server_routes.build_latency_payload")
+    def test_handle_get_api_observability_latency(self, mock_build_payload):
+        mock_build_payload.return_value = {"ok": True, "latency": {}}
+        handler = MagicMock(path="/api/observability/latency")
+        handler._dashboard_authorized.return_value = True
+        handle_get(handler)
+        mock_build_payload.assert_called_once_with("")
+        handler._send_json.assert_called_once()
+
+    @patch("bot.dashboard_server_routes.event_loop_monitor")
+    @patch("bot.dashboard_server_routes.hud_runtime")
+    @patch("bot.dashboard_server_routes.clip_jobs")
+    @patch("bot.dashboard_server_routes.control_plane")
+    @patch("bot.dashboard_server_routes.observability")
+    def test_handle_get_metrics_serves_openmetrics_without_snapshot(
+        self, mock_observability, mock_control_plane, mock_clip_jobs, mock_hud, mock_monitor
+    ):
+        mock_observability.export_metrics.return_value = {"uptime_seconds": 5.0}
+        mock_control_plane.action_queue_summary.return_value = {"pending": 3, "total": 3}
+        mock_clip_jobs.count_by_status.return_value = {"queued": 1}
+        mock_hud.get_status.return_value = {"count": 4, "max": 50}
+        mock_monitor.get_status.return_value = {"last_lag_ms": 1.0, "max_lag_ms": 2.0}
+
+        handler = MagicMock(path="/metrics")
+        handler._dashboard_authorized.return_value = True
+        handle_get(handler)
+
+        payload = handler._send_bytes.call_args.args[0].decode("utf-8")
+        assert handler._send_bytes.call_args.kwargs["content_type"].startswith(
+            "application/openmetrics-text"
+        )
+        assert 'byte_queue_depth{queue="action_queue",status="pending"} 3' in payload
+        assert 'byte_queue_depth{queue="clip_jobs",status="queued"} 1' in payload
+        assert 'status="total"' not in payload
+        assert payload.endswith("# EOF\n")
+        mock_observability.snapshot.assert_not_called()
+
+    def test_handle_get_metrics_requires_auth(self):
+        handler = MagicMock(path="/metrics")
+        handler._dashboard_authorized.return_value = False
+        handle_get(handler)
+        handler._send_forbidden.assert_called_once()
+        handler._send_bytes.assert_not_called()
+
     @patch("bot.dashboard_server_routes.vision_runtime")
     def test_handle_get_api_vision(self, mock_vis):
         mock_vis.get_status.return_value = {"status": "ok"}
@@ -1,8 +1,8 @@
 import json
-import time
 import unittest
 from unittest.mock import MagicMock, patch
 
+from bot.dashboard_rate_limit import DashboardRateLimiter, RateBudget
 from bot.dashboard_server import HealthHandler
 
 
@@ -163,17 +163,31 @@ class TestDashboardServerExtra(unittest.TestCase):
         self.handler.wfile.write.assert_called()
 
     def test_rate_limit_rejection(self):
-        HealthHandler._rate_limit_state = {"127.0.0.1": [time.time()] * 100}
+        limiter = DashboardRateLimiter(default_budget=RateBudget("default", 100), route_budgets={})
+        for _ in range(100):
+            assert limiter.check("127.0.0.1").allowed
         self.handler.client_address = ("127.0.0.1", 12345)
-        assert self.handler._check_rate_limit() is False
-
-        self.handler.do_GET()
-        self.handler._send_text.assert_called_with("Too Many Requests", status_code=429)
-
-    def test_rate_limit_cleanup(self):
-        # Fill state with many IPs
-        HealthHandler._rate_limit_state = {f"ip{i}": [1.0] for i in range(1001)}
-        self.handler.client_address = ("127.0.0.1", 12345)
-        # Trigger check_rate_limit which should clear state
-        assert self.handler._check_rate_limit() is True
-        assert len(HealthHandler._rate_limit_state) == 1  # only current IP
+        self.handler.path = "/api/observability"
+        with patch.object(HealthHandler, "_rate_limiter", limiter):
+            assert self.handler._check_rate_limit() is False
+
+            self.handler.do_GET()
+        self.handler._send_bytes.assert_called_once()
+        assert self.handler._send_bytes.call_args.kwargs["status_code"] == 429
+        retry_after = dict(self.handler._send_bytes.call_args.kwargs["extra_headers"])
+        assert int(retry_after["Retry-After"]) >= 1
+        assert limiter.get_status()["throttled_by_budget"]["default"] == 2
+
+    def test_rate_limit_evicts_idle_clients_without_resetting_others(self):
+        limiter = DashboardRateLimiter(
+            default_budget=RateBudget("default", 2), route_budgets={}, max_clients=3
+        )
+        assert limiter.check("ativo", now=0.0).allowed
+        assert limiter.check("ativo", now=0.0).allowed
+        for index in range(5):
+            limiter.check(f"ip{index}", now=1.0)
+            # O cliente ativo segue no topo do LRU e continua limitado.
+            assert limiter.check("ativo", now=1.0).allowed is False
+        status = limiter.get_status()
+        assert status["tracked_clients"] == 3
+        assert status["evicted_total"] == 3
@@ -0,0 +1,262 @@
+import asyncio
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from bot.control_plane_actions import ControlPlaneActionQueue
+from bot.dashboard_async_server import AsyncDashboardServer
+from bot.dashboard_rate_limit import DashboardRateLimiter
+from bot.dashboard_server import HealthHandler
+from bot.dashboard_stream import DashboardEventStream, merge_patch_diff
+from bot.hud_runtime import HudRuntime
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limit():
+    # O limitador e compartilhado: outros testes no mesmo processo ja consumiram 127.0.0.1.
+    with patch.object(HealthHandler, "_rate_limiter", DashboardRateLimiter()):
+        yield
+
+
+def _hub(**kwargs):
+    snapshots = kwargs.pop("snapshots", {})
+    return DashboardEventStream(
+        snapshot_builder=lambda channel: dict(snapshots.get(channel, {"channel": channel})),
+        snapshot_interval_seconds=3600,
+        **kwargs,
+    )
+
+
+def _parse_sse(raw: bytes) -> list[dict]:
+    events = []
+    for block in raw.decode("utf-8").split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            if line.startswith(":") or ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            fields[key] = value.strip()
+        if "event" in fields:
+            fields["data"] = json.loads(fields["data"])
+            events.append(fields)
+    return events
+
+
+def test_merge_patch_diff_reports_nested_changes_and_removals():
+    previous = {"a": 1, "b": {"c": 2, "d": 3}, "gone": True, "items": [1]}
+    current = {"a": 1, "b": {"c": 5, "d": 3}, "items": [1, 2], "new": "x"}
+
+    assert merge_patch_diff(previous, current) == {
+        "b": {"c": 5},
+        "items": [1, 2],
+        "new": "x",
+        "gone": None,
+    }
+    assert merge_patch_diff(current, current) == {}
+
+
+def test_subscription_filters_by_topic_and_channel():
+    hub = _hub()
+    hud_only, initial = hub.subscribe(channel="canal_a", topics=["hud"])
+    assert [event.event for event in initial] == ["hello"]
+    everything, initial = hub.subscribe(channel="canal_a")
+    assert [event.event for event in initial] == ["hello", "snapshot"]
+
+    hub.publish("hud", {"text": "oi"})
+    hub.publish_snapshot("canal_b", {"channel": "canal_b"})
+    hub.publish("action_queue", {"transition": "created"})
+
+    assert [event.event for event in hub.drain(hud_only)] == ["hud"]
+    assert [event.event for event in hub.drain(everything)] == ["hud", "action_queue"]
+
+
+def test_snapshot_deltas_are_merge_patches_against_the_previous_tick():
+    snapshots = {"canal_a": {"metrics": {"chat": 1, "replies": 0}}}
+    hub = _hub(snapshots=snapshots)
+    subscription, initial = hub.subscribe(channel="canal_a", topics=["observability"])
+    assert initial[-1].data["payload"] == {"metrics": {"chat": 1, "replies": 0}}
+
+    assert hub.tick() == 0
+    snapshots["canal_a"] = {"metrics": {"chat": 4, "replies": 0}}
+    assert hub.tick() == 1
+
+    events = hub.drain(subscription)
+    assert [event.event for event in events] == ["observability"]
+    assert events[0].data == {"channel": "canal_a", "patch": {"metrics": {"chat": 4}}}
+
+
+def test_resume_replays_missed_events_and_falls_back_on_gaps():
+    hub = _hub(history_size=4)
+    first, _ = hub.subscribe(topics=["hud"])
+    hub.publish("hud", {"text": "1"})
+    last_seen = hub.encode(hub.drain(first)[-1]).decode().split("\n")[0].removeprefix("id: ")
+    hub.unsubscribe(first)
+    hub.publish("hud", {"text": "2"})
+    hub.publish("hud", {"text": "3"})
+
+    resumed, replay = hub.subscribe(topics=["hud"], last_event_id=last_seen)
+    assert replay[0].data["resumed"] is True
+    assert [event.data["text"] for event in replay[1:]] == ["2", "3"]
+    hub.unsubscribe(resumed)
+
+    for index in range(6):
+        hub.publish("hud", {"text": f"x{index}"})
+    _, gap = hub.subscribe(topics=["hud"], last_event_id=last_seen)
+    assert gap[0].data == {"resumed": False, "reason": "gap", "stream_id": gap[0].data["stream_id"]}
+
+    _, foreign = hub.subscribe(topics=["hud"], last_event_id="outro-boot-3")
+    assert foreign[0].data["resumed"] is False
+
+
+def test_slow_client_overflow_triggers_resync_instead_of_dropping_silently():
+    hub = _hub(client_buffer_size=2)
+    subscription, _ = hub.subscribe(channel="canal_a")
+    for index in range(3):
+        hub.publish("hud", {"text": str(index)})
+
+    events = hub.drain(subscription)
+    assert [event.event for event in events] == ["hello", "snapshot"]
+    assert events[0].data["reason"] == "overflow"
+    hub.publish("hud", {"text": "depois"})
+    assert [event.data["text"] for event in hub.drain(subscription)] == ["depois"]
+
+
+def test_client_limit_rejects_new_subscriptions():
+    hub = _hub(max_clients=1)
+    assert hub.subscribe(topics=["hud"])[0] is not None
+    assert hub.subscribe(topics=["hud"]) == (None, [])
+    assert hub.get_status()["rejected_total"] == 1
+
+
+def test_runtime_transitions_are_published():
+    hub = _hub()
+    subscription, _ = hub.subscribe(topics=["hud", "action_queue"])
+    with (
+        patch("bot.hud_runtime.dashboard_stream", hub),
+        patch("bot.control_plane_actions.dashboard_stream", hub),
+    ):
+        HudRuntime().push_message("Chat acelerou", source="coaching")
+        queue = ControlPlaneActionQueue()
+        item = queue.enqueue_action(kind="goal", risk="suggest_streamer", title="t", body="b")
+        queue.decide_action(action_id=item["id"], decision="approve")
+
+    events = hub.drain(subscription)
+    assert [event.event for event in events] == ["hud", "action_queue", "action_queue"]
+    assert events[0].data["text"] == "Chat acelerou"
+    assert [event.data["transition"] for event in events[1:]] == ["created", "approved"]
+    assert events[2].data["item"]["id"] == item["id"]
+
+
+def _read_until(response, marker: bytes) -> bytes:
+    buffer = b""
+    while marker not in buffer:
+        chunk = response.read1(4096)
+        if not chunk:
+            break
+        buffer += chunk
+    return buffer
+
+
+def test_threaded_server_streams_events_over_sse():
+    hub = _hub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with (
+        patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN),
+        patch("bot.dashboard_server_routes.dashboard_stream", hub),
+    ):
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", server.server_address[1], timeout=5
+            )
+            connection.request("GET", f"/api/stream?topics=hud&auth={TOKEN}")
+            response = connection.getresponse()
+            assert response.status == 200
+            assert response.getheader("Content-Type").startswith("text/event-stream")
+            assert _parse_sse(_read_until(response, b"event: hello"))[0]["event"] == "hello"
+
+            hub.publish("hud", {"text": "ao vivo"})
+            events = _parse_sse(_read_until(response, b"event: hud"))
+            assert events[0]["data"] == {"text": "ao vivo"}
+            assert events[0]["id"].endswith("-1")
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_threaded_server_rejects_unauthenticated_stream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN):
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", server.server_address[1], timeout=5
+            )
+            connection.request("GET", "/api/stream")
+            assert connection.getresponse().status == 403
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_async_server_streams_events_and_resumes_from_last_event_id():
+    hub = _hub()
+
+    async def _read_events(reader, marker: bytes) -> bytes:
+        buffer = b""
+        while marker not in buffer:
+            chunk = await asyncio.wait_for(reader.read(4096), timeout=5)
+            if not chunk:
+                break
+            buffer += chunk
+        return buffer
+
+    async def _run():
+        server = AsyncDashboardServer()
+        started = await server.start("127.0.0.1", 0)
+        port = started.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET /api/stream?topics=hud HTTP/1.1\r\nHost: x\r\nX-Byte-Admin-Token: {TOKEN}\r\n\r\n".encode()
+        )
+        await writer.drain()
+        head = await _read_events(reader, b"event: hello")
+        hub.publish("hud", {"text": "primeira"})
+        first = _parse_sse(await _read_events(reader, b"event: hud"))
+        writer.close()
+
+        hub.publish("hud", {"text": "perdida"})
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            "GET /api/stream?topics=hud HTTP/1.1\r\nHost: x\r\n"
+            f"X-Byte-Admin-Token: {TOKEN}\r\nLast-Event-ID: {first[0]['id']}\r\n\r\n".encode()
+        )
+        await writer.drain()
+        resumed = _parse_sse(await _read_events(reader, b"event: hud"))
+        writer.close()
+        await server.close()
+        return head, first, resumed
+
+    with (
+        patch("bot.dashboard_server.BYTE_DASHBOARD_ADMIN_TOKEN", TOKEN),
+        patch("bot.dashboard_server_routes.dashboard_stream", hub),
+        patch("bot.dashboard_async_server.dashboard_stream", hub),
+    ):
+        head, first, resumed = asyncio.run(_run())
+
+    assert b"text/event-stream" in head
+    assert b"Content-Length" not in head.split(b"\r\n\r\n")[0]
+    assert first[0]["data"] == {"text": "primeira"}
+    assert resumed[0]["data"]["resumed"] is True
+    assert resumed[1]["data"] == {"text": "perdida"}
+    assert hub.get_status()["clients"] == 0
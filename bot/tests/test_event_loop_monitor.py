@@ -0,0 +1,34 @@
+import asyncio
+from unittest.mock import patch
+
+from bot.event_loop_monitor import EventLoopLagMonitor
+
+
+@patch("bot.observability.observability")
+def test_record_sample_tracks_last_and_max_lag(mock_observability):
+    monitor = EventLoopLagMonitor()
+    monitor.record_sample(80.0)
+    monitor.record_sample(-5.0)
+
+    status = monitor.get_status()
+    assert status["samples_total"] == 2
+    assert status["last_lag_ms"] == 0.0
+    assert status["max_lag_ms"] == 80.0
+    assert mock_observability.record_latency.call_args.kwargs["operation"] == "event_loop"
+
+
+@patch("bot.observability.observability")
+def test_start_loop_samples_until_cancelled(mock_observability):
+    monitor = EventLoopLagMonitor()
+
+    async def _run() -> None:
+        task = asyncio.create_task(monitor.start_loop(interval_seconds=0.01))
+        await asyncio.sleep(0.05)
+        assert monitor.get_status()["running"] is True
+        task.cancel()
+        await task
+
+    asyncio.run(_run())
+    status = monitor.get_status()
+    assert status["running"] is False
+    assert status["samples_total"] >= 1
@@ -1,8 +1,10 @@
 import asyncio
+import time
 import unittest
 from unittest.mock import AsyncMock, PropertyMock, patch
 
 from bot.logic_context import ContextManager
+from bot.persistence_channel_bundle import ChannelBundle
 from bot.persistence_layer import persistence
 
 
@@ -87,34 +89,19 @@ class TestLogicContext(unittest.IsolatedAsyncioTestCase):
             patch.object(
                 type(persistence), "is_enabled", new_callable=PropertyMock, return_value=True
             ),
-            patch.object(persistence, "load_channel_state", new_callable=AsyncMock) as mock_state,
-            patch.object(
-                persistence, "load_recent_history", new_callable=AsyncMock
-            ) as mock_history,
-            patch.object(
-                persistence, "load_channel_config", new_callable=AsyncMock
-            ) as mock_channel_config,
-            patch.object(
-                persistence, "load_agent_notes", new_callable=AsyncMock
-            ) as mock_agent_notes,
-            patch.object(
-                persistence, "load_channel_identity", new_callable=AsyncMock
-            ) as mock_channel_identity,
+            patch.object(persistence, "load_channel_bundle", new_callable=AsyncMock) as mock_bundle,
         ):
-            mock_state.return_value = None
-            mock_history.return_value = []
-            mock_channel_config.return_value = {
-                "temperature": 0.31,
-                "top_p": 0.67,
-                "agent_paused": True,
-            }
-            mock_agent_notes.return_value = {"notes": "Priorize o contexto do host."}
-            mock_channel_identity.return_value = {
-                "persona_name": "Byte Coach",
-                "tone": "analitico",
-                "emote_vocab": ["PogChamp", "LUL"],
-                "lore": "Lore ativo.",
-            }
+            mock_bundle.return_value = ChannelBundle(
+                channel_id="canal_lazy",
+                channel_config={"temperature": 0.31, "top_p": 0.67, "agent_paused": True},
+                agent_notes={"notes": "Priorize o contexto do host."},
+                channel_identity={
+                    "persona_name": "Byte Coach",
+                    "tone": "analitico",
+                    "emote_vocab": ["PogChamp", "LUL"],
+                    "lore": "Lore ativo.",
+                },
+            )
 
             ctx = manager.get("canal_lazy")
             await asyncio.sleep(0)
@@ -129,6 +116,119 @@ class TestLogicContext(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(ctx.persona_lore, "Lore ativo.")
         self.assertTrue(ctx.channel_paused)
         self.assertTrue(ctx.channel_config_loaded)
+        mock_bundle.assert_awaited_once_with("canal_lazy")
+
+    async def test_lazy_loads_in_same_tick_share_one_bulk_restore(self):
+        manager = ContextManager()
+
+        with (
+            patch.object(
+                type(persistence), "is_enabled", new_callable=PropertyMock, return_value=True
+            ),
+            patch.object(persistence, "load_channel_bundle", new_callable=AsyncMock) as mock_one,
+            patch.object(persistence, "load_channel_bundles", new_callable=AsyncMock) as mock_many,
+        ):
+            mock_many.return_value = {
+                "canal_a": ChannelBundle(channel_id="canal_a", agent_notes={"notes": "A"}),
+                "canal_b": ChannelBundle(channel_id="canal_b", agent_notes={"notes": "B"}),
+            }
+
+            ctx_a = manager.get("canal_a")
+            ctx_b = manager.get("canal_b")
+            self.assertIsNone(ctx_a.ready_ms)
+            self.assertEqual(
+                manager.get_restore_status()["restoring_channels"], ["canal_a", "canal_b"]
+            )
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        mock_one.assert_not_awaited()
+        mock_many.assert_awaited_once_with(["canal_a", "canal_b"])
+        self.assertEqual((ctx_a.agent_notes, ctx_b.agent_notes), ("A", "B"))
+        status = manager.get_restore_status()
+        self.assertEqual(status["batches_total"], 1)
+        self.assertEqual(status["last_batch_size"], 2)
+        self.assertEqual(status["restoring_channels"], [])
+        self.assertGreaterEqual(status["ready_ms"]["canal_b"], 0.0)
+
+    async def test_prefetch_restores_new_channels_and_reports_ready_ms(self):
+        manager = ContextManager()
+        existing = manager.get("canal_a")
+
+        with (
+            patch.object(
+                type(persistence), "is_enabled", new_callable=PropertyMock, return_value=True
+            ),
+            patch.object(persistence, "load_channel_bundles", new_callable=AsyncMock) as mock_many,
+        ):
+            mock_many.return_value = {
+                "canal_b": ChannelBundle(channel_id="canal_b", state={"current_game": "Hades"}),
+                "canal_c": ChannelBundle(channel_id="canal_c"),
+            }
+            ready = await manager.prefetch(["canal_a", "Canal_B", "canal_c", ""])
+
+        mock_many.assert_awaited_once_with(["canal_b", "canal_c"])
+        self.assertEqual(set(ready), {"canal_b", "canal_c"})
+        self.assertEqual(manager.get("canal_b").current_game, "Hades")
+        self.assertIs(manager.get("canal_a"), existing)
+        self.assertEqual(await manager.prefetch(["canal_b"]), {})
+
+    async def test_prompt_path_joins_in_flight_restore(self):
+        manager = ContextManager()
+
+        async def _slow_bundle(channel_id):
+            await asyncio.sleep(0.02)
+            return ChannelBundle(channel_id=channel_id, channel_config={"temperature": 0.2})
+
+        with (
+            patch.object(
+                type(persistence), "is_enabled", new_callable=PropertyMock, return_value=True
+            ),
+            patch.object(
+                persistence, "load_channel_bundle", side_effect=_slow_bundle
+            ) as mock_bundle,
+            patch.object(persistence, "load_channel_bundle_sync") as mock_sync,
+        ):
+            manager.get("canal_sf")
+            first, second = await asyncio.gather(
+                manager.ensure_channel_ready("canal_sf"),
+                manager.ensure_channel_ready("Canal_SF"),
+            )
+
+        self.assertIs(first, second)
+        self.assertEqual(first.inference_temperature, 0.2)
+        self.assertTrue(first.channel_config_loaded)
+        mock_bundle.assert_called_once_with("canal_sf")
+        mock_sync.assert_not_called()
+        self.assertEqual(manager.get_restore_status()["in_flight"], 0)
+
+    async def test_prompt_path_continues_with_defaults_after_deadline(self):
+        manager = ContextManager()
+
+        async def _slow_bundle(channel_id):
+            await asyncio.sleep(0.2)
+            return ChannelBundle(channel_id=channel_id, channel_config={"agent_paused": True})
+
+        with (
+            patch.object(
+                type(persistence), "is_enabled", new_callable=PropertyMock, return_value=True
+            ),
+            patch.object(persistence, "load_channel_bundle", side_effect=_slow_bundle),
+        ):
+            started = time.monotonic()
+            ctx = await manager.ensure_channel_ready("canal_lento", deadline_seconds=0.02)
+            waited = time.monotonic() - started
+
+            self.assertLess(waited, 0.15)
+            self.assertFalse(ctx.channel_paused)
+            self.assertIsNone(ctx.ready_ms)
+            self.assertEqual(manager.get_restore_status()["timeouts_total"], 1)
+
+            # A restauracao compartilhada nao foi cancelada pelo prazo.
+            await asyncio.sleep(0.3)
+
+        self.assertTrue(ctx.channel_paused)
+        self.assertIsNotNone(ctx.ready_ms)
 
     async def test_ensure_channel_config_loaded_restores_sync_config(self):
         manager = ContextManager()
@@ -1,8 +1,11 @@
+import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
 from bot.observability import ObservabilityState
+from bot.observability_openmetrics import render_openmetrics
 
 
 class FakePersistence:
@@ -44,6 +47,19 @@ class FakePersistence:
         return point
 
 
+class ArchivingPersistence(FakePersistence):
+    def __init__(self, loaded=None, *, archives=None):
+        super().__init__(loaded)
+        self.archives = {} if archives is None else archives
+
+    def save_observability_scope_archive_sync(self, channel_id, state):
+        self.archives[channel_id] = {"state": dict(state)}
+        return self.archives[channel_id]
+
+    def load_observability_scope_archive_sync(self, channel_id):
+        return self.archives.get(channel_id)
+
+
 class TestObservabilityState(unittest.TestCase):
     def test_snapshot_tracks_core_metrics_and_routes(self):
         state = ObservabilityState()
@@ -390,6 +406,7 @@ class TestObservabilityState(unittest.TestCase):
         state = ObservabilityState(
             persistence_layer=persistence,
             persist_interval_seconds=1000.0,
+            flush_in_background=False,
         )
         stream_context = SimpleNamespace(
             stream_vibe="Conversa",
@@ -432,6 +449,7 @@ class TestObservabilityState(unittest.TestCase):
             stream_context=stream_context,
             timestamp=1_700_012_010.0,
         )
+        self.assertTrue(state.flush())
 
         self.assertGreater(len(persistence.saved), 0)
         saved_state = persistence.saved[-1]["state"]
@@ -448,6 +466,7 @@ class TestObservabilityState(unittest.TestCase):
         state = ObservabilityState(
             persistence_layer=persistence,
             persist_interval_seconds=1000.0,
+            flush_in_background=False,
         )
         stream_context = SimpleNamespace(
             stream_vibe="Conversa",
@@ -483,6 +502,7 @@ class TestObservabilityState(unittest.TestCase):
             stream_context=stream_context,
             timestamp=1_700_050_010.0,
         )
+        state.flush()
 
         self.assertGreaterEqual(len(persistence.history_saved), 2)
         channels = {entry["channel_id"] for entry in persistence.history_saved}
@@ -590,11 +610,12 @@ class TestObservabilityState(unittest.TestCase):
         self.assertEqual(snapshot["persistence"]["source"], "supabase")
         self.assertEqual(snapshot["persistence"]["updated_at"], "2026-02-27T15:55:00Z")
 
-    def test_snapshot_forces_rollup_flush_when_interval_has_not_elapsed(self):
+    def test_recording_and_snapshot_do_not_persist_inline(self):
         persistence = FakePersistence()
         state = ObservabilityState(
             persistence_layer=persistence,
-            persist_interval_seconds=1000.0,
+            persist_interval_seconds=0.0,
+            flush_in_background=False,
         )
         stream_context = SimpleNamespace(
             stream_vibe="Conversa",
@@ -602,36 +623,99 @@ class TestObservabilityState(unittest.TestCase):
             live_observability={},
         )
 
-        with patch("bot.observability_state.time.monotonic", side_effect=[100.0, 101.0]):
-            state.record_chat_message(
-                author_name="alice",
-                source="irc",
-                text="hello there",
-                timestamp=1_700_020_000.0,
-            )
-            self.assertEqual(len(persistence.saved), 0)
+        state.record_chat_message(
+            author_name="alice",
+            source="irc",
+            text="hello there",
+            timestamp=1_700_020_000.0,
+        )
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=stream_context,
+            timestamp=1_700_020_010.0,
+        )
+        self.assertEqual(len(persistence.saved), 0)
+        self.assertTrue(snapshot["persistence"]["dirty"])
+        self.assertGreaterEqual(snapshot["persistence"]["flusher"]["pending_lag_ms"], 0.0)
 
-            snapshot = state.snapshot(
-                bot_brand="Byte",
-                bot_version="1.5",
-                bot_mode="irc",
-                stream_context=stream_context,
-                timestamp=1_700_020_010.0,
-            )
+        self.assertTrue(state.flush())
+        self.assertFalse(state.flush())
 
         self.assertEqual(len(persistence.saved), 1)
         self.assertEqual(
             persistence.saved[0]["state"]["counters"]["chat_messages_total"],
             1,
         )
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=stream_context,
+            timestamp=1_700_020_011.0,
+        )
         self.assertEqual(snapshot["metrics"]["chat_messages_total"], 1)
         self.assertFalse(snapshot["persistence"]["dirty"])
         self.assertEqual(snapshot["persistence"]["updated_at"], "2026-02-27T16:00:00Z")
+        self.assertEqual(snapshot["persistence"]["flusher"]["flushes_total"], 1)
+
+    def test_background_flusher_persists_and_batches_channel_history(self):
+        persistence = FakePersistence()
+        batches = []
+        persistence.save_observability_channel_history_batch_sync = batches.append
+        state = ObservabilityState(
+            persistence_layer=persistence,
+            persist_interval_seconds=0.0,
+        )
+        for channel_id in ("canal_a", "canal_b"):
+            state.record_chat_message(
+                author_name="alice",
+                source="irc",
+                text="oi",
+                channel_id=channel_id,
+                timestamp=1_700_040_000.0,
+            )
+
+        state.close(timeout=2.0)
+
+        self.assertGreater(len(persistence.saved), 0)
+        self.assertEqual(
+            persistence.saved[-1]["state"]["counters"]["chat_messages_total"],
+            2,
+        )
+        self.assertEqual(persistence.history_saved, [])
+        self.assertEqual({channel for channel, _ in batches[-1]}, {"canal_a", "canal_b"})
+
+    def test_snapshot_reads_respect_persist_interval(self):
+        state = ObservabilityState(
+            persistence_layer=FakePersistence(),
+            persist_interval_seconds=1000.0,
+            flush_in_background=True,
+        )
+        stream_context = SimpleNamespace(
+            stream_vibe="Conversa", last_event="", live_observability={}
+        )
+        with patch.object(state._flusher, "request") as mock_request:
+            state.record_chat_message(
+                author_name="viewer", source="irc", text="oi", timestamp=1_700_040_000.0
+            )
+            # Acabou de persistir: leitura nao antecipa a proxima escrita.
+            state._last_persisted_monotonic = time.monotonic()
+            mock_request.reset_mock()
+            state.snapshot(
+                bot_brand="Byte", bot_version="1.5", bot_mode="irc", stream_context=stream_context
+            )
+            state.snapshot_many(
+                [("default", stream_context)], bot_brand="Byte", bot_version="1.5", bot_mode="irc"
+            )
+        mock_request.assert_not_called()
 
     def test_state_handles_restore_and_flush_failures_without_breaking_snapshot(self):
         state = ObservabilityState(
             persistence_layer=FakePersistence(fail_load=True, fail_save=True),
             persist_interval_seconds=1000.0,
+            flush_in_background=False,
         )
         stream_context = SimpleNamespace(
             stream_vibe="Conversa",
@@ -685,6 +769,7 @@ class TestObservabilityState(unittest.TestCase):
                 stream_context=stream_context,
                 timestamp=1_700_030_010.0,
             )
+            self.assertFalse(state.flush())
 
         self.assertEqual(snapshot["metrics"]["token_input_total"], 12)
         self.assertEqual(snapshot["metrics"]["token_output_total"], 7)
@@ -697,6 +782,537 @@ class TestObservabilityState(unittest.TestCase):
         self.assertTrue(snapshot["persistence"]["enabled"])
         self.assertFalse(snapshot["persistence"]["restored"])
         self.assertTrue(snapshot["persistence"]["dirty"])
+        self.assertEqual(
+            state.snapshot(
+                bot_brand="Byte",
+                bot_version="1.5",
+                bot_mode="irc",
+                stream_context=stream_context,
+                timestamp=1_700_030_011.0,
+            )["persistence"]["flusher"]["failures_total"],
+            1,
+        )
+
+    def test_recording_scales_to_many_distinct_chatters(self):
+        state = ObservabilityState()
+        base = 1_700_100_000.0
+        stream_context = SimpleNamespace(
+            stream_vibe="Conversa",
+            last_event="Scale",
+            live_observability={},
+        )
+
+        for index in range(10_000):
+            state.record_chat_message(
+                author_name=f"viewer_{index % 5_000}",
+                source="irc",
+                text="kkkk",
+                channel_id="canal_scale",
+                timestamp=base + index * 0.5,
+            )
+
+        self.assertEqual(len(state._chatter_last_seen), 5_000)
+        self.assertLessEqual(len(state._minute_buckets), 181)
+
+        # Um dia depois, o proximo evento expira todos os chatters antigos.
+        state.record_chat_message(
+            author_name="late_viewer",
+            source="irc",
+            text="cheguei",
+            channel_id="canal_scale",
+            timestamp=base + 5_000 + 86_401,
+        )
+        self.assertEqual(list(state._chatter_last_seen), ["late_viewer"])
+        self.assertEqual(len(state._minute_buckets), 1)
+
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=stream_context,
+            channel_id="canal_scale",
+            timestamp=base + 5_000 + 86_402,
+        )
+        self.assertEqual(snapshot["metrics"]["chat_messages_total"], 10_001)
+        # HyperLogLog (p=12): erro tipico ~1.6%.
+        self.assertAlmostEqual(snapshot["chatters"]["unique_total"], 5_001, delta=5_001 * 0.04)
+        self.assertNotIn("unique_total_exact", snapshot["chatters"])
+        self.assertEqual(snapshot["chatters"]["active_10m"], 1)
+
+    def test_snapshot_windows_match_full_scan_of_event_logs(self):
+        state = ObservabilityState()
+        base = 1_700_200_000.0
+        stream_context = SimpleNamespace(
+            stream_vibe="Conversa",
+            last_event="Parity",
+            live_observability={},
+        )
+        outcomes = ["retry", "retry_success", "fallback", "ok"]
+        for index in range(3000):
+            ts = base + index * 3.0
+            state.record_chat_message(
+                author_name=f"viewer_{index % 37}",
+                source="irc" if index % 3 else "eventsub",
+                text="!cmd" if index % 5 == 0 else "https://x.y" if index % 7 == 0 else "oi",
+                channel_id="canal_parity",
+                timestamp=ts,
+            )
+            if index % 4 == 0:
+                state.record_byte_trigger(
+                    prompt="byte?",
+                    source="irc",
+                    author_name=f"viewer_{index % 11}",
+                    channel_id="canal_parity",
+                    timestamp=ts,
+                )
+                state.record_byte_interaction(
+                    route="llm_default" if index % 8 else "llm_fallback",
+                    author_name="viewer",
+                    prompt_chars=5,
+                    reply_parts=1,
+                    reply_chars=10,
+                    serious=False,
+                    follow_up=False,
+                    current_events=False,
+                    latency_ms=100.0,
+                    channel_id="canal_parity",
+                    timestamp=ts,
+                )
+                state.record_quality_gate(
+                    outcome=outcomes[index % 4],
+                    reason="r",
+                    channel_id="canal_parity",
+                    timestamp=ts,
+                )
+                state.record_token_usage(
+                    input_tokens=10,
+                    output_tokens=20,
+                    estimated_cost_usd=0.0001,
+                    channel_id="canal_parity",
+                    timestamp=ts,
+                )
+
+        now = base + 3000 * 3.0
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.0",
+            bot_mode="irc",
+            stream_context=stream_context,
+            channel_id="canal_parity",
+            timestamp=now,
+        )
+        scope = state._channel_scopes["canal_parity"]
+        chat_60m = [e for e in scope._chat_events if e["ts"] >= now - 3600]
+        chat_10m = [e for e in scope._chat_events if e["ts"] >= now - 600]
+        triggers_60m = [e for e in scope._byte_trigger_events if e["ts"] >= now - 3600]
+        llm_60m = [e for e in scope._interaction_events if e["ts"] >= now - 3600]
+        quality_60m = [e for e in scope._quality_events if e["ts"] >= now - 3600]
+        tokens_60m = [e for e in scope._token_usage_events if e["ts"] >= now - 3600]
+
+        analytics = snapshot["chat_analytics"]
+        self.assertEqual(analytics["messages_10m"], len(chat_10m))
+        self.assertEqual(analytics["messages_60m"], len(chat_60m))
+        self.assertEqual(
+            analytics["avg_message_length_60m"],
+            round(sum(e["length"] for e in chat_60m) / len(chat_60m), 1),
+        )
+        self.assertEqual(
+            analytics["prefixed_commands_60m"], sum(1 for e in chat_60m if e["is_command"])
+        )
+        self.assertEqual(analytics["url_messages_60m"], sum(1 for e in chat_60m if e["has_url"]))
+        self.assertEqual(
+            analytics["source_counts_60m"]["eventsub"],
+            sum(1 for e in chat_60m if e["source"] == "eventsub"),
+        )
+        self.assertEqual(analytics["byte_triggers_60m"], len(triggers_60m))
+
+        outcomes_block = snapshot["agent_outcomes"]
+        self.assertEqual(outcomes_block["llm_interactions_60m"], len(llm_60m))
+        self.assertEqual(
+            outcomes_block["useful_llm_interactions_60m"],
+            sum(1 for e in llm_60m if e["is_useful_llm"]),
+        )
+        self.assertEqual(
+            outcomes_block["quality_retry_60m"],
+            sum(1 for e in quality_60m if e["outcome"] == "retry"),
+        )
+        self.assertEqual(outcomes_block["token_input_60m"], 10 * len(tokens_60m))
+        self.assertAlmostEqual(
+            outcomes_block["estimated_cost_usd_60m"], 0.0001 * len(tokens_60m), places=6
+        )
+
+        top_60m = snapshot["leaderboards"]["top_chatters_60m"]
+        expected_top = {}
+        for event in chat_60m:
+            expected_top[event["author"]] = expected_top.get(event["author"], 0) + 1
+        self.assertEqual(top_60m[0]["messages"], max(expected_top.values()))
+        self.assertEqual(
+            snapshot["chatters"]["active_60m"],
+            len({e["author"] for e in chat_60m}),
+        )
+
+    def test_rolling_windows_follow_event_log_maxlen_eviction(self):
+        state = ObservabilityState()
+        base = 1_700_300_000.0
+        max_items = state._chat_events.maxlen
+        for index in range(max_items + 50):
+            state.record_chat_message(
+                author_name="flood",
+                source="irc",
+                text="x",
+                timestamp=base + index * 0.01,
+            )
+
+        self.assertEqual(len(state._chat_events), max_items)
+        self.assertEqual(int(state._windows.chat_60m.total("count")), max_items)
+        self.assertEqual(state._windows.chat_60m.group("sources")["irc"], max_items)
+
+    def test_latency_sketches_split_by_operation_and_channel_without_dirtying(self):
+        state = ObservabilityState(persistence_layer=FakePersistence())
+        base = 1_700_500_000.0
+        for index in range(200):
+            state.record_latency(
+                operation="llm",
+                name="Model-A",
+                latency_ms=100.0 + index,
+                channel_id="canal_a",
+                timestamp=base + index,
+            )
+        state.record_latency(
+            operation="persistence",
+            name="observability_rollups",
+            latency_ms=42.0,
+            timestamp=base + 199,
+        )
+        self.assertFalse(state._dirty)
+
+        now = base + 200
+        channel_latency = state.query_metrics(["latency"], channel_id="canal_a", timestamp=now)[
+            "latency"
+        ]
+        llm_1m = channel_latency["llm"]["model-a"]["1m"]
+        self.assertEqual(llm_1m["count"], 60)
+        self.assertAlmostEqual(llm_1m["p50"], 270.0, delta=270.0 * 0.02)
+        self.assertAlmostEqual(
+            channel_latency["llm"]["model-a"]["60m"]["p999"], 298.0, delta=298.0 * 0.02
+        )
+        self.assertNotIn("persistence", channel_latency)
+
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=SimpleNamespace(
+                stream_vibe="Conversa", last_event="", live_observability={}
+            ),
+            timestamp=now,
+        )
+        global_latency = snapshot["latency"]
+        self.assertEqual(global_latency["llm"]["model-a"]["60m"]["count"], 200)
+        self.assertEqual(global_latency["persistence"]["observability_rollups"]["10m"]["max"], 42.0)
+
+    def test_idle_channel_scopes_are_archived_and_rehydrated_lazily(self):
+        persistence = ArchivingPersistence()
+        state = ObservabilityState(persistence_layer=persistence, flush_in_background=False)
+        base = 1_700_700_000.0
+        for index in range(3):
+            state.record_chat_message(
+                author_name=f"viewer{index}", source="irc", channel_id="canal_a", timestamp=base
+            )
+        state.record_chat_message(
+            author_name="viewer", source="irc", channel_id="canal_b", timestamp=base + 7000
+        )
+
+        evicted = state.evict_idle_scopes(max_age_seconds=7200, timestamp=base + 7300)
+        self.assertEqual(evicted, 1)
+        self.assertNotIn("canal_a", state._channel_scopes)
+        self.assertIn("canal_a", persistence.archives)
+        self.assertEqual(persistence.history_saved[-1]["channel_id"], "canal_a")
+
+        self.assertTrue(state.flush())
+        rollup = persistence.saved[-1]["state"]
+        self.assertEqual(rollup["archived_channels"], ["canal_a"])
+        self.assertEqual(sorted(rollup["channel_scopes"]), ["canal_b"])
+        self.assertEqual(rollup["counters"]["chat_messages_total"], 4)
+
+        restarted = ObservabilityState(
+            persistence_layer=ArchivingPersistence(
+                loaded=persistence.saved[-1], archives=persistence.archives
+            ),
+            flush_in_background=False,
+        )
+        self.assertNotIn("canal_a", restarted._channel_scopes)
+        metrics = restarted.query_metrics(
+            ["chat_messages_total", "unique_chatters_total"],
+            channel_id="canal_a",
+            timestamp=base + 7400,
+        )
+        self.assertEqual(metrics, {"chat_messages_total": 3, "unique_chatters_total": 3})
+        self.assertIn("canal_a", restarted._channel_scopes)
+
+        restarted.record_chat_message(
+            author_name="viewer0", source="irc", channel_id="canal_a", timestamp=base + 7500
+        )
+        self.assertEqual(
+            restarted.query_metrics(["chat_messages_total"], channel_id="canal_a")[
+                "chat_messages_total"
+            ],
+            4,
+        )
+        self.assertTrue(restarted.flush())
+        self.assertNotIn("canal_a", restarted._archived_channels)
+        self.assertEqual(restarted._persistence.saved[-1]["state"]["archived_channels"], [])
+
+    def test_unknown_channel_reads_do_not_create_scopes(self):
+        state = ObservabilityState()
+        state.query_metrics(["chat_messages_total"], channel_id="nunca_visto")
+        self.assertNotIn("nunca_visto", state._channel_scopes)
+        self.assertEqual(state.evict_idle_scopes(max_age_seconds=1), 0)
+
+    def test_export_metrics_renders_openmetrics_without_flushing(self):
+        persistence = FakePersistence()
+        state = ObservabilityState(persistence_layer=persistence, flush_in_background=False)
+        base = 1_700_600_000.0
+        state.record_chat_message(
+            author_name="viewer", source="irc", channel_id="canal_a", timestamp=base
+        )
+        state.record_token_usage(
+            input_tokens=120,
+            output_tokens=30,
+            estimated_cost_usd=0.002,
+            channel_id="canal_a",
+            timestamp=base,
+        )
+        for latency_ms in (0.5, 40.0, 40.0, 3000.0):
+            state.record_latency(
+                operation="persistence",
+                name="channels_config",
+                latency_ms=latency_ms,
+                timestamp=base,
+            )
+        saves_before = len(persistence.saved)
+
+        metrics = state.export_metrics(timestamp=base + 1)
+        self.assertEqual(len(persistence.saved), saves_before)
+        self.assertTrue(metrics["persistence"]["dirty"])
+        self.assertEqual(metrics["channels"]["canal_a"]["windows"]["chat_messages_10m"], 1)
+
+        text = render_openmetrics(
+            metrics,
+            queues={"action_queue": {"pending": 2}},
+            event_loop={"last_lag_ms": 12.0, "max_lag_ms": 80.0},
+        )
+        lines = text.splitlines()
+        self.assertEqual(lines[-1], "# EOF")
+        self.assertIn('byte_chat_messages_total{channel="_all"} 1', lines)
+        self.assertIn('byte_chat_messages_total{channel="canal_a"} 1', lines)
+        self.assertIn('byte_llm_tokens_total{channel="canal_a",direction="input"} 120', lines)
+        labels = 'operation="persistence",name="channels_config"'
+        self.assertIn(f'byte_operation_latency_seconds_bucket{{{labels},le="0.001"}} 1', lines)
+        self.assertIn(f'byte_operation_latency_seconds_bucket{{{labels},le="0.05"}} 3', lines)
+        self.assertIn(f'byte_operation_latency_seconds_bucket{{{labels},le="+Inf"}} 4', lines)
+        self.assertIn(f"byte_operation_latency_seconds_count{{{labels}}} 4", lines)
+        self.assertIn('byte_queue_depth{queue="action_queue",status="pending"} 2', lines)
+        self.assertIn('byte_event_loop_lag_seconds{stat="max"} 0.08', lines)
+        self.assertIn("byte_persistence_dirty 1", lines)
+
+    @patch("bot.observability_snapshot._build_sentiment_block")
+    def test_query_metrics_matches_snapshot_without_flushing(self, mock_sentiment_block):
+        mock_sentiment_block.return_value = {
+            "vibe": "Hyped",
+            "avg": 1.2,
+            "count": 4,
+            "positive": 3,
+            "negative": 0,
+        }
+        state = ObservabilityState(persistence_layer=FakePersistence())
+        base = 1_700_400_000.0
+        for index in range(12):
+            state.record_chat_message(
+                author_name=f"user{index % 4}",
+                source="irc",
+                text="byte status",
+                channel_id="canal_a",
+                timestamp=base + index * 30,
+            )
+        state.record_byte_trigger(
+            prompt="byte status",
+            source="prefix",
+            author_name="user1",
+            channel_id="canal_a",
+            timestamp=base + 200,
+        )
+        state.record_byte_interaction(
+            route="llm",
+            author_name="user1",
+            prompt_chars=11,
+            reply_parts=1,
+            reply_chars=2,
+            serious=False,
+            follow_up=False,
+            current_events=False,
+            latency_ms=320.0,
+            channel_id="canal_a",
+            timestamp=base + 201,
+        )
+        state.record_error(
+            category="llm", details="timeout", channel_id="canal_a", timestamp=base + 202
+        )
+        state.flush()
+        now = base + 700
+
+        names = [
+            "messages_10m",
+            "messages_60m",
+            "active_chatters_10m",
+            "byte_triggers_10m",
+            "p95_latency_ms",
+            "errors_30m",
+            "stream_health",
+        ]
+        with patch.object(state._flusher, "request") as mock_request:
+            metrics = state.query_metrics(names, channel_id="Canal_A", timestamp=now)
+        mock_request.assert_not_called()
+
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=SimpleNamespace(
+                stream_vibe="Conversa", last_event="", live_observability={}
+            ),
+            channel_id="canal_a",
+            timestamp=now,
+        )
+        self.assertEqual(metrics["messages_10m"], snapshot["chat_analytics"]["messages_10m"])
+        self.assertEqual(metrics["messages_60m"], snapshot["chat_analytics"]["messages_60m"])
+        self.assertEqual(metrics["active_chatters_10m"], snapshot["chatters"]["active_10m"])
+        self.assertEqual(
+            metrics["byte_triggers_10m"], snapshot["chat_analytics"]["byte_triggers_10m"]
+        )
+        self.assertEqual(metrics["p95_latency_ms"], snapshot["metrics"]["p95_latency_ms"])
+        self.assertEqual(metrics["errors_30m"], 1)
+        self.assertEqual(metrics["stream_health"], snapshot["stream_health"])
+
+        self.assertEqual(
+            state.query_metrics(["messages_10m"], channel_id="sem_atividade"),
+            {"messages_10m": 0},
+        )
+        with self.assertRaises(ValueError):
+            state.query_metrics(["nao_existe"])
+
+    def test_recording_does_not_wait_for_other_channel_readers(self):
+        state = ObservabilityState()
+        state.record_chat_message(
+            author_name="alice", source="irc", text="oi", channel_id="canal_a"
+        )
+        busy_scope = state._channel_scopes["canal_a"]
+
+        def record_other_channel():
+            state.record_chat_message(
+                author_name="bob", source="irc", text="oi", channel_id="canal_b"
+            )
+
+        with busy_scope._lock:
+            worker = threading.Thread(target=record_other_channel)
+            worker.start()
+            worker.join(timeout=2.0)
+            self.assertFalse(worker.is_alive())
+
+        metrics = state.query_metrics(["chat_messages_total", "unique_chatters_total"])
+        self.assertEqual(metrics, {"chat_messages_total": 2, "unique_chatters_total": 2})
+
+    def test_concurrent_recorders_and_readers_keep_global_equal_to_channel_sum(self):
+        state = ObservabilityState()
+        channels = [f"canal_{index}" for index in range(20)]
+        stream_context = SimpleNamespace(stream_vibe="", last_event="", live_observability={})
+        per_thread = 200
+        stop_readers = threading.Event()
+
+        def record(channel_id):
+            for index in range(per_thread):
+                state.record_chat_message(
+                    author_name=f"user{index % 7}",
+                    source="irc",
+                    text="oi",
+                    channel_id=channel_id,
+                )
+
+        def read():
+            while not stop_readers.is_set():
+                state.snapshot(
+                    bot_brand="Byte",
+                    bot_version="1.5",
+                    bot_mode="irc",
+                    stream_context=stream_context,
+                    channel_id=channels[0],
+                )
+                state.query_metrics(["messages_10m"])
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        recorders = [threading.Thread(target=record, args=(channel,)) for channel in channels]
+        for thread in readers + recorders:
+            thread.start()
+        for thread in recorders:
+            thread.join(timeout=30.0)
+        stop_readers.set()
+        for thread in readers:
+            thread.join(timeout=30.0)
+
+        expected_total = per_thread * len(channels)
+        metrics = state.query_metrics(["chat_messages_total", "messages_10m"])
+        self.assertEqual(metrics["chat_messages_total"], expected_total)
+        self.assertEqual(metrics["messages_10m"], expected_total)
+        for channel in channels:
+            self.assertEqual(
+                state.query_metrics(["chat_messages_total"], channel_id=channel),
+                {"chat_messages_total": per_thread},
+            )
+
+    def test_exact_chatter_set_is_opt_in_debug_and_survives_restore(self):
+        persistence = FakePersistence()
+        state = ObservabilityState(
+            persistence_layer=persistence, flush_in_background=False, exact_chatters=True
+        )
+        base = 1_700_700_000.0
+        for index, author in enumerate(["Alice", "bob", "alice", "carol"]):
+            state.record_chat_message(
+                author_name=author,
+                source="irc",
+                text="oi",
+                channel_id="canal_a",
+                timestamp=base + index,
+            )
+        self.assertTrue(state.flush())
+        saved_state = persistence.saved[-1]["state"]
+        self.assertEqual(saved_state["known_chatters"], ["alice", "bob", "carol"])
+        self.assertIn("chatter_sketch", saved_state)
+
+        stream_context = SimpleNamespace(stream_vibe="", last_event="", live_observability={})
+        restored = ObservabilityState(
+            persistence_layer=FakePersistence(loaded=persistence.saved[-1]), exact_chatters=True
+        )
+        chatters = restored.snapshot(
+            bot_brand="Byte",
+            bot_version="1.5",
+            bot_mode="irc",
+            stream_context=stream_context,
+            channel_id="canal_a",
+            timestamp=base + 10,
+        )["chatters"]
+        self.assertEqual(chatters["unique_total"], 3)
+        self.assertEqual(chatters["unique_total_exact"], 3)
+
+        default_state = ObservabilityState(
+            persistence_layer=FakePersistence(loaded=persistence.saved[-1])
+        )
+        self.assertIsNone(default_state._known_chatters)
+        self.assertEqual(
+            default_state.query_metrics(
+                ["unique_chatters_total", "unique_chatters_60m_estimate"], timestamp=base + 10
+            ),
+            {"unique_chatters_total": 3, "unique_chatters_60m_estimate": 3},
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bot.dashboard_server_routes import build_observability_batch_payload, handle_get
+from bot.observability_fields import (
+    BATCH_DEFAULT_FIELDS,
+    parse_channel_list,
+    parse_observability_fields,
+    resolve_snapshot_sections,
+)
+from bot.observability_state import ObservabilityState
+
+BASE = 1_700_000_000.0
+
+
+def _context(channel_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        channel_id=channel_id,
+        stream_vibe="Conversa",
+        last_event="Bot Online",
+        live_observability={},
+        get_uptime_minutes=lambda: 3,
+    )
+
+
+def _state_with_traffic(*channels: str) -> ObservabilityState:
+    state = ObservabilityState(flush_in_background=False)
+    for index, channel_id in enumerate(channels):
+        for offset in range(index + 1):
+            state.record_chat_message(
+                author_name=f"viewer_{offset}",
+                source="irc",
+                text="oi",
+                channel_id=channel_id,
+                timestamp=BASE + offset,
+            )
+    return state
+
+
+def test_parse_fields_and_channels():
+    assert parse_observability_fields([], default=BATCH_DEFAULT_FIELDS) is BATCH_DEFAULT_FIELDS
+    assert parse_observability_fields(["metrics, Chatters"], default=frozenset()) == {
+        "metrics",
+        "chatters",
+    }
+    with pytest.raises(ValueError):
+        parse_observability_fields(["metrics,nope"], default=frozenset())
+
+    assert parse_channel_list(["Canal_A,canal_b", "canal_a"]) == ["canal_a", "canal_b"]
+    assert parse_channel_list([]) is None
+    assert parse_channel_list(["canal_a,*"]) is None
+    with pytest.raises(ValueError):
+        parse_channel_list([",".join(f"c{index}" for index in range(100))])
+
+    assert resolve_snapshot_sections(frozenset({"metrics", "autonomy"})) == {"metrics"}
+    assert "stream_health" in resolve_snapshot_sections(frozenset({"coaching"}))
+
+
+def test_snapshot_sections_skip_unrequested_computations():
+    state = _state_with_traffic("canal_a")
+    with (
+        patch("bot.observability_snapshot.compute_leaderboards") as leaderboards,
+        patch("bot.observability_snapshot._build_sentiment_block") as sentiment,
+        patch("bot.observability_snapshot._build_vision_block") as vision,
+    ):
+        snapshot = state.snapshot(
+            bot_brand="Byte",
+            bot_version="1.0",
+            bot_mode="irc",
+            stream_context=_context("canal_a"),
+            channel_id="canal_a",
+            timestamp=BASE + 60,
+            sections=frozenset({"metrics", "chatters"}),
+        )
+
+    leaderboards.assert_not_called()
+    sentiment.assert_not_called()
+    vision.assert_not_called()
+    assert set(snapshot) == {"timestamp", "metrics", "chatters", "persistence"}
+    assert snapshot["metrics"]["chat_messages_total"] == 1
+
+
+def test_snapshot_many_matches_single_snapshots():
+    state = _state_with_traffic("canal_a", "canal_b")
+    channels = [("canal_a", _context("canal_a")), ("canal_b", _context("canal_b"))]
+    batch = state.snapshot_many(
+        channels, bot_brand="Byte", bot_version="1.0", bot_mode="irc", timestamp=BASE + 60
+    )
+
+    assert list(batch["channels"]) == ["canal_a", "canal_b"]
+    single = state.snapshot(
+        bot_brand="Byte",
+        bot_version="1.0",
+        bot_mode="irc",
+        stream_context=_context("canal_b"),
+        channel_id="canal_b",
+        timestamp=BASE + 60,
+    )
+    single.pop("persistence")
+    assert batch["channels"]["canal_b"] == single
+    assert batch["persistence"]["enabled"] is False
+
+
+@patch("bot.dashboard_server_routes.coaching_runtime")
+@patch("bot.dashboard_server_routes.control_plane")
+@patch("bot.dashboard_server_routes.context_manager")
+def test_batch_payload_shares_global_blocks(mock_context_manager, mock_cp, mock_coaching):
+    state = _state_with_traffic("canal_a", "canal_b", "canal_c")
+    mock_context_manager.list_active_channels.return_value = ["canal_c", "canal_a", "canal_b"]
+    mock_context_manager.get.side_effect = _context
+    mock_cp.runtime_snapshot.return_value = {"queue_window_60m": {"ignored": 2}}
+    mock_cp.build_capabilities.return_value = {"cap": 1}
+
+    with patch("bot.dashboard_server_routes.observability", state):
+        payload = build_observability_batch_payload(
+            None, fields=frozenset({"chatters", "agent_outcomes", "autonomy"})
+        )
+
+    assert payload["scope"] == "active"
+    assert payload["channel_ids"] == ["canal_a", "canal_b", "canal_c"]
+    assert payload["channels"]["canal_c"]["chatters"]["unique_total"] == 3
+    assert payload["channels"]["canal_a"]["agent_outcomes"]["ignored_total_60m"] == 2
+    assert set(payload["channels"]["canal_b"]) == {"timestamp", "chatters", "agent_outcomes"}
+    assert payload["autonomy"] == {"queue_window_60m": {"ignored": 2}}
+    assert "capabilities" not in payload
+    mock_cp.runtime_snapshot.assert_called_once()
+    mock_cp.build_capabilities.assert_not_called()
+    mock_coaching.evaluate_and_emit.assert_not_called()
+
+
+@patch("bot.dashboard_server_routes.coaching_runtime")
+@patch("bot.dashboard_server_routes.control_plane")
+@patch("bot.dashboard_server_routes.context_manager")
+def test_batch_coaching_computes_dependencies_without_returning_them(
+    mock_context_manager, mock_cp, mock_coaching
+):
+    state = _state_with_traffic("canal_a")
+    mock_context_manager.get.side_effect = _context
+    mock_cp.runtime_snapshot.return_value = {"queue_window_60m": {}}
+    mock_coaching.evaluate_and_emit.return_value = {"risk_band": "low"}
+
+    with patch("bot.dashboard_server_routes.observability", state):
+        payload = build_observability_batch_payload(["canal_a"], fields=frozenset({"coaching"}))
+
+    seen_snapshot = mock_coaching.evaluate_and_emit.call_args.args[0]
+    assert "stream_health" in seen_snapshot
+    assert set(payload["channels"]["canal_a"]) == {"timestamp", "coaching"}
+
+
+@patch("bot.dashboard_server_routes.build_observability_batch_payload")
+def test_handle_get_api_observability_batch(mock_build_payload):
+    mock_build_payload.return_value = {"ok": True}
+    handler = MagicMock(path="/api/observability/batch?channels=Canal_A,canal_b&fields=metrics")
+    handler._dashboard_authorized.return_value = True
+    handle_get(handler)
+    mock_build_payload.assert_called_once_with(
+        ["canal_a", "canal_b"], fields=frozenset({"metrics"})
+    )
+
+    handler = MagicMock(path="/api/observability/batch?fields=bogus")
+    handler._dashboard_authorized.return_value = True
+    handle_get(handler)
+    assert handler._send_json.call_args.kwargs["status_code"] == 400
@@ -0,0 +1,134 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bot.observability import ObservabilityState
+from bot.observability_helpers import CHAT_EVENT_FIELDS
+from bot.observability_rollup_codec import (
+    decode_event_rows,
+    decode_rollup_document,
+    encode_event_rows,
+    encode_rollup_document,
+)
+from bot.persistence_layer import PersistenceLayer
+
+STREAM_CONTEXT = SimpleNamespace(stream_vibe="Conversa", last_event="Delta", live_observability={})
+
+
+def _snapshot(state, channel_id=None, timestamp=1_700_500_100.0):
+    return state.snapshot(
+        bot_brand="Byte",
+        bot_version="1.5",
+        bot_mode="irc",
+        stream_context=STREAM_CONTEXT,
+        channel_id=channel_id,
+        timestamp=timestamp,
+    )
+
+
+def _memory_layer():
+    with patch.dict(os.environ, {}, clear=True):
+        return PersistenceLayer()
+
+
+def test_codec_round_trips_documents_and_columnar_rows():
+    rows = [
+        {
+            "ts": 1_700_000_000.123456,
+            "source": "irc",
+            "author": "alice",
+            "length": 4,
+            "is_command": False,
+            "has_url": True,
+        },
+        {
+            "ts": 1_700_000_001.5,
+            "source": "eventsub",
+            "author": "bob",
+            "length": 9,
+            "is_command": True,
+            "has_url": False,
+        },
+    ]
+    encoded = encode_event_rows(rows, CHAT_EVENT_FIELDS)
+    assert encoded["ts"][1] == 1_376_544
+    assert decode_event_rows(encoded, CHAT_EVENT_FIELDS) == rows
+    assert decode_event_rows(rows, CHAT_EVENT_FIELDS) == rows
+
+    document = encode_rollup_document({"counters": {"chat_messages_total": 3}})
+    assert document["codec"] == "zlib+json/v1"
+    assert decode_rollup_document(document) == {"counters": {"chat_messages_total": 3}}
+    assert decode_rollup_document({"counters": {}}) == {"counters": {}}
+
+
+def test_state_persists_checkpoint_then_deltas_and_restores_both():
+    layer = _memory_layer()
+    state = ObservabilityState(
+        persistence_layer=layer, flush_in_background=False, checkpoint_every=10
+    )
+    base = 1_700_500_000.0
+    state.record_chat_message(
+        author_name="alice", source="irc", text="oi", channel_id="canal_a", timestamp=base
+    )
+    assert state.flush()
+    checkpoint = layer.load_observability_rollup_sync()
+    assert checkpoint["state"]["schema_version"] == 3
+    assert layer.load_observability_rollup_deltas_sync(checkpoint["state"]["checkpoint_id"]) == []
+
+    state.record_chat_message(
+        author_name="bob", source="irc", text="!cmd", channel_id="canal_b", timestamp=base + 5
+    )
+    state.record_reply(text="resposta", channel_id="canal_a", timestamp=base + 6)
+    assert state.flush()
+    deltas = layer.load_observability_rollup_deltas_sync(checkpoint["state"]["checkpoint_id"])
+    assert len(deltas) == 1
+    delta = decode_rollup_document(deltas[0]["state"])
+    assert delta["counters"] == {
+        "chat_messages_total": 2,
+        "chat_messages_irc": 2,
+        "chat_prefixed_messages": 1,
+        "replies_total": 1,
+        "reply_chars_total": 8,
+    }
+    assert len(delta["chat_events"]["ts"]) == 1
+    assert set(delta["channel_scopes"]) == {"canal_a", "canal_b"}
+
+    restored = ObservabilityState(persistence_layer=layer, flush_in_background=False)
+    snapshot = _snapshot(restored)
+    assert snapshot["metrics"]["chat_messages_total"] == 2
+    assert snapshot["metrics"]["replies_total"] == 1
+    assert snapshot["chat_analytics"]["messages_10m"] == 2
+    assert snapshot["chatters"]["unique_total"] == 2
+    assert _snapshot(restored, "canal_b")["metrics"]["chat_messages_total"] == 1
+    assert _snapshot(restored, "canal_a")["context"]["last_reply"] == "resposta"
+
+
+def test_state_writes_full_checkpoint_after_limit_and_after_failed_delta():
+    layer = _memory_layer()
+    state = ObservabilityState(
+        persistence_layer=layer, flush_in_background=False, checkpoint_every=1
+    )
+    base = 1_700_600_000.0
+    kinds = []
+    for index in range(3):
+        state.record_chat_message(
+            author_name="alice", source="irc", text="oi", timestamp=base + index
+        )
+        state.flush()
+        kinds.append(
+            _snapshot(state, timestamp=base + 10)["persistence"]["flusher"]["last_persist_kind"]
+        )
+    assert kinds == ["checkpoint", "delta", "checkpoint"]
+
+    state.record_chat_message(author_name="bob", source="irc", text="oi", timestamp=base + 20)
+    with patch.object(
+        layer, "append_observability_rollup_delta_sync", side_effect=RuntimeError("offline")
+    ):
+        assert state.flush() is False
+    assert state.flush()
+    assert (
+        _snapshot(state, timestamp=base + 30)["persistence"]["flusher"]["last_persist_kind"]
+        == "checkpoint"
+    )
+    restored = ObservabilityState(persistence_layer=layer, flush_in_background=False)
+    assert _snapshot(restored, timestamp=base + 30)["metrics"]["chat_messages_total"] == 4
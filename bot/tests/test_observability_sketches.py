@@ -0,0 +1,187 @@
+import pytest
+
+from bot.observability_sketches import (
+    HyperLogLog,
+    QuantileSketch,
+    SpaceSavingTopK,
+    WindowedHyperLogLog,
+    WindowedQuantileSketch,
+    WindowedTopK,
+)
+
+
+def test_hyperloglog_estimates_distinct_counts_within_error_bounds():
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    for index in range(20):
+        sketch.add(f"viewer_{index % 5}")
+    assert sketch.count() == 5
+
+    for index in range(100_000):
+        sketch.add(f"viewer_{index}")
+    assert abs(sketch.count() - 100_000) / 100_000 < 0.04
+    assert len(sketch._registers) == 4096
+
+
+def test_hyperloglog_merges_and_round_trips_payload():
+    left = HyperLogLog()
+    right = HyperLogLog()
+    left.update(f"a{index}" for index in range(3_000))
+    right.update(f"a{index}" for index in range(2_000, 6_000))
+
+    merged = left.copy()
+    merged.merge(right)
+    assert abs(merged.count() - 6_000) / 6_000 < 0.05
+
+    restored = HyperLogLog.from_payload(merged.to_payload())
+    assert restored is not None
+    assert restored.count() == merged.count()
+    assert HyperLogLog.from_payload({"p": 12, "registers": "invalido"}) is None
+
+    with pytest.raises(ValueError):
+        merged.merge(HyperLogLog(precision=10))
+
+
+def test_hyperloglog_tracks_register_changes():
+    sketch = HyperLogLog()
+    sketch.add("alice")
+    assert sketch.drain_changed() is True
+    sketch.add("alice")
+    assert sketch.drain_changed() is False
+
+
+def test_windowed_hyperloglog_counts_only_recent_buckets():
+    window = WindowedHyperLogLog(bucket_seconds=60, buckets=12, precision=12)
+    for index in range(50):
+        window.add(f"old_{index}", 0.0)
+    for index in range(30):
+        window.add(f"new_{index}", 600.0)
+    window.add("new_0", 610.0)
+
+    assert window.count_since(600.0) == 30
+    assert abs(window.count_since(0.0) - 80) <= 2
+    assert window.count_since(720.0) == 0
+
+    # Minuto 12 recicla o slot do minuto 0, que sai da contagem.
+    window.add("recycled", 720.0)
+    assert abs(window.count_since(0.0) - 31) <= 1
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounded_memory():
+    sketch = SpaceSavingTopK(capacity=32)
+    for index in range(50_000):
+        sketch.increment(f"viewer_{index}")
+        if index % 10 == 0:
+            sketch.increment("flood")
+        if index % 25 == 0:
+            sketch.increment("regular")
+
+    assert len(sketch) == 32
+    assert len(sketch._heap) <= 4 * 32 + 16
+    assert len(sketch._dropped) <= 32 and len(sketch._fresh) <= 32
+    assert sketch.total == 50_000 + 5_000 + 2_000
+    top = sketch.top(2)
+    assert [author for author, _ in top] == ["flood", "regular"]
+    # Contagem e limite superior; o erro herdado fica abaixo de total/capacity.
+    assert 5_000 <= top[0][1] <= 5_000 + sketch.total // 32
+    assert sketch.error("flood") <= sketch.total // 32
+
+
+def test_space_saving_is_exact_below_capacity_and_keeps_tie_order():
+    sketch = SpaceSavingTopK(capacity=8)
+    for author in ("alice", "bob", "bob", "carol", "alice"):
+        sketch.increment(author)
+    assert sketch.top(3) == [("alice", 2), ("bob", 2), ("carol", 1)]
+    assert sketch.error("alice") == 0
+
+
+def test_space_saving_changes_replay_to_identical_state():
+    source = SpaceSavingTopK(capacity=4)
+    replica = SpaceSavingTopK.from_payload(source.to_payload(), capacity=4)
+    for round_index in range(5):
+        for index in range(12):
+            source.increment(f"v{(index * 7 + round_index) % 9}", amount=index % 3 + 1)
+        replica.apply_changes(source.drain_changes())
+        assert dict(replica.items()) == dict(source.items())
+    assert source.drain_changes() is None
+
+    restored = SpaceSavingTopK.from_payload(source.to_payload())
+    assert restored.top(4) == source.top(4)
+    assert restored.total == source.total
+
+
+def test_space_saving_restores_legacy_counter_payload():
+    legacy = {f"viewer_{index}": index for index in range(1, 11)}
+    sketch = SpaceSavingTopK.from_payload(legacy, capacity=4)
+    assert sketch.top(4) == [("viewer_10", 10), ("viewer_9", 9), ("viewer_8", 8), ("viewer_7", 7)]
+    assert sketch.total == sum(legacy.values())
+
+    sketch.apply_changes({"viewer_1": 50})
+    assert sketch.top(1) == [("viewer_1", 50)]
+    assert len(sketch) == 4
+
+
+def test_windowed_top_k_ranks_recent_buckets_and_handles_late_events():
+    window = WindowedTopK(bucket_seconds=60, buckets=61, capacity=16)
+    for _ in range(5):
+        window.add("old", 0.0)
+    for minute in range(1, 61):
+        window.add("steady", minute * 60.0)
+        if minute % 2 == 0:
+            window.add("burst", minute * 60.0 + 1, amount=3)
+
+    since = 60.0
+    assert window.top(2, since) == [("burst", 90), ("steady", 60)]
+    assert all(author != "old" for author, _ in window.top(8, since))
+    assert window.top(8, 0.0)[-1] == ("old", 5)
+
+    # Evento atrasado num bucket fechado invalida o ranking em cache.
+    window.add("late", 1_800.0, amount=200)
+    assert window.top(1, since) == [("late", 200)]
+    assert window.top(3, 4_000.0) == []
+
+
+def test_quantile_sketch_tracks_tail_within_relative_error():
+    sketch = QuantileSketch()
+    values = [float(index % 1000) + 0.5 for index in range(20_000)]
+    values.extend([2_500.0] * 30 + [9_000.0] * 5)
+    for value in values:
+        sketch.add(value)
+
+    ordered = sorted(values)
+    labels = (0.5, 0.9, 0.99, 0.999)
+    for quantile, estimate in zip(labels, sketch.quantiles(labels), strict=True):
+        exact = ordered[int(quantile * (len(ordered) - 1))]
+        assert abs(estimate - exact) <= exact * 0.011
+    assert sketch.quantile(1.0) == 9_000.0
+    assert sketch.count == len(values)
+    assert len(sketch._bins) < 450
+
+    other = QuantileSketch()
+    other.add(0.0)
+    other.add(50_000.0)
+    sketch.merge(other)
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.max == 50_000.0
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_windowed_quantile_sketch_separates_windows():
+    window = WindowedQuantileSketch()
+    now = 10_000.0
+    for index in range(100):
+        window.add(10.0, now - 3_000 + index)
+        window.add(100.0, now - 300 + index)
+        window.add(1_000.0, now - 30 + index * 0.1)
+
+    assert window.window(60, now).count == 100
+    assert abs(window.window(60, now).quantile(0.5) - 1_000.0) <= 10.0
+    assert window.window(600, now).count == 200
+    assert window.window(3_600, now).count == 300
+    assert abs(window.window(3_600, now).quantile(0.1) - 10.0) <= 0.1
+
+    # Evento atrasado entra no bucket fechado e invalida o cache.
+    window.add(5.0, now - 200)
+    assert window.window(600, now).count == 201
+    assert window.window(60, now + 7_200).count == 0
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from bot.observability_snapshot_cache import ObservabilitySnapshotCache
+
+
+def test_cache_serves_hits_within_ttl_and_rebuilds_after_expiry():
+    cache = ObservabilitySnapshotCache(ttl_seconds=0.05)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"build": len(builds)}
+
+    assert cache.get_or_build("canal_a", build)[:2] == ({"build": 1}, "miss")
+    assert cache.get_or_build("canal_a", build)[:2] == ({"build": 1}, "hit")
+    assert cache.get_or_build("canal_b", build)[:2] == ({"build": 2}, "miss")
+    time.sleep(0.06)
+    assert cache.get_or_build("canal_a", build)[:2] == ({"build": 3}, "miss")
+
+    status = cache.get_status()
+    assert status["hits"] == 1
+    assert status["misses"] == 3
+    assert status["hit_ratio"] == 0.25
+
+
+def test_cache_coalesces_concurrent_builds_into_one():
+    cache = ObservabilitySnapshotCache(ttl_seconds=5.0)
+    release = threading.Event()
+    builds = []
+
+    def slow_build():
+        builds.append(1)
+        release.wait(timeout=2.0)
+        return {"ok": True}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_build("canal", slow_build)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2.0)
+
+    assert len(builds) == 1
+    assert sorted(source for _, source, _ in results).count("miss") == 1
+    assert cache.get_status()["hits"] + cache.get_status()["coalesced"] == 7
+
+
+def test_cache_retries_after_failed_leader_and_zero_ttl_disables_storage():
+    cache = ObservabilitySnapshotCache(ttl_seconds=5.0)
+
+    def failing_build():
+        raise RuntimeError("snapshot falhou")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build("canal", failing_build)
+    assert cache.get_or_build("canal", lambda: {"ok": 1})[:2] == ({"ok": 1}, "miss")
+
+    disabled = ObservabilitySnapshotCache(ttl_seconds=0)
+    disabled.get_or_build("canal", lambda: {"ok": 1})
+    assert disabled.get_or_build("canal", lambda: {"ok": 2})[:2] == ({"ok": 2}, "miss")
+    assert disabled.get_status()["entries"] == 0
@@ -0,0 +1,165 @@
+from bot.observability_structures import (
+    ColumnarEventLog,
+    MinuteBucketRing,
+    RecencyMap,
+    RollingWindow,
+    SequencedDeque,
+    TrackedCounter,
+)
+
+
+def test_minute_bucket_ring_overwrites_expired_slots_and_honors_floor():
+    ring = MinuteBucketRing(3)
+    ring[10] = {"chat_messages": 1}
+    ring[11] = {"chat_messages": 2}
+    ring[13] = {"chat_messages": 3}
+
+    assert 10 not in ring
+    assert ring.keys() == [11, 13]
+    assert ring.get(13) == {"chat_messages": 3}
+
+    ring.expire_before(12)
+    assert ring.items() == [(13, {"chat_messages": 3})]
+    assert len(ring) == 1
+
+    ring[11] = {"chat_messages": 9}
+    assert ring.get(11) is None
+
+
+def test_minute_bucket_ring_keeps_newest_minute_on_collision():
+    ring = MinuteBucketRing(2)
+    ring[8] = {"errors": 1}
+    ring[6] = {"errors": 5}
+
+    assert ring.get(8) == {"errors": 1}
+    assert ring.get(6) is None
+
+
+def test_recency_map_expires_only_from_the_front():
+    recency = RecencyMap()
+    recency.touch("alice", 10.0)
+    recency.touch("bob", 20.0)
+    recency.touch("alice", 30.0)
+
+    assert list(recency) == ["bob", "alice"]
+    assert recency.expire_before(25.0) == 1
+    assert dict(recency) == {"alice": 30.0}
+
+
+def test_recency_map_from_mapping_orders_by_timestamp():
+    recency = RecencyMap.from_mapping({"late": 50.0, "early": 5.0})
+
+    assert list(recency) == ["early", "late"]
+
+
+def test_recency_map_counts_recent_keys_from_the_back():
+    recency = RecencyMap()
+    for index, author in enumerate(["a", "b", "c", "d"]):
+        recency.touch(author, float(index * 10))
+
+    assert recency.count_since(15.0) == 2
+    assert recency.count_since(100.0) == 0
+    assert recency.count_since(0.0) == 4
+
+
+def test_recency_map_items_since_returns_recent_tail():
+    recency = RecencyMap.from_mapping({"a": 1.0, "b": 5.0, "c": 9.0})
+
+    assert recency.items_since(5.0) == {"c": 9.0, "b": 5.0}
+
+
+def test_tracked_counter_drains_only_changed_keys():
+    counter = TrackedCounter({"a": 1, "b": 2})
+    assert counter.drain_changes() == {}
+
+    counter["a"] += 2
+    counter.update(["c"])
+    assert counter.drain_changes() == {"a": 3, "c": 1}
+    assert counter.drain_changes() == {}
+
+
+def test_sequenced_deque_returns_tail_since_cursor():
+    values = SequencedDeque([1, 2], maxlen=3)
+    cursor = values.appended
+    for value in (3, 4, 5, 6):
+        values.append(value)
+
+    assert values.tail_since(cursor) == [4, 5, 6]
+    assert values.tail_since(values.appended - 1) == [6]
+    assert values.tail_since(values.appended) == []
+
+
+FIELDS = (("ts", "float"), ("author", "symbol"), ("length", "int"), ("flag", "bool"))
+
+
+def _apply_lengths(window, event, sign):
+    window.bump("count", sign)
+    window.bump("length", sign * event["length"])
+    window.tally("authors", event["author"], sign)
+
+
+def _append(log, windows, event):
+    if log.is_full():
+        for window in windows:
+            window.evict(log.first_seq)
+    log.append(event)
+    for window in windows:
+        window.add(event)
+
+
+def test_columnar_event_log_round_trips_rows_and_wraps_at_capacity():
+    log = ColumnarEventLog(FIELDS, 3)
+    for index in range(5):
+        log.append(
+            {"ts": float(index), "author": f"a{index % 2}", "length": index, "flag": index % 2}
+        )
+
+    assert len(log) == 3
+    assert log.first_seq == 2
+    assert list(log) == [
+        {"ts": 2.0, "author": "a0", "length": 2, "flag": False},
+        {"ts": 3.0, "author": "a1", "length": 3, "flag": True},
+        {"ts": 4.0, "author": "a0", "length": 4, "flag": False},
+    ]
+
+    assert log.expire_before(3.5) == 2
+    assert list(log) == [{"ts": 4.0, "author": "a0", "length": 4, "flag": False}]
+    assert log._symbol_ids == {"a0": 0}
+
+
+def test_columnar_event_log_fills_missing_fields_with_defaults():
+    log = ColumnarEventLog.from_events(FIELDS, 10, [{"ts": 1.0}, "invalido"])
+
+    assert list(log) == [{"ts": 1.0, "author": "", "length": 0, "flag": False}]
+
+
+def test_rolling_window_adds_and_expires_incrementally():
+    log = ColumnarEventLog(FIELDS, 10)
+    window = RollingWindow(log, 60, _apply_lengths)
+    _append(log, [window], {"ts": 0.0, "length": 5, "author": "alice"})
+    _append(log, [window], {"ts": 30.0, "length": 7, "author": "bob"})
+    _append(log, [window], {"ts": 50.0, "length": 1, "author": "alice"})
+
+    window.expire(70.0)
+    assert len(window) == 2
+    assert window.total("count") == 2
+    assert window.total("length") == 8
+    assert dict(window.group("authors")) == {"bob": 1, "alice": 1}
+
+    window.expire(200.0)
+    assert len(window) == 0
+    assert window.totals == {}
+    assert window.group("authors") == {}
+
+
+def test_rolling_window_follows_log_eviction_and_rebuilds_from_log():
+    log = ColumnarEventLog(FIELDS, 2)
+    window = RollingWindow(log, 600, _apply_lengths)
+    for index in range(4):
+        _append(log, [window], {"ts": float(index), "length": index, "author": "alice"})
+
+    assert window.total("count") == 2
+    assert window.total("length") == 5
+
+    restored = RollingWindow(log, 600, _apply_lengths)
+    assert restored.totals == window.totals
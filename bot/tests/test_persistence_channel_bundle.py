@@ -0,0 +1,190 @@
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from bot.persistence_channel_bundle import ChannelBundleLoader
+from bot.persistence_layer import PersistenceLayer
+
+QUERY_LATENCY_SECONDS = 0.05
+
+
+class _SlowQuery:
+    """Stand-in do builder do postgrest: cada ``execute()`` custa um round trip."""
+
+    def __init__(self, table: str, rows: dict[str, object], latency: dict[str, float]) -> None:
+        self._table = table
+        self._rows = rows
+        self._latency = latency
+
+    def __getattr__(self, _name: str):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self._latency.get(self._table, QUERY_LATENCY_SECONDS))
+        return SimpleNamespace(data=self._rows.get(self._table))
+
+
+class _SlowSupabase:
+    def __init__(self, rows: dict[str, object], latency: dict[str, float] | None = None) -> None:
+        self._rows = rows
+        self._latency = latency or {}
+
+    def table(self, name: str) -> _SlowQuery:
+        return _SlowQuery(name, self._rows, self._latency)
+
+
+ROWS = {
+    "channel_state": {"channel_id": "canal_a", "current_game": "Balatro"},
+    "channel_history": [{"author": "viewer", "message": "oi"}],
+    "channels_config": {"channel_id": "canal_a", "temperature": 0.4, "top_p": 0.9},
+    "agent_notes": {"channel_id": "canal_a", "notes": "Sem spoiler."},
+    "channel_identity": {"channel_id": "canal_a", "persona_name": "Byte Coach"},
+    "persona_profiles": None,
+}
+
+
+def _layer(client: _SlowSupabase) -> PersistenceLayer:
+    env = {"SUPABASE_URL": "http://localhost:54321", "SUPABASE_KEY": "local"}
+    with (
+        patch.dict(os.environ, env, clear=True),
+        patch("bot.persistence_layer.create_client", return_value=client),
+    ):
+        return PersistenceLayer()
+
+
+def test_bundle_reads_in_parallel_against_slow_standin():
+    layer = _layer(_SlowSupabase(ROWS))
+
+    started = time.perf_counter()
+    bundle = layer.load_channel_bundle_sync("Canal_A")
+    elapsed = time.perf_counter() - started
+
+    assert bundle.channel_id == "canal_a"
+    assert bundle.state["current_game"] == "Balatro"
+    assert bundle.history == ["viewer: oi"]
+    assert bundle.channel_config["temperature"] == 0.4
+    assert bundle.agent_notes["notes"] == "Sem spoiler."
+    assert bundle.channel_identity["persona_name"] == "Byte Coach"
+    assert bundle.timed_out == ()
+    # Seis round trips em serie custariam ~0.3s; em paralelo, perto de um so.
+    assert elapsed < QUERY_LATENCY_SECONDS * 6 * 0.6
+    status = layer.get_channel_bundle_status()
+    assert status["loads_total"] == 1
+    assert status["avg_serial_ms"] > status["avg_elapsed_ms"]
+
+
+def test_bundle_deadline_returns_partial_bundle():
+    layer = _layer(_SlowSupabase(ROWS, latency={"channel_history": 1.0}))
+
+    bundle = layer.load_channel_bundle_sync("canal_a", deadline_seconds=0.2)
+
+    assert bundle.timed_out == ("history",)
+    assert bundle.history == []
+    assert bundle.agent_notes["notes"] == "Sem spoiler."
+    assert bundle.elapsed_ms < 1000
+    assert layer.get_channel_bundle_status()["timeouts_total"] == 1
+
+
+class _BulkQuery:
+    """Stand-in que aplica ``in_``/``eq``/``limit`` e conta as idas ao banco."""
+
+    def __init__(self, table: str, client: "_BulkSupabase") -> None:
+        self._table = table
+        self._client = client
+        self._channel_ids: list[str] | None = None
+        self._limit: int | None = None
+
+    def __getattr__(self, _name: str):
+        return lambda *args, **kwargs: self
+
+    def in_(self, _column: str, values: list[str]) -> "_BulkQuery":
+        self._channel_ids = list(values)
+        return self
+
+    def eq(self, _column: str, value: str) -> "_BulkQuery":
+        self._channel_ids = [value]
+        return self
+
+    def limit(self, value: int) -> "_BulkQuery":
+        self._limit = value
+        return self
+
+    def execute(self):
+        self._client.queries.append((self._table, tuple(self._channel_ids or ())))
+        rows = [
+            row
+            for row in self._client.rows.get(self._table, [])
+            if self._channel_ids is None or row["channel_id"] in self._channel_ids
+        ]
+        return SimpleNamespace(data=rows[: self._limit] if self._limit else rows)
+
+
+class _BulkSupabase:
+    def __init__(self, rows: dict[str, list[dict[str, object]]]) -> None:
+        self.rows = rows
+        self.queries: list[tuple[str, tuple[str, ...]]] = []
+
+    def table(self, name: str) -> _BulkQuery:
+        return _BulkQuery(name, self)
+
+
+def test_bulk_bundles_use_one_in_query_per_table():
+    # Historico ja em ordem decrescente de ``ts``, como o ``order`` devolveria.
+    history = [{"channel_id": "canal_a", "author": "a", "message": str(i)} for i in range(40)]
+    history.append({"channel_id": "canal_b", "author": "b", "message": "oi"})
+    client = _BulkSupabase(
+        {
+            "channel_state": [{"channel_id": "canal_b", "current_game": "Hades"}],
+            "channel_history": history,
+            "channels_config": [{"channel_id": "canal_a", "temperature": 0.4}],
+            "agent_notes": [{"channel_id": "canal_b", "notes": "Sem spoiler."}],
+        }
+    )
+    layer = _layer(client)
+
+    bundles = layer.load_channel_bundles_sync(["Canal_A", "canal_b", "canal_c"])
+
+    assert list(bundles) == ["canal_a", "canal_b", "canal_c"]
+    assert bundles["canal_b"].state["current_game"] == "Hades"
+    assert bundles["canal_a"].state is None
+    assert bundles["canal_a"].channel_config["temperature"] == 0.4
+    assert bundles["canal_b"].agent_notes["notes"] == "Sem spoiler."
+    assert bundles["canal_c"].history == []
+    assert bundles["canal_a"].history == [f"a: {i}" for i in reversed(range(12))]
+    # canal_a encheu o teto do ``in``: canal_b e canal_c sao relidos um a um.
+    assert bundles["canal_b"].history == ["b: oi"]
+    bulk_tables = sorted(table for table, channel_ids in client.queries if len(channel_ids) == 3)
+    assert bulk_tables == sorted(
+        [
+            "channel_state",
+            "channel_history",
+            "channels_config",
+            "agent_notes",
+            "channel_identity",
+            "persona_profiles",
+        ]
+    )
+    assert sorted(
+        channel_ids for table, channel_ids in client.queries if len(channel_ids) == 1
+    ) == [("canal_b",), ("canal_c",)]
+    status = layer.get_channel_bundle_status()
+    assert status["bulk_loads_total"] == 1
+    assert status["bulk_channels_total"] == 3
+
+
+def test_bundle_reads_inline_when_persistence_disabled():
+    calls: list[str] = []
+    loader = ChannelBundleLoader(
+        {"state": lambda channel_id: calls.append(channel_id)},
+        parallel=lambda: False,
+    )
+
+    bundle = loader.load_sync("Canal_B", parts=("state",))
+
+    assert calls == ["canal_b"]
+    assert bundle.state is None
+    with pytest.raises(ValueError):
+        loader.load_sync("canal_b", parts=("webhooks",))
@@ -245,6 +245,30 @@ class TestPersistenceLayer(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(payload["agent_paused"])
         self.assertEqual(payload["source"], "memory")
 
+    def test_supabase_queries_report_latency_per_table_including_failures(self):
+        mock_client = MagicMock()
+        table = mock_client.table.return_value
+        select_chain = table.select.return_value.eq.return_value.maybe_single.return_value
+        select_chain.execute.side_effect = RuntimeError("supabase down")
+
+        with patch.dict(
+            os.environ,
+            {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_KEY": "test_key"},
+            clear=True,
+        ):
+            with patch("bot.persistence_layer.create_client", return_value=mock_client):
+                layer = PersistenceLayer()
+
+        recorded = []
+        layer._client._sink = lambda table_name, latency_ms: recorded.append(table_name)
+
+        layer.load_channel_config_sync("canal_latency")
+        layer._client.rpc("match_entries", {"k": 1}).execute()
+
+        self.assertEqual(recorded, ["channels_config", "rpc:match_entries"])
+        table.select.assert_called_once()
+        mock_client.rpc.assert_called_once_with("match_entries", {"k": 1})
+
     def test_save_channel_config_sync_returns_memory_payload_on_supabase_error(self):
         mock_client = MagicMock()
         mock_client.table.return_value.upsert.return_value.execute.side_effect = RuntimeError(
@@ -1022,6 +1046,18 @@ class TestPersistenceLayer(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(saved["source"], "memory")
         self.assertEqual(loaded["state"]["counters"]["chat_messages_total"], 2)
 
+    def test_observability_scope_archive_memory_fallback_when_disabled(self):
+        with patch.dict(os.environ, {}, clear=True):
+            layer = PersistenceLayer()
+
+        saved = layer.save_observability_scope_archive_sync("Canal_A", {"codec": "zlib"})
+
+        self.assertEqual(saved["rollup_key"], "channel:archive:canal_a")
+        self.assertEqual(
+            layer.load_observability_scope_archive_sync("canal_a")["state"]["codec"], "zlib"
+        )
+        self.assertIsNone(layer.load_observability_scope_archive_sync("canal_b"))
+
     def test_observability_rollup_supabase_roundtrip(self):
         mock_client = MagicMock()
         table = mock_client.table.return_value
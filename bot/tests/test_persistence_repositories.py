@@ -1,5 +1,5 @@
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from bot.persistence_agent_notes_repository import AgentNotesRepository
 from bot.persistence_channel_config_repository import ChannelConfigRepository
@@ -87,6 +87,28 @@ def test_observability_history_repository_memory_timeline_and_latest_snapshots()
     assert latest[1]["channel_id"] == "canal_a"
 
 
+def test_observability_history_repository_batch_insert_uses_single_request():
+    mock_client = MagicMock()
+    cache: dict[str, list[dict[str, object]]] = {}
+    repository = ObservabilityHistoryRepository(enabled=True, client=mock_client, cache=cache)
+
+    saved = repository.save_channel_history_batch_sync(
+        [
+            ("Canal_A", {"metrics": {"chat_messages_total": 4}}),
+            ("", {"metrics": {}}),
+            ("canal_b", {"metrics": {"chat_messages_total": 1}}),
+        ]
+    )
+
+    assert [point["channel_id"] for point in saved] == ["canal_a", "canal_b"]
+    assert all(point["source"] == "supabase" for point in saved)
+    table = mock_client.table.return_value
+    table.insert.assert_called_once()
+    rows = table.insert.call_args.args[0]
+    assert [row["channel_id"] for row in rows] == ["canal_a", "canal_b"]
+    assert cache["canal_a"][-1]["metrics"]["chat_messages_total"] == 4
+
+
 def test_post_stream_report_repository_memory_roundtrip():
     cache: dict[str, dict[str, object]] = {}
     repository = PostStreamReportRepository(enabled=False, client=None, cache=cache)
@@ -166,3 +188,93 @@ def test_persistence_layer_facade_shares_repository_caches():
     assert layer._observability_history_repo._cache is layer._observability_channel_history_cache
     assert layer._post_stream_report_repo._cache is layer._post_stream_report_cache
     assert layer._semantic_memory_repo._cache is layer._semantic_memory_cache
+
+
+def _config_client(row: dict[str, object]) -> MagicMock:
+    client = MagicMock()
+    table = client.table.return_value
+    select_chain = table.select.return_value.eq.return_value.maybe_single.return_value
+    select_chain.execute.return_value = MagicMock(data=row)
+    return client
+
+
+def test_cached_repository_serves_reads_from_cache_within_ttl():
+    client = _config_client({"channel_id": "canal_a", "temperature": 0.4})
+    select_chain = client.table.return_value.select.return_value.eq.return_value.maybe_single
+    repository = ChannelConfigRepository(enabled=True, client=client, cache={}, ttl_seconds=60)
+
+    first = repository.load_sync("Canal_A")
+    second = repository.load_sync("canal_a")
+    second["temperature"] = 1.9
+
+    assert first["temperature"] == 0.4
+    assert repository.load_sync("canal_a")["temperature"] == 0.4
+    assert select_chain.return_value.execute.call_count == 1
+    stats = repository.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+
+    assert repository.invalidate("canal_a") == 1
+    repository.load_sync("canal_a")
+    assert select_chain.return_value.execute.call_count == 2
+    assert repository.get_cache_stats()["invalidations"] == 1
+
+
+def test_cached_repository_ttl_zero_always_reads_supabase():
+    client = _config_client({"channel_id": "canal_a", "temperature": 0.4})
+    select_chain = client.table.return_value.select.return_value.eq.return_value.maybe_single
+    repository = ChannelConfigRepository(enabled=True, client=client, cache={}, ttl_seconds=0)
+
+    repository.load_sync("canal_a")
+    repository.load_sync("canal_a")
+
+    assert select_chain.return_value.execute.call_count == 2
+    assert repository.get_cache_stats()["hits"] == 0
+
+
+def test_cached_repository_save_uses_upsert_returning_without_reload():
+    client = _config_client({"channel_id": "canal_a", "temperature": 0.1})
+    select_chain = client.table.return_value.select.return_value.eq.return_value.maybe_single
+    client.table.return_value.upsert.return_value.execute.return_value = MagicMock(
+        data=[
+            {
+                "channel_id": "canal_a",
+                "temperature": 0.55,
+                "top_p": 0.9,
+                "agent_paused": False,
+                "updated_at": "2026-10-19T12:00:00Z",
+            }
+        ]
+    )
+    repository = ChannelConfigRepository(enabled=True, client=client, cache={}, ttl_seconds=60)
+
+    saved = repository.save_sync("canal_a", temperature=0.55, top_p=0.9)
+    loaded = repository.load_sync("canal_a")
+
+    select_chain.return_value.execute.assert_not_called()
+    assert saved["source"] == "supabase"
+    assert saved["updated_at"] == "2026-10-19T12:00:00Z"
+    assert loaded == saved
+    assert repository.get_cache_stats()["hits"] == 1
+
+
+def test_persistence_layer_reports_cache_status_and_invalidates_by_resource():
+    client = _config_client({"channel_id": "canal_a", "notes": "Sem spoiler."})
+    with (
+        patch.dict(
+            os.environ,
+            {"SUPABASE_URL": "http://localhost:54321", "SUPABASE_KEY": "local"},
+            clear=True,
+        ),
+        patch("bot.persistence_layer.create_client", return_value=client),
+    ):
+        layer = PersistenceLayer()
+
+    layer.load_agent_notes_sync("canal_a")
+    layer.load_agent_notes_sync("canal_a")
+
+    status = layer.get_channel_cache_status()
+    assert set(status) == {"channel_config", "agent_notes", "channel_identity", "persona_profile"}
+    assert status["agent_notes"]["hits"] == 1
+    assert status["channel_config"]["hits"] == 0
+    assert layer.invalidate_channel_caches("canal_a", resources=("agent_notes",)) == 1
+    assert layer.invalidate_channel_caches() == 0
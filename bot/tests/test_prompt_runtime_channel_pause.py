@@ -12,7 +12,8 @@ class TestPromptRuntimeChannelPause(unittest.IsolatedAsyncioTestCase):
         with (
             patch("bot.prompt_runtime.context_manager.get", return_value=ctx),
             patch(
-                "bot.prompt_runtime.context_manager.ensure_channel_config_loaded",
+                "bot.prompt_runtime.context_manager.ensure_channel_ready",
+                new_callable=AsyncMock,
                 return_value=ctx,
             ),
             patch(
@@ -41,7 +42,8 @@ class TestPromptRuntimeChannelPause(unittest.IsolatedAsyncioTestCase):
         with (
             patch("bot.prompt_runtime.context_manager.get", return_value=ctx),
             patch(
-                "bot.prompt_runtime.context_manager.ensure_channel_config_loaded",
+                "bot.prompt_runtime.context_manager.ensure_channel_ready",
+                new_callable=AsyncMock,
                 return_value=ctx,
             ),
             patch(
@@ -59,7 +61,8 @@ class TestPromptRuntimeChannelPause(unittest.IsolatedAsyncioTestCase):
         with (
             patch("bot.prompt_runtime.context_manager.get", return_value=ctx),
             patch(
-                "bot.prompt_runtime.context_manager.ensure_channel_config_loaded",
+                "bot.prompt_runtime.context_manager.ensure_channel_ready",
+                new_callable=AsyncMock,
                 return_value=ctx,
             ),
             patch(
@@ -1,5 +1,6 @@
 from bot.semantic_memory import (
     EMBEDDING_DIMENSIONS,
+    cluster_semantic_entries,
     cosine_similarity,
     embed_text,
     rank_semantic_matches,
@@ -45,3 +46,40 @@ def test_rank_semantic_matches_orders_by_similarity_and_limits_result():
     assert len(matches) == 1
     assert matches[0]["entry_id"] == "a"
     assert "similarity" in matches[0]
+
+
+def test_cluster_semantic_entries_groups_near_duplicates_by_type():
+    entries = [
+        {
+            "entry_id": "old",
+            "memory_type": "fact",
+            "content": "Streamer joga de mouse X",
+            "updated_at": "2026-02-27T21:00:00Z",
+        },
+        {
+            "entry_id": "new",
+            "memory_type": "fact",
+            "content": "Streamer joga de mouse X",
+            "updated_at": "2026-02-27T22:00:00Z",
+        },
+        {
+            "entry_id": "pref",
+            "memory_type": "preference",
+            "content": "Streamer joga de mouse X",
+            "updated_at": "2026-02-27T21:30:00Z",
+        },
+        {
+            "entry_id": "other",
+            "memory_type": "fact",
+            "content": "Canal foca em speedrun competitivo",
+            "updated_at": "2026-02-27T20:00:00Z",
+        },
+    ]
+
+    clusters = cluster_semantic_entries(entries, similarity_threshold=0.9)
+
+    assert [[row["entry_id"] for row in cluster] for cluster in clusters] == [
+        ["new", "old"],
+        ["pref"],
+        ["other"],
+    ]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from bot.persistence_semantic_memory_repository import (
+    COMPACTION_PAGE_SIZE,
+    SemanticMemoryRepository,
+)
+from bot.semantic_memory_compaction_runtime import SemanticMemoryCompactionRuntime
+
+
+def _row(entry_id: str, content: str, updated_at: str, **extra: object) -> dict[str, object]:
+    return {
+        "entry_id": entry_id,
+        "channel_id": "canal_a",
+        "memory_type": "fact",
+        "content": content,
+        "tags": [],
+        "context": {},
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        **extra,
+    }
+
+
+def test_compaction_merges_duplicates_in_memory_mode():
+    repository = SemanticMemoryRepository(enabled=False, client=None, cache={})
+    repository.save_entry_sync(
+        "canal_a", content="Streamer joga de mouse X", tags=["setup"], context={"a": 1}
+    )
+    repository.save_entry_sync(
+        "canal_a", content="streamer joga de mouse x", tags=["hardware"], context={"b": 2}
+    )
+    repository.save_entry_sync("canal_a", content="Canal foca em speedrun competitivo")
+
+    report = repository.compact_channel_entries_sync("Canal_A", similarity_threshold=0.95)
+
+    assert report["ok"] is True
+    assert report["source"] == "memory"
+    assert report["entries_before"] == 3
+    assert report["entries_after"] == 2
+    assert report["duplicates_removed"] == 1
+    assert report["removed_count"] == 1
+    assert "rank_latency_ms_before" in report
+    assert "rank_latency_ms_delta" in report
+
+    entries = repository.load_channel_entries_sync("canal_a", limit=10)
+    assert len(entries) == 2
+    merged = next(entry for entry in entries if "mouse" in entry["content"].lower())
+    assert set(merged["tags"]) == {"setup", "hardware"}
+    assert merged["context"] == {"a": 1, "b": 2}
+
+
+def test_compaction_keeps_table_within_max_entries():
+    repository = SemanticMemoryRepository(enabled=False, client=None, cache={})
+    for index, topic in enumerate(["lore", "speedrun", "setup", "musica"]):
+        repository.save_entry_sync("canal_a", content=f"Fato {index} sobre {topic}")
+
+    report = repository.compact_channel_entries_sync(
+        "canal_a", similarity_threshold=1.0, max_entries=2
+    )
+
+    assert report["entries_after"] == 2
+    assert report["trimmed_over_limit"] == 2
+    assert len(repository.load_channel_entries_sync("canal_a", limit=10)) == 2
+
+
+def test_compaction_uses_bulk_upsert_and_batched_delete_on_supabase():
+    mock_client = MagicMock()
+    table = mock_client.table.return_value
+    select_chain = table.select.return_value.eq.return_value.order.return_value.order.return_value.range.return_value
+    select_chain.execute.return_value = MagicMock(
+        data=[
+            _row("entry_new", "Streamer joga de mouse X", "2026-02-28T13:00:00Z", tags=["a"]),
+            _row("entry_old", "Streamer joga de mouse X", "2026-02-28T12:00:00Z", tags=["b"]),
+            _row("entry_other", "Canal prioriza lore sem spoiler", "2026-02-28T11:00:00Z"),
+        ]
+    )
+    repository = SemanticMemoryRepository(enabled=True, client=mock_client, cache={})
+
+    report = repository.compact_channel_entries_sync("canal_a")
+
+    assert report["ok"] is True
+    assert report["source"] == "supabase"
+    assert report["entries_before"] == 3
+    assert report["entries_after"] == 2
+    upsert_rows = table.upsert.call_args.args[0]
+    assert [row["entry_id"] for row in upsert_rows] == ["entry_new"]
+    assert set(upsert_rows[0]["tags"]) == {"a", "b"}
+    assert upsert_rows[0]["created_at"] == "2026-02-28T12:00:00Z"
+    table.delete.return_value.eq.assert_called_once_with("channel_id", "canal_a")
+    table.delete.return_value.eq.return_value.in_.assert_called_once_with("entry_id", ["entry_old"])
+
+
+def test_compaction_reports_error_without_touching_cache_when_delete_fails():
+    mock_client = MagicMock()
+    table = mock_client.table.return_value
+    select_chain = table.select.return_value.eq.return_value.order.return_value.order.return_value.range.return_value
+    select_chain.execute.return_value = MagicMock(
+        data=[
+            _row("entry_new", "Streamer joga de mouse X", "2026-02-28T13:00:00Z"),
+            _row("entry_old", "Streamer joga de mouse X", "2026-02-28T12:00:00Z"),
+        ]
+    )
+    table.delete.return_value.eq.return_value.in_.return_value.execute.side_effect = RuntimeError(
+        "boom"
+    )
+    cache: dict[str, list[dict[str, object]]] = {}
+    repository = SemanticMemoryRepository(enabled=True, client=mock_client, cache=cache)
+
+    report = repository.compact_channel_entries_sync("canal_a")
+
+    assert report["ok"] is False
+    assert report["error"] == "boom"
+    assert "canal_a" not in cache
+
+
+def test_compaction_runtime_skips_default_and_records_reports():
+    runtime = SemanticMemoryCompactionRuntime()
+    with patch(
+        "bot.persistence_layer.persistence.compact_semantic_memory_entries_sync",
+        side_effect=[{"ok": True, "channel_id": "canal_a", "removed_count": 2}],
+    ) as mock_compact:
+        reports = runtime.compact_channels_sync(["default", "Canal_A", "canal_a"])
+
+    mock_compact.assert_called_once_with("canal_a")
+    assert len(reports) == 1
+    status = runtime.get_status()
+    assert status["channels"]["canal_a"]["removed_count"] == 2
+    assert status["last_run_at"] > 0
+
+
+def test_compaction_pages_through_tables_larger_than_one_page():
+    mock_client = MagicMock()
+    table = mock_client.table.return_value
+    select_chain = (
+        table.select.return_value.eq.return_value.order.return_value.order.return_value.range
+    )
+    rows = [
+        _row(f"entry_{index:05d}", f"Fato {index} sobre topico {index}", "2026-02-28T12:00:00Z")
+        for index in range(COMPACTION_PAGE_SIZE + 5)
+    ]
+    select_chain.return_value.execute.side_effect = [
+        MagicMock(data=rows[:COMPACTION_PAGE_SIZE]),
+        MagicMock(data=rows[COMPACTION_PAGE_SIZE:]),
+    ]
+    repository = SemanticMemoryRepository(enabled=True, client=mock_client, cache={})
+
+    with patch("bot.persistence_semantic_memory_repository.cluster_semantic_entries") as cluster:
+        cluster.side_effect = lambda entries, similarity_threshold: [[entry] for entry in entries]
+        report = repository.compact_channel_entries_sync("canal_a", max_entries=10)
+
+    assert [call.args for call in select_chain.call_args_list] == [
+        (0, COMPACTION_PAGE_SIZE - 1),
+        (COMPACTION_PAGE_SIZE, 2 * COMPACTION_PAGE_SIZE - 1),
+    ]
+    assert report["entries_before"] == COMPACTION_PAGE_SIZE + 5
+    assert report["entries_after"] == 10
+    assert report["removed_count"] == COMPACTION_PAGE_SIZE - 5
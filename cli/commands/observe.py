@@ -25,45 +25,86 @@ def register(subparsers: argparse._SubParsersAction) -> None:
     p_hist.add_argument("--limit", type=int, default=24, help="Max timeline entries (default: 24)")
     p_hist.set_defaults(handler=_handle_history)
 
+    # channels
+    p_chan = sub.add_parser("channels", help="Multi-channel summary in a single request")
+    p_chan.add_argument(
+        "--channels",
+        default="*",
+        help="Comma-separated channel ids (default: all active channels)",
+    )
+    p_chan.add_argument("--fields", default="", help="Comma-separated snapshot fields")
+    p_chan.set_defaults(handler=_handle_channels)
+
 
 def _handle_overview(args: argparse.Namespace, client: ByteClient, config: CLIConfig) -> None:
     params = {"channel": config.channel} if config.channel != "default" else {}
-    data = client.get("/api/observability", params)
+    data = client.get("/api/observability", {**params, "view": "compact"})
     output(data, json_mode=config.json_output, human_fn=_human_overview)
 
 
 def _human_overview(data: dict[str, Any]) -> None:
-    counters = data.get("counters", {})
-    cost = data.get("cost", {})
-    interactions = data.get("interactions", {})
+    metrics = data.get("metrics", {}) or {}
+    health = data.get("stream_health", {}) or {}
 
     print_header("Observability Snapshot")
     print_kv(
         {
-            "Mode": data.get("mode", "—"),
-            "Messages Received": counters.get("chat_messages_received", 0),
-            "Replies Sent": counters.get("chat_replies_sent", 0),
-            "Trigger Events": counters.get("trigger_events", 0),
-            "Errors": counters.get("errors", 0),
-            "Total Tokens": counters.get("total_tokens", 0),
-            "Estimated Cost": f"${cost.get('total_usd', 0):.4f}",
+            "Channel": data.get("selected_channel", "—"),
+            "Messages Received": metrics.get("chat_messages_total", 0),
+            "Replies Sent": metrics.get("replies_total", 0),
+            "Trigger Events": metrics.get("byte_triggers_total", 0),
+            "Errors": metrics.get("errors_total", 0),
+            "Total Tokens": int(metrics.get("token_input_total", 0))
+            + int(metrics.get("token_output_total", 0)),
+            "Estimated Cost": f"${metrics.get('estimated_cost_usd_total', 0):.4f}",
+            "Stream Health": health.get("score", "—"),
         }
     )
 
-    if interactions:
-        print_header("Recent Interactions")
-        rows = []
-        for item in (interactions.get("recent", []) or [])[:10]:
-            rows.append(
-                [
-                    str(item.get("type", "—")),
-                    str(item.get("channel", "—")),
-                    str(item.get("text", "—"))[:60],
-                    format_timestamp(item.get("timestamp")),
-                ]
-            )
-        if rows:
-            print_table(["Type", "Channel", "Text", "Time"], rows)
+    events = data.get("recent_events", []) or []
+    if events:
+        print_header("Recent Events")
+        rows = [
+            [
+                str(item.get("level", "—")),
+                str(item.get("event", "—")),
+                str(item.get("message", "—"))[:60],
+                format_timestamp(item.get("ts")),
+            ]
+            for item in events[:10]
+        ]
+        print_table(["Level", "Event", "Message", "Time"], rows)
+
+
+def _handle_channels(args: argparse.Namespace, client: ByteClient, config: CLIConfig) -> None:
+    params: dict[str, str] = {"channels": args.channels}
+    if args.fields:
+        params["fields"] = args.fields
+    data = client.get("/api/observability/batch", params)
+    output(data, json_mode=config.json_output, human_fn=_human_channels)
+
+
+def _human_channels(data: dict[str, Any]) -> None:
+    channels = data.get("channels", {}) or {}
+    print_header(f"Channels ({len(channels)})")
+    if not channels:
+        return
+
+    rows = []
+    for channel_id, snapshot in channels.items():
+        metrics = snapshot.get("metrics", {}) or {}
+        chatters = snapshot.get("chatters", {}) or {}
+        health = snapshot.get("stream_health", {}) or {}
+        rows.append(
+            [
+                str(channel_id),
+                str(metrics.get("chat_messages_total", "—")),
+                str(chatters.get("active_10m", "—")),
+                str(metrics.get("errors_total", "—")),
+                str(health.get("score", "—")),
+            ]
+        )
+    print_table(["Channel", "Msgs", "Active 10m", "Errors", "Health"], rows)
 
 
 def _handle_sentiment(args: argparse.Namespace, client: ByteClient, config: CLIConfig) -> None:
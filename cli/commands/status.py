@@ -45,7 +45,7 @@ def _handle(args: argparse.Namespace, client: ByteClient, config: CLIConfig) ->
 
     if online:
         cp_data = client.get("/api/control-plane")
-        obs_data = client.get("/api/observability")
+        obs_data = client.get("/api/observability", {"view": "compact"})
 
     combined = {
         "online": online,
@@ -84,17 +84,17 @@ def _human_output(data: dict[str, Any]) -> None:
     )
 
     # Observability
-    counters = obs.get("counters", {})
-    cost = obs.get("cost", {})
+    metrics = obs.get("metrics", {}) or {}
     print_header("Observability")
     print_kv(
         {
-            "Messages Received": counters.get("chat_messages_received", 0),
-            "Replies Sent": counters.get("chat_replies_sent", 0),
-            "Triggers": counters.get("trigger_events", 0),
-            "Errors": counters.get("errors", 0),
-            "Tokens Used": counters.get("total_tokens", 0),
-            "Estimated Cost": f"${cost.get('total_usd', 0):.4f}",
-            "Last Activity": format_timestamp(obs.get("last_activity_at")),
+            "Messages Received": metrics.get("chat_messages_total", 0),
+            "Replies Sent": metrics.get("replies_total", 0),
+            "Triggers": metrics.get("byte_triggers_total", 0),
+            "Errors": metrics.get("errors_total", 0),
+            "Tokens Used": int(metrics.get("token_input_total", 0))
+            + int(metrics.get("token_output_total", 0)),
+            "Estimated Cost": f"${metrics.get('estimated_cost_usd_total', 0):.4f}",
+            "Snapshot At": format_timestamp(obs.get("timestamp")),
         }
     )
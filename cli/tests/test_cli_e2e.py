@@ -488,7 +488,7 @@ def _run(mock_server: str, argv: list[str]) -> int:
 class TestE2E:
     def test_status(self, mock_server: str) -> None:
         _MockHandler.responses["GET:/api/control-plane"] = {"ok": True, "config": {"goals": []}}
-        _MockHandler.responses["GET:/api/observability"] = {"ok": True, "counters": {}, "cost": {}}
+        _MockHandler.responses["GET:/api/observability"] = {"ok": True, "metrics": {}}
         assert _run(mock_server, ["status"]) == 0
 
     def test_suspend(self, mock_server: str) -> None:
@@ -517,11 +517,19 @@ class TestE2E:
     def test_observe(self, mock_server: str) -> None:
         _MockHandler.responses["GET:/api/observability"] = {
             "ok": True,
-            "counters": {},
-            "cost": {},
-            "interactions": {},
+            "metrics": {"chat_messages_total": 4, "token_input_total": 10},
+            "recent_events": [{"level": "info", "event": "reply", "message": "oi"}],
         }
         assert _run(mock_server, ["observe"]) == 0
+        assert _MockHandler.last_request["query"]["view"] == ["compact"]
+
+    def test_observe_channels(self, mock_server: str) -> None:
+        _MockHandler.responses["GET:/api/observability/batch"] = {
+            "ok": True,
+            "channels": {"canal_a": {"metrics": {"chat_messages_total": 3}}},
+        }
+        assert _run(mock_server, ["observe", "channels", "--channels", "canal_a,canal_b"]) == 0
+        assert _MockHandler.last_request["query"]["channels"] == ["canal_a,canal_b"]
 
     def test_sentiment(self, mock_server: str) -> None:
         _MockHandler.responses["GET:/api/sentiment/scores"] = {
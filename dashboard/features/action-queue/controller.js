@@ -15,6 +15,9 @@ import {
 } from "./view.js";
 
 const ACTION_QUEUE_INTERVAL_MS = 12000;
+const ACTION_QUEUE_STREAM_INTERVAL_MS = 60000;
+// Bursts of transitions (playbooks enqueue several items) collapse into one refresh.
+const ACTION_QUEUE_STREAM_DEBOUNCE_MS = 400;
 
 export function createActionQueueController({
   aqEls,
@@ -24,6 +27,8 @@ export function createActionQueueController({
   let isPolling = false;
   let timerId = 0;
   let selectedChannel = "default";
+  let streamActive = false;
+  let streamRefreshTimerId = 0;
 
   async function refreshActionQueue({ showFeedback = true } = {}) {
     if (!aqEls || isPolling) return;
@@ -95,10 +100,31 @@ export function createActionQueueController({
     if (timerId) {
       window.clearTimeout(timerId);
     }
-    timerId = window.setTimeout(async () => {
-      await refreshActionQueue({ showFeedback: false });
+    timerId = window.setTimeout(
+      async () => {
+        await refreshActionQueue({ showFeedback: false });
+        scheduleActionQueuePolling();
+      },
+      streamActive ? ACTION_QUEUE_STREAM_INTERVAL_MS : ACTION_QUEUE_INTERVAL_MS,
+    );
+  }
+
+  function handleStreamTransition() {
+    if (streamRefreshTimerId) {
+      window.clearTimeout(streamRefreshTimerId);
+    }
+    streamRefreshTimerId = window.setTimeout(() => {
+      streamRefreshTimerId = 0;
+      refreshActionQueue({ showFeedback: false });
+    }, ACTION_QUEUE_STREAM_DEBOUNCE_MS);
+  }
+
+  function setStreamActive(active) {
+    const changed = streamActive !== Boolean(active);
+    streamActive = Boolean(active);
+    if (changed && timerId) {
       scheduleActionQueuePolling();
-    }, ACTION_QUEUE_INTERVAL_MS);
+    }
   }
 
   async function decideQueueItem(actionId, decision, note = "") {
@@ -197,8 +223,10 @@ export function createActionQueueController({
 
   return {
     bindActionQueueEvents,
+    handleStreamTransition,
     refreshActionQueue,
     scheduleActionQueuePolling,
+    setStreamActive,
     setSelectedChannel(channelId) {
       selectedChannel =
         String(channelId || "")
@@ -1,6 +1,10 @@
 import { fetchClipJobs, fetchVisionStatus, postVisionIngest } from "./api.js";
 import { renderClipCard, renderVisionStatus } from "./view.js";
 
+const CLIPS_POLL_INTERVAL_MS = 2000;
+// Clip transitions arrive over the push stream; polling keeps vision status fresh.
+const CLIPS_STREAM_POLL_INTERVAL_MS = 30000;
+
 // Adaptive polling based on Page Visibility API.
 class AdaptivePoller {
     constructor(fn, intervalMs = 2000) {
@@ -32,6 +36,15 @@ class AdaptivePoller {
         this.tick();
     }
 
+    setInterval(intervalMs) {
+        if (this.baseInterval === intervalMs) return;
+        this.baseInterval = intervalMs;
+        if (this.isRunning) {
+            if (this.timer) clearTimeout(this.timer);
+            this.timer = setTimeout(() => this.tick(), this.baseInterval);
+        }
+    }
+
     async tick() {
         if (!this.isRunning) return;
 
@@ -45,6 +58,8 @@ class AdaptivePoller {
 }
 
 export function createClipsController({ els }) {
+    let jobsById = new Map();
+
     const render = (jobs) => {
         if (!els.container) return;
 
@@ -75,6 +90,7 @@ export function createClipsController({ els }) {
             ]);
 
             if (clipData?.ok && Array.isArray(clipData.items)) {
+                jobsById = new Map(clipData.items.map((job) => [job.job_id, job]));
                 render(clipData.items);
             }
             if (visionData?.ok) {
@@ -118,11 +134,23 @@ export function createClipsController({ els }) {
         els.visionIngestBtn.addEventListener("click", handleVisionIngest);
     }
 
-    const poller = new AdaptivePoller(fetchAndRender, 2000);
+    const applyStreamJob = (job) => {
+        if (!job?.job_id) return;
+        jobsById.set(job.job_id, { ...(jobsById.get(job.job_id) || {}), ...job });
+        const jobs = Array.from(jobsById.values()).sort((a, b) =>
+            String(b.created_at || "").localeCompare(String(a.created_at || "")),
+        );
+        render(jobs);
+    };
+
+    const poller = new AdaptivePoller(fetchAndRender, CLIPS_POLL_INTERVAL_MS);
 
     return {
         startPolling: () => poller.start(),
         stopPolling: () => poller.stop(),
-        manualRefresh: fetchAndRender
+        manualRefresh: fetchAndRender,
+        applyStreamJob,
+        setStreamActive: (active) =>
+            poller.setInterval(active ? CLIPS_STREAM_POLL_INTERVAL_MS : CLIPS_POLL_INTERVAL_MS),
     };
 }
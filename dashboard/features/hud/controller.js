@@ -3,11 +3,15 @@ import { renderHudMessages } from "./view.js";
 import { getStorageItem } from "../shared/dom.js";
 
 const HUD_POLL_INTERVAL_MS = 3000;
+const HUD_STREAM_POLL_INTERVAL_MS = 30000;
+const HUD_MAX_MESSAGES = 20;
 
 export function createHudController({ hudEls }) {
   let lastTs = 0;
   let timerId = 0;
   let ttsEnabled = false;
+  let streamActive = false;
+  let messages = [];
 
   function resolveAdminToken() {
     const tokenInput = document.getElementById("adminTokenInput");
@@ -39,26 +43,46 @@ export function createHudController({ hudEls }) {
     window.speechSynthesis.speak(utterance);
   }
 
+  function mergeMessages(incoming) {
+    const fresh = incoming.filter((msg) => (msg.ts || 0) > lastTs);
+    if (fresh.length === 0) return;
+    messages = messages.concat(fresh).slice(-HUD_MAX_MESSAGES);
+    renderHudMessages(messages, hudEls);
+    // TTS for new messages
+    const newest = fresh[fresh.length - 1];
+    const newestTs = newest.ts || 0;
+    if (newestTs > lastTs && lastTs > 0) {
+      speakMessage(newest.text);
+    }
+    lastTs = Math.max(lastTs, newestTs);
+  }
+
   async function fetchAndRender() {
     try {
       const data = await fetchHudMessages(lastTs);
       if (data.ok && Array.isArray(data.messages)) {
-        renderHudMessages(data.messages, hudEls);
-        // TTS for new messages
-        if (data.messages.length > 0) {
-          const newest = data.messages[data.messages.length - 1];
-          const newestTs = newest.ts || 0;
-          if (newestTs > lastTs && lastTs > 0) {
-            speakMessage(newest.text);
-          }
-          lastTs = Math.max(lastTs, newestTs);
+        if (data.messages.length === 0 && messages.length === 0) {
+          renderHudMessages([], hudEls);
         }
+        mergeMessages(data.messages);
       }
     } catch (error) {
       console.error("HUD polling error:", error);
     }
   }
 
+  function applyStreamMessage(message) {
+    if (!message || !message.text) return;
+    mergeMessages([message]);
+  }
+
+  function resolvePollInterval() {
+    const interval = streamActive
+      ? HUD_STREAM_POLL_INTERVAL_MS
+      : HUD_POLL_INTERVAL_MS;
+    return document.hidden ? Math.max(interval, HUD_POLL_INTERVAL_MS * 5) : interval;
+  }
+
   function schedulePolling() {
     if (timerId) window.clearTimeout(timerId);
     timerId = window.setTimeout(
@@ -66,7 +90,7 @@ export function createHudController({ hudEls }) {
         await fetchAndRender();
         schedulePolling();
       },
-      document.hidden ? HUD_POLL_INTERVAL_MS * 5 : HUD_POLL_INTERVAL_MS,
+      resolvePollInterval(),
     );
   }
 
@@ -93,5 +117,14 @@ export function createHudController({ hudEls }) {
       schedulePolling();
     },
     bindEvents,
+    applyStreamMessage,
+    refresh: fetchAndRender,
+    setStreamActive(active) {
+      const changed = streamActive !== Boolean(active);
+      streamActive = Boolean(active);
+      if (changed && timerId) {
+        schedulePolling();
+      }
+    },
   };
 }
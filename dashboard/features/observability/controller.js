@@ -21,8 +21,11 @@ import {
 import { applyChannelControlCapability } from "../channel-control/view.js";
 import { renderControlPlaneCapabilities } from "../control-plane/view.js";
 import { renderAutonomyRuntime } from "../autonomy/view.js";
+import { applyMergePatch } from "../shared/stream.js";
 
 const OBSERVABILITY_INTERVAL_MS = 10000;
+// With the push stream live, polling only refreshes the secondary panels.
+const OBSERVABILITY_STREAM_INTERVAL_MS = 60000;
 const OBSERVABILITY_TIMEOUT_MS = 8000;
 const OBSERVABILITY_HISTORY_LIMIT = 24;
 const OBSERVABILITY_COMPARE_LIMIT = 6;
@@ -50,6 +53,9 @@ export function createObservabilityController({
   let semanticMemoryQuery = "";
   let semanticMemoryMinSimilarity = "";
   let semanticMemoryForceFallback = false;
+  let streamActive = false;
+  let streamSnapshot = null;
+  let lastSentimentData = null;
 
   function syncSemanticMemorySearchTuning() {
     if (!obsEls) return;
@@ -120,6 +126,7 @@ export function createObservabilityController({
           OBSERVABILITY_TIMEOUT_MS,
         ).catch((_error) => null),
       ]);
+      lastSentimentData = sentimentData;
       renderObservabilitySnapshot(data, obsEls, sentimentData);
       renderChannelContextSnapshot(channelData, obsEls);
       renderObservabilityHistorySnapshot(historyData, obsEls);
@@ -332,14 +339,53 @@ export function createObservabilityController({
     if (timerId) {
       window.clearTimeout(timerId);
     }
-    timerId = window.setTimeout(async () => {
-      await fetchAndRenderObservability();
+    timerId = window.setTimeout(
+      async () => {
+        await fetchAndRenderObservability();
+        scheduleObservabilityPolling();
+      },
+      streamActive ? OBSERVABILITY_STREAM_INTERVAL_MS : OBSERVABILITY_INTERVAL_MS,
+    );
+  }
+
+  function renderStreamSnapshot() {
+    if (!obsEls || !streamSnapshot) return;
+    renderObservabilitySnapshot(streamSnapshot, obsEls, lastSentimentData);
+    setConnectionState("ok", obsEls);
+    applyRuntimeCapabilities(
+      streamSnapshot?.capabilities || {},
+      streamSnapshot?.bot?.mode || "",
+    );
+    renderAutonomyRuntime(streamSnapshot?.autonomy || {}, autEls);
+  }
+
+  function applyStreamSnapshot(data) {
+    if (String(data?.channel || "") !== selectedChannel) return;
+    streamSnapshot = data?.payload || null;
+    renderStreamSnapshot();
+  }
+
+  function applyStreamPatch(data) {
+    if (String(data?.channel || "") !== selectedChannel || !streamSnapshot) return;
+    streamSnapshot = applyMergePatch(streamSnapshot, data?.patch || {});
+    renderStreamSnapshot();
+  }
+
+  function setStreamActive(active) {
+    const changed = streamActive !== Boolean(active);
+    streamActive = Boolean(active);
+    if (!streamActive) {
+      streamSnapshot = null;
+    }
+    if (changed && timerId) {
       scheduleObservabilityPolling();
-    }, OBSERVABILITY_INTERVAL_MS);
+    }
   }
 
   return {
     applyRuntimeCapabilities,
+    applyStreamPatch,
+    applyStreamSnapshot,
     fetchAndRenderObservability,
     generatePostStreamReport,
     refreshSemanticMemory,
@@ -350,7 +396,9 @@ export function createObservabilityController({
         String(channelId || "")
           .trim()
           .toLowerCase() || "default";
+      streamSnapshot = null;
     },
+    setStreamActive,
     scheduleObservabilityPolling,
   };
 }
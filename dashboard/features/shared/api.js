@@ -2,6 +2,48 @@
 import { getStorageItem } from "./dom.js";
 export const TIMEOUT_DEFAULT_MS = 12000;
 
+export function resolveActiveToken() {
+    const tokenInput = document.getElementById("adminTokenInput");
+    const domToken = tokenInput ? tokenInput.value.trim() : "";
+    const localToken = getStorageItem("byte_dashboard_admin_token");
+    const serverToken = window.BYTE_CONFIG?.adminToken || "";
+    return domToken || localToken || serverToken;
+}
+
+// HF Spaces Subdomain Resolver for Private Iframes
+export function resolveApiUrl(url) {
+    if (!url.startsWith("./api/") && !url.startsWith("/api/")) {
+        return url;
+    }
+    const routePath = url.replace(/^\.\//, "/").replace(/^\/api\//, "api/");
+    const currentOrigin = window.location.origin;
+    if (currentOrigin.includes(".hf.space") || currentOrigin.includes("localhost") || currentOrigin.includes("127.0.0.1")) {
+        return `${currentOrigin}/${routePath}`;
+    }
+    // Fallback for remote context outside Space (unlikely in this setup)
+    return `https://juancs-dev-twitch-byte-bot.hf.space/${routePath}`;
+}
+
+// Attach token in query string as fallback (HF proxy may block headers).
+function withAuthQuery(url, token) {
+    if (!token) return url;
+    const separator = url.includes("?") ? "&" : "?";
+    return `${url}${separator}auth=${encodeURIComponent(token)}`;
+}
+
+/**
+ * URL of the SSE push stream. EventSource cannot send headers,
+ * so the admin token always travels in the query string.
+ */
+export function buildStreamUrl({ channel = "default", topics = [] } = {}) {
+    const params = new URLSearchParams();
+    params.set("channel", String(channel || "default").trim().toLowerCase() || "default");
+    if (topics.length) {
+        params.set("topics", topics.join(","));
+    }
+    return withAuthQuery(resolveApiUrl(`./api/stream?${params.toString()}`), resolveActiveToken());
+}
+
 /**
  * Standard fetch wrapper that throws HTTP errors
  * and handles abort/timeout.
@@ -15,11 +57,7 @@ export async function fetchWithTimeout(url, options = {}, timeoutMs = TIMEOUT_DE
         ...options.headers,
     };
 
-    const tokenInput = document.getElementById("adminTokenInput");
-    let domToken = tokenInput ? tokenInput.value.trim() : "";
-    let localToken = getStorageItem("byte_dashboard_admin_token");
-    let serverToken = window.BYTE_CONFIG?.adminToken || "";
-    let activeToken = domToken || localToken || serverToken;
+    const activeToken = resolveActiveToken();
 
     if (activeToken) {
         headers["X-Byte-Admin-Token"] = activeToken;
@@ -28,28 +66,12 @@ export async function fetchWithTimeout(url, options = {}, timeoutMs = TIMEOUT_DE
     const fetchOptions = {
         ...options,
         signal: controller.signal,
-        cache: "no-store",
+        // Revalida com If-None-Match: o servidor responde 304 quando o JSON nao mudou.
+        cache: "no-cache",
         headers,
     };
 
-    // HF Spaces Subdomain Resolver for Private Iframes
-    let finalUrl = url;
-    if (url.startsWith("./api/") || url.startsWith("/api/")) {
-        const routePath = url.replace(/^\.\//, "/").replace(/^\/api\//, "api/");
-        const currentOrigin = window.location.origin;
-        if (currentOrigin.includes(".hf.space") || currentOrigin.includes("localhost") || currentOrigin.includes("127.0.0.1")) {
-            finalUrl = `${currentOrigin}/${routePath}`;
-        } else {
-            // Fallback for remote context outside Space (unlikely in this setup)
-            finalUrl = `https://juancs-dev-twitch-byte-bot.hf.space/${routePath}`;
-        }
-    }
-
-    // Attach token in query string as fallback (HF proxy may block headers).
-    if (activeToken) {
-        const separator = finalUrl.includes("?") ? "&" : "?";
-        finalUrl = `${finalUrl}${separator}auth=${encodeURIComponent(activeToken)}`;
-    }
+    const finalUrl = withAuthQuery(resolveApiUrl(url), activeToken);
 
     try {
         const response = await fetch(finalUrl, fetchOptions);
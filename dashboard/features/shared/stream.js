@@ -0,0 +1,118 @@
+// dashboard/features/shared/stream.js
+import { buildStreamUrl } from "./api.js";
+
+export const STREAM_TOPICS = ["observability", "hud", "action_queue", "clip_jobs"];
+export const STREAM_EVENTS = [
+    "hello",
+    "snapshot",
+    "observability",
+    "hud",
+    "action_queue",
+    "clip_job",
+];
+// The browser retries transient drops itself; a refused stream (403/503) is retried here.
+const STREAM_REOPEN_DELAY_MS = 30000;
+
+function isPlainObject(value) {
+    return typeof value === "object" && value !== null && !Array.isArray(value);
+}
+
+/**
+ * Applies a JSON Merge Patch (RFC 7386) in place and returns the target.
+ * `null` removes the key; arrays are replaced as a whole.
+ */
+export function applyMergePatch(target, patch) {
+    if (!isPlainObject(patch)) return patch;
+    const base = isPlainObject(target) ? target : {};
+    Object.entries(patch).forEach(([key, value]) => {
+        if (value === null) {
+            delete base[key];
+        } else if (isPlainObject(value)) {
+            base[key] = applyMergePatch(base[key], value);
+        } else {
+            base[key] = value;
+        }
+    });
+    return base;
+}
+
+/**
+ * Server-Sent Events client for /api/stream. Polling stays the fallback:
+ * `onStatusChange(false)` fires whenever the stream is not delivering.
+ */
+export function createDashboardStream({
+    channel = "default",
+    topics = STREAM_TOPICS,
+    handlers = {},
+    onStatusChange = () => {},
+} = {}) {
+    let source = null;
+    let reopenTimerId = 0;
+    let active = false;
+    let selectedChannel = channel;
+
+    function setActive(next) {
+        if (active === next) return;
+        active = next;
+        onStatusChange(active);
+    }
+
+    function close() {
+        if (reopenTimerId) {
+            window.clearTimeout(reopenTimerId);
+            reopenTimerId = 0;
+        }
+        if (source) {
+            source.close();
+            source = null;
+        }
+    }
+
+    function open() {
+        close();
+        if (typeof window.EventSource !== "function") {
+            setActive(false);
+            return;
+        }
+        source = new window.EventSource(buildStreamUrl({ channel: selectedChannel, topics }));
+        source.addEventListener("open", () => setActive(true));
+        source.addEventListener("error", () => {
+            setActive(false);
+            if (source && source.readyState === window.EventSource.CLOSED) {
+                reopenTimerId = window.setTimeout(open, STREAM_REOPEN_DELAY_MS);
+            }
+        });
+        STREAM_EVENTS.forEach((eventName) => {
+            const handler = handlers[eventName];
+            if (typeof handler !== "function") return;
+            source.addEventListener(eventName, (event) => {
+                let data;
+                try {
+                    data = JSON.parse(event.data);
+                } catch (_error) {
+                    return;
+                }
+                handler(data);
+            });
+        });
+    }
+
+    return {
+        start: open,
+        stop() {
+            close();
+            setActive(false);
+        },
+        isActive: () => active,
+        setChannel(channelId) {
+            const nextChannel =
+                String(channelId || "")
+                    .trim()
+                    .toLowerCase() || "default";
+            if (nextChannel === selectedChannel) return;
+            selectedChannel = nextChannel;
+            // New channel means a new snapshot chain: reconnect without Last-Event-ID.
+            if (source) open();
+        },
+    };
+}
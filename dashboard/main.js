@@ -15,6 +15,7 @@ import { createAutonomyController } from "./features/autonomy/controller.js";
 import { createActionQueueController } from "./features/action-queue/controller.js";
 import { createClipsController } from "./features/clips/controller.js";
 import { createHudController } from "./features/hud/controller.js";
+import { createDashboardStream } from "./features/shared/stream.js";
 
 async function bootstrapDashboard() {
   const obsEls = getObservabilityElements();
@@ -35,11 +36,15 @@ async function bootstrapDashboard() {
   });
   let controlPlaneController;
   let actionQueueController;
+  let dashboardStream;
   async function syncDashboardChannel(
     channelId,
     { refreshObservability = true } = {},
   ) {
     observabilityController.setSelectedChannel(channelId);
+    if (dashboardStream) {
+      dashboardStream.setChannel(channelId);
+    }
     if (controlPlaneController) {
       controlPlaneController.setSelectedChannel(channelId);
     }
@@ -95,6 +100,30 @@ async function bootstrapDashboard() {
     hudEls,
   });
 
+  dashboardStream = createDashboardStream({
+    channel: channelControlController.getSelectedDashboardChannel(),
+    handlers: {
+      hello: (data) => {
+        // Events may have been missed: catch up once through the REST endpoints.
+        if (data?.resumed) return;
+        hudController.refresh();
+        clipsController.manualRefresh();
+        actionQueueController.refreshActionQueue({ showFeedback: false });
+      },
+      snapshot: observabilityController.applyStreamSnapshot,
+      observability: observabilityController.applyStreamPatch,
+      hud: hudController.applyStreamMessage,
+      action_queue: actionQueueController.handleStreamTransition,
+      clip_job: clipsController.applyStreamJob,
+    },
+    onStatusChange: (active) => {
+      observabilityController.setStreamActive(active);
+      actionQueueController.setStreamActive(active);
+      clipsController.setStreamActive(active);
+      hudController.setStreamActive(active);
+    },
+  });
+
   channelControlController.bindChannelControlEvents();
   observabilityController.bindObservabilityEvents();
   controlPlaneController.bindControlPlaneEvents();
@@ -124,6 +153,7 @@ async function bootstrapDashboard() {
   actionQueueController.scheduleActionQueuePolling();
   clipsController.startPolling();
   hudController.startPolling();
+  dashboardStream.start();
 }
 
 bootstrapDashboard().catch((err) =>
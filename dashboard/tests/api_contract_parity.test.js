@@ -30,6 +30,8 @@ import {
   postVisionIngest,
 } from "../features/clips/api.js";
 import { fetchHudMessages } from "../features/hud/api.js";
+import { buildStreamUrl } from "../features/shared/api.js";
+import { applyMergePatch } from "../features/shared/stream.js";
 import {
   getChannelContextSnapshot,
   getObservabilityHistorySnapshot,
@@ -322,3 +324,25 @@ test("operational runtime APIs keep backend contract", async () => {
   assert.ok(visionIngestCall);
   assert.equal(visionIngestCall.options.headers["Content-Type"], "image/jpeg");
 });
+
+test("push stream URL keeps backend contract and merge patches apply", () => {
+  installApiEnv({ token: "secret-token" });
+
+  const streamUrl = new URL(
+    buildStreamUrl({ channel: "Canal_A", topics: ["observability", "hud"] }),
+  );
+  assert.equal(streamUrl.pathname, "/api/stream");
+  assert.equal(streamUrl.searchParams.get("channel"), "canal_a");
+  assert.equal(streamUrl.searchParams.get("topics"), "observability,hud");
+  assert.equal(streamUrl.searchParams.get("auth"), "secret-token");
+
+  const snapshot = { metrics: { chat: 1, replies: 2 }, items: [1], stale: true };
+  assert.deepEqual(
+    applyMergePatch(snapshot, {
+      metrics: { chat: 4 },
+      items: [1, 2],
+      stale: null,
+    }),
+    { metrics: { chat: 4, replies: 2 }, items: [1, 2] },
+  );
+});